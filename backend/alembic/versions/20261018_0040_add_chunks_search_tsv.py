@@ -0,0 +1,48 @@
+"""add chunks.search_tsv generated tsvector + GIN index
+
+Lexical retrieval used OR-chains of ILIKE '%term%' over chunks.text, backed
+only by idx_chunks_document — every lexical query scanned all chunk text of
+the document/collection. search_tsv is a STORED generated column ('english'
+stemmed + 'simple' verbatim, title weighted A, body B) so the planner can
+match through a GIN index instead. CJK terms have no usable word
+boundaries in either config; retrieval keeps ILIKE for those.
+
+Adding a stored generated column rewrites `chunks` under an ACCESS
+EXCLUSIVE lock; run during a maintenance window on large installs.
+
+Revision ID: 20261018_0040
+Revises: 20260808_0039
+Create Date: 2026-10-18
+"""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import TSVECTOR
+
+from alembic import op
+
+revision = "20261018_0040"
+down_revision = "20260808_0039"
+branch_labels = None
+depends_on = None
+
+# Frozen copy of app.models.tables.CHUNK_SEARCH_TSV_SQL at this revision.
+_SEARCH_TSV_SQL = (
+    "setweight(to_tsvector('english'::regconfig, coalesce(section_title, '')), 'A') || "
+    "setweight(to_tsvector('english'::regconfig, coalesce(text, '')), 'B') || "
+    "setweight(to_tsvector('simple'::regconfig, coalesce(section_title, '')), 'A') || "
+    "setweight(to_tsvector('simple'::regconfig, coalesce(text, '')), 'B')"
+)
+
+
+def upgrade() -> None:
+    op.add_column(
+        "chunks",
+        sa.Column("search_tsv", TSVECTOR, sa.Computed(_SEARCH_TSV_SQL, persisted=True), nullable=True),
+    )
+    op.create_index("idx_chunks_search_tsv", "chunks", ["search_tsv"], postgresql_using="gin")
+
+
+def downgrade() -> None:
+    op.drop_index("idx_chunks_search_tsv", table_name="chunks")
+    op.drop_column("chunks", "search_tsv")
@@ -0,0 +1,44 @@
+"""add document_lexical_indexes (per-document inverted index blobs)
+
+The parse worker serializes a BM25 inverted index (term -> postings with
+term frequencies, unit lengths) for each document right after chunking; the
+API loads it into a per-process LRU for lexical retrieval and the Quote
+Finder term scan instead of re-tokenizing chunk text per request. One row
+per document, cascade-deleted with it. Documents parsed before this
+revision have no row and keep the SQL lexical path.
+
+Revision ID: 20261018_0041
+Revises: 20261018_0040
+Create Date: 2026-10-18
+"""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+from alembic import op
+
+revision = "20261018_0041"
+down_revision = "20261018_0040"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "document_lexical_indexes",
+        sa.Column(
+            "document_id",
+            UUID(as_uuid=True),
+            sa.ForeignKey("documents.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("format_version", sa.Integer, nullable=False),
+        sa.Column("chunk_count", sa.Integer, nullable=False),
+        sa.Column("blob", sa.LargeBinary, nullable=False),
+        sa.Column("built_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("document_lexical_indexes")
@@ -0,0 +1,43 @@
+"""add document_normalized_texts (parse-time quote normalization blobs)
+
+The parse worker stores each chunk's and page's text normalized for the
+Quote Finder (base and fuzzy levels) together with a compact run-encoded
+norm->raw offset map. Quote search's term scan and verify_quote read these
+instead of re-normalizing the whole document on every search. One row per
+document, cascade-deleted with it. Documents parsed before this revision
+have no row and keep normalizing on the fly.
+
+Revision ID: 20261018_0042
+Revises: 20261018_0041
+Create Date: 2026-10-18
+"""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+from alembic import op
+
+revision = "20261018_0042"
+down_revision = "20261018_0041"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "document_normalized_texts",
+        sa.Column(
+            "document_id",
+            UUID(as_uuid=True),
+            sa.ForeignKey("documents.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("format_version", sa.Integer, nullable=False),
+        sa.Column("blob", sa.LargeBinary, nullable=False),
+        sa.Column("built_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("document_normalized_texts")
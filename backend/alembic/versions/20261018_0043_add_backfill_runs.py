@@ -0,0 +1,78 @@
+"""add backfill_runs / backfill_items (parse-pipeline backfill checkpoints)
+
+The backfill orchestrator (app.services.backfill_service) selects documents
+parsed by an older PARSE_PIPELINE_VERSION or with low text quality, then
+re-dispatches parse_document for them in priority order under a concurrency
+cap and an embedding-token budget. A run's limits and totals live in
+backfill_runs; each document's state lives in backfill_items, so a run
+resumes exactly where it stopped after a deploy or beat restart.
+
+Revision ID: 20261018_0043
+Revises: 20261018_0042
+Create Date: 2026-10-18
+"""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+
+from alembic import op
+
+revision = "20261018_0043"
+down_revision = "20261018_0042"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "backfill_runs",
+        sa.Column("id", UUID(as_uuid=True), primary_key=True, server_default=sa.text("gen_random_uuid()")),
+        sa.Column("target_version", sa.Integer, nullable=False),
+        sa.Column("status", sa.String(16), nullable=False, server_default=sa.text("'running'")),
+        sa.Column("max_in_flight", sa.Integer, nullable=False),
+        sa.Column("budget_tokens", sa.BigInteger, nullable=True),
+        sa.Column("params", JSONB, nullable=False, server_default=sa.text("'{}'::jsonb")),
+        sa.Column("docs_total", sa.Integer, nullable=False, server_default=sa.text("0")),
+        sa.Column("docs_done", sa.Integer, nullable=False, server_default=sa.text("0")),
+        sa.Column("docs_failed", sa.Integer, nullable=False, server_default=sa.text("0")),
+        sa.Column("docs_skipped", sa.Integer, nullable=False, server_default=sa.text("0")),
+        sa.Column("chunks_done", sa.BigInteger, nullable=False, server_default=sa.text("0")),
+        sa.Column("tokens_spent", sa.BigInteger, nullable=False, server_default=sa.text("0")),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_table(
+        "backfill_items",
+        sa.Column(
+            "run_id",
+            UUID(as_uuid=True),
+            sa.ForeignKey("backfill_runs.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column(
+            "document_id",
+            UUID(as_uuid=True),
+            sa.ForeignKey("documents.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("position", sa.Integer, nullable=False),
+        sa.Column("state", sa.String(16), nullable=False, server_default=sa.text("'pending'")),
+        sa.Column("est_tokens", sa.Integer, nullable=False, server_default=sa.text("0")),
+        sa.Column("chunks", sa.Integer, nullable=True),
+        sa.Column("tokens", sa.Integer, nullable=True),
+        sa.Column("dispatched_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index(
+        "idx_backfill_items_run_state_position", "backfill_items", ["run_id", "state", "position"]
+    )
+    op.create_index("idx_backfill_items_document", "backfill_items", ["document_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("idx_backfill_items_document", table_name="backfill_items")
+    op.drop_index("idx_backfill_items_run_state_position", table_name="backfill_items")
+    op.drop_table("backfill_items")
+    op.drop_table("backfill_runs")
@@ -16,6 +16,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.cache import cache_get, cache_set
 from app.core.config import settings
 from app.core.deps import get_db_session, require_admin
+from app.core.principal_cache import user_principal_cache
+from app.core.sse import stats as sse_stats
 from app.models.tables import (
     ChatSession,
     CreditLedger,
@@ -37,6 +39,12 @@ from app.schemas.admin import (
     AdminTrendsResponse,
     AdminUserActivityResponse,
 )
+from app.services.chunk_cache import chunk_cache
+from app.services.embedding_cache import embedding_cache
+from app.services.embedding_client import embedding_client
+from app.services.lexical_index import lexical_index_cache
+from app.services.normalized_text_index import normalized_text_cache
+from app.services.query_embedding_cache import query_embedding_cache
 
 router = APIRouter(prefix="/api/admin", tags=["admin"])
 
@@ -1994,6 +2002,22 @@ async def admin_billing_health(
     }
 
 
+@router.get("/cache-stats")
+async def admin_cache_stats(_admin: User = Depends(require_admin)):
+    """Hit/miss counters for the retrieval-path caches, and this process's
+    embedding provider client and SSE stream counters."""
+    return {
+        "embedding_cache": await asyncio.to_thread(embedding_cache.stats),
+        "query_embedding_cache": query_embedding_cache.stats(),
+        "lexical_index_cache": lexical_index_cache.stats(),
+        "normalized_text_cache": normalized_text_cache.stats(),
+        "chunk_cache": chunk_cache.stats(),
+        "user_principal_cache": user_principal_cache.stats(),
+        "embedding_client": embedding_client.stats(),
+        "sse": sse_stats(),
+    }
+
+
 @router.get("/funnel")
 async def admin_funnel(
     _admin: User = Depends(require_admin),
@@ -15,6 +15,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.cache import cache_delete, cache_get, cache_set
 from app.core.config import settings
 from app.core.deps import get_db_session, require_auth
+from app.core.principal_cache import user_principal_cache
 from app.core.security_log import log_security_event
 from app.models.tables import CreditLedger, PlanTransition, ProductEvent, User
 from app.schemas.billing import (
@@ -496,12 +497,13 @@ _BILLING_STATE_CACHE_TTL = 60  # seconds
 
 
 async def _invalidate_user_caches(user_id) -> None:
-    """Invalidate both the profile cache and the billing_state cache for a user.
+    """Invalidate the profile, billing_state and principal caches for a user.
 
     Called from every mutation path that changes `user.plan` or
     `user.stripe_subscription_id` so the next profile fetch refreshes
     `billing_state` within one call (not up to 60s stale).
     """
+    user_principal_cache.invalidate(user_id)
     await cache_delete(f"user:profile:{user_id}")
     await cache_delete(f"user:billing_state:{user_id}")
 
@@ -1,13 +1,12 @@
 from __future__ import annotations
 
 import datetime as dt
-import json
 import uuid
 from datetime import datetime, timedelta, timezone
-from typing import AsyncGenerator, Optional
+from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.responses import JSONResponse
 from sqlalchemy import asc, desc, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
@@ -22,6 +21,7 @@ from app.core.rate_limit import (
     get_client_ip,
 )
 from app.core.security_log import log_security_event
+from app.core.sse import sse_response
 from app.models.tables import (
     ChatSession,
     Collection,
@@ -482,25 +482,11 @@ async def chat_stream(
                 },
             )
 
-    async def event_generator() -> AsyncGenerator[str, None]:
-        async for ev in chat_service.chat_stream(
+    return sse_response(
+        chat_service.chat_stream(
             session_id, body.message, db, user=user, locale=body.locale, mode=body.mode,
             domain_mode=body.domain_mode
-        ):
-            # Format per SSE: event: <type>\ndata: {json}\n\n
-            line = f"event: {ev['event']}\n"
-            payload = json.dumps(ev.get("data", {}), ensure_ascii=False)
-            data_line = f"data: {payload}\n\n"
-            yield line + data_line
-
-    return StreamingResponse(
-        event_generator(),
-        media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache, no-transform",
-            "X-Accel-Buffering": "no",
-            "Connection": "keep-alive",
-        },
+        )
     )
 
 
@@ -619,23 +605,8 @@ async def chat_continue(
                 },
             )
 
-    async def event_generator() -> AsyncGenerator[str, None]:
-        async for ev in chat_service.continue_stream(
-            session_id, msg_id, db, user=user, locale=body.locale, mode=body.mode
-        ):
-            line = f"event: {ev['event']}\n"
-            payload = json.dumps(ev.get("data", {}), ensure_ascii=False)
-            data_line = f"data: {payload}\n\n"
-            yield line + data_line
-
-    return StreamingResponse(
-        event_generator(),
-        media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache, no-transform",
-            "X-Accel-Buffering": "no",
-            "Connection": "keep-alive",
-        },
+    return sse_response(
+        chat_service.continue_stream(session_id, msg_id, db, user=user, locale=body.locale, mode=body.mode)
     )
 
 
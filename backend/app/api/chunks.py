@@ -7,9 +7,10 @@ from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.deps import get_current_user_optional, get_db_session
+from app.core.deps import get_current_principal_optional, get_db_session
+from app.core.principal_cache import UserPrincipal
 from app.core.rate_limit import anon_read_limiter, get_client_ip
-from app.models.tables import Chunk, Document, User
+from app.models.tables import Chunk, Document
 from app.services.doc_service import can_access_document
 
 chunks_router = APIRouter(prefix="/api", tags=["chunks"])
@@ -19,7 +20,7 @@ chunks_router = APIRouter(prefix="/api", tags=["chunks"])
 async def get_chunk_detail(
     chunk_id: uuid.UUID,
     request: Request,
-    user: Optional[User] = Depends(get_current_user_optional),
+    user: Optional[UserPrincipal] = Depends(get_current_principal_optional),
     db: AsyncSession = Depends(get_db_session),
 ):
     if user is None:
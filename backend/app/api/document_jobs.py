@@ -10,8 +10,9 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from app.core.deps import get_db_session, require_auth
-from app.models.tables import DocumentJob, DocumentTable, User
+from app.core.deps import get_db_session, require_principal
+from app.core.principal_cache import UserPrincipal
+from app.models.tables import DocumentJob, DocumentTable
 from app.services.layout_translation_service import (
     LAYOUT_TRANSLATION_JOB_TYPE,
     layout_translation_public_error_message,
@@ -71,7 +72,7 @@ def _table_preview(tables: list[DocumentTable]) -> list[dict[str, Any]]:
     return payload
 
 
-async def _artifact_for_job(job: DocumentJob, db: AsyncSession, user: User) -> DocumentJobArtifactResponse:
+async def _artifact_for_job(job: DocumentJob, db: AsyncSession, user: UserPrincipal) -> DocumentJobArtifactResponse:
     if job.job_type == LAYOUT_TRANSLATION_JOB_TYPE:
         metadata = job.metadata_json or {}
         artifacts = metadata.get("artifacts") if isinstance(metadata, dict) else {}
@@ -218,7 +219,7 @@ async def _artifact_for_job(job: DocumentJob, db: AsyncSession, user: User) -> D
 @router.get("/document-jobs/{job_id}", response_model=DocumentJobDetailResponse)
 async def get_document_job(
     job_id: uuid.UUID,
-    user: User = Depends(require_auth),
+    user: UserPrincipal = Depends(require_principal),
     db: AsyncSession = Depends(get_db_session),
 ):
     row = await db.execute(
@@ -1,10 +1,10 @@
 from __future__ import annotations
 
-import io
+import json
 import logging
 import uuid
 import zipfile
-from typing import Optional
+from typing import AsyncIterator, BinaryIO, Optional
 from urllib.parse import urlparse
 
 from fastapi import (
@@ -17,13 +17,14 @@ from fastapi import (
     UploadFile,
     status,
 )
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.cache import cache_get, cache_set
 from app.core.config import settings
-from app.core.deps import get_current_user_optional, get_db_session, require_auth
+from app.core.deps import get_current_principal_optional, get_db_session, require_auth
+from app.core.principal_cache import UserPrincipal
 from app.core.security_log import log_security_event
 from app.models.tables import User
 from app.schemas.common import StatusResponse
@@ -36,6 +37,7 @@ from app.schemas.document import (
     DocumentResponse,
     DocumentTextContentResponse,
 )
+from app.services.chunk_cache import chunk_cache
 from app.services.doc_service import can_access_document, doc_service, sanitize_filename
 from app.services.storage_service import StorageUnavailableError, storage_service
 
@@ -87,30 +89,40 @@ _UPLOAD_VALUE_ERROR_MAP: dict[str, dict[str, object]] = {
 }
 
 
-def _validate_file_content(data: bytes, file_type: str) -> bool:
-    """Validate file content against expected magic bytes and structure."""
+def _validate_file_content(stream: BinaryIO, file_type: str) -> bool:
+    """Validate file content against expected magic bytes and structure.
+
+    Reads only the leading signature bytes (and, for Office Open XML, the
+    ZIP central directory) from the seekable `stream`, then rewinds it.
+    """
     sigs = _MAGIC_SIGNATURES.get(file_type, [])
-    if sigs and not any(data[:len(sig)] == sig for sig in sigs):
-        return False
-    # For Office Open XML formats, verify ZIP structure
-    if file_type in ('docx', 'pptx', 'xlsx'):
-        try:
-            with zipfile.ZipFile(io.BytesIO(data)) as zf:
-                if '[Content_Types].xml' not in zf.namelist():
-                    return False
-                total_uncompressed = sum(info.file_size for info in zf.infolist())
-                if total_uncompressed > _MAX_UNCOMPRESSED_SIZE:
-                    return False
-        except zipfile.BadZipFile:
-            return False
-    return True
+    try:
+        if sigs:
+            stream.seek(0)
+            head = stream.read(max(len(sig) for sig in sigs))
+            if not any(head.startswith(sig) for sig in sigs):
+                return False
+        # For Office Open XML formats, verify ZIP structure
+        if file_type in ('docx', 'pptx', 'xlsx'):
+            try:
+                with zipfile.ZipFile(stream) as zf:
+                    if '[Content_Types].xml' not in zf.namelist():
+                        return False
+                    total_uncompressed = sum(info.file_size for info in zf.infolist())
+                    if total_uncompressed > _MAX_UNCOMPRESSED_SIZE:
+                        return False
+            except zipfile.BadZipFile:
+                return False
+        return True
+    finally:
+        stream.seek(0)
 
 
 @documents_router.get("", response_model=list[DocumentBrief])
 async def list_documents(
     limit: int = Query(50, ge=1, le=100),
     offset: int = Query(0, ge=0),
-    user: Optional[User] = Depends(get_current_user_optional),
+    user: Optional[UserPrincipal] = Depends(get_current_principal_optional),
     db: AsyncSession = Depends(get_db_session),
 ):
     """List current user's documents. Returns empty list for anonymous users."""
@@ -186,6 +198,7 @@ async def upload_document(
     db: AsyncSession = Depends(get_db_session),
 ):
     # Validate file type
+    import asyncio
     import os
 
     from app.core.config import EXTENSION_TYPE_MAP, FILE_TYPE_MAP
@@ -232,52 +245,42 @@ async def upload_document(
             },
         )
 
-    # Validate size by streaming bytes with early abort to prevent memory DoS
+    # Validate size without reading the body: Starlette has already spooled
+    # the part (in memory up to 1MB, then to a temp file), so the upload is
+    # checked and streamed to storage from that spool and never copied into
+    # a Python bytes object.
     max_size_mb = {
         "free": settings.FREE_MAX_FILE_SIZE_MB,
         "plus": settings.PLUS_MAX_FILE_SIZE_MB,
         "pro": settings.PRO_MAX_FILE_SIZE_MB,
     }.get(plan, settings.FREE_MAX_FILE_SIZE_MB)
     max_bytes = max_size_mb * 1024 * 1024
-    buf = bytearray()
-    while True:
-        chunk = await file.read(64 * 1024)
-        if not chunk:
-            break
-        buf.extend(chunk)
-        if len(buf) > max_bytes:
-            log_security_event("upload_rejected", user_id=user.id, reason="file_too_large", size=len(buf), max_mb=max_size_mb)
-            raise HTTPException(
-                status_code=400,
-                detail={
-                    "error": "FILE_TOO_LARGE",
-                    "message": "File is too large",
-                    "max_mb": max_size_mb,
-                    "plan": plan,
-                },
-            )
-    data = bytes(buf)
+    spool = file.file
+    size = spool.seek(0, os.SEEK_END)
+    spool.seek(0)
+    if size > max_bytes:
+        log_security_event("upload_rejected", user_id=user.id, reason="file_too_large", size=size, max_mb=max_size_mb)
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "error": "FILE_TOO_LARGE",
+                "message": "File is too large",
+                "max_mb": max_size_mb,
+                "plan": plan,
+            },
+        )
 
     # Validate file content matches declared type (magic bytes + structure)
-    if not _validate_file_content(data, file_type):
+    if not await asyncio.to_thread(_validate_file_content, spool, file_type):
         log_security_event("upload_rejected", user_id=user.id, reason="invalid_magic_bytes", filename=file.filename, file_type=file_type)
         raise HTTPException(
             status_code=400,
             detail={"error": "INVALID_FILE_CONTENT", "message": "Invalid file content"},
         )
 
-    # FastAPI resets file after read? We already have bytes; reconstruct UploadFile-like
-    # to pass filename/content_type to service: create an in-memory UploadFile proxy
-    class _MemUpload:
-        filename = file.filename
-        content_type = file.content_type
-
-        async def read(self):
-            return data
-
     try:
         document_id = await doc_service.create_document(
-            _MemUpload(),
+            file,
             db,
             user_id=user.id,
             file_type=file_type,
@@ -292,7 +295,7 @@ async def upload_document(
         logger.exception("Unexpected ValueError in upload_document")
         raise HTTPException(status_code=500, detail=SERVER_ERROR_DETAIL)
 
-    log_security_event("file_upload", user_id=user.id, document_id=document_id, filename=file.filename, file_type=file_type, size=len(data))
+    log_security_event("file_upload", user_id=user.id, document_id=document_id, filename=file.filename, file_type=file_type, size=size)
     return JSONResponse(
         status_code=status.HTTP_202_ACCEPTED,
         content={"document_id": str(document_id), "status": "parsing", "filename": file.filename},
@@ -508,7 +511,7 @@ async def ingest_url(
 @documents_router.get("/{document_id}", response_model=DocumentResponse)
 async def get_document(
     document_id: uuid.UUID,
-    user: Optional[User] = Depends(get_current_user_optional),
+    user: Optional[UserPrincipal] = Depends(get_current_principal_optional),
     db: AsyncSession = Depends(get_db_session),
 ):
     doc = await doc_service.get_document(document_id, db)
@@ -590,7 +593,7 @@ def _hydrate_brief_items(items: list[dict], chunks_by_id: dict[uuid.UUID, object
 @documents_router.get("/{document_id}/brief", response_model=DocumentHierarchicalBriefResponse)
 async def get_document_brief(
     document_id: uuid.UUID,
-    user: Optional[User] = Depends(get_current_user_optional),
+    user: Optional[UserPrincipal] = Depends(get_current_principal_optional),
     db: AsyncSession = Depends(get_db_session),
 ):
     from sqlalchemy import select
@@ -657,7 +660,7 @@ async def get_document_brief(
 async def get_document_file_url(
     document_id: uuid.UUID,
     variant: Optional[str] = Query(None, description="'converted' for converted PDF"),
-    user: Optional[User] = Depends(get_current_user_optional),
+    user: Optional[UserPrincipal] = Depends(get_current_principal_optional),
     db: AsyncSession = Depends(get_db_session),
 ):
     import asyncio
@@ -693,7 +696,7 @@ async def get_document_file_url(
 @documents_router.get("/{document_id}/text-content", response_model=DocumentTextContentResponse)
 async def get_document_text_content(
     document_id: uuid.UUID,
-    user: Optional[User] = Depends(get_current_user_optional),
+    user: Optional[UserPrincipal] = Depends(get_current_principal_optional),
     db: AsyncSession = Depends(get_db_session),
 ):
     """Return extracted text content grouped by page for non-PDF viewer.
@@ -794,6 +797,11 @@ async def get_document_text_content(
             for pn, texts in sorted(pages_dict.items())
         ]
 
+    return {**_text_content_meta(doc), "pages": pages_list}
+
+
+def _text_content_meta(doc) -> dict:
+    """Document-level fields shared by the text-content endpoints."""
     source_url = getattr(doc, 'source_url', None)
     domain = urlparse(source_url).netloc if source_url else None
     title = getattr(doc, 'filename', None)
@@ -801,13 +809,183 @@ async def get_document_text_content(
         title = title.rsplit(".", 1)[0]
     return {
         "file_type": getattr(doc, 'file_type', 'pdf'),
-        "pages": pages_list,
         "title": title,
         "source_url": source_url,
         "domain": domain,
     }
 
 
+# Rows fetched per round trip by the streamed text-content cursors.
+_TEXT_STREAM_YIELD_PER = 100
+
+# Every character str.strip() removes (str.isspace() in Unicode), handed to
+# PostgreSQL's btrim so the SQL completeness check matches the buffered
+# endpoint's. NUL is left out: text columns cannot hold it.
+_BLANK_CHARS = (
+    "\t\n\x0b\x0c\r\x1c\x1d\x1e\x1f \x85\xa0\u1680"
+    "\u2000\u2001\u2002\u2003\u2004\u2005\u2006\u2007\u2008\u2009\u200a"
+    "\u2028\u2029\u202f\u205f\u3000"
+)
+
+
+async def _page_content_complete(db: AsyncSession, doc) -> bool:
+    """The buffered endpoint's Page.content trust bar (FIX-8 / FIX2-D) as one
+    aggregate query: rows for exactly pages 1..page_count, none blank."""
+    from sqlalchemy import func, select as sa_select  # noqa: I001
+
+    from app.models.tables import Page as PageModel
+
+    expected = getattr(doc, "page_count", None)
+    if expected is None:
+        return False
+    blank = func.btrim(func.coalesce(PageModel.content, ""), _BLANK_CHARS) == ""
+    row = (
+        await db.execute(
+            sa_select(
+                func.count(),
+                func.min(PageModel.page_number),
+                func.max(PageModel.page_number),
+                func.count().filter(blank),
+            ).where(PageModel.document_id == doc.id)
+        )
+    ).one()
+    total, first, last, blank_pages = row
+    if total != expected or blank_pages:
+        return False
+    # (document_id, page_number) is unique, so count + bounds pin 1..N exactly.
+    return total == 0 or (first == 1 and last == expected)
+
+
+async def _section_titles_in_window(
+    db: AsyncSession, document_id: uuid.UUID, page_from: int, page_to: Optional[int],
+) -> dict[int, str]:
+    from sqlalchemy import select as sa_select  # noqa: I001
+
+    from app.models.tables import Chunk
+
+    stmt = (
+        sa_select(Chunk.section_title, Chunk.page_start, Chunk.page_end)
+        .where(Chunk.document_id == document_id)
+        .where(Chunk.section_title.is_not(None))
+        .where(Chunk.page_end >= page_from)
+        .order_by(Chunk.chunk_index)
+    )
+    if page_to is not None:
+        stmt = stmt.where(Chunk.page_start <= page_to)
+    section_titles: dict[int, str] = {}
+    for section_title, page_start, page_end in (await db.execute(stmt)).all():
+        title = (section_title or "").strip()
+        if not title:
+            continue
+        for page_num in range(max(page_start, page_from), page_end + 1):
+            if page_to is not None and page_num > page_to:
+                break
+            section_titles.setdefault(page_num, title)
+    return section_titles
+
+
+async def _iter_text_pages(
+    db: AsyncSession, doc, page_from: int, page_to: Optional[int],
+) -> AsyncIterator[dict]:
+    """Yield the pages get_document_text_content would return, restricted to
+    page_from..page_to, reading rows through server-side cursors.
+
+    Chunk reconstruction relies on the (page_start, chunk_index) order: once a
+    chunk starting on page N arrives, no later chunk can touch a page below N,
+    so those pages are complete and are emitted straight away.
+    """
+    from sqlalchemy import select as sa_select  # noqa: I001
+
+    from app.models.tables import Chunk, Page as PageModel
+
+    section_titles = await _section_titles_in_window(db, doc.id, page_from, page_to)
+
+    def _page(page_number: int, text: str) -> dict:
+        return {"page_number": page_number, "text": text, "section_title": section_titles.get(page_number)}
+
+    if await _page_content_complete(db, doc):
+        stmt = (
+            sa_select(PageModel.page_number, PageModel.content)
+            .where(PageModel.document_id == doc.id)
+            .where(PageModel.page_number >= page_from)
+            .order_by(PageModel.page_number)
+            .execution_options(yield_per=_TEXT_STREAM_YIELD_PER)
+        )
+        if page_to is not None:
+            stmt = stmt.where(PageModel.page_number <= page_to)
+        async for page_number, content in await db.stream(stmt):
+            yield _page(page_number, content or '')
+        return
+
+    stmt = (
+        sa_select(Chunk.text, Chunk.page_start, Chunk.page_end)
+        .where(Chunk.document_id == doc.id)
+        .where(Chunk.page_end >= page_from)
+        .order_by(Chunk.page_start, Chunk.chunk_index)
+        .execution_options(yield_per=_TEXT_STREAM_YIELD_PER)
+    )
+    if page_to is not None:
+        stmt = stmt.where(Chunk.page_start <= page_to)
+    pending: dict[int, list[str]] = {}
+    async for text, page_start, page_end in await db.stream(stmt):
+        for page_num in sorted(pn for pn in pending if pn < page_start):
+            yield _page(page_num, "\n".join(pending.pop(page_num)))
+        last = page_end if page_to is None else min(page_end, page_to)
+        for page_num in range(max(page_start, page_from), last + 1):
+            pending.setdefault(page_num, []).append(text)
+    for page_num in sorted(pending):
+        yield _page(page_num, "\n".join(pending[page_num]))
+
+
+def _ndjson_line(obj: dict) -> bytes:
+    return (json.dumps(obj, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+@documents_router.get("/{document_id}/text-content/stream")
+async def stream_document_text_content(
+    document_id: uuid.UUID,
+    page_from: int = Query(1, ge=1),
+    page_to: Optional[int] = Query(None, ge=1),
+    user: Optional[UserPrincipal] = Depends(get_current_principal_optional),
+    db: AsyncSession = Depends(get_db_session),
+):
+    """Streamed variant of /text-content as NDJSON, one JSON object per line:
+
+    - ``{"type": "meta", ...}`` with the document fields and page_count;
+    - ``{"type": "page", "page_number", "text", "section_title"}`` per page,
+      in page order, limited to page_from..page_to;
+    - ``{"type": "end", "pages": n}``. A body without it was cut short.
+
+    Same page text as /text-content. Pages are read through server-side
+    cursors and written as they complete, so neither side holds the whole
+    document, and the viewer can fetch just the pages it is showing.
+    """
+    if page_to is not None and page_to < page_from:
+        raise HTTPException(
+            status_code=400,
+            detail={"error": "INVALID_PAGE_RANGE", "message": "page_to must not be before page_from"},
+        )
+    doc = await doc_service.get_document(document_id, db)
+    if not doc:
+        raise HTTPException(status_code=404, detail=DOCUMENT_NOT_FOUND_DETAIL)
+    if not can_access_document(doc, user):
+        raise HTTPException(status_code=404, detail=DOCUMENT_NOT_FOUND_DETAIL)
+
+    async def _body() -> AsyncIterator[bytes]:
+        yield _ndjson_line({"type": "meta", **_text_content_meta(doc), "page_count": getattr(doc, "page_count", None)})
+        sent = 0
+        async for page in _iter_text_pages(db, doc, page_from, page_to):
+            sent += 1
+            yield _ndjson_line({"type": "page", **page})
+        yield _ndjson_line({"type": "end", "pages": sent})
+
+    return StreamingResponse(
+        _body(),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache, no-transform", "X-Accel-Buffering": "no"},
+    )
+
+
 class ReparseRequest(BaseModel):
     locale: str | None = Field(default=None, max_length=16)
 
@@ -867,6 +1045,7 @@ async def reparse_document(
                 "status": "parsing",
             },
         )
+    chunk_cache.invalidate(doc.id)
     from app.workers.parse_worker import parse_document
     parse_document.delay(str(doc.id), locale=requested_locale)
     return {"status": "reparsing"}
@@ -6,9 +6,10 @@ from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.deps import get_current_user_optional, get_db_session
+from app.core.deps import get_current_principal_optional, get_db_session
+from app.core.principal_cache import UserPrincipal
 from app.core.rate_limit import get_client_ip, public_event_limiter
-from app.models.tables import ProductEvent, User
+from app.models.tables import ProductEvent
 
 router = APIRouter(prefix="/api/events", tags=["events"])
 
@@ -100,7 +101,7 @@ def _safe_properties(raw: dict[str, Any]) -> dict[str, Any]:
 async def record_product_event(
     body: ProductEventRequest,
     request: Request,
-    user: User | None = Depends(get_current_user_optional),
+    user: UserPrincipal | None = Depends(get_current_principal_optional),
     db: AsyncSession = Depends(get_db_session),
 ):
     if body.event_name not in ALLOWED_EVENTS:
@@ -80,6 +80,8 @@ class QuestionTemplateRunResponse(BaseModel):
     updated_at: str
     completed_at: str | None
     result: ExtractionResultPayload | None = None
+    # {"cells_done", "cells_total"}, plus the answers so far while running.
+    progress: dict[str, Any] | None = None
 
 
 def _content_disposition(filename: str) -> str:
@@ -133,6 +135,7 @@ def _run_response(job: DocumentJob) -> QuestionTemplateRunResponse:
         updated_at=job.updated_at.isoformat(),
         completed_at=job.completed_at.isoformat() if job.completed_at else None,
         result=result,
+        progress=(getattr(job, "metadata_json", None) or {}).get("progress"),
     )
 
 
@@ -6,9 +6,10 @@ from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.deps import get_current_user_optional, get_db_session
+from app.core.deps import get_current_principal_optional, get_db_session
+from app.core.principal_cache import UserPrincipal
 from app.core.rate_limit import anon_read_limiter, get_client_ip
-from app.models.tables import Document, User
+from app.models.tables import Document
 from app.schemas.search import (
     SearchRequest,
     SearchResponse,
@@ -39,7 +40,7 @@ async def search_document(
     document_id: uuid.UUID,
     body: SearchRequest,
     request: Request,
-    user: Optional[User] = Depends(get_current_user_optional),
+    user: Optional[UserPrincipal] = Depends(get_current_principal_optional),
     db: AsyncSession = Depends(get_db_session),
 ):
     # Anonymous traffic goes through the shared anon_read_limiter so demo
@@ -17,6 +17,7 @@ from app.api.billing import compute_billing_state
 from app.core.cache import cache_get, cache_set
 from app.core.config import MODEL_TO_MODE, settings
 from app.core.deps import get_db_session, require_auth
+from app.core.principal_cache import user_principal_cache
 from app.core.security_log import log_security_event
 from app.models.tables import (
     Account,
@@ -447,6 +448,7 @@ async def delete_me(
     try:
         await db.delete(user)
         await db.commit()
+        user_principal_cache.invalidate(user.id)
     except Exception:
         # If deletion fails, return error
         raise HTTPException(
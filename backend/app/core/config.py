@@ -23,11 +23,48 @@ class Settings(BaseSettings):
     # Embedding — 模型与维度强绑定 (通过 OpenRouter 调用)
     EMBEDDING_MODEL: str = Field(default="openai/text-embedding-3-small")
     EMBEDDING_DIM: int = Field(default=1536)
+    # Content-addressed embedding cache (Redis, LRU-bounded). ~6 KB per
+    # 1536-dim float32 entry, so the default caps it near 300 MB.
+    EMBEDDING_CACHE_ENABLED: bool = Field(default=True)
+    EMBEDDING_CACHE_MAX_ENTRIES: int = Field(default=50000)
+    # Process-local query-vector LRU in front of it (per API/worker process).
+    QUERY_EMBEDDING_CACHE_SIZE: int = Field(default=2048)
+    QUERY_EMBEDDING_CACHE_TTL_SECONDS: int = Field(default=3600)
+    # Provider client (app/services/embedding_client.py): one pooled HTTP/2
+    # connection set per process; retries honour Retry-After.
+    EMBEDDING_HTTP2: bool = Field(default=True)
+    EMBEDDING_MAX_CONNECTIONS: int = Field(default=20)
+    EMBEDDING_TIMEOUT_SECONDS: float = Field(default=60.0)
+    EMBEDDING_MAX_RETRIES: int = Field(default=5)
+    # Fleet-wide token bucket in Redis, shared by the API and every worker.
+    # Set to the provider account's limits; 0 disables that bucket.
+    EMBEDDING_RATE_LIMIT_RPM: int = Field(default=1000)
+    EMBEDDING_RATE_LIMIT_TPM: int = Field(default=1000000)
+    # Estimated input tokens per request; larger batches are split.
+    EMBEDDING_BATCH_MAX_TOKENS: int = Field(default=100000)
 
     # Qdrant
     QDRANT_URL: str = Field(default="http://localhost:6333")
     QDRANT_API_KEY: Optional[str] = None
     QDRANT_COLLECTION: str = Field(default="doc_chunks")
+    # Collection layout (applied on create; scripts/qdrant_migrate_collection.py
+    # applies it to an existing collection). Every search is filtered to one or
+    # a few documents, so document_id is a tenant index and HNSW builds only
+    # per-document graphs (m=0 disables the global graph, payload_m sizes the
+    # per-tenant ones).
+    QDRANT_TENANT_INDEX: bool = Field(default=True)
+    QDRANT_HNSW_M: int = Field(default=0)
+    QDRANT_HNSW_PAYLOAD_M: int = Field(default=16)
+    QDRANT_HNSW_EF_CONSTRUCT: int = Field(default=100)
+    # Search-time beam width; 0 leaves Qdrant's default.
+    QDRANT_HNSW_EF: int = Field(default=0)
+    # Original vectors on disk, int8 quantized copies in RAM; searches rescore
+    # the oversampled quantized candidates against the originals.
+    QDRANT_ON_DISK_VECTORS: bool = Field(default=True)
+    QDRANT_QUANTIZATION: str = Field(default="int8")  # "int8" or "none"
+    QDRANT_QUANTIZATION_QUANTILE: float = Field(default=0.99)
+    QDRANT_QUANTIZATION_RESCORE: bool = Field(default=True)
+    QDRANT_QUANTIZATION_OVERSAMPLING: float = Field(default=2.0)
 
     # LLM defaults
     LLM_MODEL: str = Field(default="deepseek-v4-pro")
@@ -59,14 +96,66 @@ class Settings(BaseSettings):
     CELERY_BROKER_URL: str = Field(default="redis://localhost:6379/0")
     EMBED_BATCH_SIZE: int = Field(default=64)
     EMBED_MAX_CONCURRENCY: int = Field(default=4)
+    # Reparses keep chunk rows (ids) and vectors whose text is unchanged and
+    # only embed new/changed chunks; False always re-indexes from scratch.
+    PARSE_INCREMENTAL_REINDEX: bool = Field(default=True)
+    # Pipeline-version backfill (app/services/backfill_service.py). Backfill
+    # parses go to this queue ("parse" shares the upload workers; point it at
+    # a dedicated queue to isolate them) and stop being dispatched while this
+    # many user-initiated parses are in progress.
+    BACKFILL_PARSE_QUEUE: str = Field(default="parse")
+    BACKFILL_LIVE_YIELD_THRESHOLD: int = Field(default=2)
 
     # Limits
     MAX_PDF_SIZE_MB: int = Field(default=50)
     MAX_PDF_PAGES: int = Field(default=500)
     MAX_CHAT_HISTORY_TURNS: int = Field(default=6)
     MAX_RETRIEVAL_TOKENS: int = Field(default=1750)
+    # Deadline for each concurrent corrective-retrieval leg (dense, lexical,
+    # table, planned sub-query), counted from when the leg has its database
+    # connection. A leg that misses it contributes nothing rather than
+    # delaying the first token.
+    RETRIEVAL_LEG_TIMEOUT_SECONDS: float = Field(default=8.0)
+    # Retrieval legs holding their own pooled session at once, across all
+    # chat turns in the process. Kept well below the engine's pool (10 + 20
+    # overflow) so concurrent turns queue here instead of starving requests.
+    RETRIEVAL_LEG_MAX_SESSIONS: int = Field(default=8)
+    # Lexical retrieval backend: "ilike" is the substring scan (no index);
+    # "fts" matches through the chunks.search_tsv GIN index and keeps the
+    # weighted-match ordering; "bm25" additionally ranks candidates by
+    # length-normalised ts_rank_cd; "index" runs Okapi BM25 over the
+    # per-document inverted index built at parse time (falling back to "fts"
+    # for documents parsed before it existed). The default stays "ilike"
+    # until tests/test_lexical_search_fts_integration.py has passed against
+    # the production Postgres.
+    LEXICAL_SEARCH_MODE: str = Field(default="ilike")
+    # Loaded inverted indexes are kept in a per-process LRU bounded by this size.
+    LEXICAL_INDEX_CACHE_MB: int = Field(default=256)
+    # Parse-time normalized chunk/page text for the Quote Finder, same LRU policy.
+    NORMALIZED_TEXT_CACHE_MB: int = Field(default=256)
+    # Chunk rows of ready documents (app.services.chunk_cache), same LRU policy.
+    CHUNK_CACHE_MB: int = Field(default=256)
     LLM_MAX_CONTEXT_TOKENS: int = Field(default=180000)
     MAX_CONTINUATIONS_PER_MESSAGE: int = 3
+    # Streamed answer text goes out as one SSE token event per provider delta,
+    # not per character. A delta whose text is shorter than
+    # CHAT_TOKEN_COALESCE_CHARS is held back and merged with the next one,
+    # unless it has been pending for CHAT_TOKEN_COALESCE_MS. 0 sends every
+    # delta as it arrives.
+    CHAT_TOKEN_COALESCE_CHARS: int = Field(default=16)
+    CHAT_TOKEN_COALESCE_MS: float = Field(default=40.0)
+    # SSE transport (app.core.sse). A quiet stream gets a comment frame every
+    # SSE_HEARTBEAT_SECONDS. Events stop being pulled once
+    # SSE_BUFFER_MAX_BYTES are waiting for the client's socket. A client that
+    # drains nothing for SSE_STALL_TIMEOUT_SECONDS is treated as disconnected.
+    # Waiting frames are joined into writes of up to SSE_WRITE_MAX_BYTES.
+    SSE_HEARTBEAT_SECONDS: float = Field(default=15.0)
+    SSE_BUFFER_MAX_BYTES: int = Field(default=256 * 1024)
+    SSE_STALL_TIMEOUT_SECONDS: float = Field(default=30.0)
+    SSE_WRITE_MAX_BYTES: int = Field(default=64 * 1024)
+    # Question × document cells a batch question-template job answers at once
+    # (concurrent LLM calls per job). 1 runs the cells one after another.
+    QUESTION_TEMPLATE_CONCURRENCY: int = Field(default=6)
 
     # Chat-native tool planning. The planner may call the low-latency chat
     # model to classify ambiguous user requests, then falls back to the
@@ -87,6 +176,34 @@ class Settings(BaseSettings):
     OCR_ENABLED: bool = Field(default=True)
     OCR_LANGUAGES: str = Field(default="eng+chi_sim+jpn+kor+spa+deu+fra+por+ita+ara+hin+urd")
     OCR_DPI: int = Field(default=300)
+    # Processes OCR'ing one scanned document in parallel (page shards). 1 =
+    # serial in the task process. Each worker runs its own Tesseract at
+    # OCR_DPI (up to a 20MP image), so budget ~300MB RAM per worker per
+    # concurrently parsing Celery slot.
+    OCR_WORKERS: int = Field(default=1)
+
+    # PPTX/DOCX → PDF conversion: long-lived headless LibreOffice instances
+    # per worker process, driven over a UNO pipe by the system Python's
+    # python3-uno. 0 = spawn a fresh `libreoffice --convert-to` per document.
+    # Budget ~300MB RSS per instance.
+    LIBREOFFICE_POOL_SIZE: int = Field(default=1)
+    # An instance is restarted after this many conversions, or when its
+    # process tree's RSS passes LIBREOFFICE_POOL_MAX_RSS_MB (0 = no limit).
+    LIBREOFFICE_POOL_MAX_CONVERSIONS: int = Field(default=200)
+    LIBREOFFICE_POOL_MAX_RSS_MB: int = Field(default=1024)
+    # Conversions waiting for a busy instance beyond this many are refused,
+    # as are waits longer than the timeout.
+    LIBREOFFICE_POOL_MAX_QUEUE: int = Field(default=8)
+    LIBREOFFICE_POOL_QUEUE_TIMEOUT_SECONDS: float = Field(default=120.0)
+    LIBREOFFICE_POOL_STARTUP_TIMEOUT_SECONDS: float = Field(default=60.0)
+    # Instances idle for longer than this are pinged before they are used.
+    LIBREOFFICE_POOL_HEALTH_CHECK_SECONDS: float = Field(default=30.0)
+    LIBREOFFICE_UNO_PYTHON: str = Field(default="/usr/bin/python3")
+
+    # Document deletion: deletion_worker purges pages/chunks/elements/tables/
+    # sessions in transactions of at most this many rows each, so lock time
+    # and WAL per statement stay flat however large the document is.
+    DELETE_BATCH_SIZE: int = Field(default=2000)
 
     # Multi-format support
     ALLOWED_FILE_TYPES: list[str] = Field(default=[
@@ -102,6 +219,9 @@ class Settings(BaseSettings):
     # Auth
     AUTH_SECRET: Optional[str] = None  # Shared with Next.js Auth.js
     ADAPTER_SECRET: Optional[str] = None  # For internal adapter API calls
+    # Process-local (sub, iat) -> principal cache behind get_current_principal_optional.
+    USER_PRINCIPAL_CACHE_SIZE: int = Field(default=10000)
+    USER_PRINCIPAL_CACHE_TTL_SECONDS: int = Field(default=60)
 
     # Demo LLM — faster model for anonymous demo conversations
     DEMO_LLM_MODEL: str = "deepseek-v4-flash"
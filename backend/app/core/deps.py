@@ -5,9 +5,11 @@ from uuid import UUID
 from fastapi import Depends, HTTPException, Request
 from jose import JWTError, jwt
 from jose.jwt import ExpiredSignatureError, JWTClaimsError
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
+from app.core.principal_cache import TokenKey, UserPrincipal, user_principal_cache
 from app.core.security_log import log_security_event
 from app.models.database import AsyncSessionLocal
 from app.models.tables import User
@@ -21,11 +23,9 @@ async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
         yield session
 
 
-async def get_current_user_optional(
-    request: Request,
-    db: AsyncSession = Depends(get_db_session),
-) -> Optional[User]:
-    """Extract user from JWT if present. Returns None for guests."""
+def _token_key(request: Request) -> Optional[TokenKey]:
+    """Validate the bearer JWT and return its ``(sub, iat)``; None for guests
+    and invalid tokens."""
     auth_header = request.headers.get("Authorization")
     if not auth_header or not auth_header.startswith("Bearer "):
         return None
@@ -49,10 +49,6 @@ async def get_current_user_optional(
                 "require_sub": True,  # Require subject claim
             },
         )
-        user_id = payload.get("sub")
-        if not user_id:
-            return None
-        return await db.get(User, UUID(user_id))
     except ExpiredSignatureError:
         log_security_event("auth_failure", reason="token_expired")
         return None
@@ -62,6 +58,55 @@ async def get_current_user_optional(
     except JWTError as e:
         log_security_event("auth_failure", reason="decode_error", detail=str(e))
         return None
+    user_id = payload.get("sub")
+    if not user_id:
+        return None
+    return user_id, payload.get("iat")
+
+
+async def get_current_user_optional(
+    request: Request,
+    db: AsyncSession = Depends(get_db_session),
+) -> Optional[User]:
+    """Extract user from JWT if present. Returns None for guests.
+
+    Loads the full ``User`` row into the request session, for endpoints that
+    read or mutate it (credits, billing, profile). Endpoints that only need
+    who the caller is should depend on ``get_current_principal_optional``.
+    """
+    key = _token_key(request)
+    if key is None:
+        return None
+    generation = user_principal_cache.generation
+    user = await db.get(User, UUID(key[0]))
+    if user is not None:
+        user_principal_cache.put(key, UserPrincipal.from_user(user), generation)
+    return user
+
+
+async def get_current_principal_optional(request: Request) -> Optional[UserPrincipal]:
+    """Caller's id/email/plan from the principal cache. Returns None for guests.
+
+    Takes no request session: a hit costs no database work at all, and a miss
+    reads three columns on a session that is returned to the pool before the
+    endpoint runs.
+    """
+    key = _token_key(request)
+    if key is None:
+        return None
+    principal = user_principal_cache.get(key)
+    if principal is not None:
+        return principal
+    generation = user_principal_cache.generation
+    async with AsyncSessionLocal() as db:
+        row = (
+            await db.execute(select(User.id, User.email, User.plan).where(User.id == UUID(key[0])))
+        ).first()
+    if row is None:
+        return None
+    principal = UserPrincipal(id=row.id, email=row.email, plan=row.plan)
+    user_principal_cache.put(key, principal, generation)
+    return principal
 
 
 async def require_auth(
@@ -73,6 +118,15 @@ async def require_auth(
     return user
 
 
+async def require_principal(
+    principal: Optional[UserPrincipal] = Depends(get_current_principal_optional),
+) -> UserPrincipal:
+    """Principal counterpart of ``require_auth``."""
+    if not principal:
+        raise HTTPException(status_code=401, detail="Authentication required")
+    return principal
+
+
 async def require_admin(
     user: User = Depends(require_auth),
 ) -> User:
@@ -0,0 +1,116 @@
+"""Process-local TTL cache of authenticated user principals.
+
+Every authenticated request used to resolve its bearer token with
+``db.get(User, sub)`` — a pool checkout and a round trip just to learn who is
+calling, repeated on every poll, product event and SSE stream. Most read
+endpoints only need the caller's id, email and plan, so
+``get_current_principal_optional`` answers them from here and only opens a
+short session of its own on a miss.
+
+Entries are keyed by the token's ``(sub, iat)``: a freshly issued token never
+reuses a stale entry, and the TTL bounds how long a plan change made by
+another API process can go unseen. Mutation paths in this process (billing
+plan changes, profile updates, account deletion) call ``invalidate``.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from app.core.config import settings
+
+TokenKey = tuple[str, int]
+
+
+@dataclass(frozen=True, slots=True)
+class UserPrincipal:
+    """The caller as seen by endpoints that never touch the ``User`` row."""
+
+    id: uuid.UUID
+    email: str
+    plan: str
+
+    @classmethod
+    def from_user(cls, user) -> "UserPrincipal":
+        return cls(id=user.id, email=user.email, plan=user.plan)
+
+
+class UserPrincipalCache:
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self.max_entries = max(1, int(max_entries))
+        self.ttl_seconds = float(ttl_seconds)
+        self._entries: "OrderedDict[TokenKey, tuple[float, UserPrincipal]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped by every invalidation; a load that started before one must
+        # not store what it read (it may predate the change).
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, key: TokenKey) -> Optional[UserPrincipal]:
+        if self.ttl_seconds <= 0:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            stored_at, principal = entry
+            if time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return principal
+
+    def put(self, key: TokenKey, principal: UserPrincipal, generation: int) -> None:
+        """Store `principal` unless an invalidation ran since `generation`
+        was read (before the row was loaded)."""
+        if self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._entries[key] = (time.monotonic(), principal)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: uuid.UUID) -> None:
+        """Drop every cached token of `user_id`."""
+        sub = str(user_id)
+        with self._lock:
+            self.generation += 1
+            self.invalidations += 1
+            for key in [key for key in self._entries if key[0] == sub]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+        }
+
+
+user_principal_cache = UserPrincipalCache(
+    settings.USER_PRINCIPAL_CACHE_SIZE,
+    settings.USER_PRINCIPAL_CACHE_TTL_SECONDS,
+)
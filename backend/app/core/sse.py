@@ -0,0 +1,212 @@
+"""Server-sent events transport for the chat streams.
+
+Events from a service generator ({"event", "data"} dicts built by
+chat_service.sse()) are encoded to bytes once. They are written through a
+bounded per-connection buffer filled by a producer task:
+
+- frames are orjson-encoded behind a cached ``event: <type>\\ndata: `` prefix;
+- frames produced while the previous write was still in flight go out
+  together as a single write;
+- a comment frame is written after SSE_HEARTBEAT_SECONDS without events, so
+  proxies keep the connection open through retrieval or a slow first token;
+- the producer stops pulling events while SSE_BUFFER_MAX_BYTES wait for the
+  socket. If the client drains nothing for SSE_STALL_TIMEOUT_SECONDS, the
+  source is cancelled exactly as on a client disconnect (CancelledError at
+  its yield, so its cancel-path persistence and credit settlement run) and
+  the response ends. The response waits (up to _CANCEL_DRAIN_TIMEOUT_S) for
+  the cancelled source to finish unwinding, so request-scoped dependencies
+  such as its DB session are not closed underneath that cleanup.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from collections import deque
+from typing import Any, AsyncGenerator, AsyncIterator, Dict, Optional
+
+import anyio
+import orjson
+from fastapi.responses import StreamingResponse
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache, no-transform",
+    "X-Accel-Buffering": "no",
+    "Connection": "keep-alive",
+}
+
+_HEARTBEAT_FRAME = b": ping\n\n"
+
+# Event names are a small fixed set, so the prefix cache stays tiny.
+_prefixes: dict[str, bytes] = {}
+
+# How long a disconnected response waits for its cancelled source to unwind.
+# Covers the source's cancel-path persist and credit settlement, each bounded
+# by chat_service._CANCEL_IO_TIMEOUT_S (5s).
+_CANCEL_DRAIN_TIMEOUT_S = 10.0
+
+# Producers still unwinding when that wait runs out finish their cleanup after
+# the response task is gone; keep them referenced until they do.
+_orphaned_producers: set[asyncio.Task] = set()
+
+_stats = {"open": 0, "opened": 0, "stalled": 0, "heartbeats": 0, "frames": 0, "writes": 0, "bytes": 0}
+
+
+class ClientStalled(Exception):
+    """The client drained nothing for SSE_STALL_TIMEOUT_SECONDS."""
+
+
+def encode_event(event: Dict[str, Any]) -> bytes:
+    name = event["event"]
+    prefix = _prefixes.get(name)
+    if prefix is None:
+        prefix = _prefixes[name] = f"event: {name}\ndata: ".encode()
+    data = event.get("data", {})
+    try:
+        payload = orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+    except TypeError:  # orjson.JSONEncodeError, e.g. an int beyond 64 bits
+        payload = json.dumps(data, ensure_ascii=False, default=str).encode()
+    return prefix + payload + b"\n\n"
+
+
+class SSEStream:
+    """Async iterable of SSE bytes for a StreamingResponse body."""
+
+    def __init__(
+        self,
+        source: AsyncGenerator[Dict[str, Any], None],
+        *,
+        heartbeat_seconds: Optional[float] = None,
+        buffer_max_bytes: Optional[int] = None,
+        stall_timeout_seconds: Optional[float] = None,
+        write_max_bytes: Optional[int] = None,
+    ) -> None:
+        self._source = source
+        self._heartbeat = heartbeat_seconds if heartbeat_seconds is not None else settings.SSE_HEARTBEAT_SECONDS
+        self._buffer_max = buffer_max_bytes if buffer_max_bytes is not None else settings.SSE_BUFFER_MAX_BYTES
+        self._stall_timeout = (
+            stall_timeout_seconds if stall_timeout_seconds is not None else settings.SSE_STALL_TIMEOUT_SECONDS
+        )
+        self._write_max = write_max_bytes if write_max_bytes is not None else settings.SSE_WRITE_MAX_BYTES
+        self._frames: deque[bytes] = deque()
+        self._buffered = 0
+        self._ready = asyncio.Event()
+        self._drained = asyncio.Event()
+        self._done = False
+        self._stalled = False
+        self._error: Optional[BaseException] = None
+        # True while the source is suspended at a yield, waiting for buffer space.
+        self._parked = False
+
+    def __aiter__(self) -> AsyncIterator[bytes]:
+        return self._write_loop()
+
+    async def _put(self, frame: bytes) -> None:
+        # An empty buffer always takes the frame, however large.
+        while self._buffered and self._buffered + len(frame) > self._buffer_max:
+            self._drained.clear()
+            try:
+                async with asyncio.timeout(self._stall_timeout):
+                    await self._drained.wait()
+            except TimeoutError:
+                raise ClientStalled from None
+        self._frames.append(frame)
+        self._buffered += len(frame)
+        self._ready.set()
+
+    def _take(self) -> bytes:
+        out = [self._frames.popleft()]
+        size = len(out[0])
+        while self._frames and size + len(self._frames[0]) <= self._write_max:
+            frame = self._frames.popleft()
+            out.append(frame)
+            size += len(frame)
+        self._buffered -= size
+        self._drained.set()
+        _stats["frames"] += len(out)
+        _stats["writes"] += 1
+        _stats["bytes"] += size
+        return out[0] if len(out) == 1 else b"".join(out)
+
+    async def _cancel_source(self) -> None:
+        try:
+            await self._source.athrow(asyncio.CancelledError())
+        except (asyncio.CancelledError, StopAsyncIteration):
+            pass
+        except Exception:
+            logger.exception("SSE source raised while being cancelled")
+        finally:
+            await self._source.aclose()
+
+    async def _pump(self) -> None:
+        try:
+            async for event in self._source:
+                frame = encode_event(event)
+                self._parked = True
+                await self._put(frame)
+                self._parked = False
+        except ClientStalled:
+            _stats["stalled"] += 1
+            logger.warning("SSE client stalled for %.0fs; cancelling the stream", self._stall_timeout)
+            self._stalled = True
+            self._frames.clear()
+            await self._cancel_source()
+        except asyncio.CancelledError:
+            if self._parked:
+                await self._cancel_source()
+            raise
+        except Exception as e:
+            self._error = e
+        finally:
+            self._done = True
+            self._ready.set()
+
+    async def _write_loop(self) -> AsyncIterator[bytes]:
+        producer = asyncio.get_running_loop().create_task(self._pump())
+        _stats["open"] += 1
+        _stats["opened"] += 1
+        try:
+            while True:
+                if not self._frames and not self._done:
+                    self._ready.clear()
+                    try:
+                        async with asyncio.timeout(self._heartbeat):
+                            await self._ready.wait()
+                    except TimeoutError:
+                        _stats["heartbeats"] += 1
+                        yield _HEARTBEAT_FRAME
+                        continue
+                if self._frames and not self._stalled:
+                    yield self._take()
+                    continue
+                if self._error is not None:
+                    raise self._error
+                return
+        finally:
+            _stats["open"] -= 1
+            if not producer.done():
+                # Client disconnect: the source sees CancelledError, as it
+                # did when it was iterated by the response directly.
+                producer.cancel()
+                # Shielded: the response task is itself being cancelled. Wait
+                # without awaiting the task directly, so a timeout here does
+                # not cancel the source's cleanup a second time.
+                with anyio.CancelScope(shield=True), anyio.move_on_after(_CANCEL_DRAIN_TIMEOUT_S):
+                    await asyncio.wait({producer})
+                if not producer.done():
+                    logger.warning("SSE source still unwinding after %.0fs; detaching it", _CANCEL_DRAIN_TIMEOUT_S)
+                    _orphaned_producers.add(producer)
+                    producer.add_done_callback(_orphaned_producers.discard)
+
+
+def sse_response(source: AsyncGenerator[Dict[str, Any], None]) -> StreamingResponse:
+    return StreamingResponse(SSEStream(source), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
+def stats() -> dict:
+    return dict(_stats)
@@ -8,7 +8,6 @@ from typing import Union
 import sentry_sdk
 from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from qdrant_client.models import PayloadSchemaType
 from sqlalchemy import text
 
 from .api import auth
@@ -98,12 +97,7 @@ async def lifespan(app: FastAPI):
             embedding_service.ensure_collection()
             logger.info("Qdrant collection ready")
             try:
-                qdrant = embedding_service.get_qdrant_client()
-                qdrant.create_payload_index(
-                    collection_name=settings.QDRANT_COLLECTION,
-                    field_name="document_id",
-                    field_schema=PayloadSchemaType.KEYWORD,
-                )
+                embedding_service.ensure_document_index()
                 logger.info("Qdrant payload index ready for field=document_id")
             except Exception as e:
                 # 409 = already exists (expected on restart, not actionable).
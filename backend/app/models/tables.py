@@ -5,11 +5,22 @@ from datetime import datetime
 from typing import List, Optional
 
 import sqlalchemy as sa
-from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base
 
+# Generated full-text vector over chunk title + text. Two configs: 'english'
+# stems (revenue/revenues, run/running) and 'simple' keeps every token
+# verbatim (numbers, product names, non-English words, stop words). Must stay
+# byte-identical to migration 20261018_0040.
+CHUNK_SEARCH_TSV_SQL = (
+    "setweight(to_tsvector('english'::regconfig, coalesce(section_title, '')), 'A') || "
+    "setweight(to_tsvector('english'::regconfig, coalesce(text, '')), 'B') || "
+    "setweight(to_tsvector('simple'::regconfig, coalesce(section_title, '')), 'A') || "
+    "setweight(to_tsvector('simple'::regconfig, coalesce(text, '')), 'B')"
+)
+
 
 # Documents table
 class Document(Base):
@@ -153,12 +164,109 @@ class Chunk(Base):
     section_title: Mapped[Optional[str]] = mapped_column(sa.String(500))
     vector_id: Mapped[Optional[str]] = mapped_column(sa.String(100))
     created_at: Mapped[sa.DateTime] = mapped_column(sa.DateTime(timezone=True), server_default=sa.text("now()"))
+    # Deferred: only lexical search touches it, and only inside SQL.
+    search_tsv: Mapped[Optional[str]] = mapped_column(
+        TSVECTOR, sa.Computed(CHUNK_SEARCH_TSV_SQL, persisted=True), deferred=True
+    )
 
     document: Mapped[Document] = relationship("Document", back_populates="chunks")
 
     __table_args__ = (
         sa.UniqueConstraint("document_id", "chunk_index", name="uq_chunks_document_index"),
         sa.Index("idx_chunks_document", "document_id"),
+        sa.Index("idx_chunks_search_tsv", "search_tsv", postgresql_using="gin"),
+    )
+
+
+class DocumentLexicalIndex(Base):
+    """Serialized per-document inverted index (app.services.lexical_index),
+    rebuilt by every parse. One row per document; the blob is only read on an
+    API-process cache miss."""
+
+    __tablename__ = "document_lexical_indexes"
+
+    document_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), sa.ForeignKey("documents.id", ondelete="CASCADE"), primary_key=True
+    )
+    format_version: Mapped[int] = mapped_column(sa.Integer, nullable=False)
+    chunk_count: Mapped[int] = mapped_column(sa.Integer, nullable=False)
+    blob: Mapped[bytes] = mapped_column(sa.LargeBinary, nullable=False)
+    built_at: Mapped[datetime] = mapped_column(
+        sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")
+    )
+
+
+class DocumentNormalizedText(Base):
+    """Pre-normalized chunk and page text with offset maps
+    (app.services.normalized_text_index), rebuilt by every parse so quote
+    search and verification skip per-request normalization."""
+
+    __tablename__ = "document_normalized_texts"
+
+    document_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), sa.ForeignKey("documents.id", ondelete="CASCADE"), primary_key=True
+    )
+    format_version: Mapped[int] = mapped_column(sa.Integer, nullable=False)
+    blob: Mapped[bytes] = mapped_column(sa.LargeBinary, nullable=False)
+    built_at: Mapped[datetime] = mapped_column(
+        sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")
+    )
+
+
+class BackfillRun(Base):
+    """One parse-pipeline backfill (app.services.backfill_service): its
+    selection, limits and running totals. Per-document progress is
+    checkpointed in backfill_items, so a run resumes after any restart."""
+
+    __tablename__ = "backfill_runs"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, server_default=sa.text("gen_random_uuid()")
+    )
+    target_version: Mapped[int] = mapped_column(sa.Integer, nullable=False)
+    # running | paused | exhausted (budget reached) | completed | cancelled
+    status: Mapped[str] = mapped_column(sa.String(16), nullable=False, server_default=sa.text("'running'"))
+    max_in_flight: Mapped[int] = mapped_column(sa.Integer, nullable=False)
+    budget_tokens: Mapped[Optional[int]] = mapped_column(sa.BigInteger, nullable=True)
+    params: Mapped[dict] = mapped_column(JSONB, nullable=False, server_default=sa.text("'{}'::jsonb"))
+    docs_total: Mapped[int] = mapped_column(sa.Integer, nullable=False, server_default=sa.text("0"))
+    docs_done: Mapped[int] = mapped_column(sa.Integer, nullable=False, server_default=sa.text("0"))
+    docs_failed: Mapped[int] = mapped_column(sa.Integer, nullable=False, server_default=sa.text("0"))
+    docs_skipped: Mapped[int] = mapped_column(sa.Integer, nullable=False, server_default=sa.text("0"))
+    chunks_done: Mapped[int] = mapped_column(sa.BigInteger, nullable=False, server_default=sa.text("0"))
+    tokens_spent: Mapped[int] = mapped_column(sa.BigInteger, nullable=False, server_default=sa.text("0"))
+    created_at: Mapped[datetime] = mapped_column(
+        sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()"), onupdate=sa.func.now()
+    )
+    finished_at: Mapped[Optional[datetime]] = mapped_column(sa.DateTime(timezone=True), nullable=True)
+
+
+class BackfillItem(Base):
+    __tablename__ = "backfill_items"
+
+    run_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), sa.ForeignKey("backfill_runs.id", ondelete="CASCADE"), primary_key=True
+    )
+    document_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), sa.ForeignKey("documents.id", ondelete="CASCADE"), primary_key=True
+    )
+    # Dispatch order within the run (0 = first).
+    position: Mapped[int] = mapped_column(sa.Integer, nullable=False)
+    # pending | dispatched | done | failed | skipped
+    state: Mapped[str] = mapped_column(sa.String(16), nullable=False, server_default=sa.text("'pending'"))
+    # Upper bound of the embedding tokens a reparse costs (current chunks).
+    est_tokens: Mapped[int] = mapped_column(sa.Integer, nullable=False, server_default=sa.text("0"))
+    chunks: Mapped[Optional[int]] = mapped_column(sa.Integer, nullable=True)
+    tokens: Mapped[Optional[int]] = mapped_column(sa.Integer, nullable=True)
+    dispatched_at: Mapped[Optional[datetime]] = mapped_column(sa.DateTime(timezone=True), nullable=True)
+    finished_at: Mapped[Optional[datetime]] = mapped_column(sa.DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        sa.Index("idx_backfill_items_run_state_position", "run_id", "state", "position"),
+        sa.Index("idx_backfill_items_document", "document_id"),
     )
 
 
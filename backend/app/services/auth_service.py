@@ -11,6 +11,7 @@ from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
+from app.core.principal_cache import user_principal_cache
 from app.models.tables import Account, CreditLedger, User, VerificationToken
 
 logger = logging.getLogger(__name__)
@@ -98,6 +99,7 @@ async def update_user(db: AsyncSession, user: User, **kwargs) -> User:
         if hasattr(user, key) and value is not None:
             setattr(user, key, value)
     await db.commit()
+    user_principal_cache.invalidate(user.id)
     await db.refresh(user)
     return user
 
@@ -105,6 +107,7 @@ async def update_user(db: AsyncSession, user: User, **kwargs) -> User:
 async def delete_user(db: AsyncSession, user: User) -> None:
     await db.delete(user)
     await db.commit()
+    user_principal_cache.invalidate(user.id)
 
 
 async def link_account(
@@ -0,0 +1,366 @@
+"""Parse-pipeline backfill orchestrator.
+
+Bumping ``PARSE_PIPELINE_VERSION`` used to mean running
+``scripts/find_low_quality_docs.py --enqueue``. That fires one
+``parse_document`` per candidate onto the parse queue at once: no order, no
+cap, no idea what it costs, and user uploads wait behind the whole backlog.
+
+A backfill run instead snapshots its candidates into ``backfill_items`` in
+priority order, and the ``advance_backfill_runs`` beat task (or
+``scripts/backfill_pipeline.py tick``) moves it forward one step at a time:
+
+- reconcile: dispatched documents that reached ``ready``/``error`` are
+  checkpointed with their chunk count and the embedding tokens their
+  reparse actually spent (chunk rows created by it; incremental reparses
+  reuse unchanged chunks);
+- dispatch: claim and enqueue the next pending documents, up to the run's
+  ``max_in_flight``, while the projected spend (spent + in-flight upper
+  bounds + next) stays within ``budget_tokens``, and only while fewer than
+  ``BACKFILL_LIVE_YIELD_THRESHOLD`` user-initiated parses are in progress.
+
+Every decision is committed per document, so a crash, deploy or paused run
+resumes exactly where it stopped.
+"""
+
+from __future__ import annotations
+
+import logging
+import uuid
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Optional
+
+from sqlalchemy import (
+    and_,
+    case,
+    exists,
+    func,
+    insert,
+    nulls_first,
+    or_,
+    select,
+    update,
+)
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.tables import BackfillItem, BackfillRun, Chunk, Document
+from app.services.parse_service import PARSE_PIPELINE_VERSION
+
+logger = logging.getLogger(__name__)
+
+# Statuses a run can be advanced from; everything else is terminal or parked.
+_OPEN_STATUSES = ("running", "paused", "exhausted")
+_INSERT_BATCH = 1000
+
+
+def _processing_statuses() -> tuple[str, ...]:
+    from app.workers.parse_worker import _PROCESSING_STATUSES
+
+    return _PROCESSING_STATUSES
+
+
+def _candidate_filter(quality: float, force: bool):
+    """Documents parsed by an older pipeline; with `force`, also current-
+    version documents whose text quality is below `quality` (the finder's
+    --force: re-running the same pipeline rarely helps, so opt-in only)."""
+    stale = or_(Document.parse_version.is_(None), Document.parse_version < PARSE_PIPELINE_VERSION)
+    if force:
+        stale = or_(stale, and_(Document.text_quality.isnot(None), Document.text_quality < quality))
+    return and_(Document.status == "ready", Document.demo_slug.is_(None), stale)
+
+
+def select_candidates(db: Session, *, quality: float, limit: Optional[int], force: bool) -> list:
+    """Candidate rows (id, est_tokens) in dispatch order: garbled text first,
+    then the oldest pipeline versions, then the oldest documents. Documents
+    already owned by an open run are excluded."""
+    est_tokens = (
+        select(func.coalesce(func.sum(Chunk.token_count), 0))
+        .where(Chunk.document_id == Document.id)
+        .scalar_subquery()
+    )
+    owned = exists().where(
+        BackfillItem.document_id == Document.id,
+        BackfillItem.state.in_(("pending", "dispatched")),
+        BackfillItem.run_id.in_(select(BackfillRun.id).where(BackfillRun.status.in_(_OPEN_STATUSES))),
+    )
+    low_quality = case((Document.text_quality < quality, 0), else_=1)
+    stmt = (
+        select(Document.id, est_tokens.label("est_tokens"))
+        .where(_candidate_filter(quality, force), ~owned)
+        .order_by(
+            low_quality,
+            nulls_first(Document.parse_version.asc()),
+            nulls_first(Document.text_quality.asc()),
+            Document.created_at,
+        )
+    )
+    if limit:
+        stmt = stmt.limit(limit)
+    return db.execute(stmt).all()
+
+
+def create_run(
+    db: Session,
+    *,
+    quality: float = 0.70,
+    limit: Optional[int] = None,
+    force: bool = False,
+    max_in_flight: int = 4,
+    budget_tokens: Optional[int] = None,
+) -> BackfillRun:
+    """Snapshot the current candidates into a new running backfill."""
+    rows = select_candidates(db, quality=quality, limit=limit, force=force)
+    run = BackfillRun(
+        target_version=PARSE_PIPELINE_VERSION,
+        status="running",
+        max_in_flight=max(1, max_in_flight),
+        budget_tokens=budget_tokens,
+        params={"quality": quality, "limit": limit, "force": force},
+        docs_total=len(rows),
+    )
+    db.add(run)
+    db.flush()
+    items = (
+        {"run_id": run.id, "document_id": row.id, "position": position, "est_tokens": int(row.est_tokens)}
+        for position, row in enumerate(rows)
+    )
+    while batch := list(islice(items, _INSERT_BATCH)):
+        db.execute(insert(BackfillItem), batch)
+    db.commit()
+    logger.info("Backfill run %s created: %d documents -> pipeline v%d", run.id, len(rows), PARSE_PIPELINE_VERSION)
+    return run
+
+
+def set_status(
+    db: Session,
+    run: BackfillRun,
+    status: str,
+    *,
+    budget_tokens: Optional[int] = None,
+    max_in_flight: Optional[int] = None,
+) -> None:
+    """Pause, resume (optionally with a new budget/cap) or cancel a run.
+    Documents already dispatched finish and are still reconciled, also
+    after a cancel (see ``advance_open_runs``)."""
+    if status not in ("running", "paused", "cancelled"):
+        raise ValueError(f"Unsupported backfill status: {status}")
+    if run.status in ("completed", "cancelled"):
+        raise ValueError(f"Backfill run {run.id} is already {run.status}")
+    if budget_tokens is not None:
+        run.budget_tokens = budget_tokens
+    if max_in_flight is not None:
+        run.max_in_flight = max(1, max_in_flight)
+    run.status = status
+    if status == "cancelled":
+        run.finished_at = func.now()
+    db.add(run)
+    db.commit()
+
+
+def _finish_item(db: Session, run: BackfillRun, item_row, state: str) -> None:
+    chunks = tokens = None
+    if state == "done":
+        chunks = int(item_row.chunks_total or 0)
+        # Rows the reparse created; incremental reparses keep (and don't
+        # re-embed) unchanged chunks, which keep their old created_at.
+        tokens = int(
+            db.execute(
+                select(func.coalesce(func.sum(Chunk.token_count), 0)).where(
+                    Chunk.document_id == item_row.document_id,
+                    Chunk.created_at >= item_row.dispatched_at,
+                )
+            ).scalar()
+            or 0
+        )
+        run.docs_done += 1
+        run.chunks_done += chunks
+        run.tokens_spent += tokens
+    elif state == "failed":
+        run.docs_failed += 1
+    else:
+        run.docs_skipped += 1
+    db.execute(
+        update(BackfillItem)
+        .where(BackfillItem.run_id == run.id, BackfillItem.document_id == item_row.document_id)
+        .values(state=state, chunks=chunks, tokens=tokens, finished_at=func.now())
+    )
+    db.add(run)
+    db.commit()
+
+
+def _live_parses(db: Session) -> int:
+    """Parses in progress that no backfill dispatched (uploads, user reparses)."""
+    backfilled = exists().where(BackfillItem.document_id == Document.id, BackfillItem.state == "dispatched")
+    return int(
+        db.execute(
+            select(func.count()).select_from(Document).where(
+                Document.status.in_(_processing_statuses()), ~backfilled
+            )
+        ).scalar()
+        or 0
+    )
+
+
+def advance_run(db: Session, run: BackfillRun) -> int:
+    """Reconcile dispatched documents, then dispatch within the run's
+    limits. Returns the number of documents dispatched."""
+    processing = _processing_statuses()
+    in_flight = 0
+    in_flight_tokens = 0
+    dispatched_rows = db.execute(
+        select(
+            BackfillItem.document_id,
+            BackfillItem.est_tokens,
+            BackfillItem.dispatched_at,
+            Document.status,
+            Document.chunks_total,
+        )
+        .join(Document, Document.id == BackfillItem.document_id)
+        .where(BackfillItem.run_id == run.id, BackfillItem.state == "dispatched")
+    ).all()
+    for row in dispatched_rows:
+        if row.status in processing:
+            in_flight += 1
+            in_flight_tokens += int(row.est_tokens)
+        elif row.status == "ready":
+            _finish_item(db, run, row, "done")
+        elif row.status == "error":
+            _finish_item(db, run, row, "failed")
+        else:  # deleting / re-uploaded under us
+            _finish_item(db, run, row, "skipped")
+
+    dispatched = 0
+    if run.status == "running":
+        dispatched = _dispatch(db, run, in_flight, in_flight_tokens)
+        in_flight += dispatched
+
+    remaining = db.execute(
+        select(func.count()).where(
+            BackfillItem.run_id == run.id, BackfillItem.state.in_(("pending", "dispatched"))
+        )
+    ).scalar()
+    if not remaining and run.status in _OPEN_STATUSES:
+        run.status = "completed"
+        run.finished_at = func.now()
+        db.add(run)
+        db.commit()
+        logger.info("Backfill run %s completed: %s", run.id, progress(run))
+    return dispatched
+
+
+def _dispatch(db: Session, run: BackfillRun, in_flight: int, in_flight_tokens: int) -> int:
+    slots = run.max_in_flight - in_flight
+    if slots <= 0:
+        return 0
+    live = _live_parses(db)
+    if live >= settings.BACKFILL_LIVE_YIELD_THRESHOLD:
+        logger.info("Backfill run %s yielding: %d live parses in progress", run.id, live)
+        return 0
+
+    from app.workers.parse_worker import parse_document
+
+    force = bool((run.params or {}).get("force"))
+    quality = float((run.params or {}).get("quality") or 0.0)
+    pending = db.execute(
+        select(BackfillItem.document_id, BackfillItem.est_tokens)
+        .where(BackfillItem.run_id == run.id, BackfillItem.state == "pending")
+        .order_by(BackfillItem.position)
+        .limit(slots)
+    ).all()
+    dispatched = 0
+    for item in pending:
+        projected = int(run.tokens_spent) + in_flight_tokens + int(item.est_tokens)
+        if run.budget_tokens is not None and projected > run.budget_tokens:
+            if in_flight == 0 and dispatched == 0:
+                run.status = "exhausted"
+                db.add(run)
+                db.commit()
+                logger.warning(
+                    "Backfill run %s stopped at its budget: %d tokens spent of %d",
+                    run.id, run.tokens_spent, run.budget_tokens,
+                )
+            break  # strict priority order: never skip ahead to a cheaper document
+        # Same atomic claim as every other dispatcher: the worker no-ops
+        # documents that aren't in a processing status. The stored
+        # parse_requested_locale is left as the user set it.
+        claimed = db.execute(
+            update(Document)
+            .where(Document.id == item.document_id, _candidate_filter(quality, force))
+            .values(status="parsing", updated_at=func.now())
+        )
+        if claimed.rowcount != 1:
+            db.execute(
+                update(BackfillItem)
+                .where(BackfillItem.run_id == run.id, BackfillItem.document_id == item.document_id)
+                .values(state="skipped", finished_at=func.now())
+            )
+            run.docs_skipped += 1
+            db.add(run)
+            db.commit()
+            continue
+        db.execute(
+            update(BackfillItem)
+            .where(BackfillItem.run_id == run.id, BackfillItem.document_id == item.document_id)
+            .values(state="dispatched", dispatched_at=func.now())
+        )
+        db.commit()
+        try:
+            parse_document.apply_async(args=[str(item.document_id)], queue=settings.BACKFILL_PARSE_QUEUE)
+        except Exception:
+            # Claimed but not published: the stale-processing watchdog
+            # re-dispatches it, and reconcile picks up the outcome.
+            logger.exception("Backfill run %s failed to dispatch %s", run.id, item.document_id)
+        dispatched += 1
+        in_flight += 1
+        in_flight_tokens += int(item.est_tokens)
+    return dispatched
+
+
+def progress(run: BackfillRun, *, now: Optional[datetime] = None) -> dict:
+    """Totals, throughput (docs/hour, chunks/s) and ETA of a run."""
+    now = now or datetime.now(timezone.utc)
+    end = run.finished_at if isinstance(run.finished_at, datetime) else now
+    elapsed = max(1.0, (end - run.created_at).total_seconds())
+    finished = run.docs_done + run.docs_failed + run.docs_skipped
+    remaining = max(0, run.docs_total - finished)
+    rate = (run.docs_done + run.docs_failed) / elapsed
+    return {
+        "run_id": str(run.id),
+        "status": run.status,
+        "target_version": run.target_version,
+        "docs_total": run.docs_total,
+        "docs_done": run.docs_done,
+        "docs_failed": run.docs_failed,
+        "docs_skipped": run.docs_skipped,
+        "docs_remaining": remaining,
+        "chunks_done": run.chunks_done,
+        "tokens_spent": run.tokens_spent,
+        "budget_tokens": run.budget_tokens,
+        "docs_per_hour": round(rate * 3600, 1),
+        "chunks_per_second": round(run.chunks_done / elapsed, 2),
+        "eta_seconds": round(remaining / rate) if rate > 0 and remaining else None,
+    }
+
+
+def advance_open_runs(db: Session) -> int:
+    """Advance every running run (oldest first) and reconcile paused,
+    exhausted and cancelled ones; returns the documents dispatched.
+
+    A cancelled run is reconciled until none of its documents is still
+    dispatched, so their outcome lands in its totals and they stop
+    counting as backfill parses in ``_live_parses``."""
+    draining = and_(
+        BackfillRun.status == "cancelled",
+        exists().where(BackfillItem.run_id == BackfillRun.id, BackfillItem.state == "dispatched"),
+    )
+    runs = db.execute(
+        select(BackfillRun)
+        .where(or_(BackfillRun.status.in_(_OPEN_STATUSES), draining))
+        .order_by(BackfillRun.created_at)
+    ).scalars().all()
+    return sum(advance_run(db, run) for run in runs)
+
+
+def get_run(db: Session, run_id: str | uuid.UUID) -> Optional[BackfillRun]:
+    return db.get(BackfillRun, uuid.UUID(str(run_id)))
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import logging
 import re
 import time
@@ -31,6 +32,7 @@ from app.models.tables import (
 from app.services import credit_service, quote_search_service
 from app.services.action_planner import ChatAction, action_planner
 from app.services.chat_tool_executor import ChatArtifact, chat_tool_executor
+from app.services.chunk_cache import known_documents
 from app.services.citation_focus_service import current_claim, focus_sentence
 from app.services.citation_quote_service import apply_focus_quotes, extract_focus_quotes
 from app.services.claim_verifier_service import claim_verifier_service
@@ -1241,61 +1243,154 @@ class RefParserFSM:
     - state: TEXT | MAYBE_REF
     - buffer 上限 8 字符，超限回退
     - char_offset: 已输出字符计数
+
+    Contiguous plain text is coalesced into one token event instead of one
+    per character. Pending text is flushed before a citation and at the end
+    of each feed() (one provider delta). With coalesce_chars set, a shorter
+    run is held back and merged with the next delta. The first delta is
+    never held (time to first token). Held text is due coalesce_ms after it
+    arrived: the stream loop waits for the next delta only until
+    flush_deadline and then calls tick() (see _deltas_with_flush_ticks), so
+    a provider pause does not hold text back. char_offset and recent_claim
+    advance as text is accepted, so citation offsets and claims do not
+    depend on when the text is flushed.
     """
 
     # Rolling window of recently emitted answer text, used as the "claim" that a
     # following [n] cites — to focus the citation on one chunk sentence.
     _CLAIM_WINDOW = 200
 
-    def __init__(self, chunk_map: dict[int, _ChunkInfo]):
+    def __init__(self, chunk_map: dict[int, _ChunkInfo], *, coalesce_chars: int = 0, coalesce_ms: float = 0.0):
         self.chunk_map = chunk_map
         self.buffer: str = ""
         self.char_offset: int = 0
         self.state: str = "TEXT"  # TEXT | MAYBE_REF
         self.recent_claim: str = ""
+        self.coalesce_chars = coalesce_chars
+        self.coalesce_seconds = coalesce_ms / 1000.0
+        self._pending: List[str] = []
+        self._pending_len = 0
+        self._pending_since = 0.0
+        self._emitted = False
+
+    @property
+    def held_text(self) -> str:
+        """Accepted text not yet emitted. char_offset already counts it, so a
+        partial answer saved on error or cancel must include it."""
+        return "".join(self._pending)
+
+    def _accept(self, text: str, *, claim: bool) -> None:
+        if not self._pending:
+            self._pending_since = time.monotonic()
+        self._pending.append(text)
+        self._pending_len += len(text)
+        self.char_offset += len(text)
+        if claim:
+            self.recent_claim = (self.recent_claim + text)[-self._CLAIM_WINDOW:]
+
+    @property
+    def flush_deadline(self) -> Optional[float]:
+        """time.monotonic() at which held text is due, or None if none is held."""
+        return self._pending_since + self.coalesce_seconds if self._pending else None
+
+    def _emit_pending(self, events: List[Dict[str, Any]]) -> None:
+        if self._pending:
+            events.append(sse("token", {"text": "".join(self._pending)}))
+            self._pending = []
+            self._pending_len = 0
+            self._emitted = True
+
+    def tick(self) -> List[Dict[str, Any]]:
+        """Emit held text that is due, while no new delta has arrived."""
+        events: List[Dict[str, Any]] = []
+        if self._pending and time.monotonic() - self._pending_since >= self.coalesce_seconds:
+            self._emit_pending(events)
+        return events
 
     def feed(self, token: str) -> List[Dict[str, Any]]:
         events: List[Dict[str, Any]] = []
-        for ch in token:
+        i, n = 0, len(token)
+        while i < n:
             if self.state == "TEXT":
-                if ch == "[":
-                    self.state = "MAYBE_REF"
-                    self.buffer = "["
+                j = token.find("[", i)
+                if j < 0:
+                    self._accept(token[i:], claim=True)
+                    break
+                if j > i:
+                    self._accept(token[i:j], claim=True)
+                self.state = "MAYBE_REF"
+                self.buffer = "["
+                i = j + 1
+                continue
+
+            ch = token[i]
+            i += 1
+            self.buffer += ch
+            if ch == "]":
+                inner = self.buffer[1:-1]
+                if inner.isdigit() and (int(inner) in self.chunk_map):
+                    ref_num = int(inner)
+                    chunk = self.chunk_map[ref_num]
+                    self._emit_pending(events)
+                    events.append(sse("citation", _citation_payload(ref_num, chunk, self.char_offset, current_claim(self.recent_claim))))
                 else:
-                    events.append(sse("token", {"text": ch}))
-                    self.char_offset += 1
-                    self.recent_claim = (self.recent_claim + ch)[-self._CLAIM_WINDOW:]
-
-            elif self.state == "MAYBE_REF":
-                self.buffer += ch
-                if ch == "]":
-                    inner = self.buffer[1:-1]
-                    if inner.isdigit() and (int(inner) in self.chunk_map):
-                        ref_num = int(inner)
-                        chunk = self.chunk_map[ref_num]
-                        events.append(sse("citation", _citation_payload(ref_num, chunk, self.char_offset, current_claim(self.recent_claim))))
-                    else:
-                        # 非有效引用，回退为普通文本
-                        events.append(sse("token", {"text": self.buffer}))
-                        self.char_offset += len(self.buffer)
-                    self.buffer = ""
-                    self.state = "TEXT"
-                elif len(self.buffer) > 8:
-                    # 超限回退
-                    events.append(sse("token", {"text": self.buffer}))
-                    self.char_offset += len(self.buffer)
-                    self.buffer = ""
-                    self.state = "TEXT"
+                    # 非有效引用，回退为普通文本
+                    self._accept(self.buffer, claim=False)
+                self.buffer = ""
+                self.state = "TEXT"
+            elif len(self.buffer) > 8:
+                # 超限回退
+                self._accept(self.buffer, claim=False)
+                self.buffer = ""
+                self.state = "TEXT"
+
+        if self._pending and (
+            not self._emitted
+            or self._pending_len >= self.coalesce_chars
+            or time.monotonic() - self._pending_since >= self.coalesce_seconds
+        ):
+            self._emit_pending(events)
         return events
 
     def flush(self) -> List[Dict[str, Any]]:
         events: List[Dict[str, Any]] = []
         if self.buffer:
-            events.append(sse("token", {"text": self.buffer}))
+            self._pending.append(self.buffer)
             self.buffer = ""
+        self._emit_pending(events)
         return events
 
 
+async def _deltas_with_flush_ticks(stream: Any, fsm: RefParserFSM) -> AsyncGenerator[Any, None]:
+    """Yield the provider stream's chunks, plus None whenever text held by
+    ``fsm`` falls due while the provider is quiet.
+
+    The pending read is kept across ticks in its own task, so a tick never
+    cancels (and loses) a chunk in flight.
+    """
+    chunks = stream.__aiter__()
+    pending: Optional[asyncio.Future] = None
+    try:
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(chunks.__anext__())
+            deadline = fsm.flush_deadline
+            if deadline is not None:
+                done, _ = await asyncio.wait({pending}, timeout=max(0.0, deadline - time.monotonic()))
+                if not done:
+                    yield None
+                    continue
+            try:
+                chunk = await pending
+            except StopAsyncIteration:
+                return
+            pending = None
+            yield chunk
+    finally:
+        if pending is not None and not pending.done():
+            pending.cancel()
+
+
 # ---------------------------
 # Chat Service
 # ---------------------------
@@ -1594,6 +1689,9 @@ class ChatService:
         collection_doc_names: dict[uuid.UUID, str] = {}
         collection_doc_types: dict[uuid.UUID, str] = {}
         collection_doc_pages: dict[uuid.UUID, int] = {}
+        # Rows carry status/updated_at so retrieval can validate cached chunks
+        # without querying the documents again (chunk_cache.known_documents).
+        collection_doc_rows: list = []
         if is_collection_session:
             cd_rows = await db.execute(
                 select(collection_documents.c.document_id).where(
@@ -1603,10 +1701,18 @@ class ChatService:
             collection_doc_ids = [row[0] for row in cd_rows.all()]
             if collection_doc_ids:
                 doc_rows = await db.execute(
-                    select(Document.id, Document.filename, Document.file_type, Document.page_count)
+                    select(
+                        Document.id,
+                        Document.filename,
+                        Document.file_type,
+                        Document.page_count,
+                        Document.status,
+                        Document.updated_at,
+                    )
                     .where(Document.id.in_(collection_doc_ids))
                 )
-                for drow in doc_rows.all():
+                collection_doc_rows = doc_rows.all()
+                for drow in collection_doc_rows:
                     collection_doc_names[drow[0]] = drow[1]
                     collection_doc_types[drow[0]] = drow[2]
                     if drow[3]:
@@ -1914,13 +2020,14 @@ class ChatService:
                 )
                 retrieval_strategy = "collection_summary_context"
             elif is_collection_session and collection_doc_ids:
-                corrective = await corrective_retrieval_service.retrieve_multi(
-                    user_message,
-                    query_route,
-                    collection_doc_ids,
-                    top_k=8,
-                    db=db,
-                )
+                with known_documents(collection_doc_rows):
+                    corrective = await corrective_retrieval_service.retrieve_multi(
+                        user_message,
+                        query_route,
+                        collection_doc_ids,
+                        top_k=8,
+                        db=db,
+                    )
                 retrieved = corrective.retrieved
                 retrieval_strategy = corrective.strategy
                 retrieval_evaluation = corrective.evaluation
@@ -1944,23 +2051,25 @@ class ChatService:
                         retrieved = []
                         retrieval_strategy = "page_lookup_miss"
                     else:
-                        corrective = await corrective_retrieval_service.retrieve_single(
-                            user_message, query_route, document_id, top_k=8, db=db,
-                            doc_pages=getattr(doc, "page_count", None),
-                        )
+                        with known_documents([doc] if doc is not None else []):
+                            corrective = await corrective_retrieval_service.retrieve_single(
+                                user_message, query_route, document_id, top_k=8, db=db,
+                                doc_pages=getattr(doc, "page_count", None),
+                            )
                         retrieved = corrective.retrieved
                         retrieval_strategy = corrective.strategy
                         retrieval_evaluation = corrective.evaluation
                         retrieval_plan = corrective.plan
             elif document_id:
-                corrective = await corrective_retrieval_service.retrieve_single(
-                    user_message,
-                    query_route,
-                    document_id,
-                    top_k=8,
-                    db=db,
-                    doc_pages=getattr(doc, "page_count", None),
-                )
+                with known_documents([doc] if doc is not None else []):
+                    corrective = await corrective_retrieval_service.retrieve_single(
+                        user_message,
+                        query_route,
+                        document_id,
+                        top_k=8,
+                        db=db,
+                        doc_pages=getattr(doc, "page_count", None),
+                    )
                 retrieved = corrective.retrieved
                 retrieval_strategy = corrective.strategy
                 retrieval_evaluation = corrective.evaluation
@@ -2217,7 +2326,11 @@ class ChatService:
 
         assistant_text_parts: List[str] = []
         citations: List[dict] = []
-        fsm = RefParserFSM(chunk_map)
+        fsm = RefParserFSM(
+            chunk_map,
+            coalesce_chars=settings.CHAT_TOKEN_COALESCE_CHARS,
+            coalesce_ms=settings.CHAT_TOKEN_COALESCE_MS,
+        )
 
         last_ping = time.monotonic()
         prompt_tokens: Optional[int] = None
@@ -2245,37 +2358,43 @@ class ChatService:
                 _apply_provider_options(create_kwargs, effective_model)
                 stream = await client.chat.completions.create(**create_kwargs)
 
-                async for chunk in stream:
-                    # Extract text delta
-                    if chunk.choices and chunk.choices[0].delta.content:
-                        text = chunk.choices[0].delta.content
-                        token_count += 1
-                        if not first_token_logged:
-                            first_token_logged = True
-                            latency = time.time() - llm_start
-                            logger.info("LLM first_token_latency=%.2fs model=%s", latency, effective_model)
-                        # 7) Feed FSM and emit events
-                        for ev in fsm.feed(text):
-                            if ev["event"] == "token":
+                async with contextlib.aclosing(_deltas_with_flush_ticks(stream, fsm)) as deltas:
+                    async for chunk in deltas:
+                        if chunk is None:
+                            for ev in fsm.tick():
                                 assistant_text_parts.append(ev["data"]["text"])
-                            elif ev["event"] == "citation":
-                                citations.append(ev["data"])
-                            yield ev
-
-                    # Track finish_reason from choices
-                    if chunk.choices and chunk.choices[0].finish_reason:
-                        finish_reason = chunk.choices[0].finish_reason
-
-                    # Extract usage if present (last chunk)
-                    if hasattr(chunk, "usage") and chunk.usage:
-                        prompt_tokens = getattr(chunk.usage, "prompt_tokens", None)
-                        output_tokens = getattr(chunk.usage, "completion_tokens", None)
-
-                    # Ping every 15 seconds
-                    now = time.monotonic()
-                    if now - last_ping >= 15.0:
-                        yield sse("ping", {})
-                        last_ping = now
+                                yield ev
+                            continue
+                        # Extract text delta
+                        if chunk.choices and chunk.choices[0].delta.content:
+                            text = chunk.choices[0].delta.content
+                            token_count += 1
+                            if not first_token_logged:
+                                first_token_logged = True
+                                latency = time.time() - llm_start
+                                logger.info("LLM first_token_latency=%.2fs model=%s", latency, effective_model)
+                            # 7) Feed FSM and emit events
+                            for ev in fsm.feed(text):
+                                if ev["event"] == "token":
+                                    assistant_text_parts.append(ev["data"]["text"])
+                                elif ev["event"] == "citation":
+                                    citations.append(ev["data"])
+                                yield ev
+
+                        # Track finish_reason from choices
+                        if chunk.choices and chunk.choices[0].finish_reason:
+                            finish_reason = chunk.choices[0].finish_reason
+
+                        # Extract usage if present (last chunk)
+                        if hasattr(chunk, "usage") and chunk.usage:
+                            prompt_tokens = getattr(chunk.usage, "prompt_tokens", None)
+                            output_tokens = getattr(chunk.usage, "completion_tokens", None)
+
+                        # Ping every 15 seconds
+                        now = time.monotonic()
+                        if now - last_ping >= 15.0:
+                            yield sse("ping", {})
+                            last_ping = now
 
                 # Flush at stream end
                 for ev in fsm.flush():
@@ -2314,7 +2433,7 @@ class ChatService:
                 )
 
             except Exception as e:
-                assistant_snapshot = "".join(assistant_text_parts)
+                assistant_snapshot = "".join(assistant_text_parts) + fsm.held_text
                 has_partial_answer = bool(assistant_snapshot.strip())
                 if (
                     user is not None
@@ -2555,7 +2674,7 @@ class ChatService:
         except asyncio.CancelledError:
             raise
         finally:
-            assistant_snapshot = "".join(assistant_text_parts)
+            assistant_snapshot = "".join(assistant_text_parts) + fsm.held_text
             has_partial_answer = bool(assistant_snapshot.strip())
             if not done_emitted and has_partial_answer and not persisted:
                 try:
@@ -2936,7 +3055,11 @@ class ChatService:
 
         continuation_text_parts: List[str] = []
         new_citations: List[dict] = []
-        fsm = RefParserFSM(chunk_map)
+        fsm = RefParserFSM(
+            chunk_map,
+            coalesce_chars=settings.CHAT_TOKEN_COALESCE_CHARS,
+            coalesce_ms=settings.CHAT_TOKEN_COALESCE_MS,
+        )
         fsm.char_offset = len(asst_msg.content)  # Offset citations relative to full text
 
         last_ping = time.monotonic()
@@ -2964,27 +3087,33 @@ class ChatService:
                 _apply_provider_options(create_kwargs, effective_model)
                 stream = await client.chat.completions.create(**create_kwargs)
 
-                async for chunk in stream:
-                    if chunk.choices and chunk.choices[0].delta.content:
-                        text = chunk.choices[0].delta.content
-                        for ev in fsm.feed(text):
-                            if ev["event"] == "token":
+                async with contextlib.aclosing(_deltas_with_flush_ticks(stream, fsm)) as deltas:
+                    async for chunk in deltas:
+                        if chunk is None:
+                            for ev in fsm.tick():
                                 continuation_text_parts.append(ev["data"]["text"])
-                            elif ev["event"] == "citation":
-                                new_citations.append(ev["data"])
-                            yield ev
-
-                    if chunk.choices and chunk.choices[0].finish_reason:
-                        finish_reason = chunk.choices[0].finish_reason
-
-                    if hasattr(chunk, "usage") and chunk.usage:
-                        prompt_tokens = getattr(chunk.usage, "prompt_tokens", None)
-                        output_tokens = getattr(chunk.usage, "completion_tokens", None)
-
-                    now = time.monotonic()
-                    if now - last_ping >= 15.0:
-                        yield sse("ping", {})
-                        last_ping = now
+                                yield ev
+                            continue
+                        if chunk.choices and chunk.choices[0].delta.content:
+                            text = chunk.choices[0].delta.content
+                            for ev in fsm.feed(text):
+                                if ev["event"] == "token":
+                                    continuation_text_parts.append(ev["data"]["text"])
+                                elif ev["event"] == "citation":
+                                    new_citations.append(ev["data"])
+                                yield ev
+
+                        if chunk.choices and chunk.choices[0].finish_reason:
+                            finish_reason = chunk.choices[0].finish_reason
+
+                        if hasattr(chunk, "usage") and chunk.usage:
+                            prompt_tokens = getattr(chunk.usage, "prompt_tokens", None)
+                            output_tokens = getattr(chunk.usage, "completion_tokens", None)
+
+                        now = time.monotonic()
+                        if now - last_ping >= 15.0:
+                            yield sse("ping", {})
+                            last_ping = now
 
                 for ev in fsm.flush():
                     if ev["event"] == "token":
@@ -3012,7 +3141,7 @@ class ChatService:
                     yield sse("truncated", {"reason": "max_tokens"})
 
             except Exception as e:
-                continuation_snapshot = "".join(continuation_text_parts)
+                continuation_snapshot = "".join(continuation_text_parts) + fsm.held_text
                 has_partial_answer = bool(continuation_snapshot.strip())
                 if (
                     user is not None
@@ -3207,7 +3336,7 @@ class ChatService:
         except asyncio.CancelledError:
             raise
         finally:
-            continuation_snapshot = "".join(continuation_text_parts)
+            continuation_snapshot = "".join(continuation_text_parts) + fsm.held_text
             has_partial_answer = bool(continuation_snapshot.strip())
             if not done_emitted and has_partial_answer and getattr(asst_msg, "id", None) is not None and not persisted:
                 try:
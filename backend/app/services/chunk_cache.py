@@ -0,0 +1,330 @@
+"""Per-document hot chunk cache for the API process.
+
+Chat, search and the Quote Finder re-select ``Chunk`` rows of the same few
+active documents on every request, although a document's chunks never change
+between parses. ``chunk_cache`` keeps each ready document's chunk table in a
+ByteLRU as ``__slots__`` rows (attribute-compatible with ``Chunk`` for every
+read path) and serves id/index lookups from it.
+
+Search hydration (``fetch_chunks_by_id``) never loads a chunk table on the
+request path: ids of documents that are not resident are read through
+``WHERE id IN (...)``, and those documents are loaded in the background if
+they fit. Only whole-document callers (``get``/``get_many``) read through.
+
+Entries are keyed by document and revalidated against the document's
+``updated_at``: a reparse leaves ``status='ready'`` and only returns to it
+with a fresh ``updated_at`` once every chunk is in place, and deletion flips
+the status to ``'deleting'``. Documents that are not ready (mid-parse,
+deleting, failed) are never cached and their callers read through to SQL.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import sys
+import time
+import uuid
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Iterable, Iterator, Optional, Sequence
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.tables import Chunk, Document
+from app.services.byte_lru import ByteLRU
+
+logger = logging.getLogger(__name__)
+
+_COLUMNS = (
+    Chunk.id,
+    Chunk.document_id,
+    Chunk.chunk_index,
+    Chunk.text,
+    Chunk.token_count,
+    Chunk.page_start,
+    Chunk.page_end,
+    Chunk.bboxes,
+    Chunk.section_title,
+    Chunk.vector_id,
+)
+# Approximate resident size of one row object (slots, two UUIDs, small ints)
+# and of one bbox dict inside ``bboxes``.
+_ROW_OVERHEAD_BYTES = 320
+_BBOX_BYTES = 320
+# How long a document found too large to keep is left alone before its
+# version is checked again (a reparse elsewhere may have shrunk it).
+_OVERSIZED_RECHECK_SECONDS = 600.0
+
+
+class CachedChunk:
+    """Read-only stand-in for a ``Chunk`` row."""
+
+    __slots__ = tuple(column.key for column in _COLUMNS)
+
+    def __init__(self, *values) -> None:
+        for name, value in zip(self.__slots__, values):
+            setattr(self, name, value)
+
+    @property
+    def nbytes(self) -> int:
+        return (
+            _ROW_OVERHEAD_BYTES
+            + sys.getsizeof(self.text or "")
+            + sys.getsizeof(self.section_title or "")
+            + _BBOX_BYTES * len(self.bboxes or ())
+        )
+
+
+class DocumentChunks:
+    """One document's chunks in chunk_index order, with id/index lookups."""
+
+    __slots__ = ("chunks", "_by_id", "_by_index", "nbytes")
+
+    def __init__(self, chunks: Sequence[CachedChunk]) -> None:
+        self.chunks = list(chunks)
+        self._by_id = {ch.id: ch for ch in self.chunks}
+        self._by_index = {ch.chunk_index: ch for ch in self.chunks}
+        self.nbytes = sum(ch.nbytes for ch in self.chunks) + 64 * len(self.chunks)
+
+    def __len__(self) -> int:
+        return len(self.chunks)
+
+    def __iter__(self) -> Iterator[CachedChunk]:
+        return iter(self.chunks)
+
+    def get(self, chunk_id: uuid.UUID) -> Optional[CachedChunk]:
+        return self._by_id.get(chunk_id)
+
+    def at_index(self, chunk_index: int) -> Optional[CachedChunk]:
+        return self._by_index.get(chunk_index)
+
+
+# Document versions (id -> (status, updated_at)) from rows the current request
+# has already loaded; see known_documents.
+_known_versions: ContextVar[Optional[dict]] = ContextVar("chunk_cache_known_versions", default=None)
+
+
+@contextmanager
+def known_documents(documents: Iterable[Any]) -> Iterator[None]:
+    """Make already-loaded document rows (anything with id/status/updated_at)
+    available to hydrations in this context, including retrieval legs started
+    as tasks inside it, so they skip the version query."""
+    versions = dict(_known_versions.get() or {})
+    for doc in documents:
+        # Partial rows (no status/updated_at loaded) are validated by query instead.
+        if getattr(doc, "status", None) is not None and hasattr(doc, "updated_at"):
+            versions[doc.id] = (doc.status, doc.updated_at)
+    token = _known_versions.set(versions)
+    try:
+        yield
+    finally:
+        _known_versions.reset(token)
+
+
+def _row_estimate(n_chunks: int, text_bytes: int) -> int:
+    """DocumentChunks.nbytes of a document, before loading it."""
+    return n_chunks * (_ROW_OVERHEAD_BYTES + 64 + _BBOX_BYTES) + text_bytes
+
+
+class ChunkCache:
+    """Chunk tables of ready documents in a ByteLRU keyed by updated_at.
+
+    Search hydration only reads what is already resident (``resident``);
+    other documents are loaded off the request path, one background task per
+    document on its own session. A document larger than a quarter of the
+    budget is never kept, so one huge book cannot flush every other document
+    out, and is not loaded again until it is reparsed."""
+
+    # Background loads running at once, each holding a pooled session.
+    warm_concurrency = 2
+
+    def __init__(self, max_bytes: int, session_factory: Optional[Callable[[], AsyncSession]] = None) -> None:
+        self._lru = ByteLRU(max_bytes)
+        self._session_factory = session_factory
+        # document id -> (updated_at, monotonic time it was found too large)
+        self._oversized: dict[uuid.UUID, tuple[Any, float]] = {}
+        self._warming: dict[uuid.UUID, asyncio.Task] = {}
+        self._warm_slots: Optional[tuple[asyncio.AbstractEventLoop, asyncio.Semaphore]] = None
+
+    @property
+    def max_bytes(self) -> int:
+        return self._lru.max_bytes
+
+    async def _versions(
+        self, db: AsyncSession, document_ids: Sequence[uuid.UUID], documents: Iterable[Any]
+    ) -> dict[uuid.UUID, tuple[str, Any]]:
+        versions = dict(_known_versions.get() or {})
+        versions.update({doc.id: (doc.status, doc.updated_at) for doc in documents})
+        unknown = [doc_id for doc_id in document_ids if doc_id not in versions]
+        if unknown:
+            rows = await db.execute(
+                select(Document.id, Document.status, Document.updated_at).where(Document.id.in_(unknown))
+            )
+            versions.update({row.id: (row.status, row.updated_at) for row in rows})
+        return versions
+
+    @staticmethod
+    async def _load(db: AsyncSession, document_ids: Sequence[uuid.UUID]) -> dict[uuid.UUID, DocumentChunks]:
+        rows = await db.execute(
+            select(*_COLUMNS).where(Chunk.document_id.in_(document_ids)).order_by(Chunk.document_id, Chunk.chunk_index)
+        )
+        grouped: dict[uuid.UUID, list[CachedChunk]] = defaultdict(list)
+        for row in rows:
+            grouped[row.document_id].append(CachedChunk(*row))
+        return {doc_id: DocumentChunks(grouped.get(doc_id, ())) for doc_id in document_ids}
+
+    def _keep(self, document_id: uuid.UUID, updated_at: Any, entry: DocumentChunks) -> None:
+        if entry.nbytes <= self.max_bytes // 4:
+            self._lru.put(document_id, updated_at, entry)
+        else:
+            self._oversized[document_id] = (updated_at, time.monotonic())
+
+    async def resident(
+        self, db: AsyncSession, document_ids: Iterable[uuid.UUID], documents: Iterable[Any] = ()
+    ) -> dict[uuid.UUID, DocumentChunks]:
+        """Fresh cached chunks of the documents in `document_ids`; never reads
+        chunk rows. Only documents with a resident entry need their version,
+        taken from `documents`, known_documents or one query. The others are
+        scheduled for a background load."""
+        document_ids = list(dict.fromkeys(document_ids))
+        held = [doc_id for doc_id in document_ids if doc_id in self._lru]
+        versions = await self._versions(db, held, documents) if held else {}
+        found: dict[uuid.UUID, DocumentChunks] = {}
+        for doc_id in document_ids:
+            status, updated_at = versions.get(doc_id, (None, None))
+            entry = self._lru.get(doc_id, updated_at) if doc_id in held and status == "ready" else None
+            if entry is not None:
+                found[doc_id] = entry
+                continue
+            if doc_id in held and status != "ready":
+                self._lru.invalidate(doc_id)
+            self._warm(doc_id)
+        return found
+
+    def _warm(self, document_id: uuid.UUID) -> None:
+        if document_id in self._warming:
+            return
+        oversized = self._oversized.get(document_id)
+        if oversized is not None and time.monotonic() - oversized[1] < _OVERSIZED_RECHECK_SECONDS:
+            return
+        task = asyncio.get_running_loop().create_task(self._warm_one(document_id))
+        self._warming[document_id] = task
+        task.add_done_callback(lambda _task: self._warming.pop(document_id, None))
+
+    def _warm_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._warm_slots is None or self._warm_slots[0] is not loop:
+            self._warm_slots = (loop, asyncio.Semaphore(self.warm_concurrency))
+        return self._warm_slots[1]
+
+    async def _warm_one(self, document_id: uuid.UUID) -> None:
+        factory = self._session_factory
+        if factory is None:
+            from app.models.database import AsyncSessionLocal
+
+            factory = AsyncSessionLocal
+        try:
+            async with self._warm_semaphore(), factory() as session:
+                row = (
+                    await session.execute(
+                        select(Document.status, Document.updated_at).where(Document.id == document_id)
+                    )
+                ).first()
+                if row is None or row.status != "ready":
+                    return
+                oversized = self._oversized.get(document_id)
+                if oversized is not None and oversized[0] == row.updated_at:
+                    self._oversized[document_id] = (row.updated_at, time.monotonic())
+                    return
+                size = (
+                    await session.execute(
+                        select(func.count(), func.coalesce(func.sum(func.octet_length(Chunk.text)), 0)).where(
+                            Chunk.document_id == document_id
+                        )
+                    )
+                ).one()
+                if _row_estimate(int(size[0]), int(size[1])) > self.max_bytes // 4:
+                    self._oversized[document_id] = (row.updated_at, time.monotonic())
+                    return
+                entry = (await self._load(session, [document_id]))[document_id]
+            self._keep(document_id, row.updated_at, entry)
+        except Exception as e:
+            logger.warning("Chunk cache could not load document %s: %s", document_id, e)
+
+    async def get_many(
+        self,
+        db: AsyncSession,
+        document_ids: Iterable[uuid.UUID],
+        documents: Iterable[Any] = (),
+    ) -> dict[uuid.UUID, DocumentChunks]:
+        """Every chunk of each ready document in `document_ids`, for callers
+        that need whole documents (the Quote Finder term scan), loading misses
+        in one query. `documents` are already-loaded rows whose
+        status/updated_at are used instead of querying them again."""
+        document_ids = list(dict.fromkeys(document_ids))
+        versions = await self._versions(db, document_ids, documents)
+
+        found: dict[uuid.UUID, DocumentChunks] = {}
+        missing: list[uuid.UUID] = []
+        for doc_id in document_ids:
+            status, updated_at = versions.get(doc_id, (None, None))
+            if status != "ready":
+                self._lru.invalidate(doc_id)
+                continue
+            entry = self._lru.get(doc_id, updated_at)
+            if entry is None:
+                missing.append(doc_id)
+            else:
+                found[doc_id] = entry
+        if missing:
+            for doc_id, entry in (await self._load(db, missing)).items():
+                self._keep(doc_id, versions[doc_id][1], entry)
+                found[doc_id] = entry
+        return found
+
+    async def get(
+        self, db: AsyncSession, document_id: uuid.UUID, document: Optional[Any] = None
+    ) -> Optional[DocumentChunks]:
+        """Chunks of one document, or None when it is not ready."""
+        found = await self.get_many(db, [document_id], [document] if document is not None else ())
+        return found.get(document_id)
+
+    def invalidate(self, document_id: uuid.UUID) -> None:
+        self._lru.invalidate(document_id)
+        self._oversized.pop(document_id, None)
+
+    def stats(self) -> dict:
+        return self._lru.stats() | {"oversized": len(self._oversized), "warming": len(self._warming)}
+
+
+chunk_cache = ChunkCache(int(settings.CHUNK_CACHE_MB) * 1024 * 1024)
+
+
+async def fetch_chunks_by_id(
+    db: AsyncSession,
+    document_ids: Iterable[uuid.UUID],
+    chunk_ids: Iterable[uuid.UUID],
+    documents: Iterable[Any] = (),
+) -> dict[uuid.UUID, CachedChunk | Chunk]:
+    """`chunk_ids` (all belonging to `document_ids`) hydrated from resident
+    cache entries, with any the cache cannot serve read through
+    ``WHERE id IN (...)`` as before the cache existed."""
+    chunk_ids = list(chunk_ids)
+    if not chunk_ids:
+        return {}
+    cached = await chunk_cache.resident(db, document_ids, documents)
+    out: dict[uuid.UUID, CachedChunk | Chunk] = {}
+    for entry in cached.values():
+        for chunk_id in chunk_ids:
+            ch = entry.get(chunk_id)
+            if ch is not None:
+                out[chunk_id] = ch
+    rest = [chunk_id for chunk_id in chunk_ids if chunk_id not in out]
+    if rest:
+        rows = await db.execute(select(Chunk).where(Chunk.id.in_(rest)))
+        out.update({ch.id: ch for ch in rows.scalars()})
+    return out
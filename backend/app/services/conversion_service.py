@@ -1,10 +1,33 @@
-"""Convert office documents (PPTX, DOCX) to PDF using LibreOffice headless."""
+"""Convert office documents (PPTX, DOCX) to PDF using LibreOffice headless.
+
+Conversions go through a per-process pool of long-lived headless LibreOffice
+instances. Each instance is driven over a UNO pipe by libreoffice_bridge.py,
+which runs under the system Python that ships ``uno``. This skips the
+multi-second start of a fresh ``libreoffice --convert-to`` for every
+document. Instances are pinged when they have been idle, and restarted after
+LIBREOFFICE_POOL_MAX_CONVERSIONS, past LIBREOFFICE_POOL_MAX_RSS_MB, or when a
+conversion overruns its timeout. Conversions that find every instance busy
+wait in a bounded queue. When the pool is disabled (LIBREOFFICE_POOL_SIZE=0)
+or cannot start, each conversion spawns its own process as before.
+"""
 from __future__ import annotations
 
+import json
 import logging
 import os
+import select
+import shutil
+import signal
 import subprocess
 import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+from celery.signals import worker_process_shutdown
+
+from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +40,414 @@ _SUFFIX_MAP = {
     "docx": ".docx",
 }
 
+# PDF export filter per file type, for conversions through the pool
+_FILTER_MAP = {
+    "pptx": "impress_pdf_Export",
+    "docx": "writer_pdf_Export",
+}
+
+_OFFICE_BINARY = "libreoffice"
+_BRIDGE_PATH = str(Path(__file__).with_name("libreoffice_bridge.py"))
+_PING_TIMEOUT_SECONDS = 10.0
+# After an instance fails to start, conversions skip the pool for this long.
+_UNAVAILABLE_BACKOFF_SECONDS = 300.0
+
+try:
+    _PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+except (AttributeError, ValueError, OSError):
+    _PAGE_SIZE = 4096
+
+
+class ConversionPoolBusy(RuntimeError):
+    """Every instance is busy and the wait queue is full, or the wait timed out."""
+
+
+class ConversionPoolUnavailable(RuntimeError):
+    """The pool is closed or no LibreOffice instance could be started."""
+
+
+class _BridgeError(RuntimeError):
+    """The bridge died or answered garbage; its instance is discarded."""
+
+
+class _BridgeTimeout(_BridgeError):
+    pass
+
+
+def _tree_rss_bytes(pid: int) -> int:
+    """Resident memory of a process and its descendants (0 without /proc).
+
+    The `libreoffice` launcher is a script in front of soffice.bin, so the
+    process we started is not the one holding the documents.
+    """
+    total = 0
+    stack, seen = [pid], set()
+    while stack:
+        current = stack.pop()
+        if current in seen:
+            continue
+        seen.add(current)
+        try:
+            with open(f"/proc/{current}/statm") as f:
+                total += int(f.read().split()[1]) * _PAGE_SIZE
+            for task in os.listdir(f"/proc/{current}/task"):
+                with open(f"/proc/{current}/task/{task}/children") as f:
+                    stack.extend(int(child) for child in f.read().split())
+        except (OSError, ValueError, IndexError):
+            continue
+    return total
+
+
+class _Instance:
+    """One headless LibreOffice process and the bridge talking to it."""
+
+    def __init__(self, pool: ConversionPool, index: int) -> None:
+        self.pool = pool
+        self.index = index
+        self.office: Optional[subprocess.Popen] = None
+        self.bridge: Optional[subprocess.Popen] = None
+        self.profile_dir: Optional[str] = None
+        self.generation = 0
+        self.conversions = 0
+        self.last_used = 0.0
+        self._buf = b""
+
+    @property
+    def running(self) -> bool:
+        return (
+            self.office is not None
+            and self.bridge is not None
+            and self.office.poll() is None
+            and self.bridge.poll() is None
+        )
+
+    def start(self) -> None:
+        self.generation += 1
+        self.conversions = 0
+        self._buf = b""
+        # A profile per instance: instances sharing one would hand their
+        # work to whichever started first.
+        self.profile_dir = tempfile.mkdtemp(prefix="doctalk-lo-")
+        pipe_name = f"doctalk_lo_{os.getpid()}_{self.index}_{self.generation}"
+        try:
+            self.office = subprocess.Popen(
+                self.pool.office_argv(pipe_name, self.profile_dir),
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                start_new_session=True,
+            )
+            self.bridge = subprocess.Popen(
+                self.pool.bridge_argv(pipe_name, self.office.pid),
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+            reply = self.request({"op": "ping"}, self.pool.startup_timeout)
+            if not reply.get("ok"):
+                raise _BridgeError(str(reply.get("error") or "ping failed"))
+        except BaseException:
+            self.stop()
+            raise
+        self.last_used = time.monotonic()
+
+    def stop(self) -> None:
+        for proc in (self.bridge, self.office):
+            if proc is None:
+                continue
+            if proc.poll() is None:
+                try:
+                    if proc is self.office:
+                        os.killpg(proc.pid, signal.SIGKILL)
+                    else:
+                        proc.kill()
+                except (ProcessLookupError, PermissionError):
+                    pass
+            try:
+                proc.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                logger.warning("LibreOffice pool process %s did not exit after SIGKILL", proc.pid)
+            for stream in (proc.stdin, proc.stdout):
+                if stream is not None:
+                    stream.close()
+        self.office = self.bridge = None
+        if self.profile_dir:
+            shutil.rmtree(self.profile_dir, ignore_errors=True)
+            self.profile_dir = None
+
+    def request(self, message: dict[str, Any], timeout: float) -> dict[str, Any]:
+        assert self.bridge is not None and self.bridge.stdin is not None and self.bridge.stdout is not None
+        try:
+            self.bridge.stdin.write(json.dumps(message).encode() + b"\n")
+            self.bridge.stdin.flush()
+        except OSError as e:
+            raise _BridgeError(f"bridge is gone: {e}") from None
+        deadline = time.monotonic() + timeout
+        fd = self.bridge.stdout.fileno()
+        while b"\n" not in self._buf:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise _BridgeTimeout(f"no reply within {timeout}s")
+            ready, _, _ = select.select([fd], [], [], remaining)
+            if not ready:
+                continue
+            data = os.read(fd, 65536)
+            if not data:
+                raise _BridgeError("bridge exited")
+            self._buf += data
+        line, _, self._buf = self._buf.partition(b"\n")
+        try:
+            reply = json.loads(line)
+        except ValueError:
+            raise _BridgeError(f"unreadable bridge reply: {line[:200]!r}") from None
+        if not isinstance(reply, dict):
+            raise _BridgeError(f"unexpected bridge reply: {line[:200]!r}")
+        return reply
+
+    def rss_bytes(self) -> int:
+        return _tree_rss_bytes(self.office.pid) if self.office is not None else 0
+
+
+class ConversionPool:
+    """Long-lived LibreOffice instances shared by the threads of one process.
+
+    Instances start on first use. ``convert`` waits for an idle instance when
+    all are busy, unless ``max_queue`` conversions are already waiting.
+    """
+
+    def __init__(
+        self,
+        size: Optional[int] = None,
+        *,
+        max_conversions: Optional[int] = None,
+        max_rss_mb: Optional[int] = None,
+        max_queue: Optional[int] = None,
+        queue_timeout: Optional[float] = None,
+        startup_timeout: Optional[float] = None,
+        health_check_seconds: Optional[float] = None,
+    ) -> None:
+        size = settings.LIBREOFFICE_POOL_SIZE if size is None else size
+        self.max_conversions = (
+            settings.LIBREOFFICE_POOL_MAX_CONVERSIONS if max_conversions is None else max_conversions
+        )
+        self.max_rss_bytes = (settings.LIBREOFFICE_POOL_MAX_RSS_MB if max_rss_mb is None else max_rss_mb) * 1024 * 1024
+        self.max_queue = settings.LIBREOFFICE_POOL_MAX_QUEUE if max_queue is None else max_queue
+        self.queue_timeout = (
+            settings.LIBREOFFICE_POOL_QUEUE_TIMEOUT_SECONDS if queue_timeout is None else queue_timeout
+        )
+        self.startup_timeout = (
+            settings.LIBREOFFICE_POOL_STARTUP_TIMEOUT_SECONDS if startup_timeout is None else startup_timeout
+        )
+        self.health_check_seconds = (
+            settings.LIBREOFFICE_POOL_HEALTH_CHECK_SECONDS if health_check_seconds is None else health_check_seconds
+        )
+        self._instances = [_Instance(self, i) for i in range(max(1, size))]
+        # Most recently used last, so the warmest instance is reused first.
+        self._idle = list(self._instances)
+        self._cond = threading.Condition()
+        self._waiting = 0
+        self._closed = False
+        self._unavailable_until = 0.0
+        self._pid = os.getpid()
+        self._stats = {
+            "conversions": 0, "failures": 0, "timeouts": 0, "started": 0, "recycled": 0,
+            "unhealthy": 0, "queued": 0, "rejected": 0,
+        }
+
+    def office_argv(self, pipe_name: str, profile_dir: str) -> list[str]:
+        return [
+            _OFFICE_BINARY,
+            "--headless",
+            "--invisible",
+            "--nologo",
+            "--nodefault",
+            "--norestore",
+            "--nolockcheck",
+            f"-env:UserInstallation={Path(profile_dir).as_uri()}",
+            f"--accept=pipe,name={pipe_name};urp;StarOffice.ComponentContext",
+        ]
+
+    def bridge_argv(self, pipe_name: str, office_pid: int) -> list[str]:
+        return [settings.LIBREOFFICE_UNO_PYTHON, _BRIDGE_PATH, pipe_name, str(office_pid)]
+
+    def _acquire(self) -> _Instance:
+        with self._cond:
+            if self._closed:
+                raise ConversionPoolUnavailable("conversion pool is closed")
+            if time.monotonic() < self._unavailable_until:
+                raise ConversionPoolUnavailable("LibreOffice instances recently failed to start")
+            if not self._idle:
+                if self._waiting >= self.max_queue:
+                    self._stats["rejected"] += 1
+                    raise ConversionPoolBusy(
+                        f"All {len(self._instances)} LibreOffice instances are busy "
+                        f"and {self._waiting} conversions are queued"
+                    )
+                self._stats["queued"] += 1
+                self._waiting += 1
+                try:
+                    if not self._cond.wait_for(lambda: self._idle or self._closed, timeout=self.queue_timeout):
+                        self._stats["rejected"] += 1
+                        raise ConversionPoolBusy(
+                            f"No LibreOffice instance became free within {self.queue_timeout}s"
+                        )
+                finally:
+                    self._waiting -= 1
+                if self._closed:
+                    raise ConversionPoolUnavailable("conversion pool is closed")
+            return self._idle.pop()
+
+    def _release(self, instance: _Instance) -> None:
+        with self._cond:
+            if self._closed:
+                instance.stop()
+                return
+            self._idle.append(instance)
+            self._cond.notify()
+
+    def _ensure_ready(self, instance: _Instance) -> None:
+        if instance.running and time.monotonic() - instance.last_used > self.health_check_seconds:
+            try:
+                healthy = bool(instance.request({"op": "ping"}, _PING_TIMEOUT_SECONDS).get("ok"))
+            except _BridgeError:
+                healthy = False
+            if not healthy:
+                self._stats["unhealthy"] += 1
+                logger.warning("LibreOffice instance %d failed its health check; restarting", instance.index)
+                instance.stop()
+        if instance.running:
+            return
+        instance.stop()
+        try:
+            instance.start()
+        except (_BridgeError, OSError) as e:
+            with self._cond:
+                self._unavailable_until = time.monotonic() + _UNAVAILABLE_BACKOFF_SECONDS
+            raise ConversionPoolUnavailable(f"LibreOffice instance failed to start: {e}") from None
+        self._stats["started"] += 1
+
+    def convert(self, input_path: str, output_path: str, file_type: str, timeout: float) -> None:
+        """Write the PDF for ``input_path`` to ``output_path``.
+
+        Raises:
+            ConversionPoolBusy: No instance became free (backpressure).
+            ConversionPoolUnavailable: The pool could not start an instance.
+            RuntimeError: The conversion failed or timed out.
+        """
+        instance = self._acquire()
+        try:
+            self._ensure_ready(instance)
+            try:
+                reply = instance.request(
+                    {"op": "convert", "input": input_path, "output": output_path, "filter": _FILTER_MAP[file_type]},
+                    timeout,
+                )
+            except _BridgeTimeout:
+                self._stats["timeouts"] += 1
+                instance.stop()
+                raise RuntimeError(f"LibreOffice conversion timed out after {timeout}s") from None
+            except _BridgeError as e:
+                self._stats["failures"] += 1
+                instance.stop()
+                raise RuntimeError(f"LibreOffice conversion failed: {e}") from None
+            instance.conversions += 1
+            instance.last_used = time.monotonic()
+            if not reply.get("ok"):
+                self._stats["failures"] += 1
+                # The document may have taken the instance down with it.
+                instance.last_used = 0.0
+                raise RuntimeError(f"LibreOffice conversion failed: {reply.get('error')}")
+            self._stats["conversions"] += 1
+            if instance.conversions >= self.max_conversions or (
+                self.max_rss_bytes and instance.rss_bytes() > self.max_rss_bytes
+            ):
+                self._stats["recycled"] += 1
+                instance.stop()
+        except RuntimeError:
+            raise
+        except BaseException:
+            # Interrupted mid-request (e.g. a Celery soft time limit): a late
+            # reply would be read as the answer to the next request.
+            instance.stop()
+            raise
+        finally:
+            self._release(instance)
+
+    def close(self) -> None:
+        """Stop every instance. A forked child leaves its parent's instances alone."""
+        if os.getpid() != self._pid:
+            return
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._cond.notify_all()
+        for instance in idle:
+            instance.stop()
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                **self._stats,
+                "size": len(self._instances),
+                "idle": len(self._idle),
+                "waiting": self._waiting,
+                "running": sum(1 for instance in self._instances if instance.running),
+            }
+
+
+_pool: Optional[ConversionPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> Optional[ConversionPool]:
+    """This process's conversion pool, or None when LIBREOFFICE_POOL_SIZE is 0."""
+    global _pool
+    if settings.LIBREOFFICE_POOL_SIZE <= 0:
+        return None
+    with _pool_lock:
+        # A prefork child inherits the parent's pool object, whose instances
+        # belong to the parent; the child starts its own.
+        if _pool is None or _pool._pid != os.getpid():
+            _pool = ConversionPool()
+        return _pool
+
+
+@worker_process_shutdown.connect
+def _close_pool_on_worker_exit(**_kwargs: Any) -> None:
+    # Prefork children leave through os._exit, so atexit handlers never run.
+    # A child killed outright skips this too; its bridges then see stdin
+    # close and take their instances down themselves.
+    if _pool is not None:
+        _pool.close()
+
+
+def _convert_in_subprocess(input_path: str, outdir: str, timeout: float) -> None:
+    try:
+        result = subprocess.run(
+            [
+                _OFFICE_BINARY,
+                "--headless",
+                "--norestore",
+                "--convert-to", "pdf",
+                "--outdir", outdir,
+                input_path,
+            ],
+            capture_output=True,
+            timeout=timeout,
+            cwd=outdir,
+        )
+    except subprocess.TimeoutExpired:
+        raise RuntimeError(
+            f"LibreOffice conversion timed out after {timeout}s"
+        )
+
+    if result.returncode != 0:
+        stderr = result.stderr.decode("utf-8", errors="replace")[:500]
+        raise RuntimeError(
+            f"LibreOffice conversion failed (exit {result.returncode}): {stderr}"
+        )
+
 
 def convert_to_pdf(input_bytes: bytes, file_type: str, timeout: int = 120) -> bytes:
     """Convert office document bytes to PDF using LibreOffice headless.
@@ -24,13 +455,14 @@ def convert_to_pdf(input_bytes: bytes, file_type: str, timeout: int = 120) -> by
     Args:
         input_bytes: Raw file bytes.
         file_type: One of 'pptx', 'docx'.
-        timeout: Max seconds for the conversion subprocess.
+        timeout: Max seconds for the conversion.
 
     Returns:
         PDF file bytes.
 
     Raises:
         RuntimeError: If conversion fails or produces no output.
+        ConversionPoolBusy: If the pool's wait queue is full.
     """
     suffix = _SUFFIX_MAP.get(file_type)
     if not suffix:
@@ -41,33 +473,19 @@ def convert_to_pdf(input_bytes: bytes, file_type: str, timeout: int = 120) -> by
         with open(input_path, "wb") as f:
             f.write(input_bytes)
 
-        try:
-            result = subprocess.run(
-                [
-                    "libreoffice",
-                    "--headless",
-                    "--norestore",
-                    "--convert-to", "pdf",
-                    "--outdir", tmpdir,
-                    input_path,
-                ],
-                capture_output=True,
-                timeout=timeout,
-                cwd=tmpdir,
-            )
-        except subprocess.TimeoutExpired:
-            raise RuntimeError(
-                f"LibreOffice conversion timed out after {timeout}s"
-            )
-
-        if result.returncode != 0:
-            stderr = result.stderr.decode("utf-8", errors="replace")[:500]
-            raise RuntimeError(
-                f"LibreOffice conversion failed (exit {result.returncode}): {stderr}"
-            )
-
         # Output PDF has same base name as input
         output_path = os.path.join(tmpdir, "input.pdf")
+        pool = get_pool()
+        converted = False
+        if pool is not None:
+            try:
+                pool.convert(input_path, output_path, file_type, timeout)
+                converted = True
+            except ConversionPoolUnavailable as e:
+                logger.warning("LibreOffice pool unavailable, converting in a fresh process: %s", e)
+        if not converted:
+            _convert_in_subprocess(input_path, tmpdir, timeout)
+
         if not os.path.exists(output_path):
             raise RuntimeError("LibreOffice conversion produced no output PDF")
 
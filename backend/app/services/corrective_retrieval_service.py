@@ -1,10 +1,16 @@
 from __future__ import annotations
 
+import asyncio
+import logging
+import time
 import uuid
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Awaitable, Callable
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.services.query_planner_service import (
     QueryPlan,
     QueryPlanStep,
@@ -17,15 +23,27 @@ from app.services.rag_evaluator_service import (
 )
 from app.services.retrieval_service import retrieval_service
 
+logger = logging.getLogger(__name__)
+
 RetrievalStrategy = str
 
 
+RetrievalLeg = Callable[[AsyncSession], Awaitable[list[dict]]]
+
+
 @dataclass(frozen=True)
 class CorrectiveRetrievalResult:
     retrieved: list[dict]
     evaluation: RetrievalEvaluation
     strategy: RetrievalStrategy
     plan: QueryPlan | None = None
+    # Wall time per retrieval leg ("dense", "lexical", "table", "plan1.dense",
+    # "balanced2", ...) — legs run concurrently, so these overlap.
+    leg_timings_ms: dict[str, float] = field(default_factory=dict)
+
+
+async def _call_leg(fn: Callable[..., Awaitable[list[dict]]], query: str, target, db: AsyncSession, **kwargs) -> list[dict]:
+    return await fn(query, target, db=db, **kwargs)
 
 
 def _merge_results(primary: list[dict], secondary: list[dict], *, top_k: int) -> list[dict]:
@@ -149,89 +167,133 @@ def _plan_limit(
     )
 
 
+# Bounds own-session legs across every runner in the process; created per
+# event loop, since an asyncio.Semaphore binds to the loop it first waits on.
+_leg_sessions: tuple[asyncio.AbstractEventLoop, asyncio.Semaphore] | None = None
+
+
+def _leg_session_slots() -> asyncio.Semaphore:
+    global _leg_sessions
+    loop = asyncio.get_running_loop()
+    if _leg_sessions is None or _leg_sessions[0] is not loop:
+        _leg_sessions = (loop, asyncio.Semaphore(max(1, int(settings.RETRIEVAL_LEG_MAX_SESSIONS))))
+    return _leg_sessions[1]
+
+
+class _LegRunner:
+    """Runs independent retrieval legs (dense / lexical / table / planned
+    sub-queries) concurrently.
+
+    An AsyncSession must not be shared by concurrent statements, so only the
+    first leg of a batch uses the caller's session; every other leg checks
+    out its own from the pool, at most RETRIEVAL_LEG_MAX_SESSIONS at a time
+    process-wide. An own-session leg gets a deadline once its connection is
+    checked out — a leg that misses it contributes no evidence instead of
+    holding up time-to-first-token. The caller's-session leg has none: a
+    statement cancelled mid-flight would leave that session unusable for the
+    rest of the turn. A leg that fails outright cancels its siblings and
+    propagates.
+    """
+
+    def __init__(self, db: AsyncSession, session_factory: Callable[[], AsyncSession], timeout: float) -> None:
+        self._db = db
+        self._session_factory = session_factory
+        self._timeout = timeout
+        self.timings_ms: dict[str, float] = {}
+
+    async def _run_on_caller_session(self, name: str, leg: RetrievalLeg) -> list[dict]:
+        started = time.perf_counter()
+        try:
+            return await leg(self._db)
+        finally:
+            self.timings_ms[name] = round((time.perf_counter() - started) * 1000.0, 1)
+
+    async def _run_on_own_session(self, name: str, leg: RetrievalLeg) -> list[dict]:
+        started = time.perf_counter()
+        try:
+            async with _leg_session_slots(), self._session_factory() as session:
+                await session.connection()
+                try:
+                    return await asyncio.wait_for(leg(session), timeout=self._timeout)
+                except asyncio.TimeoutError:
+                    logger.warning("Retrieval leg %s exceeded %.1fs deadline; dropping it", name, self._timeout)
+                    return []
+        finally:
+            self.timings_ms[name] = round((time.perf_counter() - started) * 1000.0, 1)
+
+    async def run(self, legs: dict[str, RetrievalLeg]) -> dict[str, list[dict]]:
+        if not legs:
+            return {}
+        names = list(legs)
+        tasks = [
+            asyncio.create_task(
+                self._run_on_caller_session(name, legs[name])
+                if index == 0
+                else self._run_on_own_session(name, legs[name])
+            )
+            for index, name in enumerate(names)
+        ]
+        try:
+            results = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        return dict(zip(names, results))
+
+
 class CorrectiveRetrievalService:
-    async def _planned_single(
-        self,
+    def __init__(self, session_factory: Callable[[], AsyncSession] | None = None) -> None:
+        self._session_factory = session_factory
+
+    def _runner(self, db: AsyncSession) -> _LegRunner:
+        factory = self._session_factory
+        if factory is None:
+            from app.models.database import AsyncSessionLocal
+
+            factory = AsyncSessionLocal
+        return _LegRunner(db, factory, float(settings.RETRIEVAL_LEG_TIMEOUT_SECONDS))
+
+    @staticmethod
+    def _planned_legs(
         plan: QueryPlan,
         route: QueryRoute,
-        document_id: uuid.UUID,
         *,
-        db: AsyncSession,
-    ) -> list[dict]:
+        table_search: Callable[..., Awaitable[list[dict]]],
+        search: Callable[..., Awaitable[list[dict]]],
+        lexical_search: Callable[..., Awaitable[list[dict]]],
+        target,
+        top_k: int,
+    ) -> dict[str, RetrievalLeg]:
         if not plan.is_active:
-            return []
+            return {}
         is_table_query = QueryIntent.TABLE_QUERY in route.intents
-        planned: list[dict] = []
-        for step in plan.steps[1:]:
+        min_text_len = 20 if is_table_query else 200
+        legs: dict[str, RetrievalLeg] = {}
+        for index, step in enumerate(plan.steps[1:], start=1):
             if is_table_query:
-                table_items = await retrieval_service.table_search(
-                    step.query,
-                    document_id,
-                    top_k=2,
-                    db=db,
-                )
-                planned = _merge_results(planned, _annotate_step(table_items, step), top_k=_plan_limit(8))
-            semantic = await retrieval_service.search(step.query, document_id, top_k=2, db=db)
-            planned = _merge_results(planned, _annotate_step(semantic, step), top_k=_plan_limit(8))
-            lexical = await retrieval_service.lexical_search(
-                step.query,
-                document_id,
-                top_k=2,
-                db=db,
-                min_text_len=20 if is_table_query else 200,
+                legs[f"plan{index}.table"] = partial(_call_leg, table_search, step.query, target, top_k=top_k)
+            legs[f"plan{index}.dense"] = partial(_call_leg, search, step.query, target, top_k=top_k)
+            legs[f"plan{index}.lexical"] = partial(
+                _call_leg, lexical_search, step.query, target, top_k=top_k, min_text_len=min_text_len
             )
-            planned = _merge_results(planned, _annotate_step(lexical, step), top_k=_plan_limit(8))
-        return planned
+        return legs
 
-    async def _planned_multi(
-        self,
-        query: str,
-        plan: QueryPlan,
-        route: QueryRoute,
-        document_ids: list[uuid.UUID],
-        *,
-        db: AsyncSession,
-    ) -> tuple[list[dict], list[dict], list[dict]]:
+    @staticmethod
+    def _merge_planned(plan: QueryPlan, results: dict[str, list[dict]], *, limit: int) -> list[dict]:
+        """Fold planned-step results in step order, table -> dense -> lexical
+        per step — the exact merge sequence of the former serial loop."""
         if not plan.is_active:
-            return [], [], []
-        is_table_query = QueryIntent.TABLE_QUERY in route.intents
+            return []
         planned: list[dict] = []
-        for step in plan.steps[1:]:
-            if is_table_query:
-                table_items = await retrieval_service.table_search_multi(
-                    step.query,
-                    document_ids,
-                    top_k=3,
-                    db=db,
-                )
-                planned = _merge_results(planned, _annotate_step(table_items, step), top_k=_plan_limit(8, is_collection=True))
-            semantic = await retrieval_service.search_multi(step.query, document_ids, top_k=3, db=db)
-            planned = _merge_results(planned, _annotate_step(semantic, step), top_k=_plan_limit(8, is_collection=True))
-            lexical = await retrieval_service.lexical_search_multi(
-                step.query,
-                document_ids,
-                top_k=3,
-                db=db,
-                min_text_len=20 if is_table_query else 200,
-            )
-            planned = _merge_results(planned, _annotate_step(lexical, step), top_k=_plan_limit(8, is_collection=True))
-
-        balanced_required: list[dict] = []
-        balanced_extra: list[dict] = []
-        if plan.needs_balanced_coverage:
-            for index, document_id in enumerate(document_ids[:8], start=1):
-                label = f"balanced-doc-{index}"
-                semantic = await retrieval_service.search(query, document_id, top_k=2, db=db)
-                annotated = _annotate_doc(
-                    semantic,
-                    document_id,
-                    label=label,
-                    purpose="per-document-comparison-coverage",
-                )
-                if annotated:
-                    balanced_required.append(annotated[0])
-                    balanced_extra.extend(annotated[1:])
-        return planned, balanced_required, balanced_extra
+        for index, step in enumerate(plan.steps[1:], start=1):
+            for kind in ("table", "dense", "lexical"):
+                items = results.get(f"plan{index}.{kind}")
+                if items is None:
+                    continue
+                planned = _merge_results(planned, _annotate_step(items, step), top_k=limit)
+        return planned
 
     async def retrieve_single(
         self,
@@ -245,26 +307,58 @@ class CorrectiveRetrievalService:
     ) -> CorrectiveRetrievalResult:
         plan = query_planner_service.plan(query, route, document_count=1)
         wide_k = _dynamic_k(top_k, page_count=doc_pages)
-        initial = await retrieval_service.search(query, document_id, top_k=wide_k, db=db)
-        initial_eval = rag_evaluator_service.evaluate(query, initial, route)
         is_table_query = QueryIntent.TABLE_QUERY in route.intents
         is_plain_qa_route = (
             route.primary_intent == QueryIntent.LOCAL_QA
             and route.coverage == "top_hits"
             and not is_table_query
         )
-        table_evidence = (
-            await retrieval_service.table_search(query, document_id, top_k=6, db=db)
-            if is_table_query
-            else []
+        min_text_len = 20 if is_table_query else 200
+        runner = self._runner(db)
+
+        # Phase 1: every leg whose inputs are known before the dense results
+        # are evaluated runs concurrently. Lexical joins here only for table
+        # queries, where it always runs with fixed parameters; otherwise its
+        # top_k (and whether it runs at all) depends on initial_eval.
+        legs: dict[str, RetrievalLeg] = {
+            "dense": partial(_call_leg, retrieval_service.search, query, document_id, top_k=wide_k),
+        }
+        if is_table_query:
+            legs["table"] = partial(_call_leg, retrieval_service.table_search, query, document_id, top_k=6)
+        legs.update(
+            self._planned_legs(
+                plan,
+                route,
+                table_search=retrieval_service.table_search,
+                search=retrieval_service.search,
+                lexical_search=retrieval_service.lexical_search,
+                target=document_id,
+                top_k=2,
+            )
         )
-        planned = await self._planned_single(plan, route, document_id, db=db)
+        table_lexical_top_k = max(wide_k, 12) if route.coverage == "exhaustive_scan" else wide_k
+        if is_table_query:
+            legs["lexical"] = partial(
+                _call_leg,
+                retrieval_service.lexical_search,
+                query,
+                document_id,
+                top_k=table_lexical_top_k,
+                min_text_len=min_text_len,
+            )
+        results = await runner.run(legs)
+
+        initial = results["dense"]
+        initial_eval = rag_evaluator_service.evaluate(query, initial, route)
+        table_evidence = results.get("table", [])
+        planned = self._merge_planned(plan, results, limit=_plan_limit(8))
         if not initial_eval.should_correct and not table_evidence and not planned and not is_plain_qa_route:
             return CorrectiveRetrievalResult(
                 retrieved=initial,
                 evaluation=initial_eval,
                 strategy="semantic_top_k",
                 plan=plan,
+                leg_timings_ms=runner.timings_ms,
             )
 
         should_run_lexical = initial_eval.should_correct or is_table_query or is_plain_qa_route
@@ -273,17 +367,26 @@ class CorrectiveRetrievalService:
             lexical_top_k = min(6, max(3, int(top_k or 8)))
         elif route.coverage == "exhaustive_scan":
             lexical_top_k = max(lexical_top_k, 12)
-        lexical = (
-            await retrieval_service.lexical_search(
-                query,
-                document_id,
-                top_k=lexical_top_k,
-                db=db,
-                min_text_len=20 if is_table_query else 200,
-            )
-            if should_run_lexical
-            else []
-        )
+        if "lexical" in results:
+            lexical = results["lexical"]
+        elif should_run_lexical:
+            # Phase 2: the one leg that depends on the dense evaluation.
+            lexical = (
+                await runner.run(
+                    {
+                        "lexical": partial(
+                            _call_leg,
+                            retrieval_service.lexical_search,
+                            query,
+                            document_id,
+                            top_k=lexical_top_k,
+                            min_text_len=min_text_len,
+                        )
+                    }
+                )
+            )["lexical"]
+        else:
+            lexical = []
         result_limit = _plan_limit(max(wide_k, lexical_top_k), page_count=doc_pages)
         merged = _merge_results(table_evidence, initial, top_k=result_limit) if table_evidence else initial[:result_limit]
         merged = _merge_results(merged, planned, top_k=result_limit)
@@ -303,7 +406,13 @@ class CorrectiveRetrievalService:
             lexical_attempted=initial_eval.should_correct or is_table_query,
         )
         final_eval = rag_evaluator_service.evaluate(query, merged, route, corrected=True)
-        return CorrectiveRetrievalResult(retrieved=merged, evaluation=final_eval, strategy=strategy, plan=plan)
+        return CorrectiveRetrievalResult(
+            retrieved=merged,
+            evaluation=final_eval,
+            strategy=strategy,
+            plan=plan,
+            leg_timings_ms=runner.timings_ms,
+        )
 
     async def retrieve_multi(
         self,
@@ -316,15 +425,63 @@ class CorrectiveRetrievalService:
         doc_pages: int | None = None,
     ) -> CorrectiveRetrievalResult:
         plan = query_planner_service.plan(query, route, document_count=len(document_ids))
-        initial = await retrieval_service.search_multi(query, document_ids, top_k=top_k, db=db)
-        initial_eval = rag_evaluator_service.evaluate(query, initial, route)
         is_table_query = QueryIntent.TABLE_QUERY in route.intents
-        table_evidence = (
-            await retrieval_service.table_search_multi(query, document_ids, top_k=8, db=db)
-            if is_table_query
-            else []
+        lexical_top_k = max(top_k, 14 if route.coverage == "exhaustive_scan" else top_k)
+        min_text_len = 20 if is_table_query else 200
+        runner = self._runner(db)
+
+        legs: dict[str, RetrievalLeg] = {
+            "dense": partial(_call_leg, retrieval_service.search_multi, query, document_ids, top_k=top_k),
+        }
+        if is_table_query:
+            legs["table"] = partial(
+                _call_leg, retrieval_service.table_search_multi, query, document_ids, top_k=8
+            )
+        legs.update(
+            self._planned_legs(
+                plan,
+                route,
+                table_search=retrieval_service.table_search_multi,
+                search=retrieval_service.search_multi,
+                lexical_search=retrieval_service.lexical_search_multi,
+                target=document_ids,
+                top_k=3,
+            )
         )
-        planned, balanced_required, balanced_extra = await self._planned_multi(query, plan, route, document_ids, db=db)
+        balanced_docs = document_ids[:8] if plan.is_active and plan.needs_balanced_coverage else []
+        if balanced_docs:
+            # One grouped query covers every balanced document (per-document quota of 2).
+            legs["balanced"] = partial(
+                _call_leg, retrieval_service.search_per_document, query, balanced_docs, top_k=2
+            )
+        if is_table_query:
+            legs["lexical"] = partial(
+                _call_leg,
+                retrieval_service.lexical_search_multi,
+                query,
+                document_ids,
+                top_k=lexical_top_k,
+                min_text_len=min_text_len,
+            )
+        results = await runner.run(legs)
+
+        initial = results["dense"]
+        initial_eval = rag_evaluator_service.evaluate(query, initial, route)
+        table_evidence = results.get("table", [])
+        planned = self._merge_planned(plan, results, limit=_plan_limit(8, is_collection=True))
+        balanced_hits = results.get("balanced") or {}  # [] when the leg missed its deadline
+        balanced_required: list[dict] = []
+        balanced_extra: list[dict] = []
+        for index, document_id in enumerate(balanced_docs, start=1):
+            annotated = _annotate_doc(
+                balanced_hits.get(document_id, []),
+                document_id,
+                label=f"balanced-doc-{index}",
+                purpose="per-document-comparison-coverage",
+            )
+            if annotated:
+                balanced_required.append(annotated[0])
+                balanced_extra.extend(annotated[1:])
         balanced_all = [*balanced_required, *balanced_extra]
         if not initial_eval.should_correct and not table_evidence and not planned and not balanced_all:
             return CorrectiveRetrievalResult(
@@ -332,21 +489,29 @@ class CorrectiveRetrievalService:
                 evaluation=initial_eval,
                 strategy="semantic_top_k",
                 plan=plan,
+                leg_timings_ms=runner.timings_ms,
             )
 
-        lexical_top_k = max(top_k, 14 if route.coverage == "exhaustive_scan" else top_k)
         should_run_lexical = initial_eval.should_correct or is_table_query
-        lexical = (
-            await retrieval_service.lexical_search_multi(
-                query,
-                document_ids,
-                top_k=lexical_top_k,
-                db=db,
-                min_text_len=20 if is_table_query else 200,
-            )
-            if should_run_lexical
-            else []
-        )
+        if "lexical" in results:
+            lexical = results["lexical"]
+        elif should_run_lexical:
+            lexical = (
+                await runner.run(
+                    {
+                        "lexical": partial(
+                            _call_leg,
+                            retrieval_service.lexical_search_multi,
+                            query,
+                            document_ids,
+                            top_k=lexical_top_k,
+                            min_text_len=min_text_len,
+                        )
+                    }
+                )
+            )["lexical"]
+        else:
+            lexical = []
         result_limit = _plan_limit(max(top_k, lexical_top_k), is_collection=True, page_count=doc_pages)
         merged = (
             _merge_results(balanced_required, table_evidence, top_k=result_limit)
@@ -366,7 +531,13 @@ class CorrectiveRetrievalService:
             lexical_attempted=should_run_lexical,
         )
         final_eval = rag_evaluator_service.evaluate(query, merged, route, corrected=True)
-        return CorrectiveRetrievalResult(retrieved=merged, evaluation=final_eval, strategy=strategy, plan=plan)
+        return CorrectiveRetrievalResult(
+            retrieved=merged,
+            evaluation=final_eval,
+            strategy=strategy,
+            plan=plan,
+            leg_timings_ms=runner.timings_ms,
+        )
 
 
 corrective_retrieval_service = CorrectiveRetrievalService()
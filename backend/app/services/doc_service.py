@@ -8,11 +8,11 @@ import unicodedata
 import uuid
 from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import select
+from sqlalchemy import delete, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.security_log import log_security_event
-from app.models.tables import Document
+from app.models.tables import Document, collection_documents
+from app.services.chunk_cache import chunk_cache
 from app.services.storage_service import storage_service
 
 logger = logging.getLogger(__name__)
@@ -40,7 +40,7 @@ def sanitize_filename(name: str, max_length: int = 200) -> str:
 
 def can_access_document(doc: Optional[Document], user: Optional["User"]) -> bool:
     """Only demo documents are public; all other documents require ownership."""
-    if doc is None:
+    if doc is None or getattr(doc, "status", None) == "deleting":
         return False
     if doc.demo_slug is not None:
         return True
@@ -60,13 +60,23 @@ class DocService:
         This method accepts an UploadFile-like object with attributes:
         - filename: str
         - content_type: str
-        - read(): async -> bytes
+        - file: seekable binary file (e.g. UploadFile's spool), streamed to
+          storage from its current position without being read into memory
+        - read(): async -> bytes, used when there is no `file`
         """
         raw_filename: str = getattr(upload, "filename", "document.pdf") or "document.pdf"
         filename = sanitize_filename(raw_filename)
         content_type: str = getattr(upload, "content_type", "application/pdf") or "application/pdf"
 
-        data: bytes = await upload.read()
+        stream = getattr(upload, "file", None)
+        data: Optional[bytes] = None
+        if stream is not None:
+            start = stream.tell()
+            size = stream.seek(0, os.SEEK_END) - start
+            stream.seek(start)
+        else:
+            data = await upload.read()
+            size = len(data)
 
         # Persist to object storage under namespaced key
         doc_id = uuid.uuid4()
@@ -82,13 +92,16 @@ class DocService:
             'md': 'text/markdown',
         }
         storage_content_type = mime_types.get(file_type, content_type)
-        await asyncio.to_thread(storage_service.upload_file, data, storage_key, storage_content_type)
+        if data is None:
+            await asyncio.to_thread(storage_service.upload_stream, stream, size, storage_key, storage_content_type)
+        else:
+            await asyncio.to_thread(storage_service.upload_file, data, storage_key, storage_content_type)
 
         # Create document row (status=parsing)
         doc = Document(
             id=doc_id,
             filename=filename,
-            file_size=len(data),
+            file_size=size,
             storage_key=storage_key,
             status="parsing",
             user_id=user_id,  # Associate with user if authenticated
@@ -117,87 +130,50 @@ class DocService:
         return doc
 
     async def delete_document(self, document_id: uuid.UUID, db: AsyncSession) -> bool:
-        """Delete document and all related data via ORM cascade.
-
-        Pages, chunks, sessions, and messages are cascade-deleted by SQLAlchemy.
-        Storage and vector cleanup is best-effort.
+        """Mark the document 'deleting' and hand the purge to deletion_worker.
+
+        Document lists and access checks skip 'deleting' rows. The same
+        transaction takes the document out of every collection, so collection
+        counts, listings, chat and retrieval stop seeing it at commit, and its
+        vectors are dropped before returning so no search can surface its
+        text while the purge is queued. Pages, chunks, elements, tables,
+        sessions and stored files are removed in bounded batches by
+        ``purge_document``, so the request costs the same however large the
+        document is. If the task cannot be queued the purge runs inline (off
+        the event loop).
         """
-        from sqlalchemy.orm import selectinload
-
         res = await db.execute(
-            select(Document)
-            .options(selectinload(Document.chunks))
+            update(Document)
             .where(Document.id == document_id)
+            .values(status="deleting")
+            .returning(Document.user_id)
         )
-        doc = res.scalar_one_or_none()
-        if not doc:
+        row = res.first()
+        if row is None:
+            await db.rollback()
             return False
-
-        original_storage_ok = True
-        converted_storage_ok = True
-        qdrant_ok = True
-        storage_key = doc.storage_key
-        converted_key = doc.converted_storage_key
-
-        # Best-effort: clean up object storage (sync call, run off event loop)
-        try:
-            await asyncio.to_thread(storage_service.delete_file, storage_key)
-        except Exception as e:
-            original_storage_ok = False
-            logger.error("MinIO deletion failed for doc %s: %s", document_id, e)
-
-        # Best-effort: clean up converted PDF if it exists
-        if converted_key:
-            try:
-                await asyncio.to_thread(storage_service.delete_file, converted_key)
-            except Exception as e:
-                converted_storage_ok = False
-                logger.error("MinIO deletion of converted PDF failed for doc %s: %s", document_id, e)
-
-        # Best-effort: clean up Qdrant vectors (sync call, run off event loop)
-        try:
-            from qdrant_client.models import FieldCondition, Filter, MatchValue
-
-            from app.core.config import settings as _settings
-            from app.services.embedding_service import embedding_service
-
-            qclient = embedding_service.get_qdrant_client()
-            await asyncio.to_thread(
-                qclient.delete,
-                collection_name=_settings.QDRANT_COLLECTION,
-                points_selector=Filter(
-                    must=[FieldCondition(key="document_id", match=MatchValue(value=str(document_id)))]
-                ),
-            )
-        except Exception as e:
-            qdrant_ok = False
-            logger.error("Qdrant deletion failed for doc %s: %s", document_id, e)
-
-        # ORM cascade deletes pages, chunks, sessions, messages
-        await db.delete(doc)
+        await db.execute(delete(collection_documents).where(collection_documents.c.document_id == document_id))
         await db.commit()
+        chunk_cache.invalidate(document_id)
 
-        log_security_event(
-            "document_deleted", document_id=document_id, user_id=doc.user_id,
-            storage_cleaned=original_storage_ok and converted_storage_ok,
-            original_storage_cleaned=original_storage_ok,
-            converted_storage_cleaned=converted_storage_ok,
-            vectors_cleaned=qdrant_ok,
+        from app.workers.deletion_worker import (
+            delete_document_vectors,
+            purge_document,
+            purge_document_data,
         )
 
-        # Queue retry task if any cleanup failed
-        if not original_storage_ok or not converted_storage_ok or not qdrant_ok:
-            try:
-                from app.workers.deletion_worker import retry_failed_deletion
-                retry_failed_deletion.delay(
-                    str(document_id),
-                    original_storage_key=storage_key if not original_storage_ok else None,
-                    converted_storage_key=converted_key if not converted_storage_ok else None,
-                    cleanup_qdrant=not qdrant_ok,
-                )
-            except Exception:
-                logger.error("Failed to queue deletion retry for doc %s", document_id)
+        try:
+            await asyncio.to_thread(delete_document_vectors, str(document_id))
+        except Exception as e:
+            # The purge deletes them again; retrieval is scoped to collection
+            # members and accessible documents meanwhile.
+            logger.warning("Could not drop vectors of doc %s before the purge: %s", document_id, e)
 
+        try:
+            purge_document.delay(str(document_id))
+        except Exception:
+            logger.warning("Failed to queue purge for doc %s; purging inline", document_id)
+            await asyncio.to_thread(purge_document_data, document_id)
         return True
 
 
@@ -8,7 +8,6 @@ from datetime import datetime, timezone
 from typing import Any, Iterable, Sequence
 
 import sqlalchemy as sa
-from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
@@ -28,7 +27,11 @@ from app.services.extraction_service import (
     _citation_from_chunk,
     _get_llm_client,
     _json_from_text,
-    _retrieve_by_query,
+    element_chunk_budget,
+    first_chunks,
+    per_query_budget,
+    retrieve_by_queries,
+    select_context_chunks,
 )
 
 logger = logging.getLogger(__name__)
@@ -83,37 +86,12 @@ def retrieve_diff_chunks(
     *,
     max_chunks: int = MAX_DIFF_CHUNKS_PER_DOC,
 ) -> list[tuple[Chunk, float]]:
-    seen: set[uuid.UUID] = set()
-    selected: list[tuple[Chunk, float]] = []
-    element_budget = max(2, max_chunks // 2)
-    for chunk, score in get_element_aware_chunks(db, document_id, max_chunks=element_budget):
-        if chunk.id in seen:
-            continue
-        seen.add(chunk.id)
-        selected.append((chunk, score))
-        if len(selected) >= max_chunks:
-            return selected
-
-    per_query = max(3, max_chunks // len(DIFF_QUERIES) + 1)
-    for query in DIFF_QUERIES:
-        for chunk, score in _retrieve_by_query(db, document_id, query, per_query):
-            if chunk.id in seen:
-                continue
-            seen.add(chunk.id)
-            selected.append((chunk, score))
-            if len(selected) >= max_chunks:
-                return selected
-
-    if selected:
-        return selected[:max_chunks]
-
-    rows = db.execute(
-        select(Chunk)
-        .where(Chunk.document_id == document_id)
-        .order_by(Chunk.chunk_index)
-        .limit(max_chunks)
-    )
-    return [(chunk, 0.0) for chunk in rows.scalars()]
+    element_chunks = get_element_aware_chunks(db, document_id, max_chunks=element_chunk_budget(max_chunks))
+    selected = select_context_chunks(element_chunks, [], max_chunks)
+    if len(selected) >= max_chunks:
+        return selected
+    ranked_lists = retrieve_by_queries(db, document_id, DIFF_QUERIES, per_query_budget(max_chunks, len(DIFF_QUERIES)))
+    return select_context_chunks(element_chunks, ranked_lists, max_chunks) or first_chunks(db, document_id, max_chunks)
 
 
 def _context_text(label: str, chunks: Sequence[tuple[Chunk, float]]) -> str:
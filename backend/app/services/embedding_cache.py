@@ -0,0 +1,185 @@
+"""Content-addressed embedding cache (Redis) keyed by (model, normalized text).
+
+Reparses, duplicate uploads, demo seeds and imported translated copies all
+re-embed chunk text the provider has already seen. Vectors are stored as
+packed float32 under ``emb:v1:<model>:<sha256(normalized text)>``; a per-model
+sorted set scored by last access time bounds the entry count (LRU eviction).
+
+The cache is strictly best-effort: any Redis failure disables it for
+``_RETRY_SECONDS`` and every lookup degrades to a miss, never an error.
+Sync on purpose — EmbeddingService runs inside Celery tasks and, on the API
+side, inside ``asyncio.to_thread``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+import time
+import unicodedata
+from array import array
+from typing import List, Optional, Sequence
+
+import redis
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_KEY_PREFIX = "emb:v1:"
+_LRU_PREFIX = "emb:lru:"
+_STATS_KEY = "emb:stats"
+_RETRY_SECONDS = 30
+
+
+def normalize_for_cache(text: str) -> str:
+    """NFC + whitespace-collapsed text: PDF re-extraction noise (line-wrap
+    differences, trailing spaces) must not defeat the cache."""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def cache_key(model: str, text: str) -> str:
+    digest = hashlib.sha256(normalize_for_cache(text).encode("utf-8")).hexdigest()
+    return f"{_KEY_PREFIX}{model}:{digest}"
+
+
+def _pack(vector: Sequence[float]) -> bytes:
+    return array("f", vector).tobytes()
+
+
+def _unpack(raw: bytes) -> List[float]:
+    vec = array("f")
+    vec.frombytes(raw)
+    return vec.tolist()
+
+
+class EmbeddingCache:
+    def __init__(self) -> None:
+        self._client: Optional[redis.Redis] = None
+        self._next_retry_at = 0.0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(settings.EMBEDDING_CACHE_ENABLED)
+
+    def _get_client(self) -> Optional[redis.Redis]:
+        if self._client is not None:
+            return self._client
+        if time.time() < self._next_retry_at:
+            return None
+        with self._lock:
+            if self._client is None:
+                try:
+                    client = redis.Redis.from_url(settings.CELERY_BROKER_URL, socket_timeout=2.0)
+                    client.ping()
+                    self._client = client
+                except Exception as e:
+                    logger.warning("Embedding cache unavailable; disabled temporarily: %s", e)
+                    self._next_retry_at = time.time() + _RETRY_SECONDS
+                    return None
+        return self._client
+
+    def _reset_client(self, error: Exception) -> None:
+        logger.warning("Embedding cache error; falling back to provider: %s", error)
+        self._next_retry_at = time.time() + _RETRY_SECONDS
+        self._client = None
+
+    def get_many(self, model: str, texts: Sequence[str]) -> List[Optional[List[float]]]:
+        """Cached vectors aligned with `texts` (None = miss)."""
+        if not texts or not self.enabled:
+            return [None] * len(texts)
+        client = self._get_client()
+        if client is None:
+            self._count(0, len(texts))
+            return [None] * len(texts)
+        keys = [cache_key(model, t) for t in texts]
+        try:
+            raws = client.mget(keys)
+        except Exception as e:
+            self._reset_client(e)
+            self._count(0, len(texts))
+            return [None] * len(texts)
+        out: List[Optional[List[float]]] = [_unpack(r) if r else None for r in raws]
+        hit_keys = {k for k, v in zip(keys, out) if v is not None}
+        hits = sum(1 for v in out if v is not None)
+        try:
+            pipe = client.pipeline(transaction=False)
+            if hit_keys:
+                now = time.time()
+                pipe.zadd(f"{_LRU_PREFIX}{model}", {k: now for k in hit_keys})
+            pipe.hincrby(_STATS_KEY, "hits", hits)
+            pipe.hincrby(_STATS_KEY, "misses", len(texts) - hits)
+            pipe.execute()
+        except Exception as e:
+            self._reset_client(e)
+        self._count(hits, len(texts) - hits)
+        return out
+
+    def put_many(self, model: str, texts: Sequence[str], vectors: Sequence[Sequence[float]]) -> None:
+        if not texts or not self.enabled:
+            return
+        client = self._get_client()
+        if client is None:
+            return
+        entries = {cache_key(model, t): _pack(v) for t, v in zip(texts, vectors)}
+        lru_key = f"{_LRU_PREFIX}{model}"
+        max_entries = max(1, int(settings.EMBEDDING_CACHE_MAX_ENTRIES))
+        try:
+            now = time.time()
+            pipe = client.pipeline(transaction=False)
+            pipe.mset(entries)
+            pipe.zadd(lru_key, {k: now for k in entries})
+            pipe.zcard(lru_key)
+            size = pipe.execute()[-1]
+            excess = int(size) - max_entries
+            if excess > 0:
+                evicted = [m for m, _score in client.zpopmin(lru_key, excess)]
+                if evicted:
+                    client.delete(*evicted)
+        except Exception as e:
+            self._reset_client(e)
+
+    def _count(self, hits: int, misses: int) -> None:
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+
+    def stats(self) -> dict:
+        """Process-local counters plus fleet-wide totals (API + workers)."""
+        local_total = self.hits + self.misses
+        out: dict = {
+            "enabled": self.enabled,
+            "process": {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / local_total, 4) if local_total else None,
+            },
+            "fleet": None,
+        }
+        client = self._get_client() if self.enabled else None
+        if client is None:
+            return out
+        try:
+            raw = client.hgetall(_STATS_KEY)
+            hits = int(raw.get(b"hits", 0))
+            misses = int(raw.get(b"misses", 0))
+            entries = int(client.zcard(f"{_LRU_PREFIX}{settings.EMBEDDING_MODEL}"))
+        except Exception as e:
+            self._reset_client(e)
+            return out
+        total = hits + misses
+        out["fleet"] = {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / total, 4) if total else None,
+            "entries": entries,
+            "max_entries": int(settings.EMBEDDING_CACHE_MAX_ENTRIES),
+        }
+        return out
+
+
+embedding_cache = EmbeddingCache()
@@ -0,0 +1,433 @@
+"""Async embeddings provider client shared by the API and the Celery workers.
+
+Every process used to call the provider through a blocking ``OpenAI``
+client: one connection per thread, a fixed 1/2/4 s ``time.sleep`` backoff,
+and no coordination between processes, so an upload burst had every parse
+worker hammering the provider at once and retrying in lockstep.
+
+``embedding_client`` owns ONE pooled ``httpx.AsyncClient`` (HTTP/2 when
+``h2`` is installed) on a private event-loop thread, so async callers (any
+loop) and sync callers (worker threads) share the same connections:
+
+- requests and input tokens draw from a fleet-wide token bucket in Redis
+  (``EMBEDDING_RATE_LIMIT_RPM`` / ``_TPM``), falling back to a per-process
+  bucket while Redis is unreachable;
+- a 429 with ``Retry-After`` pauses the whole fleet for that long, other
+  transient failures back off exponentially with full jitter;
+- inputs are split into requests by an estimated token budget
+  (``EMBEDDING_BATCH_MAX_TOKENS``) and halved again if the provider still
+  rejects a request as too large.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import logging
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Coroutine, List, Optional, Sequence, TypeVar
+
+import httpx
+import redis.asyncio as redis
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_BUCKET_PREFIX = "embedrl:"
+_REDIS_RETRY_SECONDS = 30
+_BACKOFF_BASE_SECONDS = 1.0
+_BACKOFF_CAP_SECONDS = 30.0
+# Never sleep longer than this on one limiter answer; re-ask instead.
+_MAX_LIMITER_WAIT_SECONDS = 5.0
+
+# Token bucket over requests and input tokens, plus the fleet pause, in one
+# atomic call. Returns milliseconds to wait (0 = granted and consumed).
+# KEYS: requests bucket, tokens bucket, pause-until key.
+# ARGV: requests per minute, tokens per minute, token cost (0 = unlimited).
+_ACQUIRE_LUA = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local pause = tonumber(redis.call('GET', KEYS[3]) or '0')
+if pause > now then return pause - now end
+local caps = {tonumber(ARGV[1]), tonumber(ARGV[2])}
+local costs = {1, tonumber(ARGV[3])}
+local levels = {0, 0}
+local wait = 0
+for i = 1, 2 do
+  if caps[i] > 0 then
+    local rate = caps[i] / 60000.0
+    local b = redis.call('HMGET', KEYS[i], 'tokens', 'ts')
+    local level = tonumber(b[1]) or caps[i]
+    local ts = tonumber(b[2]) or now
+    level = math.min(caps[i], level + math.max(0, now - ts) * rate)
+    local cost = math.min(costs[i], caps[i])
+    costs[i] = cost
+    levels[i] = level
+    if level < cost then wait = math.max(wait, math.ceil((cost - level) / rate)) end
+  end
+end
+if wait > 0 then return wait end
+for i = 1, 2 do
+  if caps[i] > 0 then
+    redis.call('HSET', KEYS[i], 'tokens', levels[i] - costs[i], 'ts', now)
+    redis.call('PEXPIRE', KEYS[i], 120000)
+  end
+end
+return 0
+"""
+
+# Extend the fleet pause to now + ARGV[1] ms unless it already runs longer.
+_PAUSE_LUA = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local until_ms = now + tonumber(ARGV[1])
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+if until_ms > current then redis.call('SET', KEYS[1], until_ms, 'PX', ARGV[1]) end
+return 0
+"""
+
+
+class EmbeddingProviderError(RuntimeError):
+    """Non-retryable provider answer (auth, bad request) or retries exhausted."""
+
+
+def estimate_tokens(text: str) -> int:
+    """Upper-bound token estimate: ~4 bytes per token for Latin text and one
+    token per CJK character both stay under UTF-8 bytes / 3."""
+    return len(text.encode("utf-8")) // 3 + 1
+
+
+def split_by_token_budget(texts: Sequence[str], max_tokens: int) -> List[List[int]]:
+    """Consecutive index groups whose estimated tokens fit `max_tokens`; a
+    single text over the budget is sent on its own."""
+    groups: List[List[int]] = []
+    current: List[int] = []
+    used = 0
+    for i, text in enumerate(texts):
+        cost = estimate_tokens(text)
+        if current and used + cost > max_tokens:
+            groups.append(current)
+            current, used = [], 0
+        current.append(i)
+        used += cost
+    if current:
+        groups.append(current)
+    return groups
+
+
+def parse_retry_after(headers: httpx.Headers) -> Optional[float]:
+    """Seconds from ``retry-after-ms`` / ``Retry-After`` (delta or HTTP date)."""
+    raw_ms = headers.get("retry-after-ms")
+    if raw_ms:
+        try:
+            return max(0.0, float(raw_ms) / 1000)
+        except ValueError:
+            pass
+    raw = headers.get("retry-after")
+    if not raw:
+        return None
+    try:
+        return max(0.0, float(raw))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(raw).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _backoff(attempt: int) -> float:
+    return random.uniform(0, min(_BACKOFF_CAP_SECONDS, _BACKOFF_BASE_SECONDS * 2**attempt))
+
+
+class _LocalBucket:
+    """Per-process stand-in for the Redis bucket (same arithmetic)."""
+
+    def __init__(self) -> None:
+        self._levels: dict[str, tuple[float, float]] = {}
+        self._pause_until = 0.0
+
+    def acquire(self, rpm: int, tpm: int, tokens: int) -> float:
+        now = time.monotonic()
+        if self._pause_until > now:
+            return self._pause_until - now
+        wait = 0.0
+        granted: dict[str, float] = {}
+        for name, cap, cost in (("requests", rpm, 1), ("tokens", tpm, tokens)):
+            if cap <= 0:
+                continue
+            rate = cap / 60.0
+            level, ts = self._levels.get(name, (float(cap), now))
+            level = min(cap, level + (now - ts) * rate)
+            cost = min(cost, cap)
+            if level < cost:
+                wait = max(wait, (cost - level) / rate)
+            granted[name] = level - cost
+        if wait > 0:
+            return wait
+        for name, level in granted.items():
+            self._levels[name] = (level, now)
+        return 0.0
+
+    def pause(self, seconds: float) -> None:
+        self._pause_until = max(self._pause_until, time.monotonic() + seconds)
+
+
+class EmbeddingRateLimiter:
+    """Fleet-wide token bucket (requests/min and input tokens/min) in Redis."""
+
+    def __init__(self) -> None:
+        self._redis: Optional[redis.Redis] = None
+        self._next_retry_at = 0.0
+        self._local = _LocalBucket()
+        self.waited_seconds = 0.0
+        self.pauses = 0
+
+    def _keys(self) -> list[str]:
+        model = settings.EMBEDDING_MODEL
+        return [f"{_BUCKET_PREFIX}{model}:requests", f"{_BUCKET_PREFIX}{model}:tokens", f"{_BUCKET_PREFIX}{model}:pause"]
+
+    async def _client(self) -> Optional[redis.Redis]:
+        if self._redis is not None:
+            return self._redis
+        if time.monotonic() < self._next_retry_at:
+            return None
+        try:
+            client = redis.from_url(settings.CELERY_BROKER_URL, socket_timeout=2.0)
+            await client.ping()
+        except Exception as e:
+            logger.warning("Embedding rate limiter: Redis unavailable, limiting per process: %s", e)
+            self._next_retry_at = time.monotonic() + _REDIS_RETRY_SECONDS
+            return None
+        self._redis = client
+        return client
+
+    async def _drop_client(self, error: Exception) -> None:
+        logger.warning("Embedding rate limiter: Redis error, limiting per process: %s", error)
+        self._next_retry_at = time.monotonic() + _REDIS_RETRY_SECONDS
+        client, self._redis = self._redis, None
+        if client is not None:
+            try:
+                await client.aclose()
+            except Exception:
+                pass
+
+    async def _wait_seconds(self, tokens: int) -> float:
+        rpm = int(settings.EMBEDDING_RATE_LIMIT_RPM)
+        tpm = int(settings.EMBEDDING_RATE_LIMIT_TPM)
+        client = await self._client()
+        if client is not None:
+            try:
+                return int(await client.eval(_ACQUIRE_LUA, 3, *self._keys(), rpm, tpm, tokens)) / 1000
+            except Exception as e:
+                await self._drop_client(e)
+        return self._local.acquire(rpm, tpm, tokens)
+
+    async def acquire(self, tokens: int) -> None:
+        """Wait until one request carrying `tokens` input tokens may be sent."""
+        while True:
+            wait = await self._wait_seconds(tokens)
+            if wait <= 0:
+                return
+            # Jitter so waiters woken together do not all re-ask at once.
+            delay = min(wait, _MAX_LIMITER_WAIT_SECONDS) * random.uniform(1.0, 1.2)
+            self.waited_seconds += delay
+            await asyncio.sleep(delay)
+
+    async def pause(self, seconds: float) -> None:
+        """Hold every process's requests for `seconds` (provider said 429)."""
+        self.pauses += 1
+        client = await self._client()
+        if client is not None:
+            try:
+                await client.eval(_PAUSE_LUA, 1, self._keys()[2], max(1, int(seconds * 1000)))
+                return
+            except Exception as e:
+                await self._drop_client(e)
+        self._local.pause(seconds)
+
+
+class AsyncEmbeddingClient:
+    """OpenAI-compatible ``/embeddings`` over one pooled httpx client."""
+
+    def __init__(self, limiter: EmbeddingRateLimiter, transport: Optional[httpx.AsyncBaseTransport] = None) -> None:
+        self.limiter = limiter
+        self._transport = transport
+        self._http: Optional[httpx.AsyncClient] = None
+        self.requests = 0
+        self.retries = 0
+        self.splits = 0
+
+    def _client(self) -> httpx.AsyncClient:
+        if self._http is None:
+            if not settings.OPENROUTER_API_KEY:
+                raise RuntimeError("OPENROUTER_API_KEY is not configured")
+            http2 = bool(settings.EMBEDDING_HTTP2)
+            if http2 and self._transport is None:
+                try:
+                    import h2  # noqa: F401
+                except ImportError:
+                    logger.warning("h2 is not installed; embedding client falls back to HTTP/1.1")
+                    http2 = False
+            max_connections = max(1, int(settings.EMBEDDING_MAX_CONNECTIONS))
+            self._http = httpx.AsyncClient(
+                base_url=settings.OPENROUTER_BASE_URL.rstrip("/") + "/",
+                headers={"Authorization": f"Bearer {settings.OPENROUTER_API_KEY}"},
+                http2=http2,
+                limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+                timeout=httpx.Timeout(float(settings.EMBEDDING_TIMEOUT_SECONDS), connect=10.0),
+                transport=self._transport,
+            )
+        return self._http
+
+    async def embed(self, model: str, texts: Sequence[str], *, max_retries: int) -> List[List[float]]:
+        """Vectors for `texts` (order-preserving), split by token budget."""
+        if not texts:
+            return []
+        groups = split_by_token_budget(texts, max(1, int(settings.EMBEDDING_BATCH_MAX_TOKENS)))
+        parts = await asyncio.gather(
+            *(self._embed_batch(model, [texts[i] for i in group], max_retries) for group in groups)
+        )
+        return [vector for part in parts for vector in part]
+
+    async def _embed_batch(self, model: str, texts: List[str], max_retries: int) -> List[List[float]]:
+        tokens = sum(estimate_tokens(t) for t in texts)
+        last_exc: Exception | None = None
+        for attempt in range(max_retries):
+            await self.limiter.acquire(tokens)
+            self.requests += 1
+            try:
+                resp = await self._client().post("embeddings", json={"model": model, "input": texts})
+            except httpx.TransportError as exc:
+                last_exc = exc
+                delay = _backoff(attempt)
+            else:
+                if resp.status_code == 413 or (resp.status_code == 400 and _is_too_large(resp)):
+                    if len(texts) == 1:
+                        raise EmbeddingProviderError(f"Embedding input too large: {resp.text[:200]}")
+                    self.splits += 1
+                    half = len(texts) // 2
+                    left, right = await asyncio.gather(
+                        self._embed_batch(model, texts[:half], max_retries),
+                        self._embed_batch(model, texts[half:], max_retries),
+                    )
+                    return left + right
+                retry_after = parse_retry_after(resp.headers)
+                if resp.status_code == 429 or resp.status_code >= 500:
+                    last_exc = EmbeddingProviderError(f"Embedding provider HTTP {resp.status_code}")
+                    if resp.status_code == 429 and retry_after is not None:
+                        await self.limiter.pause(retry_after)
+                        delay = 0.0  # the limiter holds this request with everyone else
+                    else:
+                        delay = retry_after if retry_after is not None else _backoff(attempt)
+                elif resp.status_code >= 400:
+                    raise EmbeddingProviderError(f"Embedding provider HTTP {resp.status_code}: {resp.text[:200]}")
+                else:
+                    try:
+                        return _vectors(resp.json(), len(texts))
+                    except ValueError as exc:
+                        # OpenRouter occasionally answers 200 with empty data.
+                        last_exc = exc
+                        delay = _backoff(attempt)
+            if attempt + 1 < max_retries:
+                self.retries += 1
+                logger.warning(
+                    "Embedding attempt %d/%d failed (%d texts): %s — retrying in %.1fs",
+                    attempt + 1, max_retries, len(texts), last_exc, delay,
+                )
+                await asyncio.sleep(delay)
+        if last_exc is not None:
+            raise last_exc
+        raise RuntimeError("embed called with non-positive max_retries")
+
+    async def aclose(self) -> None:
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+
+def _is_too_large(resp: httpx.Response) -> bool:
+    text = resp.text.lower()
+    return "maximum context length" in text or "too many tokens" in text or "too large" in text
+
+
+def _vectors(body: dict, expected: int) -> List[List[float]]:
+    data = sorted(body.get("data") or [], key=lambda d: d.get("index", 0))
+    vectors = [d["embedding"] for d in data]
+    if not vectors:
+        raise ValueError("Empty embedding response")
+    if len(vectors) != expected:
+        raise ValueError(f"Embedding response size mismatch: {len(vectors)} != {expected}")
+    return vectors
+
+
+class _LoopThread:
+    """A private event loop on a daemon thread, restarted after fork (Celery
+    prefork children must not inherit the parent's loop or sockets)."""
+
+    def __init__(self) -> None:
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pid = 0
+        self._lock = threading.Lock()
+
+    def loop(self) -> asyncio.AbstractEventLoop:
+        if self._loop is None or self._pid != os.getpid():
+            with self._lock:
+                if self._loop is None or self._pid != os.getpid():
+                    loop = asyncio.new_event_loop()
+                    threading.Thread(target=loop.run_forever, name="embedding-client", daemon=True).start()
+                    self._loop, self._pid = loop, os.getpid()
+        return self._loop
+
+    def submit(self, coro: Coroutine[object, object, T]) -> "concurrent.futures.Future[T]":
+        return asyncio.run_coroutine_threadsafe(coro, self.loop())
+
+
+class EmbeddingClient:
+    """Process-wide entry point: ``embed`` for coroutines on any loop,
+    ``embed_sync`` for threads (workers, ``asyncio.to_thread``)."""
+
+    def __init__(self) -> None:
+        self._thread = _LoopThread()
+        self._pid = 0
+        self._client: Optional[AsyncEmbeddingClient] = None
+
+    def _async_client(self) -> AsyncEmbeddingClient:
+        # Built lazily per process; only ever used on the loop thread.
+        if self._client is None or self._pid != os.getpid():
+            self._client = AsyncEmbeddingClient(EmbeddingRateLimiter())
+            self._pid = os.getpid()
+        return self._client
+
+    async def _run(self, model: str, texts: List[str], max_retries: int) -> List[List[float]]:
+        return await self._async_client().embed(model, texts, max_retries=max_retries)
+
+    async def embed(self, model: str, texts: Sequence[str], *, max_retries: Optional[int] = None) -> List[List[float]]:
+        retries = int(max_retries or settings.EMBEDDING_MAX_RETRIES)
+        return await asyncio.wrap_future(self._thread.submit(self._run(model, list(texts), retries)))
+
+    def embed_sync(self, model: str, texts: Sequence[str], *, max_retries: Optional[int] = None) -> List[List[float]]:
+        retries = int(max_retries or settings.EMBEDDING_MAX_RETRIES)
+        return self._thread.submit(self._run(model, list(texts), retries)).result()
+
+    def stats(self) -> dict:
+        client = self._client
+        if client is None:
+            return {"requests": 0, "retries": 0, "splits": 0, "rate_limited_seconds": 0.0, "fleet_pauses": 0}
+        return {
+            "requests": client.requests,
+            "retries": client.retries,
+            "splits": client.splits,
+            "rate_limited_seconds": round(client.limiter.waited_seconds, 1),
+            "fleet_pauses": client.limiter.pauses,
+        }
+
+
+embedding_client = EmbeddingClient()
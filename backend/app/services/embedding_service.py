@@ -1,16 +1,30 @@
 from __future__ import annotations
 
+import asyncio
 import logging
-import threading
-import time
 from functools import lru_cache
 from typing import List, Optional
 
-from openai import OpenAI
 from qdrant_client import QdrantClient
-from qdrant_client.models import Distance, VectorParams
+from qdrant_client.models import (
+    Disabled,
+    Distance,
+    HnswConfigDiff,
+    KeywordIndexParams,
+    KeywordIndexType,
+    PointStruct,
+    QuantizationSearchParams,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    SearchParams,
+    VectorParams,
+    VectorParamsDiff,
+)
 
 from app.core.config import settings
+from app.services.embedding_cache import cache_key, embedding_cache
+from app.services.embedding_client import embedding_client
 
 logger = logging.getLogger(__name__)
 
@@ -19,58 +33,68 @@ class EmbeddingService:
     """Embedding + Qdrant collection utilities (config-driven).
 
     - Reads model/dim from settings
-    - Provides batch embedding via OpenRouter (OpenAI-compatible)
+    - Provides batch embedding via OpenRouter (OpenAI-compatible), through
+      the shared async client in ``embedding_client``
     - Ensures Qdrant collection with exact vector dimension
     """
 
     def __init__(self) -> None:
         self.model: str = settings.EMBEDDING_MODEL
         self.dim: int = int(settings.EMBEDDING_DIM)
-        self._client: Optional[OpenAI] = None
-        self._lock = threading.Lock()
 
     # ---------------- Embedding -----------------
-    def _get_client(self) -> OpenAI:
-        if not settings.OPENROUTER_API_KEY:
-            raise RuntimeError("OPENROUTER_API_KEY is not configured")
-        if self._client is None:
-            with self._lock:
-                if self._client is None:
-                    self._client = OpenAI(
-                        api_key=settings.OPENROUTER_API_KEY,
-                        base_url=settings.OPENROUTER_BASE_URL,
-                    )
-        return self._client
-
-    def embed_texts(self, texts: List[str], *, _max_retries: int = 3) -> List[List[float]]:
+    def _split_cached(self, texts: List[str]) -> tuple[list, dict[str, List[int]]]:
+        """Cached vectors (None for misses) and miss positions keyed by cache
+        key, so a text repeated in the batch is embedded once."""
+        vectors = embedding_cache.get_many(self.model, texts)
+        missing: dict[str, List[int]] = {}
+        for i, vec in enumerate(vectors):
+            if vec is None:
+                missing.setdefault(cache_key(self.model, texts[i]), []).append(i)
+        return vectors, missing
+
+    def _fill(self, vectors: list, missing: dict[str, List[int]], miss_texts: List[str], fresh: List[List[float]]) -> None:
+        for positions, vec in zip(missing.values(), fresh):
+            for i in positions:
+                vectors[i] = vec
+        embedding_cache.put_many(self.model, miss_texts, fresh)
+
+    def embed_texts(self, texts: List[str], *, _max_retries: Optional[int] = None) -> List[List[float]]:
         """Return embeddings for a list of texts (order-preserving).
 
-        Retries with exponential backoff on transient failures (e.g. OpenRouter
-        returning HTTP 200 with empty data).
+        Served from the content-addressed embedding cache where possible; only
+        misses (deduplicated by cache key) go to the provider, and their
+        vectors are written back. Blocks the calling thread; coroutines use
+        :meth:`aembed_texts`.
         """
         if not texts:
             return []
-        client = self._get_client()
-        last_exc: Exception | None = None
-        for attempt in range(_max_retries):
-            try:
-                resp = client.embeddings.create(model=self.model, input=texts)
-                vectors: List[List[float]] = [d.embedding for d in resp.data]
-                if not vectors:
-                    raise ValueError("Empty embedding response")
-                return vectors
-            except Exception as exc:
-                last_exc = exc
-                wait = 2 ** attempt  # 1s, 2s, 4s
-                logger.warning(
-                    "Embedding attempt %d/%d failed (%d texts): %s — retrying in %ds",
-                    attempt + 1, _max_retries, len(texts), exc, wait,
-                )
-                time.sleep(wait)
-        # Explicit check (not assert) so behavior is identical under `python -O`.
-        if last_exc is not None:
-            raise last_exc
-        raise RuntimeError("embed_texts called with non-positive _max_retries")
+        vectors, missing = self._split_cached(texts)
+        if missing:
+            miss_texts = [texts[positions[0]] for positions in missing.values()]
+            fresh = self._embed_uncached(miss_texts, _max_retries=_max_retries)
+            self._fill(vectors, missing, miss_texts, fresh)
+        return vectors  # type: ignore[return-value]
+
+    async def aembed_texts(self, texts: List[str], *, _max_retries: Optional[int] = None) -> List[List[float]]:
+        """:meth:`embed_texts` for coroutines: the provider call awaits the
+        shared async client instead of parking a thread for its duration."""
+        if not texts:
+            return []
+        vectors, missing = await asyncio.to_thread(self._split_cached, texts)
+        if missing:
+            miss_texts = [texts[positions[0]] for positions in missing.values()]
+            fresh = await self._aembed_uncached(miss_texts, _max_retries=_max_retries)
+            await asyncio.to_thread(self._fill, vectors, missing, miss_texts, fresh)
+        return vectors  # type: ignore[return-value]
+
+    def _embed_uncached(self, texts: List[str], *, _max_retries: Optional[int] = None) -> List[List[float]]:
+        """Provider call through the shared client (rate limited fleet-wide,
+        Retry-After aware, split by token budget); blocks until done."""
+        return embedding_client.embed_sync(self.model, texts, max_retries=_max_retries)
+
+    async def _aembed_uncached(self, texts: List[str], *, _max_retries: Optional[int] = None) -> List[List[float]]:
+        return await embedding_client.embed(self.model, texts, max_retries=_max_retries)
 
     # ---------------- Qdrant -----------------
     @lru_cache(maxsize=1)
@@ -112,11 +136,124 @@ class EmbeddingService:
             return
 
         # Create collection
-        client.create_collection(
+        client.create_collection(collection_name=name, **self.collection_params())
+        self.ensure_document_index(name)
+
+    @staticmethod
+    def _hnsw_config() -> HnswConfigDiff:
+        return HnswConfigDiff(
+            m=int(settings.QDRANT_HNSW_M),
+            payload_m=int(settings.QDRANT_HNSW_PAYLOAD_M),
+            ef_construct=int(settings.QDRANT_HNSW_EF_CONSTRUCT),
+        )
+
+    @staticmethod
+    def _quantization_config() -> Optional[ScalarQuantization]:
+        if settings.QDRANT_QUANTIZATION == "none":
+            return None
+        if settings.QDRANT_QUANTIZATION != "int8":
+            raise RuntimeError(f"Unsupported QDRANT_QUANTIZATION: {settings.QDRANT_QUANTIZATION!r}")
+        return ScalarQuantization(
+            scalar=ScalarQuantizationConfig(
+                type=ScalarType.INT8,
+                quantile=float(settings.QDRANT_QUANTIZATION_QUANTILE),
+                always_ram=True,
+            )
+        )
+
+    def collection_params(self) -> dict:
+        """create_collection kwargs for the configured layout."""
+        return {
+            "vectors_config": VectorParams(
+                size=self.dim,
+                distance=Distance.COSINE,
+                on_disk=bool(settings.QDRANT_ON_DISK_VECTORS),
+            ),
+            "hnsw_config": self._hnsw_config(),
+            "quantization_config": self._quantization_config(),
+        }
+
+    def ensure_document_index(self, name: Optional[str] = None) -> None:
+        """Keyword index on ``document_id`` — a tenant index when
+        QDRANT_TENANT_INDEX is set, which co-locates each document's points
+        and lets HNSW build the per-document graphs. Raises Qdrant's 409 if an
+        index already exists."""
+        self.get_qdrant_client().create_payload_index(
+            collection_name=name or settings.QDRANT_COLLECTION,
+            field_name="document_id",
+            field_schema=KeywordIndexParams(
+                type=KeywordIndexType.KEYWORD,
+                is_tenant=bool(settings.QDRANT_TENANT_INDEX),
+            ),
+        )
+
+    def apply_collection_config(self, name: Optional[str] = None) -> None:
+        """Bring an existing collection to the configured layout in place.
+
+        The document_id index is dropped and recreated first, so its tenant
+        flag matches before the HNSW change: with m=0 the per-document graphs
+        are built from that index, and without it filtered searches lose
+        their graph. Qdrant then rebuilds the HNSW graphs, quantized vectors
+        and vector storage in the background. Searches keep working but are
+        slower until the collection is green again; copying into a new
+        collection (copy_collection, the migration script's --rebuild) is the
+        safe path for a busy collection, and the script only runs this with
+        an explicit --in-place.
+        """
+        client = self.get_qdrant_client()
+        name = name or settings.QDRANT_COLLECTION
+        client.delete_payload_index(collection_name=name, field_name="document_id")
+        self.ensure_document_index(name)
+        client.update_collection(
             collection_name=name,
-            vectors_config=VectorParams(size=self.dim, distance=Distance.COSINE),
+            vectors_config={"": VectorParamsDiff(on_disk=bool(settings.QDRANT_ON_DISK_VECTORS))},
+            hnsw_config=self._hnsw_config(),
+            quantization_config=self._quantization_config() or Disabled.DISABLED,
         )
 
+    def copy_collection(self, source: str, target: str, *, batch_size: int = 512) -> int:
+        """Create `target` with the configured layout and copy every point of
+        `source` into it (vectors and payloads unchanged); returns the number
+        copied. Writes are idempotent upserts, so an interrupted copy can be
+        re-run."""
+        client = self.get_qdrant_client()
+        if not client.collection_exists(target):
+            client.create_collection(collection_name=target, **self.collection_params())
+            self.ensure_document_index(target)
+        copied = 0
+        offset = None
+        while True:
+            points, offset = client.scroll(
+                collection_name=source,
+                limit=batch_size,
+                offset=offset,
+                with_payload=True,
+                with_vectors=True,
+            )
+            if points:
+                client.upsert(
+                    collection_name=target,
+                    points=[PointStruct(id=p.id, vector=p.vector, payload=p.payload) for p in points],
+                    wait=True,
+                )
+                copied += len(points)
+            if offset is None:
+                return copied
+
+    @staticmethod
+    def search_params() -> Optional[SearchParams]:
+        """query_points search_params for the configured layout."""
+        hnsw_ef = int(settings.QDRANT_HNSW_EF) or None
+        quantization = None
+        if settings.QDRANT_QUANTIZATION != "none":
+            quantization = QuantizationSearchParams(
+                rescore=bool(settings.QDRANT_QUANTIZATION_RESCORE),
+                oversampling=float(settings.QDRANT_QUANTIZATION_OVERSAMPLING),
+            )
+        if hnsw_ef is None and quantization is None:
+            return None
+        return SearchParams(hnsw_ef=hnsw_ef, quantization=quantization)
+
 
 # Singleton instance for app and workers
 embedding_service = EmbeddingService()
@@ -12,7 +12,7 @@ from typing import Any, Iterable, Sequence
 
 import sqlalchemy as sa
 from openai import OpenAI
-from qdrant_client.models import FieldCondition, Filter, MatchValue
+from qdrant_client.models import FieldCondition, Filter, MatchValue, QueryRequest
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
@@ -29,6 +29,7 @@ from app.models.tables import (
 from app.services.credit_service import calculate_cost
 from app.services.document_element_service import get_element_aware_chunks
 from app.services.embedding_service import embedding_service
+from app.services.query_embedding_cache import query_embedding_cache
 
 logger = logging.getLogger(__name__)
 
@@ -184,67 +185,95 @@ def _citation_from_chunk(ref_num: int, chunk: Chunk, score: float = 0.0) -> dict
     }
 
 
-def _retrieve_by_query(db: Session, document_id: uuid.UUID, query: str, top_k: int) -> list[tuple[Chunk, float]]:
+def retrieve_by_queries(
+    db: Session,
+    document_id: uuid.UUID,
+    queries: Sequence[str],
+    top_k: int,
+    *,
+    query_vectors: Sequence[list[float]] | None = None,
+) -> list[list[tuple[Chunk, float]]]:
+    """Ranked chunks of one document for each query, in query order.
+
+    One embedding call for the queries the vector cache misses (none when
+    ``query_vectors`` is given), one Qdrant batch query and one Chunk SELECT
+    for the union of hits, whatever the number of queries. Chunks under 80
+    characters are dropped. A failure yields empty lists so callers fall back.
+    """
+    if not queries:
+        return []
     try:
-        qvec = embedding_service.embed_texts([query])[0]
-        client = embedding_service.get_qdrant_client()
-        response = client.query_points(
+        vectors = list(query_vectors) if query_vectors is not None else query_embedding_cache.embed_many_sync(list(queries))
+        doc_filter = Filter(must=[FieldCondition(key="document_id", match=MatchValue(value=str(document_id)))])
+        responses = embedding_service.get_qdrant_client().query_batch_points(
             collection_name=settings.QDRANT_COLLECTION,
-            query=qvec,
-            limit=max(top_k * 3, top_k),
-            query_filter=Filter(must=[FieldCondition(key="document_id", match=MatchValue(value=str(document_id)))]),
+            requests=[
+                QueryRequest(
+                    query=vector,
+                    limit=max(top_k * 3, top_k),
+                    filter=doc_filter,
+                    params=embedding_service.search_params(),
+                    with_payload=False,
+                )
+                for vector in vectors
+            ],
         )
-        scores: dict[uuid.UUID, float] = {}
-        ids: list[uuid.UUID] = []
-        for point in response.points:
-            try:
-                cid = uuid.UUID(str(point.id))
-            except Exception:
-                continue
-            ids.append(cid)
-            scores[cid] = float(point.score or 0.0)
+        hits: list[list[tuple[uuid.UUID, float]]] = []
+        for response in responses:
+            ranked: list[tuple[uuid.UUID, float]] = []
+            for point in response.points:
+                try:
+                    ranked.append((uuid.UUID(str(point.id)), float(point.score or 0.0)))
+                except Exception:
+                    continue
+            hits.append(ranked)
+        ids = {cid for ranked in hits for cid, _score in ranked}
         if not ids:
-            return []
-        rows = db.execute(select(Chunk).where(Chunk.id.in_(ids)))
-        chunks = list(rows.scalars())
-        chunks.sort(key=lambda ch: scores.get(ch.id, 0.0), reverse=True)
-        return [(ch, scores.get(ch.id, 0.0)) for ch in chunks if len((ch.text or "").strip()) >= 80][:top_k]
+            return [[] for _ in queries]
+        chunks = {ch.id: ch for ch in db.execute(select(Chunk).where(Chunk.id.in_(ids))).scalars()}
+        results: list[list[tuple[Chunk, float]]] = []
+        for ranked in hits:
+            scored = sorted(
+                ((chunks[cid], score) for cid, score in ranked if cid in chunks),
+                key=lambda item: item[1],
+                reverse=True,
+            )
+            results.append([(ch, score) for ch, score in scored if len((ch.text or "").strip()) >= 80][:top_k])
+        return results
     except Exception as exc:
         logger.warning("Extraction vector retrieval failed, falling back to first chunks: %s", exc)
-        return []
+        return [[] for _ in queries]
 
 
-def retrieve_extraction_chunks(
-    db: Session,
-    document_id: uuid.UUID,
-    template: ExtractionTemplate,
-    *,
-    max_chunks: int = MAX_CONTEXT_CHUNKS,
+def element_chunk_budget(max_chunks: int) -> int:
+    return max(2, max_chunks // 2)
+
+
+def per_query_budget(max_chunks: int, query_count: int) -> int:
+    return max(3, max_chunks // max(1, query_count) + 1)
+
+
+def select_context_chunks(
+    element_chunks: Iterable[tuple[Chunk, float]],
+    ranked_lists: Iterable[Sequence[tuple[Chunk, float]]],
+    max_chunks: int,
 ) -> list[tuple[Chunk, float]]:
+    """Element-aware chunks first, then each query's hits in turn, without
+    repeats, up to max_chunks."""
     seen: set[uuid.UUID] = set()
     selected: list[tuple[Chunk, float]] = []
-    element_budget = max(2, max_chunks // 2)
-    for chunk, score in get_element_aware_chunks(db, document_id, max_chunks=element_budget):
-        if chunk.id in seen:
-            continue
-        seen.add(chunk.id)
-        selected.append((chunk, score))
-        if len(selected) >= max_chunks:
-            return selected
-
-    per_query = max(3, max_chunks // max(1, len(template.query_prompts)) + 1)
-    for query in template.query_prompts:
-        for chunk, score in _retrieve_by_query(db, document_id, query, per_query):
+    for group in (element_chunks, *ranked_lists):
+        for chunk, score in group:
             if chunk.id in seen:
                 continue
             seen.add(chunk.id)
             selected.append((chunk, score))
             if len(selected) >= max_chunks:
                 return selected
+    return selected
 
-    if selected:
-        return selected[:max_chunks]
 
+def first_chunks(db: Session, document_id: uuid.UUID, max_chunks: int) -> list[tuple[Chunk, float]]:
     rows = db.execute(
         select(Chunk)
         .where(Chunk.document_id == document_id)
@@ -254,6 +283,23 @@ def retrieve_extraction_chunks(
     return [(chunk, 0.0) for chunk in rows.scalars()]
 
 
+def retrieve_extraction_chunks(
+    db: Session,
+    document_id: uuid.UUID,
+    template: ExtractionTemplate,
+    *,
+    max_chunks: int = MAX_CONTEXT_CHUNKS,
+) -> list[tuple[Chunk, float]]:
+    element_chunks = get_element_aware_chunks(db, document_id, max_chunks=element_chunk_budget(max_chunks))
+    selected = select_context_chunks(element_chunks, [], max_chunks)
+    if len(selected) >= max_chunks:
+        return selected
+    ranked_lists = retrieve_by_queries(
+        db, document_id, template.query_prompts, per_query_budget(max_chunks, len(template.query_prompts))
+    )
+    return select_context_chunks(element_chunks, ranked_lists, max_chunks) or first_chunks(db, document_id, max_chunks)
+
+
 def _context_text(chunks: Sequence[tuple[Chunk, float]]) -> str:
     parts: list[str] = []
     for idx, (chunk, _score) in enumerate(chunks, start=1):
@@ -10,7 +10,7 @@ def extract_text(file_bytes: bytes, file_type: str = 'txt') -> List[ExtractedPag
 
     For MD files, headings (lines starting with #) become section_titles.
     """
-    text = file_bytes.decode('utf-8', errors='replace')
+    text = str(file_bytes, 'utf-8', errors='replace')
 
     if not text.strip():
         return [ExtractedPage(page_number=1, text='(empty file)')]
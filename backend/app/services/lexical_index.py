@@ -0,0 +1,295 @@
+"""Per-document inverted index for BM25 lexical retrieval and quote term scans.
+
+Built once per parse (right after chunking) and stored as one compact blob in
+``document_lexical_indexes``. Lexical fallback and the Quote Finder term scan
+otherwise re-normalize and re-tokenize every chunk's text on every request.
+
+Tokens are the whitespace-separated tokens of ``normalize(text, fuzzy=True)``
+— the exact space the quote term scan matches in — with leading/trailing
+punctuation stripped. Two unit spaces share one sorted vocabulary: chunks
+(keyed by chunk id) and pages with stored content (keyed by page number).
+
+Blob layout (native little-endian uint32 arrays, viewed zero-copy through
+``memoryview.cast`` on load):
+
+    header      _HEADER (magic, format, n_terms, n_chunks, n_pages,
+                vocab_bytes, chunk_postings, page_postings)
+    chunk ids   16 bytes x n_chunks
+    page nums   u32 x n_pages
+    vocab       UTF-8, '\\n'-joined sorted terms, padded to 4 bytes
+    per space   lengths u32 x n_units, offsets u32 x (n_terms + 1),
+                units u32 x postings, freqs u32 x postings
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import re
+import struct
+import sys
+import uuid
+from array import array
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Iterable, Optional, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.tables import DocumentLexicalIndex
+from app.services.byte_lru import ByteLRU
+from app.services.text_normalizer import normalize
+
+FORMAT_VERSION = 1
+_MAGIC = b"DTLX"
+_HEADER = struct.Struct("<4sIIIIIII")
+_EDGE_PUNCT_RE = re.compile(r"^[\W_]+|[\W_]+$")
+# Standard Okapi BM25 parameters.
+_K1 = 1.2
+_B = 0.75
+# Approximate resident size, beyond the blob, of one chunk id (uuid.UUID plus
+# its 128-bit int and list slot) and of one term id in the term dict (an int
+# object; the keys are the vocab strings, counted once).
+_CHUNK_ID_BYTES = 112
+_TERM_ID_BYTES = 32
+# The ten memoryviews over the blob and the two _Space objects.
+_VIEW_OVERHEAD_BYTES = 10 * 184 + 2 * 64
+
+if sys.byteorder != "little" or array("I").itemsize != 4:  # pragma: no cover - all supported targets
+    raise ImportError("lexical_index requires a little-endian platform with 4-byte array('I')")
+
+
+def index_tokens(text: str) -> list[str]:
+    """Fuzzy-normalized whitespace tokens with edge punctuation stripped."""
+    norm, _ = normalize(text or "", fuzzy=True)
+    tokens = []
+    for raw in norm.split(" "):
+        token = _EDGE_PUNCT_RE.sub("", raw)
+        if token:
+            tokens.append(token)
+    return tokens
+
+
+@dataclass
+class _Space:
+    lengths: memoryview
+    offsets: memoryview
+    units: memoryview
+    freqs: memoryview
+    avg_length: float
+
+
+def _build_space(unit_tokens: Sequence[Counter], term_ids: dict[str, int]) -> tuple[array, array, array, array]:
+    per_term: list[list[tuple[int, int]]] = [[] for _ in term_ids]
+    lengths = array("I")
+    for unit, counts in enumerate(unit_tokens):
+        lengths.append(sum(counts.values()))
+        for term, freq in counts.items():
+            per_term[term_ids[term]].append((unit, freq))
+    offsets = array("I", [0])
+    units = array("I")
+    freqs = array("I")
+    for postings in per_term:
+        for unit, freq in postings:
+            units.append(unit)
+            freqs.append(freq)
+        offsets.append(len(units))
+    return lengths, offsets, units, freqs
+
+
+def build_index_blob(
+    chunks: Iterable[tuple[uuid.UUID, str, Optional[str]]],
+    pages: Iterable[tuple[int, Optional[str]]] = (),
+) -> bytes:
+    """Serialize the index for `chunks` ((id, text, section_title), in
+    chunk_index order) and `pages` ((page_number, content); pages without
+    content are skipped)."""
+    chunk_ids: list[uuid.UUID] = []
+    chunk_counts: list[Counter] = []
+    for chunk_id, text, section_title in chunks:
+        chunk_ids.append(chunk_id)
+        chunk_counts.append(Counter(index_tokens(" ".join([section_title or "", text or ""]))))
+    page_numbers = array("I")
+    page_counts: list[Counter] = []
+    for page_number, content in pages:
+        if content:
+            page_numbers.append(int(page_number))
+            page_counts.append(Counter(index_tokens(content)))
+
+    vocab = sorted(set().union(*chunk_counts, *page_counts))
+    term_ids = {term: i for i, term in enumerate(vocab)}
+    chunk_arrays = _build_space(chunk_counts, term_ids)
+    page_arrays = _build_space(page_counts, term_ids)
+
+    vocab_bytes = "\n".join(vocab).encode("utf-8")
+    vocab_bytes += b"\0" * (-len(vocab_bytes) % 4)
+    parts = [
+        _HEADER.pack(
+            _MAGIC,
+            FORMAT_VERSION,
+            len(vocab),
+            len(chunk_ids),
+            len(page_numbers),
+            len(vocab_bytes),
+            len(chunk_arrays[2]),
+            len(page_arrays[2]),
+        ),
+        b"".join(chunk_id.bytes for chunk_id in chunk_ids),
+        page_numbers.tobytes(),
+        vocab_bytes,
+    ]
+    parts.extend(a.tobytes() for a in (*chunk_arrays, *page_arrays))
+    return b"".join(parts)
+
+
+class LexicalIndex:
+    """Read-only view over a serialized blob; the arrays are never copied."""
+
+    def __init__(self, blob: bytes) -> None:
+        view = memoryview(blob)
+        magic, version, n_terms, n_chunks, n_pages, vocab_len, chunk_postings, page_postings = _HEADER.unpack_from(
+            view, 0
+        )
+        if magic != _MAGIC or version != FORMAT_VERSION:
+            raise ValueError("unsupported lexical index blob")
+        pos = _HEADER.size
+        raw_ids = bytes(view[pos : pos + 16 * n_chunks])
+        self.chunk_ids = [uuid.UUID(bytes=raw_ids[i : i + 16]) for i in range(0, len(raw_ids), 16)]
+        pos += 16 * n_chunks
+
+        def _u32(count: int) -> memoryview:
+            nonlocal pos
+            out = view[pos : pos + 4 * count].cast("I")
+            pos += 4 * count
+            return out
+
+        self.page_numbers = _u32(n_pages)
+        vocab_raw = bytes(view[pos : pos + vocab_len]).rstrip(b"\0")
+        pos += vocab_len
+        self.vocab: list[str] = vocab_raw.decode("utf-8").split("\n") if n_terms else []
+        self._term_ids = {term: i for i, term in enumerate(self.vocab)}
+        # What the LRU charges: the blob plus the Python objects decoded from it.
+        self.nbytes = (
+            len(blob)
+            + _VIEW_OVERHEAD_BYTES
+            + sys.getsizeof(self.chunk_ids)
+            + _CHUNK_ID_BYTES * n_chunks
+            + sys.getsizeof(self.vocab)
+            + sum(map(sys.getsizeof, self.vocab))
+            + sys.getsizeof(self._term_ids)
+            + _TERM_ID_BYTES * n_terms
+        )
+        self._blob = blob  # keep the buffer alive for the views
+        self.chunks = self._space(_u32(n_chunks), _u32(n_terms + 1), _u32(chunk_postings), _u32(chunk_postings))
+        self.pages = self._space(_u32(n_pages), _u32(n_terms + 1), _u32(page_postings), _u32(page_postings))
+
+    @staticmethod
+    def _space(lengths: memoryview, offsets: memoryview, units: memoryview, freqs: memoryview) -> _Space:
+        avg = (sum(lengths) / len(lengths)) if len(lengths) else 0.0
+        return _Space(lengths, offsets, units, freqs, avg)
+
+    def _term_postings(self, space: _Space, term_id: int) -> tuple[memoryview, memoryview]:
+        start, end = space.offsets[term_id], space.offsets[term_id + 1]
+        return space.units[start:end], space.freqs[start:end]
+
+    def _expand(self, term: str, *, substring: bool) -> list[int]:
+        if not substring:
+            term_id = self._term_ids.get(term)
+            return [] if term_id is None else [term_id]
+        return [i for i, token in enumerate(self.vocab) if term in token]
+
+    def bm25(self, weighted_terms: Sequence[tuple[str, float, bool]], top_k: int) -> list[tuple[uuid.UUID, float]]:
+        """Top-k chunks by Okapi BM25. Each term is (normalized term, query
+        weight, substring) — substring terms (CJK bigrams) match every vocab
+        token containing them, summing their frequencies."""
+        space = self.chunks
+        n_units = len(space.lengths)
+        if not n_units:
+            return []
+        scores: dict[int, float] = {}
+        for term, weight, substring in weighted_terms:
+            freq_by_unit: Counter = Counter()
+            for term_id in self._expand(term, substring=substring):
+                units, freqs = self._term_postings(space, term_id)
+                for unit, freq in zip(units, freqs):
+                    freq_by_unit[unit] += freq
+            df = len(freq_by_unit)
+            if not df:
+                continue
+            idf = math.log(1.0 + (n_units - df + 0.5) / (df + 0.5))
+            for unit, tf in freq_by_unit.items():
+                norm = _K1 * (1.0 - _B + _B * space.lengths[unit] / (space.avg_length or 1.0))
+                scores[unit] = scores.get(unit, 0.0) + weight * idf * tf * (_K1 + 1.0) / (tf + norm)
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[: max(0, int(top_k))]
+        return [(self.chunk_ids[unit], score) for unit, score in ranked]
+
+    def units_containing(self, terms: Sequence[str]) -> Optional[tuple[set[uuid.UUID], set[int]]]:
+        """(chunk ids, page numbers) whose tokens contain any of `terms` as a
+        substring — a superset of units whose normalized text contains the
+        raw term. None when a term is pure punctuation (not resolvable here;
+        the caller must scan)."""
+        chunk_hits: set[uuid.UUID] = set()
+        page_hits: set[int] = set()
+        for raw in terms:
+            term = _EDGE_PUNCT_RE.sub("", raw)
+            if not term:
+                return None
+            for term_id in self._expand(term, substring=True):
+                units, _ = self._term_postings(self.chunks, term_id)
+                chunk_hits.update(self.chunk_ids[u] for u in units)
+                units, _ = self._term_postings(self.pages, term_id)
+                page_hits.update(self.page_numbers[u] for u in units)
+        return chunk_hits, page_hits
+
+
+class LexicalIndexCache:
+    """Loaded indexes in a ByteLRU, keyed by document and revalidated
+    against ``built_at`` so a reparse is picked up on the next request.
+
+    Subclasses cache other per-document parse-time blobs by overriding
+    ``model`` (a table with document_id/format_version/blob/built_at),
+    ``format_version`` and ``load``; loaded objects must expose ``nbytes``."""
+
+    model: Any = DocumentLexicalIndex
+    format_version = FORMAT_VERSION
+
+    @staticmethod
+    def load(blob: bytes) -> Any:
+        return LexicalIndex(blob)
+
+    def __init__(self, max_bytes: int) -> None:
+        self._lru = ByteLRU(max_bytes)
+
+    async def get(self, db: AsyncSession, document_id: uuid.UUID) -> Any:
+        """Loaded index for `document_id`, or None when none is stored (not
+        parsed since the index shipped, or built by another format)."""
+        model = self.model
+        row = (
+            await db.execute(
+                select(model.built_at, model.format_version).where(model.document_id == document_id)
+            )
+        ).first()
+        if row is None or row.format_version != self.format_version:
+            return None
+        index = self._lru.get(document_id, row.built_at)
+        if index is not None:
+            return index
+        blob = (
+            await db.execute(select(model.blob).where(model.document_id == document_id))
+        ).scalar_one_or_none()
+        if blob is None:
+            return None
+        index = await asyncio.to_thread(self.load, bytes(blob))
+        self._lru.put(document_id, row.built_at, index)
+        return index
+
+    def clear(self) -> None:
+        self._lru.clear()
+
+    def stats(self) -> dict:
+        return self._lru.stats()
+
+
+lexical_index_cache = LexicalIndexCache(int(settings.LEXICAL_INDEX_CACHE_MB) * 1024 * 1024)
@@ -0,0 +1,113 @@
+"""UNO side of the LibreOffice conversion pool (see conversion_service).
+
+Runs under the system Python that ships the ``uno`` module (python3-uno), not
+the app's interpreter, so it imports nothing from the app. It connects to one
+headless LibreOffice instance over a named UNO pipe, then answers JSON-line
+requests from stdin with one JSON line each on stdout:
+
+    {"op": "ping"}
+    {"op": "convert", "input": <path>, "output": <path>, "filter": <PDF export filter>}
+
+Replies are {"ok": true} or {"ok": false, "error": "..."}. Nothing is read
+until the instance accepts the connection, so the first reply also signals
+that the instance is up.
+
+The bridge takes its instance down with it. When stdin closes, or its parent
+dies mid-conversion (a Celery child leaves through os._exit or is killed at
+its hard time limit, and no cleanup runs there), it asks the instance to
+terminate. It then kills the instance's process group, which the pool started
+in its own session.
+
+Usage: python3 libreoffice_bridge.py <pipe name> <office pid>
+"""
+import json
+import os
+import signal
+import sys
+import threading
+import time
+
+import uno
+from com.sun.star.beans import PropertyValue
+from com.sun.star.connection import NoConnectException
+
+
+def _props(**values):
+    props = []
+    for name, value in values.items():
+        prop = PropertyValue()
+        prop.Name = name
+        prop.Value = value
+        props.append(prop)
+    return tuple(props)
+
+
+def _connect(pipe_name):
+    local = uno.getComponentContext()
+    resolver = local.ServiceManager.createInstanceWithContext("com.sun.star.bridge.UnoUrlResolver", local)
+    while True:
+        try:
+            ctx = resolver.resolve(f"uno:pipe,name={pipe_name};urp;StarOffice.ComponentContext")
+            return ctx.ServiceManager.createInstanceWithContext("com.sun.star.frame.Desktop", ctx)
+        except NoConnectException:
+            time.sleep(0.1)
+
+
+def _convert(desktop, input_path, output_path, filter_name):
+    doc = desktop.loadComponentFromURL(
+        uno.systemPathToFileUrl(input_path), "_blank", 0, _props(Hidden=True, ReadOnly=True)
+    )
+    if doc is None:
+        raise RuntimeError("document could not be loaded")
+    try:
+        doc.storeToURL(uno.systemPathToFileUrl(output_path), _props(FilterName=filter_name))
+    finally:
+        try:
+            doc.close(True)
+        except Exception:
+            doc.dispose()
+
+
+def _shut_down_office(desktop, office_pid):
+    if desktop is not None:
+        closer = threading.Thread(target=desktop.terminate, daemon=True)
+        closer.start()
+        closer.join(5)
+    try:
+        os.killpg(office_pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def _watch_parent(parent_pid, state, office_pid):
+    while os.getppid() == parent_pid:
+        time.sleep(1)
+    _shut_down_office(state.get("desktop"), office_pid)
+    os._exit(1)
+
+
+def main():
+    pipe_name, office_pid = sys.argv[1], int(sys.argv[2])
+    state = {}
+    threading.Thread(target=_watch_parent, args=(os.getppid(), state, office_pid), daemon=True).start()
+    desktop = state["desktop"] = _connect(pipe_name)
+    while True:
+        line = sys.stdin.readline()
+        if not line:
+            _shut_down_office(desktop, office_pid)
+            return
+        try:
+            request = json.loads(line)
+            if request.get("op") == "convert":
+                _convert(desktop, request["input"], request["output"], request["filter"])
+            else:
+                desktop.getComponents()  # a round trip to the instance
+            reply = {"ok": True}
+        except Exception as e:
+            reply = {"ok": False, "error": f"{type(e).__name__}: {e}"[:500]}
+        sys.stdout.write(json.dumps(reply) + "\n")
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""Parse-time normalized text for the Quote Finder (normalize once per document).
+
+Quote search's term scan normalizes every chunk and every ``Page.content``
+with ``normalize(..., fuzzy=True)`` and verification normalizes each source
+segment twice (base + fuzzy) — O(document) pure-Python work per request that
+yields the same result every time. The parse worker runs both levels once and
+stores them in ``document_normalized_texts``; readers get ``NormalizedText``
+values that unpack exactly like ``normalize()``'s ``(norm_text, norm_to_raw)``.
+
+``norm_to_raw`` is stored as the runs of normalize()'s ``OffsetMap`` and read
+back into one without copying.
+
+Blob layout (zlib-compressed; native little-endian uint32 arrays viewed
+zero-copy through ``memoryview.cast`` after decompression):
+
+    header      _HEADER (magic, format, n_chunks, n_pages, text_bytes, n_runs)
+    chunk ids   16 bytes x n_chunks
+    page nums   u32 x n_pages
+    entries     u32 x 6 per (unit, level): raw_len, norm_len, text_start,
+                text_end, run_start, run_end — units are chunks then pages,
+                levels base then fuzzy
+    text        UTF-8, padded to 4 bytes
+    runs        norm starts u32 x n_runs, raw starts u32 x n_runs
+"""
+
+from __future__ import annotations
+
+import struct
+import sys
+import uuid
+import zlib
+from array import array
+from typing import Iterable, NamedTuple, Optional
+
+from app.core.config import settings
+from app.models.tables import DocumentNormalizedText
+from app.services.lexical_index import LexicalIndexCache
+from app.services.text_normalizer import OffsetMap, normalize
+
+FORMAT_VERSION = 1
+_MAGIC = b"DTNT"
+_HEADER = struct.Struct("<4sIIIII")
+_ENTRY_FIELDS = 6
+_LEVELS = (False, True)  # fuzzy flag per stored level, in entry order
+
+if sys.byteorder != "little" or array("I").itemsize != 4:  # pragma: no cover - all supported targets
+    raise ImportError("normalized_text_index requires a little-endian platform with 4-byte array('I')")
+
+
+class NormalizedText(NamedTuple):
+    text: str
+    norm_to_raw: OffsetMap
+
+
+def build_normalized_blob(
+    chunks: Iterable[tuple[uuid.UUID, Optional[str]]],
+    pages: Iterable[tuple[int, Optional[str]]] = (),
+) -> bytes:
+    """Serialize both normalization levels of `chunks` ((id, text)) and
+    `pages` ((page_number, content); pages without content are skipped)."""
+    chunk_ids: list[uuid.UUID] = []
+    page_numbers = array("I")
+    entries = array("I")
+    text_parts: list[bytes] = []
+    text_len = 0
+    run_norm = array("I")
+    run_raw = array("I")
+
+    def _add(raw: str) -> None:
+        nonlocal text_len
+        for fuzzy in _LEVELS:
+            norm, norm_to_raw = normalize(raw, fuzzy=fuzzy)
+            encoded = norm.encode("utf-8")
+            run_start = len(run_norm)
+            norm_starts, raw_starts = norm_to_raw.runs()
+            run_norm.fromlist(norm_starts.tolist())
+            run_raw.fromlist(raw_starts.tolist())
+            entries.extend(
+                (len(raw), len(norm), text_len, text_len + len(encoded), run_start, len(run_norm))
+            )
+            text_parts.append(encoded)
+            text_len += len(encoded)
+
+    for chunk_id, text in chunks:
+        chunk_ids.append(chunk_id)
+        _add(text or "")
+    for page_number, content in pages:
+        if content:
+            page_numbers.append(int(page_number))
+            _add(content)
+
+    text_bytes = b"".join(text_parts)
+    text_bytes += b"\0" * (-len(text_bytes) % 4)
+    payload = b"".join(
+        (
+            _HEADER.pack(_MAGIC, FORMAT_VERSION, len(chunk_ids), len(page_numbers), len(text_bytes), len(run_norm)),
+            b"".join(chunk_id.bytes for chunk_id in chunk_ids),
+            page_numbers.tobytes(),
+            entries.tobytes(),
+            text_bytes,
+            run_norm.tobytes(),
+            run_raw.tobytes(),
+        )
+    )
+    return zlib.compress(payload, 6)
+
+
+class NormalizedTextIndex:
+    """Read-only view over a decompressed blob; the arrays are never copied."""
+
+    def __init__(self, blob: bytes) -> None:
+        payload = zlib.decompress(blob)
+        view = memoryview(payload)
+        magic, version, n_chunks, n_pages, text_bytes, n_runs = _HEADER.unpack_from(view, 0)
+        if magic != _MAGIC or version != FORMAT_VERSION:
+            raise ValueError("unsupported normalized text blob")
+        self.nbytes = len(payload)
+        pos = _HEADER.size
+        raw_ids = bytes(view[pos : pos + 16 * n_chunks])
+        pos += 16 * n_chunks
+        self._chunk_slots = {
+            uuid.UUID(bytes=raw_ids[i : i + 16]): slot for slot, i in enumerate(range(0, len(raw_ids), 16))
+        }
+
+        def _u32(count: int) -> memoryview:
+            nonlocal pos
+            out = view[pos : pos + 4 * count].cast("I")
+            pos += 4 * count
+            return out
+
+        page_numbers = _u32(n_pages)
+        self.page_numbers: list[int] = list(page_numbers)
+        self._page_slots = {pn: n_chunks + slot for slot, pn in enumerate(self.page_numbers)}
+        self._entries = _u32((n_chunks + n_pages) * len(_LEVELS) * _ENTRY_FIELDS)
+        self._text = view[pos : pos + text_bytes]
+        pos += text_bytes
+        self._run_norm = _u32(n_runs)
+        self._run_raw = _u32(n_runs)
+        self._payload = payload  # keep the buffer alive for the views
+
+    def _entry(self, slot: Optional[int], fuzzy: bool, raw_len: Optional[int]) -> Optional[NormalizedText]:
+        if slot is None:
+            return None
+        base = (slot * len(_LEVELS) + _LEVELS.index(fuzzy)) * _ENTRY_FIELDS
+        stored_raw_len, norm_len, text_start, text_end, run_start, run_end = self._entries[base : base + _ENTRY_FIELDS]
+        if raw_len is not None and raw_len != stored_raw_len:
+            return None  # not the text this entry was built from
+        text = str(self._text[text_start:text_end], "utf-8")
+        return NormalizedText(
+            text, OffsetMap(self._run_norm[run_start:run_end], self._run_raw[run_start:run_end], norm_len)
+        )
+
+    def chunk(self, chunk_id: uuid.UUID, *, fuzzy: bool, raw_len: Optional[int] = None) -> Optional[NormalizedText]:
+        """Normalized chunk text, or None when the chunk is not indexed (or
+        `raw_len` shows the stored entry was built from different text)."""
+        return self._entry(self._chunk_slots.get(chunk_id), fuzzy, raw_len)
+
+    def page(self, page_number: int, *, fuzzy: bool, raw_len: Optional[int] = None) -> Optional[NormalizedText]:
+        """Normalized ``Page.content``; None for pages without content."""
+        return self._entry(self._page_slots.get(page_number), fuzzy, raw_len)
+
+
+class NormalizedTextCache(LexicalIndexCache):
+    """Same byte-bounded, built_at-revalidated LRU as the lexical index."""
+
+    model = DocumentNormalizedText
+    format_version = FORMAT_VERSION
+
+    @staticmethod
+    def load(blob: bytes) -> NormalizedTextIndex:
+        return NormalizedTextIndex(blob)
+
+
+normalized_text_cache = NormalizedTextCache(int(settings.NORMALIZED_TEXT_CACHE_MB) * 1024 * 1024)
@@ -0,0 +1,47 @@
+"""OCR worker process for ParseService's parallel OCR (see parse_service._run_ocr_pool).
+
+Reads shards of page numbers as JSON lines on stdin and answers each with one
+JSON line of [page_number, page or null, error or null] triples. Exits on
+stdin EOF, which is also what it sees once the parent is gone.
+
+Usage: python -m app.services.ocr_worker <pdf path> <languages> <dpi>
+"""
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import sys
+
+import fitz  # PyMuPDF
+
+from app.services.parse_service import _OCR_PAGE_ERRORS, ParseService, _page_to_dict
+
+
+def main(argv: list[str]) -> None:
+    pdf_path, languages, dpi = argv[0], argv[1], int(argv[2])
+    # Replies get a private copy of stdout; anything MuPDF or Tesseract print
+    # goes to stderr instead of corrupting them.
+    replies = os.fdopen(os.dup(1), "w")
+    os.dup2(2, 1)
+    with open(pdf_path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    # memoryview: PyMuPDF reads the shared mapping in place, no per-worker copy.
+    doc = fitz.open(stream=memoryview(mapped), filetype="pdf")
+    service = ParseService()
+    while True:
+        line = sys.stdin.readline()
+        if not line:
+            return
+        out: list[list] = []
+        for pi in json.loads(line):
+            try:
+                out.append([pi, _page_to_dict(service._ocr_page(doc[pi - 1], pi, languages, dpi)), None])
+            except _OCR_PAGE_ERRORS as e:
+                out.append([pi, None, str(e)])
+        replies.write(json.dumps(out) + "\n")
+        replies.flush()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
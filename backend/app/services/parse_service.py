@@ -1,15 +1,25 @@
 from __future__ import annotations
 
+import contextlib
+import hashlib
+import json
 import logging
 import os
+import pickle
 import re
+import selectors
+import shutil
 import subprocess
+import sys
 import tempfile
+import time
 import unicodedata
+from array import array
 from collections import Counter
-from dataclasses import dataclass
+from collections.abc import Sequence as SequenceABC
+from dataclasses import asdict, dataclass, replace
 from statistics import median
-from typing import Any, List, Optional, Sequence, Tuple
+from typing import Any, Iterator, List, Optional, Sequence, Tuple
 
 import fitz  # PyMuPDF
 
@@ -95,6 +105,7 @@ def resolve_ocr_languages(locale: str | None = None, script: str | None = None)
     return "+".join(chosen[:3])
 
 
+_OCR_MAX_PIXELS = 20_000_000  # cap rendered OCR image to prevent Tesseract crashes
 _OSD_MAX_PIXELS = 20_000_000  # cap rendered image (same as extract_pages_ocr) to avoid OOM
 _OSD_MIN_CONFIDENCE = 1.0      # Tesseract OSD confidence floor; below this the guess is noise
 
@@ -269,6 +280,261 @@ class ElementInfo:
     metadata_json: dict[str, Any]
 
 
+class PageSpool(SequenceABC):
+    """Disk-backed Sequence[PageInfo] for large documents.
+
+    Pages are pickled into an anonymous temp file as they are extracted and
+    loaded back one at a time on access, so a 1,000-page book costs one page
+    of block geometry in memory instead of all of it. The parse pipeline
+    makes several passes (scan detection, header/footer statistics, elements,
+    chunks), each of which only ever needs the current page.
+    """
+
+    def __init__(self) -> None:
+        self._file = tempfile.TemporaryFile(prefix="doctalk-pages-")
+        self._offsets = array("q")
+        self._end = 0
+
+    def append(self, page: PageInfo) -> None:
+        data = pickle.dumps(page, protocol=pickle.HIGHEST_PROTOCOL)
+        self._file.seek(self._end)
+        self._file.write(data)
+        self._offsets.append(self._end)
+        self._end += len(data)
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def _load(self, i: int) -> PageInfo:
+        start = self._offsets[i]
+        stop = self._offsets[i + 1] if i + 1 < len(self._offsets) else self._end
+        self._file.seek(start)
+        return pickle.loads(self._file.read(stop - start))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._load(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("page index out of range")
+        return self._load(index)
+
+    def __iter__(self) -> Iterator[PageInfo]:
+        # Seek per item: independent iterators over one spool may interleave.
+        for i in range(len(self)):
+            yield self._load(i)
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __del__(self) -> None:
+        # The temp file is already unlinked; this only releases the handle
+        # promptly when a spool is dropped (e.g. replaced by OCR pages).
+        file = getattr(self, "_file", None)
+        if file is not None:
+            file.close()
+
+
+# Per-page OCR failures that skip the page. Narrow (not bare Exception) so a
+# Celery SoftTimeLimitExceeded — an Exception subclass — propagates to the
+# worker and the task honours its soft time limit instead of silently skipping
+# pages and running on.
+_OCR_PAGE_ERRORS = (RuntimeError, ValueError, OSError, MemoryError)
+
+_OCR_CHECKPOINT_ROOT = os.path.join(tempfile.gettempdir(), "doctalk-ocr")
+_OCR_CHECKPOINT_MAX_AGE_SECONDS = 24 * 3600
+# Upper bound on pages per pool task: small enough that a soft time limit
+# loses little in-flight work, large enough to amortize task round trips.
+_OCR_MAX_SHARD_PAGES = 8
+# OCR workers run `python -m app.services.ocr_worker` from the backend root.
+_BACKEND_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _page_to_dict(page: PageInfo) -> dict[str, Any]:
+    return asdict(page)
+
+
+def _page_from_dict(data: dict[str, Any]) -> PageInfo:
+    return PageInfo(
+        page_number=int(data["page_number"]),
+        width_pt=float(data["width_pt"]),
+        height_pt=float(data["height_pt"]),
+        rotation=int(data["rotation"]),
+        blocks=[
+            BlockInfo(page=int(b["page"]), text=b["text"], bbox=tuple(b["bbox"]), font_size=float(b["font_size"]))
+            for b in data["blocks"]
+        ],
+        raw_text=data.get("raw_text", ""),
+    )
+
+
+class OcrCheckpoint:
+    """Completed OCR pages on local disk, keyed by (PDF bytes, languages, DPI).
+
+    Every page is stored the moment its OCR finishes, so a task interrupted by
+    the soft time limit (or a worker restart) resumes on retry with only the
+    missing pages instead of re-running Tesseract on the whole document.
+    Pages are plain JSON of the PageInfo fields, never pickles, since the
+    directory sits under the shared temp dir. Best-effort: an unwritable disk
+    only costs the resume.
+    """
+
+    def __init__(self, pdf_bytes: bytes, languages: str, dpi: int, root: Optional[str] = None) -> None:
+        root = root or _OCR_CHECKPOINT_ROOT
+        digest = hashlib.sha256(pdf_bytes)
+        digest.update(f"\0{languages}\0{dpi}\0{PARSE_PIPELINE_VERSION}".encode())
+        self.path = os.path.join(root, digest.hexdigest())
+        self._prune(root)
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            os.utime(self.path)
+            names = os.listdir(self.path)
+        except OSError as e:
+            logger.warning("OCR checkpoint unavailable (%s): %s", self.path, e)
+            names = []
+        self.pages = {int(n[:-5]) for n in names if n.endswith(".json") and n[:-5].isdigit()}
+
+    @staticmethod
+    def _prune(root: str) -> None:
+        cutoff = time.time() - _OCR_CHECKPOINT_MAX_AGE_SECONDS
+        try:
+            entries = list(os.scandir(root))
+        except OSError:
+            return
+        for entry in entries:
+            try:
+                if entry.is_dir() and entry.stat().st_mtime < cutoff:
+                    shutil.rmtree(entry.path, ignore_errors=True)
+            except OSError:
+                continue
+
+    def _file(self, page_number: int) -> str:
+        return os.path.join(self.path, f"{page_number:06d}.json")
+
+    def get(self, page_number: int) -> Optional[PageInfo]:
+        try:
+            with open(self._file(page_number), "rb") as f:
+                return _page_from_dict(json.load(f))
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning("Discarding unreadable OCR checkpoint page %d: %s", page_number, e)
+            self.pages.discard(page_number)
+            return None
+
+    def store(self, page: PageInfo) -> bool:
+        tmp = f"{self._file(page.page_number)}.{os.getpid()}.tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(_page_to_dict(page), f, ensure_ascii=False)
+            os.replace(tmp, self._file(page.page_number))
+        except OSError as e:
+            logger.warning("Could not checkpoint OCR page %d: %s", page.page_number, e)
+            return False
+        self.pages.add(page.page_number)
+        return True
+
+    def discard(self) -> None:
+        shutil.rmtree(self.path, ignore_errors=True)
+
+
+def _ocr_dpi_for_page(page_number: int, width_pt: float, height_pt: float, dpi: int) -> int:
+    """Cap rendered image size at 20MP to prevent Tesseract crashes."""
+    page_w_px = width_pt * dpi / 72
+    page_h_px = height_pt * dpi / 72
+    if page_w_px * page_h_px <= _OCR_MAX_PIXELS:
+        return dpi
+    scale = (_OCR_MAX_PIXELS / (page_w_px * page_h_px)) ** 0.5
+    effective_dpi = max(72, int(dpi * scale))
+    logger.info("Page %d too large (%.0fx%.0f px at %d DPI), reducing to %d DPI",
+                page_number, page_w_px, page_h_px, dpi, effective_dpi)
+    return effective_dpi
+
+
+def _ocr_shards(page_numbers: Sequence[int], workers: int) -> List[list[int]]:
+    """Split pages into contiguous runs, ~4 per worker for load balancing."""
+    size = max(1, min(_OCR_MAX_SHARD_PAGES, -(-len(page_numbers) // (workers * 4))))
+    return [list(page_numbers[i : i + size]) for i in range(0, len(page_numbers), size)]
+
+
+def _send_shard(proc: subprocess.Popen, shard: list[int]) -> None:
+    assert proc.stdin is not None
+    proc.stdin.write(json.dumps(shard).encode() + b"\n")
+    proc.stdin.flush()
+
+
+def _run_ocr_pool(
+    pdf_bytes: bytes, shards: List[list[int]], languages: str, dpi: int, workers: int
+) -> Iterator[list[tuple[int, Optional[PageInfo], Optional[str]]]]:
+    """Yield shard results in completion order from OCR worker processes.
+
+    The workers (app/services/ocr_worker.py) are plain subprocesses, not a
+    multiprocessing pool: the parse task runs in a daemonic Celery prefork
+    child, and multiprocessing refuses to start children from one. Each
+    worker opens its own fitz document over a memory-mapped temp file and is
+    handed one shard at a time over stdin. If the consumer is interrupted
+    (Celery soft time limit) the workers are killed, so no Tesseract process
+    outlives the task. A worker that dies (OOM kill) surfaces as
+    ChildProcessError instead of hanging the task.
+    """
+    env = dict(os.environ)
+    # Parallelism comes from the workers; Tesseract's own OpenMP threads
+    # would only oversubscribe the cores.
+    env.setdefault("OMP_THREAD_LIMIT", "1")
+    env["PYTHONPATH"] = os.pathsep.join(p for p in (_BACKEND_ROOT, env.get("PYTHONPATH")) if p)
+    with tempfile.NamedTemporaryFile(prefix="doctalk-ocr-", suffix=".pdf") as tmp:
+        tmp.write(pdf_bytes)
+        tmp.flush()
+        queued = list(reversed(shards))
+        procs: list[subprocess.Popen] = []
+        selector = selectors.DefaultSelector()
+        try:
+            for _ in range(min(workers, len(shards))):
+                proc = subprocess.Popen(
+                    [sys.executable, "-m", "app.services.ocr_worker", tmp.name, languages, str(dpi)],
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    env=env,
+                )
+                procs.append(proc)
+                _send_shard(proc, queued.pop())
+                selector.register(proc.stdout, selectors.EVENT_READ, proc)
+            replies = {proc.pid: b"" for proc in procs}
+            busy = len(procs)
+            while busy:
+                for key, _events in selector.select():
+                    proc = key.data
+                    data = os.read(key.fd, 65536)
+                    if not data:
+                        raise ChildProcessError(f"OCR worker {proc.pid} exited with status {proc.wait()}")
+                    replies[proc.pid] += data
+                    # One shard in flight per worker, so a newline ends its reply.
+                    if not replies[proc.pid].endswith(b"\n"):
+                        continue
+                    reply, replies[proc.pid] = json.loads(replies[proc.pid]), b""
+                    if queued:
+                        _send_shard(proc, queued.pop())
+                    else:
+                        selector.unregister(key.fileobj)
+                        busy -= 1
+                    yield [(pi, _page_from_dict(page) if page else None, error) for pi, page, error in reply]
+        except BaseException:
+            for proc in procs:
+                if proc.poll() is None:
+                    proc.kill()
+            raise
+        finally:
+            selector.close()
+            for proc in procs:
+                for stream in (proc.stdin, proc.stdout):
+                    with contextlib.suppress(OSError):
+                        stream.close()  # stdin EOF lets an idle worker exit
+                try:
+                    proc.wait(timeout=10)
+                except subprocess.TimeoutExpired:
+                    proc.kill()
+                    proc.wait()
+
+
 class ParseService:
     """Core PDF parsing, cleaning and chunking utilities.
 
@@ -287,14 +553,20 @@ class ParseService:
     SENTENCE_DELIMS = "。！？；.!?"  # Chinese + English basic punctuation
 
     # -------------------------- Public API --------------------------
-    def extract_pages(self, pdf_bytes: bytes) -> List[PageInfo]:
+    def extract_pages(self, pdf_bytes: bytes) -> PageSpool:
         """Use PyMuPDF to extract all pages with text blocks and geometries.
 
-        Returns a list of PageInfo entries, one per page.
+        Returns a PageSpool (one PageInfo per page, spooled to disk).
         """
+        pages = PageSpool()
+        for page in self.iter_pages(pdf_bytes):
+            pages.append(page)
+        return pages
+
+    def iter_pages(self, pdf_bytes: bytes) -> Iterator[PageInfo]:
+        """Yield one PageInfo per page, extracting lazily page by page."""
         doc = fitz.open(stream=pdf_bytes, filetype="pdf")
         try:
-            pages: List[PageInfo] = []
             for pi, page in enumerate(doc, start=1):
                 rect = page.rect
                 rotation = int(page.rotation or 0)
@@ -314,96 +586,140 @@ class ParseService:
                     # Emit one BlockInfo per line for precise bbox granularity
                     for line_info in self._extract_line_blocks(pi, lines):
                         blocks.append(line_info)
+                del page_dict
 
                 # Raw linear text on the SAME open page (no second document
                 # open) — feeds Page.content forward-only (plan §8.1/§9).
                 raw_text = page.get_text("text")
 
-                pages.append(
-                    PageInfo(
-                        page_number=pi,
-                        width_pt=width_pt,
-                        height_pt=height_pt,
-                        rotation=rotation,
-                        blocks=blocks,
-                        raw_text=raw_text,
-                    )
+                yield PageInfo(
+                    page_number=pi,
+                    width_pt=width_pt,
+                    height_pt=height_pt,
+                    rotation=rotation,
+                    blocks=blocks,
+                    raw_text=raw_text,
                 )
-
-            return pages
         finally:
             # Always close the PDF document to free resources
             doc.close()
 
     def extract_pages_ocr(
-        self, pdf_bytes: bytes, languages: str = "eng+chi_sim", dpi: int = 300
-    ) -> List[PageInfo]:
+        self, pdf_bytes: bytes, languages: str = "eng+chi_sim", dpi: int = 300, workers: int = 1
+    ) -> PageSpool:
         """Extract pages using Tesseract OCR via PyMuPDF.
 
         Same interface as extract_pages() but uses OCR for scanned PDFs.
-        Requires Tesseract to be installed on the system.
+        Requires Tesseract to be installed on the system. With workers > 1,
+        page shards are OCR'd in worker processes (see _run_ocr_pool). Either
+        way completed pages are checkpointed (OcrCheckpoint), so a retry after
+        a soft time limit only OCRs the pages that are still missing.
         """
-        import logging
-        logger = logging.getLogger(__name__)
+        checkpoint = OcrCheckpoint(pdf_bytes, languages, dpi)
+        if checkpoint.pages:
+            logger.info("Resuming OCR: %d pages already checkpointed", len(checkpoint.pages))
+        if workers > 1:
+            pages = self._extract_pages_ocr_parallel(pdf_bytes, languages, dpi, workers, checkpoint)
+        else:
+            pages = self._extract_pages_ocr_serial(pdf_bytes, languages, dpi, checkpoint)
+        checkpoint.discard()
+        return pages
+
+    def _extract_pages_ocr_serial(
+        self, pdf_bytes: bytes, languages: str, dpi: int, checkpoint: OcrCheckpoint
+    ) -> PageSpool:
         doc = fitz.open(stream=pdf_bytes, filetype="pdf")
         try:
-            pages: List[PageInfo] = []
+            pages = PageSpool()
             for pi, page in enumerate(doc, start=1):
+                resumed = checkpoint.get(pi) if pi in checkpoint.pages else None
+                if resumed is not None:
+                    pages.append(resumed)
+                    continue
                 try:
-                    rect = page.rect
-                    rotation = int(page.rotation or 0)
-                    width_pt = float(rect.width)
-                    height_pt = float(rect.height)
-
-                    # Cap rendered image size at 20MP to prevent Tesseract crashes
-                    page_w_px = width_pt * dpi / 72
-                    page_h_px = height_pt * dpi / 72
-                    max_pixels = 20_000_000
-                    if page_w_px * page_h_px > max_pixels:
-                        scale = (max_pixels / (page_w_px * page_h_px)) ** 0.5
-                        effective_dpi = max(72, int(dpi * scale))
-                        logger.info("Page %d too large (%.0fx%.0f px at %d DPI), reducing to %d DPI",
-                                    pi, page_w_px, page_h_px, dpi, effective_dpi)
-                    else:
-                        effective_dpi = dpi
-
-                    tp = page.get_textpage_ocr(language=languages, dpi=effective_dpi, full=True)
-                    page_dict = page.get_text("dict", textpage=tp)
-                    blocks: List[BlockInfo] = []
-                    for blk in page_dict.get("blocks", []):
-                        if blk.get("type", 0) != 0:
-                            continue
-                        lines = blk.get("lines", [])
-                        if not lines:
-                            continue
-                        for line_info in self._extract_line_blocks(pi, lines):
-                            blocks.append(line_info)
-
-                    # Raw OCR'd linear text on the SAME textpage used for the
-                    # block dict above — feeds Page.content when OCR is adopted.
-                    raw_text = page.get_text("text", textpage=tp)
-
-                    pages.append(
-                        PageInfo(
-                            page_number=pi,
-                            width_pt=width_pt,
-                            height_pt=height_pt,
-                            rotation=rotation,
-                            blocks=blocks,
-                            raw_text=raw_text,
-                        )
-                    )
-                except (RuntimeError, ValueError, OSError, MemoryError) as e:
-                    # Narrow catch (not bare Exception) so a Celery SoftTimeLimitExceeded —
-                    # an Exception subclass — propagates to the worker and the task honours its
-                    # soft time limit instead of silently skipping pages and running on.
+                    info = self._ocr_page(page, pi, languages, dpi)
+                except _OCR_PAGE_ERRORS as e:
                     logger.warning("OCR failed on page %d: %s", pi, e)
                     # Skip this page but continue with the rest
                     continue
+                checkpoint.store(info)
+                pages.append(info)
             return pages
         finally:
             doc.close()
 
+    def _extract_pages_ocr_parallel(
+        self, pdf_bytes: bytes, languages: str, dpi: int, workers: int, checkpoint: OcrCheckpoint
+    ) -> PageSpool:
+        doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+        try:
+            page_count = doc.page_count
+        finally:
+            doc.close()
+        todo = [pi for pi in range(1, page_count + 1) if pi not in checkpoint.pages]
+        workers = min(workers, len(todo))
+        if workers <= 1:
+            return self._extract_pages_ocr_serial(pdf_bytes, languages, dpi, checkpoint)
+
+        # Pages the checkpoint could not take (disk error) stay in memory.
+        unsaved: dict[int, PageInfo] = {}
+        try:
+            results = _run_ocr_pool(pdf_bytes, _ocr_shards(todo, workers), languages, dpi, workers)
+            for shard in results:
+                for pi, info, error in shard:
+                    if info is None:
+                        logger.warning("OCR failed on page %d: %s", pi, error)
+                    elif not checkpoint.store(info):
+                        unsaved[pi] = info
+        except (OSError, ValueError) as e:
+            # Worker start-up failure (process limits), a worker killed
+            # mid-document (ChildProcessError) or a garbled reply: finish the
+            # pages still missing from the checkpoint without parallelism.
+            logger.warning("OCR worker processes unavailable (%s); falling back to serial OCR", e)
+            return self._extract_pages_ocr_serial(pdf_bytes, languages, dpi, checkpoint)
+
+        # Merge in page order from the checkpoint; failed pages are skipped.
+        pages = PageSpool()
+        for pi in range(1, page_count + 1):
+            info = unsaved.pop(pi, None)
+            if info is None and pi in checkpoint.pages:
+                info = checkpoint.get(pi)
+            if info is not None:
+                pages.append(info)
+        return pages
+
+    def _ocr_page(self, page: Any, pi: int, languages: str, dpi: int) -> PageInfo:
+        rect = page.rect
+        rotation = int(page.rotation or 0)
+        width_pt = float(rect.width)
+        height_pt = float(rect.height)
+        effective_dpi = _ocr_dpi_for_page(pi, width_pt, height_pt, dpi)
+
+        tp = page.get_textpage_ocr(language=languages, dpi=effective_dpi, full=True)
+        page_dict = page.get_text("dict", textpage=tp)
+        blocks: List[BlockInfo] = []
+        for blk in page_dict.get("blocks", []):
+            if blk.get("type", 0) != 0:
+                continue
+            lines = blk.get("lines", [])
+            if not lines:
+                continue
+            for line_info in self._extract_line_blocks(pi, lines):
+                blocks.append(line_info)
+
+        # Raw OCR'd linear text on the SAME textpage used for the
+        # block dict above — feeds Page.content when OCR is adopted.
+        raw_text = page.get_text("text", textpage=tp)
+
+        return PageInfo(
+            page_number=pi,
+            width_pt=width_pt,
+            height_pt=height_pt,
+            rotation=rotation,
+            blocks=blocks,
+            raw_text=raw_text,
+        )
+
     def detect_scanned(self, pages: Sequence[PageInfo]) -> bool:
         """Return True if the document appears to be scanned (no text layer).
 
@@ -464,77 +780,121 @@ class ParseService:
            with 50-token overlap
         5) Normalize bbox coordinates to [0,1] using page dims (top-left origin)
         """
-        # 1) Header/footer detection
+        return list(self.iter_chunks(pages))
+
+    def iter_chunks(self, pages: Sequence[PageInfo]) -> Iterator[ChunkInfo]:
+        """Streaming chunk_document: the document-wide signals (header/footer
+        texts, median font size) come from two cheap passes over `pages`; the
+        third pass streams page -> sentences -> chunks, holding only the
+        current chunk window. With a PageSpool that keeps memory flat in page
+        count. Output is identical to the former list-based pipeline."""
         header_texts, footer_texts = self._detect_header_footer_texts(pages)
-
-        # 2) Clean and collect blocks, also gather font sizes for median
-        all_clean_blocks: List[CleanBlock] = []
+        median_size = self._clean_median_font_size(pages, header_texts, footer_texts)
+        if median_size is None:
+            return
         page_dims: dict[int, Tuple[float, float]] = {}
-        for p in pages:
-            page_dims[p.page_number] = (p.width_pt, p.height_pt)
-            cleaned = self.clean_text_blocks(
-                p.blocks, p.width_pt, p.height_pt, header_texts=header_texts, footer_texts=footer_texts
-            )
-            all_clean_blocks.extend(self._order_blocks_for_reading(cleaned, p.width_pt, p.height_pt))
-
-        if not all_clean_blocks:
-            return []
+        sentences = self._iter_sentences(pages, header_texts, footer_texts, median_size, page_dims)
+        yield from self._filter_micro_chunks(self._assemble_chunks(sentences, page_dims))
 
-        font_sizes = [cb.font_size for cb in all_clean_blocks if cb.font_size > 0]
-        median_size = median(font_sizes) if font_sizes else 12.0
-
-        # 3) Determine headings and build content sentences
+    def _iter_clean_ordered_blocks(
+        self, page: PageInfo, header_texts: set[str], footer_texts: set[str]
+    ) -> List[CleanBlock]:
+        cleaned = self.clean_text_blocks(
+            page.blocks,
+            page.width_pt,
+            page.height_pt,
+            header_texts=header_texts,
+            footer_texts=footer_texts,
+        )
+        return self._order_blocks_for_reading(cleaned, page.width_pt, page.height_pt)
+
+    def _clean_median_font_size(
+        self, pages: Sequence[PageInfo], header_texts: set[str], footer_texts: set[str]
+    ) -> Optional[float]:
+        """Median font size over all cleaned blocks (12.0 when none carry a
+        size); None when cleaning leaves no blocks at all."""
+        sizes = array("d")
+        any_blocks = False
+        for p in pages:
+            for cb in self._iter_clean_ordered_blocks(p, header_texts, footer_texts):
+                any_blocks = True
+                if cb.font_size > 0:
+                    sizes.append(cb.font_size)
+        if not any_blocks:
+            return None
+        return median(sizes) if sizes else 12.0
+
+    def _iter_sentences(
+        self,
+        pages: Sequence[PageInfo],
+        header_texts: set[str],
+        footer_texts: set[str],
+        median_size: float,
+        page_dims: dict[int, Tuple[float, float]],
+    ) -> Iterator[tuple[str, int, Tuple[float, float, float, float], Optional[str]]]:
+        """(text, page, bbox, section_title) per content sentence; headings
+        update the running section title and are not emitted. Records each
+        page's dimensions in `page_dims` before yielding its sentences."""
         current_section_title: Optional[str] = None
-        # (text, page, bbox, section_title)
-        sentences: List[tuple[str, int, Tuple[float, float, float, float], Optional[str]]] = []
-
-        for cb in all_clean_blocks:
-            if self._is_heading_block(cb, median_size):
-                # Heading: update current section title; do not include in content
-                title = cb.text.strip()
-                # Avoid overly long titles
-                current_section_title = title[:200] if title else None
-                continue
-
-            # Treat each block as a paragraph, split it into sentences
-            for sent in self._split_into_sentences(cb.text):
-                st = sent.strip()
-                if not st:
+        for p in pages:
+            page_dims[p.page_number] = (p.width_pt, p.height_pt)
+            for cb in self._iter_clean_ordered_blocks(p, header_texts, footer_texts):
+                if self._is_heading_block(cb, median_size):
+                    # Heading: update current section title; do not include in content
+                    title = cb.text.strip()
+                    # Avoid overly long titles
+                    current_section_title = title[:200] if title else None
                     continue
-                sentences.append((st, cb.page, cb.bbox, current_section_title))
 
-        # 4) Assemble chunks by sentences with overlap
-        chunks: List[ChunkInfo] = []
-        if not sentences:
-            return chunks
+                # Treat each block as a paragraph, split it into sentences
+                for sent in self._split_into_sentences(cb.text):
+                    st = sent.strip()
+                    if not st:
+                        continue
+                    yield (st, cb.page, cb.bbox, current_section_title)
 
-        # Build parallel token counts for each sentence
-        sent_tokens = [self._estimate_tokens(t) for (t, _pg, _bb, _sec) in sentences]
+    def _assemble_chunks(
+        self,
+        sentences: Iterator[tuple[str, int, Tuple[float, float, float, float], Optional[str]]],
+        page_dims: dict[int, Tuple[float, float]],
+    ) -> Iterator[ChunkInfo]:
+        """Assemble chunks by sentences with overlap. `window` holds the
+        sentences from the current chunk start onward (plus at most one
+        sentence of lookahead), never the whole document."""
+        window: List[tuple[str, int, Tuple[float, float, float, float], Optional[str]]] = []
+        window_tokens: List[int] = []
+
+        def fill(n: int) -> bool:
+            """Pull sentences until the window holds at least n; False if exhausted first."""
+            while len(window) < n:
+                nxt = next(sentences, None)
+                if nxt is None:
+                    return False
+                window.append(nxt)
+                window_tokens.append(self._estimate_tokens(nxt[0]))
+            return True
 
-        start_idx = 0
         chunk_index = 0
-
-        while start_idx < len(sentences):
+        while fill(1):
             token_sum = 0
-            end_idx = start_idx
+            end_idx = 0
 
             # Expand until reaching the target range
-            while end_idx < len(sentences) and token_sum < self.TARGET_MIN_TOKENS:
-                token_sum += sent_tokens[end_idx]
+            while token_sum < self.TARGET_MIN_TOKENS and fill(end_idx + 1):
+                token_sum += window_tokens[end_idx]
                 end_idx += 1
 
             # If we can still add more sentences without exceeding max, do so
-            while end_idx < len(sentences) and (token_sum + sent_tokens[end_idx]) <= self.TARGET_MAX_TOKENS:
-                token_sum += sent_tokens[end_idx]
+            while fill(end_idx + 1) and (token_sum + window_tokens[end_idx]) <= self.TARGET_MAX_TOKENS:
+                token_sum += window_tokens[end_idx]
                 end_idx += 1
 
             # Fallback: ensure at least one sentence
-            if end_idx == start_idx:
-                end_idx = min(start_idx + 1, len(sentences))
-                token_sum = sum(sent_tokens[start_idx:end_idx])
+            if end_idx == 0:
+                end_idx = 1
 
             # Aggregate text and bboxes
-            sel = sentences[start_idx:end_idx]
+            sel = window[:end_idx]
             text = self._join_text_units([s for (s, _pg, _bb, _sec) in sel])
             pages_range = [pg for (_t, pg, _bb, _sec) in sel]
             page_start = min(pages_range) if pages_range else 1
@@ -546,45 +906,47 @@ class ParseService:
                 w, h = page_dims.get(pg, (1.0, 1.0))
                 bbox_dicts.append(self._normalize_bbox(pg, bb, w, h))
 
-            # Track section title for this chunk as the last known heading before start_idx
-            # We approximate by scanning backwards to find the last heading block before start_idx
-            # Since we do not store headings separately per position, we reuse last_known_title
+            # Section title of the chunk's first sentence
             section_title = sel[0][3] if sel and sel[0][3] else None
 
-            chunks.append(
-                ChunkInfo(
-                    text=text,
-                    chunk_index=chunk_index,
-                    page_start=page_start,
-                    page_end=page_end,
-                    bboxes=bbox_dicts,
-                    section_title=section_title,
-                    token_count=self._estimate_tokens(text),
-                )
+            yield ChunkInfo(
+                text=text,
+                chunk_index=chunk_index,
+                page_start=page_start,
+                page_end=page_end,
+                bboxes=bbox_dicts,
+                section_title=section_title,
+                token_count=self._estimate_tokens(text),
             )
             chunk_index += 1
 
-            # Advance start index with overlap of 50 tokens
-            # Compute how many sentences to step back to preserve ~50 tokens overlap
+            # Advance start index with overlap of 50 tokens: step back k
+            # sentences so the tail carries ~OVERLAP_TOKENS into the next window
             overlap = self.OVERLAP_TOKENS
-            # We want next window to start so that the tail has ~overlap tokens
-            # Find k: sum of last k sentences' tokens >= overlap
             k = 0
             acc = 0
             j = end_idx - 1
-            while j >= start_idx and acc < overlap:
-                acc += sent_tokens[j]
+            while j >= 0 and acc < overlap:
+                acc += window_tokens[j]
                 k += 1
                 j -= 1
-            next_start = max(end_idx - k, start_idx + 1)  # ensure progress
-
-            start_idx = next_start
-
-        # Post-process: remove micro-chunks that provide no retrieval value.
-        # These arise from form fields, metadata footers, or single short lines.
+            next_start = max(end_idx - k, 1)  # ensure progress
+            del window[:next_start]
+            del window_tokens[:next_start]
+
+    def _filter_micro_chunks(self, chunks: Iterator[ChunkInfo]) -> Iterator[ChunkInfo]:
+        """Remove micro-chunks that provide no retrieval value (form fields,
+        metadata footers, single short lines) by merging them into a
+        neighbour, and re-index. The last kept chunk is held back until the
+        next one arrives because a following micro-chunk merges into it."""
         MIN_CHUNK_CHARS = 50
-        filtered: List[ChunkInfo] = []
+        held: Optional[ChunkInfo] = None
         pending_micro: List[ChunkInfo] = []
+        out_index = 0
+
+        def reindexed(c: ChunkInfo, i: int) -> ChunkInfo:
+            return c if c.chunk_index == i else replace(c, chunk_index=i)
+
         for c in chunks:
             if len(c.text.strip()) >= MIN_CHUNK_CHARS:
                 if pending_micro:
@@ -593,36 +955,25 @@ class ParseService:
                         prefix = self._merge_adjacent_chunks(prefix, micro)
                     c = self._merge_adjacent_chunks(prefix, c)
                     pending_micro = []
-                filtered.append(c)
-            elif filtered:
+                if held is not None:
+                    yield reindexed(held, out_index)
+                    out_index += 1
+                held = c
+            elif held is not None:
                 # Merge micro-chunk text into previous chunk
-                prev = filtered[-1]
-                filtered[-1] = self._merge_adjacent_chunks(prev, c)
+                held = self._merge_adjacent_chunks(held, c)
             else:
                 pending_micro.append(c)
 
-        if pending_micro and not filtered:
+        if held is not None:
+            yield reindexed(held, out_index)
+        elif pending_micro:
             # Short documents still need a searchable chunk; do not filter the
             # whole document down to nothing.
             combined = pending_micro[0]
             for micro in pending_micro[1:]:
                 combined = self._merge_adjacent_chunks(combined, micro)
-            filtered.append(combined)
-
-        # Re-index chunk_index after filtering
-        for i, c in enumerate(filtered):
-            if c.chunk_index != i:
-                filtered[i] = ChunkInfo(
-                    text=c.text,
-                    chunk_index=i,
-                    page_start=c.page_start,
-                    page_end=c.page_end,
-                    bboxes=c.bboxes,
-                    section_title=c.section_title,
-                    token_count=c.token_count,
-                )
-
-        return filtered
+            yield reindexed(combined, 0)
 
     def extract_elements(self, pages: Sequence[PageInfo]) -> List[ElementInfo]:
         """Build a canonical reading-order element stream from parsed pages.
@@ -632,57 +983,46 @@ class ParseService:
         table-aware retrieval so those workflows do not have to infer document
         structure from arbitrary chunk windows.
         """
+        return list(self.iter_elements(pages))
+
+    def iter_elements(self, pages: Sequence[PageInfo]) -> Iterator[ElementInfo]:
+        """Streaming extract_elements (same passes as iter_chunks)."""
         header_texts, footer_texts = self._detect_header_footer_texts(pages)
+        median_size = self._clean_median_font_size(pages, header_texts, footer_texts)
+        if median_size is None:
+            return
 
-        all_clean_blocks: List[CleanBlock] = []
+        current_section_title: Optional[str] = None
+        current_heading_order: Optional[int] = None
         page_dims: dict[int, Tuple[float, float]] = {}
+        page_block_orders: dict[int, int] = {}
         for p in pages:
             page_dims[p.page_number] = (p.width_pt, p.height_pt)
-            cleaned = self.clean_text_blocks(
-                p.blocks,
-                p.width_pt,
-                p.height_pt,
-                header_texts=header_texts,
-                footer_texts=footer_texts,
-            )
-            all_clean_blocks.extend(self._order_blocks_for_reading(cleaned, p.width_pt, p.height_pt))
-
-        if not all_clean_blocks:
-            return []
-
-        font_sizes = [cb.font_size for cb in all_clean_blocks if cb.font_size > 0]
-        median_size = median(font_sizes) if font_sizes else 12.0
+            for block in self._iter_clean_ordered_blocks(p, header_texts, footer_texts):
+                text = block.text.strip().replace("\x00", "")
+                if not text:
+                    continue
+                page_block_order = page_block_orders.get(block.page, 0)
+                page_block_orders[block.page] = page_block_order + 1
+                reading_order = block.page * 10000 + page_block_order
+                page_width, page_height = page_dims.get(block.page, (1.0, 1.0))
+                bbox = self._normalize_bbox(block.page, block.bbox, page_width, page_height)
+                is_heading = self._is_heading_block(block, median_size)
+                metadata: dict[str, Any] = {
+                    "font_size": round(float(block.font_size or 0.0), 2),
+                }
+                if is_heading:
+                    element_type = "heading"
+                    current_section_title = text[:200]
+                    current_heading_order = reading_order
+                else:
+                    element_type = "paragraph"
+                    if current_section_title:
+                        metadata["section_title"] = current_section_title
+                    if current_heading_order is not None:
+                        metadata["parent_reading_order"] = current_heading_order
 
-        elements: List[ElementInfo] = []
-        current_section_title: Optional[str] = None
-        current_heading_order: Optional[int] = None
-        page_block_orders: dict[int, int] = {}
-        for block in all_clean_blocks:
-            text = block.text.strip().replace("\x00", "")
-            if not text:
-                continue
-            page_block_order = page_block_orders.get(block.page, 0)
-            page_block_orders[block.page] = page_block_order + 1
-            reading_order = block.page * 10000 + page_block_order
-            page_width, page_height = page_dims.get(block.page, (1.0, 1.0))
-            bbox = self._normalize_bbox(block.page, block.bbox, page_width, page_height)
-            is_heading = self._is_heading_block(block, median_size)
-            metadata: dict[str, Any] = {
-                "font_size": round(float(block.font_size or 0.0), 2),
-            }
-            if is_heading:
-                element_type = "heading"
-                current_section_title = text[:200]
-                current_heading_order = reading_order
-            else:
-                element_type = "paragraph"
-                if current_section_title:
-                    metadata["section_title"] = current_section_title
-                if current_heading_order is not None:
-                    metadata["parent_reading_order"] = current_heading_order
-
-            elements.append(
-                ElementInfo(
+                yield ElementInfo(
                     element_type=element_type,
                     page_start=block.page,
                     page_end=block.page,
@@ -691,9 +1031,6 @@ class ParseService:
                     reading_order=reading_order,
                     metadata_json=metadata,
                 )
-            )
-
-        return elements
 
     # -------------------------- Helpers --------------------------
     def _order_blocks_for_reading(
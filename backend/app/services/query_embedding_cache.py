@@ -0,0 +1,141 @@
+"""Process-local LRU (with TTL) of query vectors, plus single-flight.
+
+One chat turn embeds the same question several times — corrective retrieval,
+quote search candidates, planned sub-queries — and suggested-question clicks
+on demo documents repeat the exact same strings across users. The Redis
+embedding cache already saves provider spend, but each lookup is still a
+network round trip; this layer answers repeats from memory and collapses
+concurrent identical queries into ONE provider call.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Optional
+
+from app.core.config import settings
+from app.services.embedding_cache import normalize_for_cache
+from app.services.embedding_service import embedding_service
+
+
+class QueryEmbeddingCache:
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self.max_entries = max(1, int(max_entries))
+        self.ttl_seconds = float(ttl_seconds)
+        self._entries: "OrderedDict[str, tuple[float, List[float]]]" = OrderedDict()
+        self._inflight: dict[str, asyncio.Task] = {}
+        # Guards _entries: the sync path runs on worker/to_thread threads.
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    @staticmethod
+    def _key(query: str) -> str:
+        return f"{embedding_service.model}\x00{normalize_for_cache(query)}"
+
+    def _lookup(self, key: str) -> Optional[List[float]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            stored_at, vector = entry
+            if time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return vector
+
+    def _store(self, key: str, vector: List[float]) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic(), vector)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    async def _fetch(self, key: str, query: str) -> List[float]:
+        vector = (await embedding_service.aembed_texts([query]))[0]
+        self._store(key, vector)
+        return vector
+
+    async def embed(self, query: str) -> List[float]:
+        """Query vector; concurrent callers for the same key share one call.
+
+        The provider call runs in its own task and every caller awaits it
+        through shield(), so a cancelled caller (client disconnect) never
+        cancels the embed other requests are waiting on.
+        """
+        key = self._key(query)
+        vector = self._lookup(key)
+        if vector is not None:
+            return vector
+        loop = asyncio.get_running_loop()
+        task = self._inflight.get(key)
+        if task is None or task.get_loop() is not loop:
+            task = loop.create_task(self._fetch(key, query))
+            self._inflight[key] = task
+
+            def _forget(done: asyncio.Task, key: str = key) -> None:
+                if self._inflight.get(key) is done:
+                    del self._inflight[key]
+                if not done.cancelled():
+                    done.exception()  # mark retrieved; callers re-raise it
+
+            task.add_done_callback(_forget)
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def embed_sync(self, query: str) -> List[float]:
+        """Cached query vector for sync callers (Celery job workers)."""
+        key = self._key(query)
+        vector = self._lookup(key)
+        if vector is None:
+            vector = embedding_service.embed_texts([query])[0]
+            self._store(key, vector)
+        return vector
+
+    def embed_many_sync(self, queries: List[str]) -> List[List[float]]:
+        """Cached vectors for several queries; the misses go to the provider
+        in one embed_texts call."""
+        keys = [self._key(query) for query in queries]
+        vectors: List[Optional[List[float]]] = [self._lookup(key) for key in keys]
+        missing: dict[str, List[int]] = {}
+        for i, (key, vector) in enumerate(zip(keys, vectors)):
+            if vector is None:
+                missing.setdefault(key, []).append(i)
+        if missing:
+            fresh = embedding_service.embed_texts([queries[positions[0]] for positions in missing.values()])
+            for (key, positions), vector in zip(missing.items(), fresh):
+                self._store(key, vector)
+                for i in positions:
+                    vectors[i] = vector
+        return vectors  # type: ignore[return-value]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+        }
+
+
+query_embedding_cache = QueryEmbeddingCache(
+    settings.QUERY_EMBEDDING_CACHE_SIZE,
+    settings.QUERY_EMBEDDING_CACHE_TTL_SECONDS,
+)
@@ -3,11 +3,15 @@ from __future__ import annotations
 import csv
 import io
 import logging
+import time
 import uuid
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from datetime import datetime, timezone
-from typing import Any, Sequence
+from typing import Any, Iterable, Sequence
 
+from app.core.config import settings
 from app.models.tables import (
+    Chunk,
     Document,
     DocumentJob,
     ExtractionResult,
@@ -15,6 +19,8 @@ from app.models.tables import (
     collection_documents,
 )
 from app.services.credit_service import calculate_cost
+from app.services.document_element_service import get_element_aware_chunks
+from app.services.embedding_service import embedding_service
 from app.services.extraction_service import (
     EXTRACTION_MODE,
     EXTRACTION_MODEL,
@@ -25,7 +31,11 @@ from app.services.extraction_service import (
     _refs,
     _refund_predebit_sync,
     _str,
-    retrieve_extraction_chunks,
+    element_chunk_budget,
+    first_chunks,
+    per_query_budget,
+    retrieve_by_queries,
+    select_context_chunks,
 )
 
 logger = logging.getLogger(__name__)
@@ -35,6 +45,8 @@ QUESTION_TEMPLATE_RESULT_KEY = "question_template"
 QUESTION_TEMPLATE_PREDEBIT_PER_CELL = 15
 MAX_TEMPLATE_QUESTIONS = 20
 MAX_TEMPLATE_DOCS = 25
+_CELL_MAX_CHUNKS = 8
+_PROGRESS_SAVE_SECONDS = 2.0
 
 
 def normalize_questions(questions: Sequence[Any]) -> list[str]:
@@ -112,6 +124,128 @@ def render_question_template_csv(data: dict[str, Any]) -> str:
     return buf.getvalue()
 
 
+def _answer_cell(
+    template: ExtractionTemplate,
+    chunks: list[tuple[Any, float]],
+    locale: str | None,
+) -> tuple[dict[str, Any], list[dict[str, Any]], int, int]:
+    """One question × document LLM call; runs on the executor's threads."""
+    raw, prompt_tokens, completion_tokens = _call_llm(template, chunks, locale, None)
+    normalized = _normalize_answer(raw, len(chunks))
+    citations = [
+        _citation_from_chunk(ref, chunks[ref - 1][0], chunks[ref - 1][1])
+        for ref in normalized["source_refs"]
+        if 1 <= ref <= len(chunks)
+    ]
+    return normalized, citations, prompt_tokens, completion_tokens
+
+
+def _save_progress(db: Any, job: DocumentJob, cells: dict[tuple[int, int], dict[str, Any]], total: int) -> None:
+    """Expose answered cells, in their final order, while the job runs."""
+    partial = [
+        {k: v for k, v in cells[key].items() if k != "citations" and not k.startswith("_")}
+        for key in sorted(cells)
+    ]
+    job.metadata_json = {
+        **(job.metadata_json or {}),
+        "progress": {"cells_done": len(cells), "cells_total": total, "answers": partial},
+    }
+    job.updated_at = datetime.now(timezone.utc)
+    db.add(job)
+    db.commit()
+
+
+def _answer_cells(
+    db: Any,
+    job: DocumentJob,
+    docs: Sequence[Document],
+    questions: list[str],
+    locale: str | None,
+) -> dict[tuple[int, int], dict[str, Any]]:
+    """Answer every question × document cell, keyed by (doc index, question index).
+
+    Retrieval stays on this thread (it uses the job's session). The question
+    vectors are embedded once for all documents, and each document's
+    element-aware chunks are fetched once for all questions. Up to
+    QUESTION_TEMPLATE_CONCURRENCY LLM calls run at a time. Finished cells are
+    written to the job's progress at most every _PROGRESS_SAVE_SECONDS.
+    """
+    templates = [_question_extraction_template(question) for question in questions]
+    vectors: list[list[float]] | None = None
+    try:
+        vectors = list(embedding_service.embed_texts(questions))
+    except Exception as exc:
+        logger.warning("Question template embedding batch failed; using the query cache: %s", exc)
+
+    total = len(docs) * len(questions)
+    cells: dict[tuple[int, int], dict[str, Any]] = {}
+    workers = max(1, settings.QUESTION_TEMPLATE_CONCURRENCY)
+    pending: dict[Future, tuple[tuple[int, int], dict[str, Any]]] = {}
+    last_saved = time.monotonic()
+
+    def _collect(done: Iterable[Future]) -> None:
+        for future in done:
+            key, cell = pending.pop(future)
+            normalized, citations, p_tokens, c_tokens = future.result()
+            for citation in citations:
+                citation["document_filename"] = cell["document_filename"]
+            cell.update(
+                answer=normalized["answer"], source_refs=normalized["source_refs"], citations=citations,
+                _prompt_tokens=p_tokens, _completion_tokens=c_tokens,
+            )
+            cells[key] = cell
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="question-template") as pool:
+        try:
+            for doc_index, doc in enumerate(docs):
+                element_chunks = get_element_aware_chunks(
+                    db, doc.id, max_chunks=element_chunk_budget(_CELL_MAX_CHUNKS)
+                )
+                ranked_lists = retrieve_by_queries(
+                    db, doc.id, questions, per_query_budget(_CELL_MAX_CHUNKS, 1), query_vectors=vectors
+                )
+                fallback: list[tuple[Chunk, float]] | None = None
+                for question_index, (question, template) in enumerate(zip(questions, templates)):
+                    chunks = select_context_chunks(element_chunks, [ranked_lists[question_index]], _CELL_MAX_CHUNKS)
+                    if not chunks:
+                        if fallback is None:
+                            fallback = first_chunks(db, doc.id, _CELL_MAX_CHUNKS)
+                        chunks = fallback
+                    cell = {
+                        "document_id": str(doc.id),
+                        "document_filename": doc.filename,
+                        "question_index": question_index,
+                        "question": question,
+                        "answer": "",
+                        "source_refs": [],
+                        "citations": [],
+                        "_prompt_tokens": 0,
+                        "_completion_tokens": 0,
+                    }
+                    if not chunks:
+                        cells[(doc_index, question_index)] = cell
+                        continue
+                    # Keep retrieval at most one round of calls ahead of the LLM.
+                    if len(pending) >= 2 * workers:
+                        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        _collect(done)
+                    pending[pool.submit(_answer_cell, template, chunks, locale)] = ((doc_index, question_index), cell)
+                    if time.monotonic() - last_saved >= _PROGRESS_SAVE_SECONDS:
+                        _save_progress(db, job, cells, total)
+                        last_saved = time.monotonic()
+            while pending:
+                done, _ = wait(pending, timeout=_PROGRESS_SAVE_SECONDS, return_when=FIRST_COMPLETED)
+                _collect(done)
+                if time.monotonic() - last_saved >= _PROGRESS_SAVE_SECONDS:
+                    _save_progress(db, job, cells, total)
+                    last_saved = time.monotonic()
+        except BaseException:
+            for future in pending:
+                future.cancel()
+            raise
+    return cells
+
+
 def run_batch_template_job_sync(job_id: str) -> None:
     from sqlalchemy import select
 
@@ -166,46 +300,11 @@ def run_batch_template_job_sync(job_id: str) -> None:
                 raise ValueError("DOCUMENT_NOT_READY")
 
             locale = scope.get("locale")
-            answers: list[dict[str, Any]] = []
-            all_citations: list[dict[str, Any]] = []
-            prompt_tokens = 0
-            completion_tokens = 0
-            for doc in ordered_docs:
-                for question_index, question in enumerate(questions):
-                    template = _question_extraction_template(question)
-                    chunks = retrieve_extraction_chunks(db, doc.id, template, max_chunks=8)
-                    if not chunks:
-                        answers.append({
-                            "document_id": str(doc.id),
-                            "document_filename": doc.filename,
-                            "question_index": question_index,
-                            "question": question,
-                            "answer": "",
-                            "source_refs": [],
-                            "citations": [],
-                        })
-                        continue
-                    raw, p_tokens, c_tokens = _call_llm(template, chunks, locale, None)
-                    prompt_tokens += p_tokens
-                    completion_tokens += c_tokens
-                    normalized = _normalize_answer(raw, len(chunks))
-                    citations = [
-                        _citation_from_chunk(ref, chunks[ref - 1][0], chunks[ref - 1][1])
-                        for ref in normalized["source_refs"]
-                        if 1 <= ref <= len(chunks)
-                    ]
-                    for citation in citations:
-                        citation["document_filename"] = doc.filename
-                    all_citations.extend(citations)
-                    answers.append({
-                        "document_id": str(doc.id),
-                        "document_filename": doc.filename,
-                        "question_index": question_index,
-                        "question": question,
-                        "answer": normalized["answer"],
-                        "source_refs": normalized["source_refs"],
-                        "citations": citations,
-                    })
+            cells = _answer_cells(db, job, ordered_docs, questions, locale)
+            answers = [cells[key] for key in sorted(cells)]
+            all_citations = [citation for answer in answers for citation in answer["citations"]]
+            prompt_tokens = sum(cell.pop("_prompt_tokens") for cell in answers)
+            completion_tokens = sum(cell.pop("_completion_tokens") for cell in answers)
 
             structured = {
                 "template": {
@@ -233,6 +332,10 @@ def run_batch_template_job_sync(job_id: str) -> None:
                 )
             )
             job.cost_credits = actual_cost
+            job.metadata_json = {
+                **(job.metadata_json or {}),
+                "progress": {"cells_done": len(answers), "cells_total": len(answers)},
+            }
             job.status = "succeeded"
             job.error_code = None
             job.error_message = None
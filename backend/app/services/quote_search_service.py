@@ -23,6 +23,7 @@ import logging
 import re
 import uuid
 from dataclasses import dataclass
+from functools import partial
 from typing import Any, Optional
 
 from openai import AsyncOpenAI
@@ -31,7 +32,13 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
 from app.models.tables import Chunk, Document, Page, User
+from app.services.chunk_cache import DocumentChunks, chunk_cache, fetch_chunks_by_id
 from app.services.corrective_retrieval_service import corrective_retrieval_service
+from app.services.lexical_index import LexicalIndex, lexical_index_cache
+from app.services.normalized_text_index import (
+    NormalizedTextIndex,
+    normalized_text_cache,
+)
 from app.services.query_router import QueryRouter
 from app.services.quote_source_service import (
     QuoteSource,
@@ -169,7 +176,11 @@ def _json_from_text(text: str) -> dict[str, Any]:
 
 # -------------------------- candidate gathering --------------------------
 
-async def _all_document_chunks(db: AsyncSession, document_id: uuid.UUID) -> list[Chunk]:
+async def _all_document_chunks(db: AsyncSession, document: Document) -> list[Chunk]:
+    cached = await chunk_cache.get(db, document.id, document)
+    if cached is not None:
+        return cached.chunks
+    document_id = document.id
     result = await db.execute(
         select(Chunk).where(Chunk.document_id == document_id).order_by(Chunk.chunk_index)
     )
@@ -183,7 +194,13 @@ async def _all_document_pages(db: AsyncSession, document_id: uuid.UUID) -> list[
     return list(result.scalars().all())
 
 
-def _term_scan_candidates(chunks: list[Chunk], pages: list[Page], topic: str) -> list[Chunk]:
+def _term_scan_candidates(
+    chunks: list[Chunk],
+    pages: list[Page],
+    topic: str,
+    index: Optional[LexicalIndex] = None,
+    texts: Optional[NormalizedTextIndex] = None,
+) -> list[Chunk]:
     """Deterministic candidate expansion (§8.3/§8.1): normalized phrase/term
     scan over the document's chunks (and page text where present), merged
     into retrieval candidates before generation. Over-retrieve alone is
@@ -200,7 +217,15 @@ def _term_scan_candidates(chunks: list[Chunk], pages: list[Page], topic: str) ->
     page-text corpus can hold a phrase whole where chunking split it
     differently across chunk boundaries; a page-content match surfaces via
     every chunk that overlaps that page (so the LLM still gets numbered
-    chunk excerpts, never raw page text)."""
+    chunk excerpts, never raw page text).
+
+    With the document's parse-time inverted index, only chunks/pages whose
+    indexed tokens contain a term are normalized and checked — the index is
+    built over the same fuzzy normalization, so the result is identical.
+
+    With the document's parse-time normalized texts, chunk and page text is
+    read pre-normalized instead of normalized per request; `pages` is then
+    unused (the stored page entries are the persisted page contents)."""
     norm_topic, _ = normalize(topic, fuzzy=True)
     norm_topic = norm_topic.strip()
     if not norm_topic:
@@ -209,21 +234,41 @@ def _term_scan_candidates(chunks: list[Chunk], pages: list[Page], topic: str) ->
     if not terms:
         return []
 
-    def _matches(text: str) -> bool:
-        norm_text, _ = normalize(text or "", fuzzy=True)
+    def _norm_matches(norm_text: str) -> bool:
         if not norm_text:
             return False
         return norm_topic in norm_text or any(t in norm_text for t in terms)
 
+    def _matches(text: str) -> bool:
+        return _norm_matches(normalize(text or "", fuzzy=True)[0])
+
+    def _chunk_matches(ch: Chunk) -> bool:
+        stored = texts.chunk(ch.id, fuzzy=True, raw_len=len(ch.text or "")) if texts is not None else None
+        return _norm_matches(stored.text) if stored is not None else _matches(ch.text)
+
+    maybe = index.units_containing(terms) if index is not None else None
+    page_numbers = list(texts.page_numbers) if texts is not None else [p.page_number for p in pages]
+    if maybe is not None:
+        maybe_chunks, maybe_pages = maybe
+        chunks_to_scan = [ch for ch in chunks if ch.id in maybe_chunks]
+        pages_to_scan = {pn for pn in page_numbers if pn in maybe_pages}
+    else:
+        chunks_to_scan, pages_to_scan = chunks, set(page_numbers)
+
     hits: list[Chunk] = []
     seen: set[uuid.UUID] = set()
-    for ch in chunks:
-        if _matches(ch.text):
+    for ch in chunks_to_scan:
+        if _chunk_matches(ch):
             hits.append(ch)
             seen.add(ch.id)
 
-    if pages:
-        matched_pages = {p.page_number for p in pages if p.content and _matches(p.content)}
+    if page_numbers:
+        if texts is not None:
+            matched_pages = {pn for pn in pages_to_scan if _norm_matches(texts.page(pn, fuzzy=True).text)}
+        else:
+            matched_pages = {
+                p.page_number for p in pages if p.page_number in pages_to_scan and p.content and _matches(p.content)
+            }
         if matched_pages:
             for ch in chunks:
                 if ch.id in seen:
@@ -235,13 +280,6 @@ def _term_scan_candidates(chunks: list[Chunk], pages: list[Page], topic: str) ->
     return hits
 
 
-async def _fetch_chunks_by_id(db: AsyncSession, chunk_ids: list[uuid.UUID]) -> dict[uuid.UUID, Chunk]:
-    if not chunk_ids:
-        return {}
-    result = await db.execute(select(Chunk).where(Chunk.id.in_(chunk_ids)))
-    return {c.id: c for c in result.scalars().all()}
-
-
 async def _build_candidates(
     db: AsyncSession, document: Document, topic: str
 ) -> tuple[list[Chunk], int]:
@@ -251,17 +289,19 @@ async def _build_candidates(
     MAX_CANDIDATE_CHUNKS. Returns (candidates, scanned_chunks) —
     scanned_chunks is the document's total chunk count examined by the term
     scan (§8.3 telemetry / empty-result UX: "show count + what was scanned")."""
-    all_chunks = await _all_document_chunks(db, document.id)
-    all_pages = await _all_document_pages(db, document.id)
+    all_chunks = await _all_document_chunks(db, document)
+    texts = await normalized_text_cache.get(db, document.id)
+    all_pages = await _all_document_pages(db, document.id) if texts is None else []
 
     route = _query_router.route(topic, is_collection=False)
     retrieval = await corrective_retrieval_service.retrieve_single(
         topic, route, document.id, top_k=RETRIEVAL_TOP_K, db=db, doc_pages=document.page_count,
     )
     retrieved_ids = [item["chunk_id"] for item in retrieval.retrieved if item.get("chunk_id")]
-    retrieved_map = await _fetch_chunks_by_id(db, retrieved_ids)
+    retrieved_map = await fetch_chunks_by_id(db, [document.id], retrieved_ids)
 
-    term_hits = _term_scan_candidates(all_chunks, all_pages, topic)
+    index = await lexical_index_cache.get(db, document.id)
+    term_hits = _term_scan_candidates(all_chunks, all_pages, topic, index, texts)
 
     ordered: list[Chunk] = []
     seen: set[uuid.UUID] = set()
@@ -291,9 +331,15 @@ def _candidate_pages_count(candidates: list[Chunk]) -> int:
     return len(pages)
 
 
-async def _neighbor_chunks(db: AsyncSession, chunk: Chunk) -> list[Chunk]:
+async def _neighbor_chunks(
+    db: AsyncSession, chunk: Chunk, cached: Optional[DocumentChunks] = None
+) -> list[Chunk]:
     """Immediately adjacent chunks by chunk_index, for B2's extracted_text
-    fallback (cross-chunk quotes)."""
+    fallback (cross-chunk quotes). Served from `cached` when given."""
+    if cached is not None:
+        return [
+            ch for ch in (cached.at_index(chunk.chunk_index - 1), cached.at_index(chunk.chunk_index + 1)) if ch
+        ]
     result = await db.execute(
         select(Chunk)
         .where(Chunk.document_id == chunk.document_id)
@@ -524,8 +570,29 @@ def _dedup_signature(source_kind: str, verification: Any) -> str:
     return ""
 
 
+def _segment_norms(
+    source: QuoteSource, segment: QuoteSourceSegment, texts: Optional[NormalizedTextIndex]
+) -> dict[str, Any]:
+    """verify_quote's precomputed-normalization kwargs for `segment`, from the
+    document's parse-time normalized texts; empty (normalize on the fly) when
+    the segment's text is not the one the stored entry was built from."""
+    if texts is None:
+        return {}
+    raw_len = len(segment.text or "")
+    if source.kind == "page_text":
+        lookup = partial(texts.page, segment.page_start, raw_len=raw_len)
+    elif segment.chunk_id is not None:
+        lookup = partial(texts.chunk, segment.chunk_id, raw_len=raw_len)
+    else:
+        return {}
+    base = lookup(fuzzy=False)
+    if base is None:
+        return {}
+    return {"source_norm": base, "source_fuzzy_norm": lookup(fuzzy=True)}
+
+
 def _verify_against_segments(
-    quote_text: str, source: QuoteSource, document: Document,
+    quote_text: str, source: QuoteSource, document: Document, texts: Optional[NormalizedTextIndex] = None,
 ) -> tuple[list[tuple[Any, QuoteSourceSegment]], Any]:
     """FIX-2 (Codex r1 BLOCKER #2): verify against EACH segment separately —
     never a concatenated multi-page/multi-chunk blob.
@@ -550,6 +617,9 @@ def _verify_against_segments(
 
     `best_failure` is the highest-scoring verify_quote() failure across ALL
     segments tried, for a discard reason when `matches` is empty.
+
+    `texts` (the document's parse-time normalized texts) only saves
+    verify_quote the per-segment normalization; the verdicts are identical.
     """
     matches: list[tuple[Any, QuoteSourceSegment]] = []
     best_failure: Any = None
@@ -557,6 +627,7 @@ def _verify_against_segments(
         v = verify_quote(
             quote_text, segment.text,
             text_quality=document.text_quality, parse_method=document.parse_method,
+            **_segment_norms(source, segment, texts),
         )
         if v.verified:
             matches.append((v, segment))
@@ -586,6 +657,9 @@ async def quote_search(
         )
 
     raw_quotes, prompt_tokens, completion_tokens = await _call_llm(candidates, topic, locale)
+    texts = await normalized_text_cache.get(db, document.id) if raw_quotes else None
+    # Resident after the term scan above unless the document is too large to keep.
+    cached = (await chunk_cache.resident(db, [document.id], [document])).get(document.id) if raw_quotes else None
 
     cards: list[QuoteCard] = []
     discarded: list[tuple[str, str, float]] = []
@@ -608,9 +682,9 @@ async def quote_search(
             continue
 
         chunk = candidates[ref_n - 1]
-        neighbors = await _neighbor_chunks(db, chunk)
+        neighbors = await _neighbor_chunks(db, chunk, cached)
         source: QuoteSource = await build_quote_source(db, document.id, chunk, neighbors)
-        matches, best_failure = _verify_against_segments(quote_text, source, document)
+        matches, best_failure = _verify_against_segments(quote_text, source, document, texts)
 
         if not matches:
             if best_failure is None:
@@ -701,13 +775,15 @@ async def verify_saved_quote(
     belongs to a different document, or genuinely not a verbatim/
     normalized/aligned match) — callers must reject the save.
     """
-    chunk = await db.get(Chunk, chunk_id)
+    cached = (await chunk_cache.resident(db, [document.id], [document])).get(document.id)
+    chunk = cached.get(chunk_id) if cached is not None else await db.get(Chunk, chunk_id)
     if chunk is None or chunk.document_id != document.id:
         return None
 
-    neighbors = await _neighbor_chunks(db, chunk)
+    neighbors = await _neighbor_chunks(db, chunk, cached)
     source = await build_quote_source(db, document.id, chunk, neighbors)
-    matches, _best_failure = _verify_against_segments(quote_text, source, document)
+    texts = await normalized_text_cache.get(db, document.id)
+    matches, _best_failure = _verify_against_segments(quote_text, source, document, texts)
 
     # `segment` is carried through alongside the attribution tuple so its
     # own corpus text (the exact string verify_quote checked `quote_text`
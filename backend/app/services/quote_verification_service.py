@@ -23,7 +23,7 @@ so fuzzy auto-accept is withheld in those cases. Deterministic substring tiers
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Optional
+from typing import Optional, Sequence
 
 from rapidfuzz import fuzz
 
@@ -91,7 +91,12 @@ def verify_quote(
     flag_cutoff: float = FLAG_CUTOFF,
     min_chars: int = MIN_CHARS,
     min_tokens: int = MIN_TOKENS,
+    source_norm: Optional[tuple[str, Sequence[int]]] = None,
+    source_fuzzy_norm: Optional[tuple[str, Sequence[int]]] = None,
 ) -> QuoteVerification:
+    """`source_norm` / `source_fuzzy_norm` are ``normalize(source_text)`` /
+    ``normalize(source_text, fuzzy=True)`` when the caller already has them
+    (the document's parse-time normalized texts); computed here otherwise."""
     proposed = (proposed or "").strip()
     if not proposed or not source_text:
         return QuoteVerification("dropped", None, None, None, 0.0, "empty")
@@ -106,7 +111,7 @@ def verify_quote(
     # Tier 2: exact substring in normalized space, projected back to raw.
     # The match must span WHOLE raw code points — a match ending inside one
     # code point's expansion (… → ...) is not a real source substring.
-    src_norm, src_map = normalize(source_text)
+    src_norm, src_map = source_norm if source_norm is not None else normalize(source_text)
     pq_norm, _ = normalize(proposed)
     if pq_norm:
         nidx = src_norm.find(pq_norm)
@@ -120,7 +125,9 @@ def verify_quote(
             nidx = src_norm.find(pq_norm, nidx + 1)
 
     # Tier 3: rapidfuzz alignment over the fuzzy normalization.
-    src_fnorm, src_fmap = normalize(source_text, fuzzy=True)
+    src_fnorm, src_fmap = (
+        source_fuzzy_norm if source_fuzzy_norm is not None else normalize(source_text, fuzzy=True)
+    )
     pq_fnorm, _ = normalize(proposed, fuzzy=True)
     if not pq_fnorm or not src_fnorm:
         return _DROPPED
@@ -3,7 +3,7 @@ from __future__ import annotations
 import asyncio
 import re
 import uuid
-from typing import Iterable, List
+from typing import Iterable, List, NamedTuple
 
 import sqlalchemy as sa
 from qdrant_client.models import FieldCondition, Filter, MatchAny, MatchValue
@@ -12,7 +12,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
 from app.models.tables import Chunk, DocumentTable
+from app.services.chunk_cache import fetch_chunks_by_id
 from app.services.embedding_service import embedding_service
+from app.services.lexical_index import index_tokens, lexical_index_cache
+from app.services.query_embedding_cache import query_embedding_cache
 from app.services.rag_evaluator_service import extract_query_terms
 
 # Minimum text length for a chunk to be useful in retrieval.
@@ -27,6 +30,15 @@ _GENERIC_TABLE_QUERY_RE = re.compile(
     r"|(表格|数据表|电子表格|行|列|单元格)",
     flags=re.IGNORECASE,
 )
+# Kana, CJK ideographs, Hangul: no word boundaries for the tsvector parsers,
+# so these terms keep substring (ILIKE) matching in every lexical mode.
+_CJK_RE = re.compile(r"[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff]")
+# ts_rank_cd normalisation 1 divides by 1 + log(document length): BM25's
+# length normalisation, while cover density gives saturating term frequency.
+_TS_RANK_NORMALIZATION = 1
+# Rank credit for an ILIKE-only (CJK) term hit in bm25 mode — roughly a
+# single mid-density ts_rank_cd hit, so mixed queries stay comparable.
+_ILIKE_HIT_RANK = 0.1
 _GENERIC_TABLE_TERMS = {
     "table",
     "tables",
@@ -77,6 +89,36 @@ def _is_usable_chunk_text(text: str | None, *, min_text_len: int) -> bool:
     return len((text or "").strip()) >= int(min_text_len)
 
 
+def _dense_fetch_limit(top_k: int) -> int:
+    """Vector hits to fetch per document so `top_k` survive micro-chunk filtering."""
+    return max(top_k * 3, 24)
+
+
+def _dense_payloads(chunks: Iterable[Chunk], scores: dict[uuid.UUID, float], top_k: int) -> list[dict]:
+    """Score-ordered payloads of one document's vector hits, minus micro-chunks."""
+    # Preserve search order based on scores
+    chunks = sorted(chunks, key=lambda c: scores.get(c.id, 0.0), reverse=True)
+
+    results = []
+    for ch in chunks:
+        # Skip micro-chunks (form fields, metadata footers, page numbers)
+        if not _is_usable_chunk_text(ch.text, min_text_len=_MIN_CHUNK_TEXT_LEN):
+            continue
+        results.append(_chunk_payload(ch, score=scores.get(ch.id, 0.0)))
+
+    # Short URL/TXT/MD documents may legitimately be smaller than the
+    # ordinary anti-noise floor. If every retrieved chunk was filtered out,
+    # backfill with short but non-empty hits instead of giving chat no
+    # context at all.
+    if not results:
+        for ch in chunks:
+            if not _is_usable_chunk_text(ch.text, min_text_len=_MIN_SHORT_CHUNK_TEXT_LEN):
+                continue
+            results.append(_chunk_payload(ch, score=scores.get(ch.id, 0.0)))
+
+    return results[:top_k]
+
+
 def _coerce_table_rows(table: DocumentTable) -> list[list[str]]:
     rows = (table.cells or {}).get("rows")
     if not isinstance(rows, list):
@@ -216,37 +258,162 @@ def _term_match_condition(term: str):
     )
 
 
-def _lexical_query_parts(query: str):
+def _term_tsquery(term: str):
+    """Phrase tsquery for one term under both configs of chunks.search_tsv:
+    'english' matches inflections, 'simple' matches the literal tokens."""
+    return sa.func.phraseto_tsquery(sa.literal_column("'english'::regconfig"), term).op("||")(
+        sa.func.phraseto_tsquery(sa.literal_column("'simple'::regconfig"), term)
+    )
+
+
+class _LexicalQuery(NamedTuple):
+    terms: tuple[str, ...]
+    conditions: list
+    score_expr: object
+    rank_expr: object
+
+
+def _lexical_query_parts(query: str, mode: str = "ilike") -> _LexicalQuery:
+    """Per-term match conditions plus the weighted-match score (exact terms
+    count 3x). In "fts"/"bm25" mode terms match through the search_tsv GIN
+    index; CJK terms have no word boundaries there and keep ILIKE. rank_expr
+    is the BM25-like ordering: per-term ts_rank_cd, length-normalised, with
+    the same exact-term weights."""
     evidence_terms = extract_query_terms(query)
     terms = evidence_terms.lexical_terms
     exact = {term.lower() for term in evidence_terms.exact_terms}
     conditions = []
     score_expr = sa.literal(0.0)
+    rank_expr = sa.literal(0.0)
     for term in terms[:8]:
-        condition = _term_match_condition(term)
-        conditions.append(condition)
         weight = 3.0 if term.lower() in exact else 1.0
+        if mode == "ilike" or _CJK_RE.search(term):
+            condition = _term_match_condition(term)
+            term_rank = sa.case((condition, weight * _ILIKE_HIT_RANK), else_=0.0)
+        else:
+            ts_query = _term_tsquery(term)
+            condition = Chunk.search_tsv.op("@@")(ts_query)
+            term_rank = weight * sa.func.ts_rank_cd(Chunk.search_tsv, ts_query, _TS_RANK_NORMALIZATION)
+        conditions.append(condition)
         score_expr = score_expr + sa.case((condition, weight), else_=0.0)
-    return terms, conditions, score_expr
+        rank_expr = rank_expr + term_rank
+    return _LexicalQuery(terms, conditions, score_expr, rank_expr)
+
+
+def _lexical_order(parts: _LexicalQuery, mode: str, *tail):
+    primary = parts.rank_expr if mode == "bm25" else parts.score_expr
+    return (primary.desc(), *tail)
+
+
+def _rank_lexical_chunks(chunks: List[Chunk], terms: tuple[str, ...], mode: str) -> List[Chunk]:
+    """bm25 keeps the SQL rank order; the other modes re-rank by
+    _lexical_score exactly as before the FTS index existed."""
+    if mode == "bm25":
+        return chunks
+    return sorted(
+        chunks,
+        key=lambda ch: (
+            _lexical_score(" ".join([ch.section_title or "", ch.text or ""]), terms),
+            -int(ch.page_start or 0),
+        ),
+        reverse=True,
+    )
+
+
+def _bm25_query_terms(query: str) -> list[tuple[str, float, bool]]:
+    """Query terms in the inverted index's token space, with the same
+    exact-term weighting as the SQL path. CJK tokens are matched as
+    substrings of indexed tokens (they have no word boundaries)."""
+    evidence_terms = extract_query_terms(query)
+    exact = {term.lower() for term in evidence_terms.exact_terms}
+    weights: dict[str, float] = {}
+    for term in evidence_terms.lexical_terms[:8]:
+        weight = 3.0 if term.lower() in exact else 1.0
+        for token in index_tokens(term):
+            weights[token] = max(weights.get(token, 0.0), weight)
+    return [(token, weight, bool(_CJK_RE.search(token))) for token, weight in weights.items()]
 
 
 class RetrievalService:
     """Vector search over chunks using Qdrant, returning DB-backed details."""
 
+    async def _hydrate_bm25(
+        self,
+        hits: list[tuple[uuid.UUID, float]],
+        terms: tuple[str, ...],
+        top_k: int,
+        db: AsyncSession,
+        *,
+        document_ids: List[uuid.UUID],
+        min_text_len: int,
+        include_document_id: bool = False,
+    ) -> list[dict]:
+        """Load only the ranked chunk ids — the first point chunks.text is read."""
+        if not hits:
+            return []
+        by_id = await fetch_chunks_by_id(db, document_ids, [chunk_id for chunk_id, _ in hits])
+        ranked = [by_id[chunk_id] for chunk_id, _ in hits if chunk_id in by_id]
+        usable = [ch for ch in ranked if _is_usable_chunk_text(ch.text, min_text_len=min_text_len)]
+        if not usable and int(min_text_len) > _MIN_SHORT_CHUNK_TEXT_LEN:
+            usable = [ch for ch in ranked if _is_usable_chunk_text(ch.text, min_text_len=_MIN_SHORT_CHUNK_TEXT_LEN)]
+        return [
+            _chunk_payload(
+                ch,
+                score=_lexical_score(" ".join([ch.section_title or "", ch.text or ""]), terms),
+                include_document_id=include_document_id,
+            )
+            for ch in usable[: int(top_k or 8)]
+        ]
+
+    async def bm25_search(
+        self,
+        query: str,
+        document_ids: List[uuid.UUID],
+        top_k: int,
+        db: AsyncSession,
+        *,
+        min_text_len: int = _MIN_CHUNK_TEXT_LEN,
+        include_document_id: bool = False,
+    ) -> List[dict] | None:
+        """Okapi BM25 over the documents' parse-time inverted indexes; chunk
+        rows are hydrated only for the ranked hits. None when any document
+        has no index yet (the caller falls back to the SQL path)."""
+        weighted_terms = _bm25_query_terms(query)
+        terms = extract_query_terms(query).lexical_terms
+        if not weighted_terms:
+            return []
+        pool = max(int(top_k or 8) * 4, 64)
+        hits: list[tuple[uuid.UUID, float]] = []
+        for document_id in document_ids:
+            index = await lexical_index_cache.get(db, document_id)
+            if index is None:
+                return None
+            hits.extend(index.bm25(weighted_terms, pool))
+        hits.sort(key=lambda hit: -hit[1])
+        return await self._hydrate_bm25(
+            hits[:pool],
+            terms,
+            top_k,
+            db,
+            document_ids=document_ids,
+            min_text_len=min_text_len,
+            include_document_id=include_document_id,
+        )
+
     async def search(self, query: str, document_id: uuid.UUID, top_k: int, db: AsyncSession):
-        # 1) Embed query — run sync call off the event loop
-        qvec = (await asyncio.to_thread(embedding_service.embed_texts, [query]))[0]
+        # 1) Embed query — cached/single-flight; the provider call runs off the event loop
+        qvec = await query_embedding_cache.embed(query)
 
         # 2) Qdrant search — over-fetch to compensate for micro-chunk filtering
         client = embedding_service.get_qdrant_client()
         flt = Filter(must=[FieldCondition(key="document_id", match=MatchValue(value=str(document_id)))])
-        fetch_limit = max(int(top_k or 5) * 3, 24)
         res = await asyncio.to_thread(
             client.query_points,
             collection_name=settings.QDRANT_COLLECTION,
             query=qvec,
-            limit=fetch_limit,
+            limit=_dense_fetch_limit(int(top_k or 5)),
             query_filter=flt,
+            search_params=embedding_service.search_params(),
         )
 
         # 3) Load chunk details by returned ids
@@ -263,30 +430,8 @@ class RetrievalService:
         if not ids:
             return []
 
-        rows = await db.execute(select(Chunk).where(Chunk.id.in_(ids)))
-        chunks: List[Chunk] = list(rows.scalars())
-
-        # Preserve search order based on scores
-        chunks.sort(key=lambda c: scores.get(c.id, 0.0), reverse=True)
-
-        results = []
-        for ch in chunks:
-            # Skip micro-chunks (form fields, metadata footers, page numbers)
-            if not _is_usable_chunk_text(ch.text, min_text_len=_MIN_CHUNK_TEXT_LEN):
-                continue
-            results.append(_chunk_payload(ch, score=scores.get(ch.id, 0.0)))
-
-        # Short URL/TXT/MD documents may legitimately be smaller than the
-        # ordinary anti-noise floor. If every retrieved chunk was filtered out,
-        # backfill with short but non-empty hits instead of giving chat no
-        # context at all.
-        if not results:
-            for ch in chunks:
-                if not _is_usable_chunk_text(ch.text, min_text_len=_MIN_SHORT_CHUNK_TEXT_LEN):
-                    continue
-                results.append(_chunk_payload(ch, score=scores.get(ch.id, 0.0)))
-
-        return results[: int(top_k or 5)]
+        chunks: List[Chunk] = list((await fetch_chunks_by_id(db, [document_id], ids)).values())
+        return _dense_payloads(chunks, scores, int(top_k or 5))
 
     async def lexical_search(
         self,
@@ -298,16 +443,23 @@ class RetrievalService:
         min_text_len: int = _MIN_CHUNK_TEXT_LEN,
     ):
         """Term-based fallback search for exact names, numbers, clauses, and page/source queries."""
-        terms, conditions, score_expr = _lexical_query_parts(query)
-        if not terms or not conditions:
+        mode = settings.LEXICAL_SEARCH_MODE
+        if mode == "index":
+            indexed = await self.bm25_search(query, [document_id], top_k, db, min_text_len=min_text_len)
+            if indexed is not None:
+                return indexed
+            mode = "fts"
+        parts = _lexical_query_parts(query, mode)
+        terms = parts.terms
+        if not terms or not parts.conditions:
             return []
 
         statement = (
             select(Chunk)
             .where(Chunk.document_id == document_id)
             .where(sa.func.length(sa.func.trim(Chunk.text)) >= int(min_text_len))
-            .where(sa.or_(*conditions))
-            .order_by(score_expr.desc(), Chunk.page_start, Chunk.chunk_index)
+            .where(sa.or_(*parts.conditions))
+            .order_by(*_lexical_order(parts, mode, Chunk.page_start, Chunk.chunk_index))
             .limit(max(int(top_k or 8) * 4, 64))
         )
         rows = await db.execute(statement)
@@ -317,20 +469,13 @@ class RetrievalService:
                 select(Chunk)
                 .where(Chunk.document_id == document_id)
                 .where(sa.func.length(sa.func.trim(Chunk.text)) >= _MIN_SHORT_CHUNK_TEXT_LEN)
-                .where(sa.or_(*conditions))
-                .order_by(score_expr.desc(), Chunk.page_start, Chunk.chunk_index)
+                .where(sa.or_(*parts.conditions))
+                .order_by(*_lexical_order(parts, mode, Chunk.page_start, Chunk.chunk_index))
                 .limit(max(int(top_k or 8) * 4, 64))
             )
             rows = await db.execute(short_statement)
             chunks = list(rows.scalars())
-        ranked = sorted(
-            chunks,
-            key=lambda ch: (
-                _lexical_score(" ".join([ch.section_title or "", ch.text or ""]), terms),
-                -int(ch.page_start or 0),
-            ),
-            reverse=True,
-        )
+        ranked = _rank_lexical_chunks(chunks, terms, mode)
         return [
             _chunk_payload(
                 ch,
@@ -346,7 +491,7 @@ class RetrievalService:
         if not document_ids:
             return []
 
-        qvec = (await asyncio.to_thread(embedding_service.embed_texts, [query]))[0]
+        qvec = await query_embedding_cache.embed(query)
 
         client = embedding_service.get_qdrant_client()
         doc_id_strs = [str(did) for did in document_ids]
@@ -358,6 +503,7 @@ class RetrievalService:
             query=qvec,
             limit=fetch_limit,
             query_filter=flt,
+            search_params=embedding_service.search_params(),
         )
 
         ids: List[uuid.UUID] = []
@@ -373,8 +519,7 @@ class RetrievalService:
         if not ids:
             return []
 
-        rows = await db.execute(select(Chunk).where(Chunk.id.in_(ids)))
-        chunks: List[Chunk] = list(rows.scalars())
+        chunks: List[Chunk] = list((await fetch_chunks_by_id(db, document_ids, ids)).values())
         chunks.sort(key=lambda c: scores.get(c.id, 0.0), reverse=True)
 
         results = []
@@ -385,6 +530,63 @@ class RetrievalService:
 
         return results[: int(top_k or 8)]
 
+    async def search_per_document(
+        self, query: str, document_ids: List[uuid.UUID], top_k: int, db: AsyncSession
+    ) -> dict[uuid.UUID, list[dict]]:
+        """Top `top_k` vector hits of EACH document, in one grouped Qdrant
+        query and one chunk hydration.
+
+        ``search_multi`` ranks the whole collection at once, so a few dense
+        documents can take every slot; per-document coverage used to cost one
+        ``search`` (query, pool checkout, hydration) per document. Grouping by
+        the ``document_id`` payload returns up to ``group_size`` points for
+        every document in a single round trip. Documents without a usable hit
+        are absent from the result.
+        """
+        if not document_ids:
+            return {}
+        per_doc_k = int(top_k or 2)
+        qvec = await query_embedding_cache.embed(query)
+
+        client = embedding_service.get_qdrant_client()
+        flt = Filter(must=[FieldCondition(key="document_id", match=MatchAny(any=[str(d) for d in document_ids]))])
+        res = await asyncio.to_thread(
+            client.query_points_groups,
+            collection_name=settings.QDRANT_COLLECTION,
+            group_by="document_id",
+            query=qvec,
+            limit=len(document_ids),
+            group_size=_dense_fetch_limit(per_doc_k),
+            query_filter=flt,
+            search_params=embedding_service.search_params(),
+            with_payload=False,
+        )
+
+        scores: dict[uuid.UUID, float] = {}
+        hit_ids: dict[uuid.UUID, list[uuid.UUID]] = {}
+        for group in res.groups:
+            try:
+                document_id = uuid.UUID(str(group.id))
+            except Exception:
+                continue
+            for p in group.hits:
+                try:
+                    cid = uuid.UUID(str(p.id))
+                except Exception:
+                    continue
+                hit_ids.setdefault(document_id, []).append(cid)
+                scores[cid] = float(p.score or 0.0)
+        if not scores:
+            return {}
+
+        by_id = await fetch_chunks_by_id(db, list(hit_ids), list(scores))
+        results: dict[uuid.UUID, list[dict]] = {}
+        for document_id, ids in hit_ids.items():
+            payloads = _dense_payloads([by_id[cid] for cid in ids if cid in by_id], scores, per_doc_k)
+            if payloads:
+                results[document_id] = payloads
+        return results
+
     async def lexical_search_multi(
         self,
         query: str,
@@ -397,27 +599,29 @@ class RetrievalService:
         """Term-based fallback search across a collection."""
         if not document_ids:
             return []
-        terms, conditions, score_expr = _lexical_query_parts(query)
-        if not terms or not conditions:
+        mode = settings.LEXICAL_SEARCH_MODE
+        if mode == "index":
+            indexed = await self.bm25_search(
+                query, document_ids, top_k, db, min_text_len=min_text_len, include_document_id=True
+            )
+            if indexed is not None:
+                return indexed
+            mode = "fts"
+        parts = _lexical_query_parts(query, mode)
+        terms = parts.terms
+        if not terms or not parts.conditions:
             return []
 
         rows = await db.execute(
             select(Chunk)
             .where(Chunk.document_id.in_(document_ids))
             .where(sa.func.length(sa.func.trim(Chunk.text)) >= int(min_text_len))
-            .where(sa.or_(*conditions))
-            .order_by(score_expr.desc(), Chunk.document_id, Chunk.page_start, Chunk.chunk_index)
+            .where(sa.or_(*parts.conditions))
+            .order_by(*_lexical_order(parts, mode, Chunk.document_id, Chunk.page_start, Chunk.chunk_index))
             .limit(max(int(top_k or 8) * 4, 96))
         )
         chunks: List[Chunk] = list(rows.scalars())
-        ranked = sorted(
-            chunks,
-            key=lambda ch: (
-                _lexical_score(" ".join([ch.section_title or "", ch.text or ""]), terms),
-                -int(ch.page_start or 0),
-            ),
-            reverse=True,
-        )
+        ranked = _rank_lexical_chunks(chunks, terms, mode)
         return [
             _chunk_payload(
                 ch,
@@ -3,7 +3,7 @@ from __future__ import annotations
 import datetime
 import logging
 from io import BytesIO
-from typing import Optional
+from typing import BinaryIO, Optional
 from urllib.parse import urlparse
 
 from minio import Minio
@@ -105,32 +105,39 @@ class StorageService:
             )
 
     def upload_file(self, file_bytes: bytes, storage_key: str, content_type: str = "application/pdf") -> None:
-        """Upload bytes to MinIO under the given storage_key.
-
-        Attempts SSE-S3 encryption first; falls back to unencrypted upload
-        if KMS is not configured on the MinIO instance.
+        """Upload bytes to MinIO under the given storage_key."""
+        self.upload_stream(BytesIO(file_bytes), len(file_bytes), storage_key, content_type)
+
+    def upload_stream(
+        self, stream: BinaryIO, length: int, storage_key: str, content_type: str = "application/pdf"
+    ) -> None:
+        """Upload `length` bytes read from the seekable `stream`.
+
+        put_object reads the stream one part at a time and switches to a
+        multipart upload above the part size, so the body is never held in
+        memory whole. Attempts SSE-S3 encryption first; falls back to
+        unencrypted upload if KMS is not configured on the MinIO instance.
         """
-        data = BytesIO(file_bytes)
-        size = len(file_bytes)
+        start = stream.tell()
         try:
             self._client.put_object(
                 self._bucket,
                 storage_key,
-                data,
-                length=size,
+                stream,
+                length=length,
                 content_type=content_type,
                 sse=SseS3(),
             )
         except S3Error as exc:
             if "KMS" in str(exc) or exc.code == "NotImplemented":
                 # KMS not configured — upload without encryption
-                data.seek(0)
+                stream.seek(start)
                 try:
                     self._client.put_object(
                         self._bucket,
                         storage_key,
-                        data,
-                        length=size,
+                        stream,
+                        length=length,
                         content_type=content_type,
                     )
                 except Exception as fallback_exc:
@@ -20,11 +20,24 @@ All transforms are per-code-point so ``norm_to_raw[i]`` is the raw index that
 produced ``norm[i]``. A single raw code point may expand to several normalized
 chars (e.g. the ﬁ ligature → ``fi``, the … ellipsis → ``...``); every emitted
 char maps back to that one raw index.
+
+Because the fold is a pure per-code-point function, ``normalize`` does not run
+it per character: runs of common code points that fold to one char each (themselves,
+a space, a folded quote/dash, or in the fuzzy tier their own ``casefold``) are
+folded in bulk with ``str.replace`` / ``str.casefold``, and only the code
+points in between (ligatures, dropped chars, multi-char folds, rare scripts)
+take the per-code-point path, memoized. ``norm_to_raw`` comes back as an
+``OffsetMap``: run-encoded, indexable and equal to the plain list.
 """
 from __future__ import annotations
 
+import re
 import unicodedata
-from typing import List, Tuple
+from array import array
+from bisect import bisect_right
+from collections.abc import Sequence
+from functools import lru_cache
+from typing import Iterator, List, Tuple
 
 # Punctuation folds applied per code point (after NFKC). NFKC already handles
 # full-width forms and NBSP, so this table only covers what NFKC leaves alone:
@@ -90,38 +103,172 @@ def _fold_codepoint(ch: str, *, fuzzy: bool) -> str | None:
     return "".join(out)
 
 
-def normalize(text: str, *, fuzzy: bool = False) -> Tuple[str, List[int]]:
+_fold_cached = lru_cache(maxsize=16384)(_fold_codepoint)
+
+# Blocks scanned for bulk-foldable code points: Latin/Greek/Cyrillic/Armenian,
+# Latin Extended Additional + Greek Extended + General Punctuation, CJK
+# punctuation + kana, CJK unified ideographs, Hangul syllables.
+_BULK_BLOCKS = ((0x0000, 0x0590), (0x1E00, 0x2070), (0x3000, 0x3100), (0x4E00, 0xA000), (0xAC00, 0xD7A4))
+# Block code points folded inside a bulk run with str.replace: whitespace
+# (to a space, collapsed afterwards) and the one-char punctuation folds.
+_BULK_REPLACE = tuple(
+    (ch, _fold_codepoint(ch, fuzzy=False) or " ")
+    for ch in sorted(
+        {chr(cp) for lo, hi in _BULK_BLOCKS for cp in range(lo, hi) if chr(cp).isspace()}
+        | {ch for ch, folded in _FOLD_MAP.items() if len(folded) == 1}
+    )
+    if ch != " "
+)
+_ASCII_BULK_REPLACE = tuple((ch, folded) for ch, folded in _BULK_REPLACE if ch.isascii())
+_SPACE_RUN_RE = re.compile(r" {2,}")
+
+
+@lru_cache(maxsize=None)
+def _slow_runs_re(fuzzy: bool) -> "re.Pattern[str]":
+    """Runs of code points that cannot be folded in bulk.
+
+    The bulk set is every block code point whose fold is itself (base) or its
+    own single-char ``casefold`` (fuzzy), plus the ``_BULK_REPLACE`` chars —
+    so a bulk run folds as ``run`` (fuzzy: ``run.casefold()``) after those
+    replacements, one output char per raw code point. Ligatures, dropped and
+    multi-char code points and everything outside the blocks match here."""
+    replaced = {" ", *(ch for ch, _ in _BULK_REPLACE)}
+    ranges: List[Tuple[int, int]] = []
+    for lo, hi in _BULK_BLOCKS:
+        for cp in range(lo, hi):
+            ch = chr(cp)
+            bulk_fold = ch.casefold() if fuzzy else ch
+            if ch not in replaced and (len(bulk_fold) != 1 or _fold_codepoint(ch, fuzzy=fuzzy) != bulk_fold):
+                continue
+            if ranges and ranges[-1][1] == cp - 1:
+                ranges[-1] = (ranges[-1][0], cp)
+            else:
+                ranges.append((cp, cp))
+    bulk = "".join(f"\\U{a:08x}-\\U{b:08x}" for a, b in ranges)
+    return re.compile(f"[^{bulk}]+")
+
+
+class OffsetMap(Sequence):
+    """Read-only ``norm_to_raw`` list stored as runs: a run starts wherever
+    the raw index does not advance by exactly one (collapsed whitespace,
+    dropped code points, multi-char expansions), so typical prose needs a
+    handful of runs per page instead of one integer per char. Indexing is a
+    bisect over the run starts; compares equal to the plain list."""
+
+    __slots__ = ("_norm", "_raw", "_len")
+
+    def __init__(self, norm_starts: Sequence[int], raw_starts: Sequence[int], length: int) -> None:
+        self._norm = norm_starts
+        self._raw = raw_starts
+        self._len = length
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self._len))]
+        if i < 0:
+            i += self._len
+        if not 0 <= i < self._len:
+            raise IndexError("norm_to_raw index out of range")
+        k = bisect_right(self._norm, i) - 1
+        return self._raw[k] + (i - self._norm[k])
+
+    def __iter__(self) -> Iterator[int]:
+        ends = [*self._norm[1:], self._len]
+        for norm_start, raw_start, end in zip(self._norm, self._raw, ends):
+            yield from range(raw_start, raw_start + end - norm_start)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (list, tuple, OffsetMap)):
+            return len(self) == len(other) and list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def runs(self) -> Tuple[Sequence[int], Sequence[int]]:
+        """(norm starts, raw starts) of the maximal runs."""
+        return self._norm, self._raw
+
+
+def normalize(text: str, *, fuzzy: bool = False) -> Tuple[str, OffsetMap]:
     """Normalize ``text`` and return ``(norm_text, norm_to_raw)``.
 
     ``norm_to_raw[i]`` is the index in ``text`` of the raw code point that
     produced ``norm_text[i]``. Whitespace runs collapse to a single space that
-    maps to the first whitespace code point of the run.
+    maps to the first whitespace code point of the run (dropped code points
+    inside a run do not split it).
     """
     out_chars: List[str] = []
-    out_map: List[int] = []
+    norm_starts = array("q")
+    raw_starts = array("q")
+    norm_len = 0
     prev_space = False
+    # One-for-one replacements of bulk code points only: the slow runs and
+    # every offset are the same in `replaced` as in `text`.
+    replaced = text
+    for ch, folded in _ASCII_BULK_REPLACE if text.isascii() else _BULK_REPLACE:
+        if ch in replaced:
+            replaced = replaced.replace(ch, folded)
 
-    for raw_i, ch in enumerate(text):
-        folded = _fold_codepoint(ch, fuzzy=fuzzy)
-        if folded is None:  # whitespace
-            if prev_space:
+    def _emit(piece: str, raw_start: int) -> None:
+        # `piece[j]` came from raw index `raw_start + j`.
+        nonlocal norm_len
+        if not norm_starts or raw_starts[-1] + norm_len - norm_starts[-1] != raw_start:
+            norm_starts.append(norm_len)
+            raw_starts.append(raw_start)
+        out_chars.append(piece)
+        norm_len += len(piece)
+
+    def _bulk(start: int, end: int) -> None:
+        nonlocal prev_space
+        if start == end:
+            return
+        run = replaced[start:end]
+        if fuzzy:
+            run = run.casefold()
+        lo = 0
+        if prev_space and run[0] == " ":  # continues a whitespace run
+            lo = len(run) - len(run.lstrip(" "))
+            if lo == len(run):
+                return
+        if "  " in run:
+            for m in _SPACE_RUN_RE.finditer(run, lo):
+                _emit(run[lo : m.start() + 1], start + lo)
+                lo = m.end()
+        _emit(run[lo:], start + lo)
+        prev_space = run[-1] == " "
+
+    pos = 0
+    for m in _slow_runs_re(fuzzy).finditer(text):
+        run_start, run_end = m.span()
+        _bulk(pos, run_start)
+        pos = run_end
+        for raw_i in range(run_start, run_end):
+            folded = _fold_cached(text[raw_i], fuzzy=fuzzy)
+            if folded is None:  # whitespace
+                if prev_space:
+                    continue
+                _emit(" ", raw_i)
+                prev_space = True
                 continue
-            out_chars.append(" ")
-            out_map.append(raw_i)
-            prev_space = True
-            continue
-        if folded == "":  # dropped
-            continue
-        prev_space = False
-        for c in folded:
-            out_chars.append(c)
-            out_map.append(raw_i)
+            if folded == "":  # dropped
+                continue
+            prev_space = False
+            _emit(folded[0], raw_i)
+            for c in folded[1:]:  # an expansion: every char maps to raw_i
+                norm_starts.append(norm_len)
+                raw_starts.append(raw_i)
+                out_chars.append(c)
+                norm_len += 1
+    _bulk(pos, len(text))
 
-    return "".join(out_chars), out_map
+    return "".join(out_chars), OffsetMap(norm_starts, raw_starts, norm_len)
 
 
 def span_on_raw_boundaries(
-    norm_to_raw: List[int], norm_start: int, norm_end: int
+    norm_to_raw: Sequence[int], norm_start: int, norm_end: int
 ) -> bool:
     """True iff ``[norm_start, norm_end)`` begins and ends at raw code-point
     boundaries — i.e. the match spans WHOLE raw code points, not part of one
@@ -139,7 +286,7 @@ def span_on_raw_boundaries(
 
 
 def raw_span(
-    norm_to_raw: List[int], raw_len: int, norm_start: int, norm_end: int
+    norm_to_raw: Sequence[int], raw_len: int, norm_start: int, norm_end: int
 ) -> Tuple[int, int]:
     """Project a half-open normalized span ``[norm_start, norm_end)`` back to a
     half-open RAW span. ``raw_len`` is ``len(original_text)``."""
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from celery.utils.log import get_task_logger
+from sqlalchemy import text
+
+from app.models.sync_database import SyncSessionLocal, sync_engine
+from app.services.backfill_service import advance_open_runs
+
+from .celery_app import celery_app
+
+logger = get_task_logger(__name__)
+
+# Advisory-lock namespace for backfill ticks (one at a time across beat
+# replicas and the CLI). Chosen once; never reuse for other locks.
+_BACKFILL_LOCK_NAMESPACE = 948
+
+
+@celery_app.task(name="advance_backfill_runs", time_limit=300, soft_time_limit=270)
+def advance_backfill_runs() -> int:
+    """Advance open parse-pipeline backfill runs by one step (see
+    app.services.backfill_service). Returns the documents dispatched."""
+    return run_backfill_tick()
+
+
+def run_backfill_tick() -> int:
+    """One reconcile + dispatch pass under a session-level advisory lock on a
+    dedicated connection (the task session commits per document)."""
+    lock_conn = sync_engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+    try:
+        got_lock = bool(
+            lock_conn.execute(text("SELECT pg_try_advisory_lock(:ns, 0)"), {"ns": _BACKFILL_LOCK_NAMESPACE}).scalar()
+        )
+        if not got_lock:
+            logger.info("Backfill tick skipped: another tick is running")
+            return 0
+        try:
+            with SyncSessionLocal() as db:
+                dispatched = advance_open_runs(db)
+        finally:
+            try:
+                lock_conn.execute(text("SELECT pg_advisory_unlock(:ns, 0)"), {"ns": _BACKFILL_LOCK_NAMESPACE})
+            except Exception:
+                # Don't return a pooled connection that still holds the lock.
+                logger.warning("Backfill advisory unlock failed; invalidating the lock connection")
+                lock_conn.invalidate()
+        if dispatched:
+            logger.info("Backfill tick dispatched %d documents", dispatched)
+        return dispatched
+    finally:
+        lock_conn.close()
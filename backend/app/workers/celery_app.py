@@ -28,6 +28,7 @@ celery_app = Celery(
         "app.workers.layout_translation_worker",
         "app.workers.deletion_worker",
         "app.workers.cleanup_tasks",
+        "app.workers.backfill_worker",
     ],
 )
 
@@ -65,4 +66,16 @@ celery_app.conf.beat_schedule = {
         "task": "requeue_stale_processing_documents",
         "schedule": 1800,
     },
+    # Same for purges: documents left in status='deleting' for >15 min (see
+    # deletion_worker._STALE_DELETING_MINUTES) get their purge re-dispatched.
+    "requeue-stale-deleting-documents": {
+        "task": "requeue_stale_deleting_documents",
+        "schedule": 1800,
+    },
+    # Parse-pipeline backfills (scripts/backfill_pipeline.py): reconcile and
+    # dispatch the next documents. A no-op unless a run is open.
+    "advance-backfill-runs": {
+        "task": "advance_backfill_runs",
+        "schedule": 60,
+    },
 }
@@ -1,12 +1,186 @@
-"""Celery task to retry failed storage/vector cleanup on document deletion."""
+"""Celery tasks that finish document deletion.
+
+``DocService.delete_document`` only flips the document to ``status='deleting'``
+(hidden from every list/count/access check) and queues ``purge_document``.
+The purge never loads chunk rows: child tables are emptied with set-based
+``DELETE ... WHERE id IN (SELECT id ... WHERE document_id = :d LIMIT n)`` in
+bounded transactions, MinIO and Qdrant cleanup run concurrently alongside,
+and the document row goes last (remaining small children go with it through
+their ``ON DELETE CASCADE`` foreign keys). Storage/vector cleanup that fails
+is handed to ``retry_failed_deletion``.
+"""
 from __future__ import annotations
 
 import logging
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import delete, func, select, text, update
 
+from app.core.config import settings
+from app.models.sync_database import SyncSessionLocal
+from app.models.tables import (
+    ChatSession,
+    Chunk,
+    Document,
+    DocumentElement,
+    DocumentTable,
+    Page,
+)
 from app.workers.celery_app import celery_app
 
 logger = logging.getLogger(__name__)
 
+# Largest tables first; sessions cascade to their messages and shares.
+_PURGE_MODELS = (Chunk, DocumentElement, Page, DocumentTable, ChatSession)
+_STALE_DELETING_MINUTES = 15
+
+
+def _delete_object(storage_key: str) -> None:
+    from app.services.storage_service import storage_service
+
+    storage_service.delete_file(storage_key)
+
+
+def delete_document_vectors(document_id: str) -> None:
+    from qdrant_client.models import FieldCondition, Filter, MatchValue
+
+    from app.services.embedding_service import embedding_service
+
+    qclient = embedding_service.get_qdrant_client()
+    qclient.delete(
+        collection_name=settings.QDRANT_COLLECTION,
+        points_selector=Filter(must=[FieldCondition(key="document_id", match=MatchValue(value=document_id))]),
+    )
+
+
+def _delete_rows_in_batches(db, model, document_id: uuid.UUID, batch_size: int) -> int:
+    """Delete `model` rows of one document, committing every `batch_size`."""
+    total = 0
+    while True:
+        batch = select(model.id).where(model.document_id == document_id).limit(batch_size).scalar_subquery()
+        deleted = db.execute(
+            delete(model).where(model.id.in_(batch)).execution_options(synchronize_session=False)
+        ).rowcount
+        db.commit()
+        total += deleted
+        if deleted < batch_size:
+            return total
+
+
+def purge_document_data(document_id: uuid.UUID) -> bool:
+    """Delete a document's rows, stored files and vectors. Returns False when
+    the document no longer exists (already purged)."""
+    batch_size = max(1, int(settings.DELETE_BATCH_SIZE))
+    with SyncSessionLocal() as db:
+        doc = db.execute(
+            select(Document.storage_key, Document.converted_storage_key, Document.user_id).where(
+                Document.id == document_id
+            )
+        ).first()
+        if doc is None:
+            return False
+
+        with ThreadPoolExecutor(max_workers=3, thread_name_prefix="purge") as pool:
+            cleanups = {"original": pool.submit(_delete_object, doc.storage_key)}
+            if doc.converted_storage_key:
+                cleanups["converted"] = pool.submit(_delete_object, doc.converted_storage_key)
+            cleanups["qdrant"] = pool.submit(delete_document_vectors, str(document_id))
+
+            try:
+                deleted = {
+                    model.__tablename__: _delete_rows_in_batches(db, model, document_id, batch_size)
+                    for model in _PURGE_MODELS
+                }
+                db.execute(delete(Document).where(Document.id == document_id))
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+
+            ok = {}
+            for name, future in cleanups.items():
+                try:
+                    future.result()
+                    ok[name] = True
+                except Exception as e:
+                    ok[name] = False
+                    logger.error("Purge: %s cleanup failed for doc %s: %s", name, document_id, e)
+
+    from app.core.security_log import log_security_event
+
+    original_storage_ok = ok["original"]
+    converted_storage_ok = ok.get("converted", True)
+    qdrant_ok = ok["qdrant"]
+    log_security_event(
+        "document_deleted", document_id=document_id, user_id=doc.user_id,
+        storage_cleaned=original_storage_ok and converted_storage_ok,
+        original_storage_cleaned=original_storage_ok,
+        converted_storage_cleaned=converted_storage_ok,
+        vectors_cleaned=qdrant_ok,
+    )
+    logger.info("Purged doc %s: %s", document_id, deleted)
+
+    if not original_storage_ok or not converted_storage_ok or not qdrant_ok:
+        try:
+            retry_failed_deletion.delay(
+                str(document_id),
+                original_storage_key=doc.storage_key if not original_storage_ok else None,
+                converted_storage_key=doc.converted_storage_key if not converted_storage_ok else None,
+                cleanup_qdrant=not qdrant_ok,
+            )
+        except Exception:
+            logger.error("Failed to queue deletion retry for doc %s", document_id)
+    return True
+
+
+@celery_app.task(
+    name="purge_document",
+    bind=True,
+    autoretry_for=(Exception,),
+    retry_backoff=30,
+    max_retries=5,
+)
+def purge_document(self, document_id: str) -> bool:
+    """Finish a deletion requested through DocService.delete_document.
+    Idempotent: every batch commits, so a retry resumes where it stopped."""
+    return purge_document_data(uuid.UUID(document_id))
+
+
+@celery_app.task(name="requeue_stale_deleting_documents")
+def requeue_stale_deleting_documents() -> int:
+    """Re-dispatch purges for documents stuck in 'deleting' (task lost or
+    retries exhausted). Claimed with a conditional UPDATE that bumps
+    updated_at, like the parse watchdog, so overlapping runs never double
+    dispatch."""
+    stale_cutoff = func.now() - text(f"interval '{_STALE_DELETING_MINUTES} minutes'")
+    requeued = 0
+    with SyncSessionLocal() as db:
+        candidate_ids = (
+            db.execute(
+                select(Document.id).where(Document.status == "deleting", Document.updated_at < stale_cutoff)
+            )
+            .scalars()
+            .all()
+        )
+        for doc_id in candidate_ids:
+            claimed = db.execute(
+                update(Document)
+                .where(Document.id == doc_id, Document.status == "deleting", Document.updated_at < stale_cutoff)
+                .values(updated_at=func.now())
+            )
+            db.commit()
+            if claimed.rowcount != 1:
+                continue
+            try:
+                purge_document.delay(str(doc_id))
+                requeued += 1
+            except Exception:
+                logger.exception("Watchdog failed to requeue purge of %s", doc_id)
+    if requeued:
+        logger.info("Watchdog requeued %d stale deleting documents", requeued)
+    return requeued
+
 
 @celery_app.task(bind=True, max_retries=3, default_retry_delay=30)
 def retry_failed_deletion(
@@ -31,8 +205,7 @@ def retry_failed_deletion(
 
     if original_storage_key:
         try:
-            from app.services.storage_service import storage_service
-            storage_service.delete_file(original_storage_key)
+            _delete_object(original_storage_key)
             logger.info("Retry: MinIO cleanup succeeded for original file of doc %s", document_id)
         except Exception as e:
             original_storage_ok = False
@@ -40,8 +213,7 @@ def retry_failed_deletion(
 
     if converted_storage_key:
         try:
-            from app.services.storage_service import storage_service
-            storage_service.delete_file(converted_storage_key)
+            _delete_object(converted_storage_key)
             logger.info("Retry: MinIO cleanup succeeded for converted file of doc %s", document_id)
         except Exception as e:
             converted_storage_ok = False
@@ -53,18 +225,7 @@ def retry_failed_deletion(
 
     if cleanup_qdrant:
         try:
-            from qdrant_client.models import FieldCondition, Filter, MatchValue
-
-            from app.core.config import settings
-            from app.services.embedding_service import embedding_service
-
-            qclient = embedding_service.get_qdrant_client()
-            qclient.delete(
-                collection_name=settings.QDRANT_COLLECTION,
-                points_selector=Filter(
-                    must=[FieldCondition(key="document_id", match=MatchValue(value=document_id))]
-                ),
-            )
+            delete_document_vectors(document_id)
             logger.info("Retry: Qdrant cleanup succeeded for doc %s", document_id)
         except Exception as e:
             qdrant_ok = False
@@ -1,20 +1,46 @@
 from __future__ import annotations
 
-import time
+import hashlib
+import mmap
+import tempfile
 import uuid
-from typing import List, Optional
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Iterable, Iterator, List, NamedTuple, Optional
 
 from celery.exceptions import SoftTimeLimitExceeded
 from celery.utils.log import get_task_logger
 from minio import Minio
-from qdrant_client.models import PointStruct
-from sqlalchemy import String, cast, func, insert, select, text, update
+from qdrant_client.models import (
+    FieldCondition,
+    Filter,
+    MatchValue,
+    PointStruct,
+    SetPayload,
+    SetPayloadOperation,
+)
+from sqlalchemy import String, cast, delete, func, insert, select, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from app.core.config import settings
 from app.models.sync_database import SyncSessionLocal, sync_engine
-from app.models.tables import Chunk, Document, DocumentBrief, DocumentElement, Page
+from app.models.tables import (
+    Chunk,
+    Document,
+    DocumentBrief,
+    DocumentElement,
+    DocumentLexicalIndex,
+    DocumentNormalizedText,
+    Page,
+)
 from app.services.conversion_service import CONVERTIBLE_TYPES, convert_to_pdf
 from app.services.embedding_service import embedding_service
+from app.services.lexical_index import FORMAT_VERSION as LEXICAL_INDEX_FORMAT
+from app.services.lexical_index import build_index_blob
+from app.services.normalized_text_index import FORMAT_VERSION as NORMALIZED_TEXT_FORMAT
+from app.services.normalized_text_index import build_normalized_blob
 from app.services.parse_service import (
     PARSE_PIPELINE_VERSION,
     ParseService,
@@ -79,15 +105,29 @@ def _get_minio_client() -> Minio:
     return Minio(host, access_key=access_key, secret_key=secret_key, secure=secure)
 
 
-def _download_file_bytes(bucket: str, object_key: str) -> bytes:
+_DOWNLOAD_CHUNK_BYTES = 1024 * 1024
+
+
+def _download_file(bucket: str, object_key: str) -> memoryview:
+    """Stream an object into an anonymous temp file and return it memory-mapped.
+
+    The mapping is file-backed, so the kernel pages the document in and out
+    as PyMuPDF/extractors touch it instead of the worker holding the whole
+    object as one ``bytes``; it is unmapped when the last view is dropped.
+    """
     client = _get_minio_client()
     response = client.get_object(bucket, object_key)
-    try:
-        data = response.read()
-    finally:
-        response.close()
-        response.release_conn()
-    return data
+    with tempfile.TemporaryFile(prefix="doctalk-src-") as tmp:
+        try:
+            for part in response.stream(_DOWNLOAD_CHUNK_BYTES):
+                tmp.write(part)
+        finally:
+            response.close()
+            response.release_conn()
+        tmp.flush()
+        if not tmp.tell():
+            return memoryview(b"")
+        return memoryview(mmap.mmap(tmp.fileno(), 0, access=mmap.ACCESS_READ))
 
 
 # One executemany round trip per batch instead of one INSERT round trip per
@@ -96,9 +136,316 @@ def _download_file_bytes(bucket: str, object_key: str) -> bytes:
 _PERSIST_BATCH_SIZE = 500
 
 
-def _insert_rows_batched(db, model, rows: List[dict]) -> None:
-    for i in range(0, len(rows), _PERSIST_BATCH_SIZE):
-        db.execute(insert(model), rows[i : i + _PERSIST_BATCH_SIZE])
+def _insert_rows_batched(db, model, rows: Iterable[dict]) -> int:
+    """Insert `rows` in executemany batches; returns the row count. `rows`
+    may be a generator — only one batch is materialized at a time, so a
+    streamed parse never holds every page/element/chunk row at once."""
+    total = 0
+    it = iter(rows)
+    while batch := list(islice(it, _PERSIST_BATCH_SIZE)):
+        db.execute(insert(model), batch)
+        total += len(batch)
+    return total
+
+
+class _ChunkingError(Exception):
+    """A failure inside the chunker while its output streams into INSERTs —
+    kept distinct from DB errors so the document gets CHUNKING_FAILED."""
+
+
+def _chunk_rows(document_id, chunk_infos: Iterable) -> Iterator[dict]:
+    """Chunk INSERT rows (text sanitized of NUL bytes for PostgreSQL)."""
+    it = iter(chunk_infos)
+    while True:
+        try:
+            ch = next(it)
+        except StopIteration:
+            return
+        except SoftTimeLimitExceeded:
+            raise
+        except Exception as e:
+            raise _ChunkingError(str(e)) from e
+        yield {
+            "document_id": document_id,
+            "chunk_index": ch.chunk_index,
+            "text": ch.text.replace("\x00", "") if ch.text else ch.text,
+            "token_count": ch.token_count,
+            "page_start": ch.page_start,
+            "page_end": ch.page_end,
+            "bboxes": ch.bboxes,
+            "section_title": ch.section_title,
+        }
+
+
+# ---------------- Incremental reparse -----------------
+# Locale-only reparses and PARSE_PIPELINE_VERSION backfills mostly reproduce
+# the same chunk texts. Matching the new chunks to the old ones by text
+# digest keeps their row ids (saved quotes' source_chunk_id, citations) and
+# their Qdrant points; only new or changed chunks are embedded.
+
+# Point ids per Qdrant retrieve / payload batch.
+_QDRANT_ID_BATCH = 1000
+
+
+class _ReusableChunk(NamedTuple):
+    id: uuid.UUID
+    indexed: bool  # its point exists in the current collection
+    chunk_index: int
+    page_start: int
+
+
+@dataclass
+class _ChunkReuse:
+    total: int = 0
+    reused: int = 0
+    indexed: int = 0
+    removed: list = field(default_factory=list)
+    payload_updates: list = field(default_factory=list)  # (point id, payload)
+
+
+def _chunk_digest(text: Optional[str]) -> str:
+    """Same value as PostgreSQL ``md5(chunks.text)``."""
+    return hashlib.md5((text or "").encode("utf-8"), usedforsecurity=False).hexdigest()
+
+
+def _load_reusable_chunks(db, doc, qclient) -> dict[str, deque]:
+    """The document's current chunks keyed by text digest (chunk order within
+    a digest). A chunk only counts as indexed if its point is still in the
+    configured collection, so a switched or rebuilt collection re-embeds."""
+    rows = db.execute(
+        select(Chunk.id, func.md5(Chunk.text).label("digest"), Chunk.chunk_index, Chunk.page_start, Chunk.vector_id)
+        .where(Chunk.document_id == doc.id)
+        .order_by(Chunk.chunk_index)
+    ).all()
+    vectored = [str(r.id) for r in rows if r.vector_id]
+    live: set[str] = set()
+    for start in range(0, len(vectored), _QDRANT_ID_BATCH):
+        found = qclient.retrieve(
+            collection_name=settings.QDRANT_COLLECTION,
+            ids=vectored[start : start + _QDRANT_ID_BATCH],
+            with_payload=False,
+            with_vectors=False,
+        )
+        live.update(str(p.id) for p in found)
+    reusable: dict[str, deque] = {}
+    for r in rows:
+        reusable.setdefault(r.digest, deque()).append(
+            _ReusableChunk(r.id, str(r.id) in live, r.chunk_index, r.page_start)
+        )
+    return reusable
+
+
+def _match_chunk_rows(rows: Iterable[dict], reusable: dict[str, deque], reuse: _ChunkReuse) -> tuple[list, list]:
+    """Split new chunk rows into UPDATEs of reused rows (by primary key) and
+    INSERTs of new ones, consuming `reusable` and recording the Qdrant payload
+    fixes reused points need."""
+    updates: list[dict] = []
+    inserts: list[dict] = []
+    for row in rows:
+        candidates = reusable.get(_chunk_digest(row["text"]))
+        if not candidates:
+            inserts.append(row)
+            continue
+        old = candidates.popleft()
+        updates.append({
+            **{k: v for k, v in row.items() if k not in ("document_id", "text")},
+            "id": old.id,
+            "vector_id": str(old.id) if old.indexed else None,
+        })
+        reuse.reused += 1
+        if old.indexed:
+            reuse.indexed += 1
+            if (old.chunk_index, old.page_start) != (row["chunk_index"], row["page_start"]):
+                reuse.payload_updates.append(
+                    (str(old.id), {"chunk_index": int(row["chunk_index"]), "page_start": int(row["page_start"])})
+                )
+    return updates, inserts
+
+
+def _persist_chunks_incremental(db, doc, chunk_infos: Iterable, reusable: dict[str, deque]) -> _ChunkReuse:
+    """Write the new chunk list over the existing rows without committing:
+    matched rows are updated in place (same id), the rest inserted, and old
+    rows nothing matched are deleted. Streams like ``_insert_rows_batched``."""
+    reuse = _ChunkReuse()
+    # Park the old rows at negative indexes so reassigning chunk_index can't
+    # collide on uq_chunks_document_index mid-statement.
+    db.execute(
+        update(Chunk).where(Chunk.document_id == doc.id).values(chunk_index=-Chunk.chunk_index - 1)
+    )
+    it = _chunk_rows(doc.id, chunk_infos)
+    while batch := list(islice(it, _PERSIST_BATCH_SIZE)):
+        updates, inserts = _match_chunk_rows(batch, reusable, reuse)
+        if updates:
+            db.execute(update(Chunk), updates)
+        if inserts:
+            db.execute(insert(Chunk), inserts)
+        reuse.total += len(batch)
+    reuse.removed = [old.id for candidates in reusable.values() for old in candidates]
+    if reuse.removed:
+        db.execute(delete(Chunk).where(Chunk.id.in_(reuse.removed)))
+    return reuse
+
+
+def _apply_reused_payloads(qclient, payload_updates: list) -> None:
+    for start in range(0, len(payload_updates), _QDRANT_ID_BATCH):
+        qclient.batch_update_points(
+            collection_name=settings.QDRANT_COLLECTION,
+            update_operations=[
+                SetPayloadOperation(set_payload=SetPayload(payload=payload, points=[point_id]))
+                for point_id, payload in payload_updates[start : start + _QDRANT_ID_BATCH]
+            ],
+            wait=True,
+        )
+
+
+def _upsert_document_row(db, model, values: dict) -> None:
+    stmt = pg_insert(model).values(**values)
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[model.document_id],
+            set_={k: stmt.excluded[k] for k in values if k != "document_id"},
+        )
+    )
+
+
+def _store_lexical_index(db, doc, page_contents: Iterable[tuple[int, Optional[str]]]) -> None:
+    """Build and upsert the document's inverted index from the chunks just
+    persisted. Best-effort: without it, lexical retrieval and the quote term
+    scan use their SQL/full-scan paths, so a failure only logs."""
+    try:
+        chunk_rows = db.execute(
+            select(Chunk.id, Chunk.text, Chunk.section_title)
+            .where(Chunk.document_id == doc.id)
+            .order_by(Chunk.chunk_index)
+        ).all()
+        blob = build_index_blob(
+            ((row.id, row.text, row.section_title) for row in chunk_rows),
+            page_contents,
+        )
+        _upsert_document_row(
+            db,
+            DocumentLexicalIndex,
+            {
+                "document_id": doc.id,
+                "format_version": LEXICAL_INDEX_FORMAT,
+                "chunk_count": len(chunk_rows),
+                "blob": blob,
+                "built_at": func.now(),
+            },
+        )
+        db.commit()
+    except SoftTimeLimitExceeded:
+        raise
+    except Exception as e:
+        if _chain_has_soft_limit(e):
+            raise SoftTimeLimitExceeded() from e
+        db.rollback()
+        logger.warning("Lexical index build failed for %s (non-blocking): %s", doc.id, e)
+
+
+def _store_normalized_texts(db, doc, page_contents: Iterable[tuple[int, Optional[str]]]) -> None:
+    """Normalize the persisted chunk texts and page contents once for the
+    Quote Finder. Best-effort like the lexical index: without the row, quote
+    search and verification normalize on the fly."""
+    try:
+        chunk_rows = db.execute(
+            select(Chunk.id, Chunk.text).where(Chunk.document_id == doc.id).order_by(Chunk.chunk_index)
+        ).all()
+        blob = build_normalized_blob(((row.id, row.text) for row in chunk_rows), page_contents)
+        _upsert_document_row(
+            db,
+            DocumentNormalizedText,
+            {
+                "document_id": doc.id,
+                "format_version": NORMALIZED_TEXT_FORMAT,
+                "blob": blob,
+                "built_at": func.now(),
+            },
+        )
+        db.commit()
+    except SoftTimeLimitExceeded:
+        raise
+    except Exception as e:
+        if _chain_has_soft_limit(e):
+            raise SoftTimeLimitExceeded() from e
+        db.rollback()
+        logger.warning("Normalized text build failed for %s (non-blocking): %s", doc.id, e)
+
+
+# Progress writes during indexing: one vector_id backfill + chunks_indexed
+# commit per this many embedding batches (and always after the last one)
+# instead of an UPDATE + commit round trip per batch.
+_PROGRESS_FLUSH_BATCHES = 4
+
+
+def _index_chunks(db, doc, chunks, qclient, *, batch_size: int, max_in_flight: int) -> int:
+    """Embed + upsert `chunks` (rows of id/text/chunk_index/page_start) and
+    backfill vector_id. Returns the new chunks_indexed total.
+
+    Pipelined: up to `max_in_flight` embedding requests run on a thread pool
+    while this thread upserts finished batches strictly in chunk order, so
+    progress stays monotonic. Upserts are fire-and-forget (wait=False — Qdrant
+    acks once the op is in its WAL) except the final batch, which waits: the
+    update queue applies in order, so 'ready' is never published before every
+    point is searchable. vector_id is only written for batches Qdrant already
+    acknowledged; a crash mid-run leaves at worst unflushed progress, and the
+    re-run either deletes the document's points up front or (incremental)
+    re-upserts the same chunk ids over them.
+    """
+    batches = [chunks[i : i + batch_size] for i in range(0, len(chunks), batch_size)]
+    total_indexed = int(doc.chunks_indexed or 0)
+    document_id = str(doc.id)
+    unflushed_ids: list = []
+
+    def _flush_progress() -> None:
+        if not unflushed_ids:
+            return
+        # vector_id is defined as the chunk's own id in text form.
+        db.execute(
+            update(Chunk)
+            .where(Chunk.id.in_(unflushed_ids))
+            .values(vector_id=cast(Chunk.id, String))
+        )
+        doc.chunks_indexed = total_indexed
+        db.add(doc)
+        db.commit()
+        unflushed_ids.clear()
+
+    pool = ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix="embed")
+    try:
+        in_flight: deque = deque()
+        next_submit = 0
+        for idx, batch in enumerate(batches):
+            while next_submit < len(batches) and len(in_flight) < max_in_flight:
+                texts = [c.text for c in batches[next_submit]]
+                in_flight.append(pool.submit(embedding_service.embed_texts, texts))
+                next_submit += 1
+            vectors = in_flight.popleft().result()
+
+            points: List[PointStruct] = [
+                PointStruct(
+                    id=str(c.id),
+                    vector=v,
+                    payload={
+                        "document_id": document_id,
+                        "chunk_index": int(c.chunk_index),
+                        "page_start": int(c.page_start),
+                    },
+                )
+                for c, v in zip(batch, vectors)
+            ]
+            is_last = idx == len(batches) - 1
+            qclient.upsert(collection_name=settings.QDRANT_COLLECTION, points=points, wait=is_last)
+
+            unflushed_ids.extend(c.id for c in batch)
+            total_indexed += len(batch)
+            if is_last or (idx + 1) % _PROGRESS_FLUSH_BATCHES == 0:
+                _flush_progress()
+    finally:
+        # A soft time limit (or provider failure) lands in .result() above;
+        # drop queued embeds instead of paying for vectors nobody will upsert.
+        pool.shutdown(wait=False, cancel_futures=True)
+    return total_indexed
 
 
 def _chain_has_soft_limit(exc: BaseException) -> bool:
@@ -341,38 +688,56 @@ def parse_document(self, document_id: str, locale: str | None = None) -> None:
                 )
             locale = doc.parse_requested_locale
 
+            # Incremental reparse: when the document already has chunks, keep
+            # them (and their vectors) for now; the chunk stage diffs the new
+            # chunk list against them by text digest. Any failure to plan it
+            # falls back to the full re-index below.
+            reusable: Optional[dict[str, deque]] = None
+            if settings.PARSE_INCREMENTAL_REINDEX and doc.chunks_total:
+                try:
+                    embedding_service.ensure_collection()
+                    reusable = _load_reusable_chunks(db, doc, embedding_service.get_qdrant_client()) or None
+                except SoftTimeLimitExceeded:
+                    raise
+                except Exception as e:
+                    if _chain_has_soft_limit(e):
+                        raise SoftTimeLimitExceeded() from e
+                    db.rollback()
+                    logger.warning("Incremental reparse unavailable for %s, re-indexing fully: %s", document_id, e)
+                    reusable = None
+
             # Delete stale Qdrant vectors BEFORE deleting any DB rows (R2b ordering fix).
             # Doing Qdrant first means a Qdrant outage leaves the document's existing
             # Pages/Chunks intact (we only set an error + return) instead of committing the
             # row deletes alongside the error — which would have been silent data loss when
             # vectors also survived. The delete is by document_id filter, so it needs no
-            # chunk rows. HARD, AWAITED precondition before re-indexing.
-            try:
-                # ensure_collection() first so a first parse on a fresh collection doesn't
-                # fail the delete with "collection not found".
-                embedding_service.ensure_collection()
-                from qdrant_client.models import FieldCondition, Filter, MatchValue
-
-                _qclient = embedding_service.get_qdrant_client()
-                _qclient.delete(
-                    collection_name=settings.QDRANT_COLLECTION,
-                    points_selector=Filter(
-                        must=[FieldCondition(key="document_id", match=MatchValue(value=str(doc.id)))]
-                    ),
-                    wait=True,
-                )
-            except SoftTimeLimitExceeded:
-                raise
-            except Exception as e:
-                # Do NOT delete DB rows or re-index with stale vectors. Mark a structured
-                # error (never leave the doc stuck in 'parsing') and stop; the user can retry.
-                logger.error("Qdrant pre-delete failed for %s: %s", document_id, e)
-                _set_doc_error(
-                    doc, "QDRANT_CLEANUP_FAILED",
-                    "Could not clear old vectors before re-processing; please retry.",
-                )
-                db.commit()
-                return
+            # chunk rows. HARD, AWAITED precondition before a full re-index (an
+            # incremental one deletes the points of removed chunks by id instead).
+            if reusable is None:
+                try:
+                    # ensure_collection() first so a first parse on a fresh collection doesn't
+                    # fail the delete with "collection not found".
+                    embedding_service.ensure_collection()
+                    _qclient = embedding_service.get_qdrant_client()
+                    _qclient.delete(
+                        collection_name=settings.QDRANT_COLLECTION,
+                        points_selector=Filter(
+                            must=[FieldCondition(key="document_id", match=MatchValue(value=str(doc.id)))]
+                        ),
+                        wait=True,
+                    )
+                except SoftTimeLimitExceeded:
+                    raise
+                except Exception as e:
+                    # Do NOT delete DB rows or re-index with stale vectors. Mark a structured
+                    # error (never leave the doc stuck in 'parsing') and stop; the user can retry.
+                    logger.error("Qdrant pre-delete failed for %s: %s", document_id, e)
+                    _set_doc_error(
+                        doc, "QDRANT_CLEANUP_FAILED",
+                        "Could not clear old vectors before re-processing; please retry.",
+                    )
+                    db.commit()
+                    return
 
             # Clean up partial data from previous attempts (idempotent re-parse). Only after
             # Qdrant vectors are confirmed gone (above) so the two stores can't diverge.
@@ -380,11 +745,16 @@ def parse_document(self, document_id: str, locale: str | None = None) -> None:
 
             db.execute(sa_delete(DocumentBrief).where(DocumentBrief.document_id == doc.id))
             db.execute(sa_delete(DocumentElement).where(DocumentElement.document_id == doc.id))
-            db.execute(sa_delete(Chunk).where(Chunk.document_id == doc.id))
+            db.execute(sa_delete(DocumentLexicalIndex).where(DocumentLexicalIndex.document_id == doc.id))
+            db.execute(sa_delete(DocumentNormalizedText).where(DocumentNormalizedText.document_id == doc.id))
+            if reusable is None:
+                db.execute(sa_delete(Chunk).where(Chunk.document_id == doc.id))
+                # Kept otherwise: it gates the next attempt's incremental
+                # mode while the old chunk rows still exist.
+                doc.chunks_total = 0
             db.execute(sa_delete(Page).where(Page.document_id == doc.id))
 
             doc.pages_parsed = 0
-            doc.chunks_total = 0
             doc.chunks_indexed = 0
             doc.summary = None
             doc.suggested_questions = None
@@ -396,11 +766,14 @@ def parse_document(self, document_id: str, locale: str | None = None) -> None:
             doc.updated_at = func.now()
             db.add(doc)
             db.commit()
-            logger.info("Cleaned up partial data for %s, starting fresh parse", document_id)
+            logger.info(
+                "Cleaned up partial data for %s, starting %s parse",
+                document_id, "fresh" if reusable is None else "incremental",
+            )
 
             # Download file
             try:
-                file_bytes = _download_file_bytes(settings.MINIO_BUCKET, doc.storage_key)
+                file_bytes = _download_file(settings.MINIO_BUCKET, doc.storage_key)
             except SoftTimeLimitExceeded:
                 raise
             except Exception as e:
@@ -548,6 +921,7 @@ def parse_document(self, document_id: str, locale: str | None = None) -> None:
                             file_bytes,
                             languages=ocr_languages_used,
                             dpi=settings.OCR_DPI,
+                            workers=settings.OCR_WORKERS,
                         )
                     except SoftTimeLimitExceeded:
                         raise
@@ -589,13 +963,12 @@ def parse_document(self, document_id: str, locale: str | None = None) -> None:
                     db.commit()
 
                 # Forward-only PDF page-text persistence (M2, plan §8.1/§9):
-                # mirror the non-PDF branch's extracted_content_map so the
-                # shared persist-pages loop below sets Page.content for PDFs
-                # too. `pages` here is whichever won above — the text layer,
-                # or the adopted OCR result — so raw_text always matches what
-                # the doc was actually indexed from.
-                for p in pages:
-                    extracted_content_map[p.page_number] = getattr(p, "raw_text", "") or ""
+                # the shared persist-pages loop below falls back to each page's
+                # raw_text when extracted_content_map has no entry, so
+                # Page.content is set for PDFs too without copying every
+                # page's text into memory. `pages` here is whichever won above
+                # — the text layer, or the adopted OCR result — so raw_text
+                # always matches what the doc was actually indexed from.
 
             # ---- Best-effort: convert PPTX/DOCX to PDF for visual rendering ----
             if file_type in CONVERTIBLE_TYPES and not doc.converted_storage_key:
@@ -616,23 +989,30 @@ def parse_document(self, document_id: str, locale: str | None = None) -> None:
 
             # ---- Shared path: persist pages, chunk, and embed ----
 
-            # Persist pages (batched executemany, single commit)
+            def _page_content(p) -> Optional[str]:
+                raw_content = extracted_content_map.get(p.page_number, getattr(p, "raw_text", "") or "")
+                return raw_content.replace("\x00", "") if raw_content else raw_content
+
+            # Persist pages (batched executemany, single commit). Rows are
+            # generated as the batches go out: `pages` may be a disk-backed
+            # PageSpool, and every stage below streams over it page by page.
             try:
-                page_rows: List[dict] = []
-                for p in pages:
-                    raw_content = extracted_content_map.get(p.page_number)
-                    page_rows.append(
+                pages_total = _insert_rows_batched(
+                    db,
+                    Page,
+                    (
                         {
                             "document_id": doc.id,
                             "page_number": p.page_number,
                             "width_pt": p.width_pt,
                             "height_pt": p.height_pt,
                             "rotation": p.rotation,
-                            "content": raw_content.replace("\x00", "") if raw_content else raw_content,
+                            "content": _page_content(p),
                         }
-                    )
-                _insert_rows_batched(db, Page, page_rows)
-                doc.pages_parsed = len(pages)
+                        for p in pages
+                    ),
+                )
+                doc.pages_parsed = pages_total
                 db.add(doc)
                 db.commit()
             except SoftTimeLimitExceeded:
@@ -647,21 +1027,23 @@ def parse_document(self, document_id: str, locale: str | None = None) -> None:
 
             # Persist canonical document elements (heading/paragraph stream).
             try:
-                element_infos = service.extract_elements(pages)
-                element_rows: List[dict] = [
-                    {
-                        "document_id": doc.id,
-                        "element_type": el.element_type,
-                        "page_start": el.page_start,
-                        "page_end": el.page_end,
-                        "bbox": el.bbox,
-                        "text": el.text,
-                        "reading_order": el.reading_order,
-                        "metadata_json": el.metadata_json,
-                    }
-                    for el in element_infos
-                ]
-                _insert_rows_batched(db, DocumentElement, element_rows)
+                _insert_rows_batched(
+                    db,
+                    DocumentElement,
+                    (
+                        {
+                            "document_id": doc.id,
+                            "element_type": el.element_type,
+                            "page_start": el.page_start,
+                            "page_end": el.page_end,
+                            "bbox": el.bbox,
+                            "text": el.text,
+                            "reading_order": el.reading_order,
+                            "metadata_json": el.metadata_json,
+                        }
+                        for el in service.iter_elements(pages)
+                    ),
+                )
                 db.commit()
             except SoftTimeLimitExceeded:
                 raise
@@ -673,42 +1055,42 @@ def parse_document(self, document_id: str, locale: str | None = None) -> None:
                     raise  # status not durably recorded — let autoretry re-run the parse
                 return
 
-            # Chunk document (includes cleaning + bbox normalization)
-            try:
-                chunk_infos = service.chunk_document(pages)
-            except SoftTimeLimitExceeded:
-                raise
-            except Exception as e:
-                logger.exception("Chunking failed for %s: %s", document_id, e)
-                _set_doc_error(doc, "CHUNKING_FAILED", "Document chunking failed")
-                db.add(doc)
-                db.commit()
-                return
-
-            # Persist chunks (sanitize text to remove NUL bytes for PostgreSQL)
+            # Chunk document (includes cleaning + bbox normalization) and
+            # persist chunks batch by batch as the chunker produces them.
             chunks_total = 0
+            reuse: Optional[_ChunkReuse] = None
             try:
-                chunk_rows: List[dict] = [
-                    {
-                        "document_id": doc.id,
-                        "chunk_index": ch.chunk_index,
-                        "text": ch.text.replace("\x00", "") if ch.text else ch.text,
-                        "token_count": ch.token_count,
-                        "page_start": ch.page_start,
-                        "page_end": ch.page_end,
-                        "bboxes": ch.bboxes,
-                        "section_title": ch.section_title,
-                    }
-                    for ch in chunk_infos
-                ]
-                _insert_rows_batched(db, Chunk, chunk_rows)
-                chunks_total = len(chunk_rows)
+                if reusable is None:
+                    chunks_total = _insert_rows_batched(db, Chunk, _chunk_rows(doc.id, service.iter_chunks(pages)))
+                else:
+                    reuse = _persist_chunks_incremental(db, doc, service.iter_chunks(pages), reusable)
+                    chunks_total = reuse.total
+                    # Points first, rows second: if the commit then fails, the
+                    # surviving rows' points are missing, which the next run's
+                    # existence probe re-embeds; the reverse would orphan them.
+                    if reuse.removed:
+                        embedding_service.get_qdrant_client().delete(
+                            collection_name=settings.QDRANT_COLLECTION,
+                            points_selector=[str(chunk_id) for chunk_id in reuse.removed],
+                            wait=True,
+                        )
+                    logger.info(
+                        "Incremental reparse for %s: %d of %d chunks reused (%d with vectors), %d removed",
+                        document_id, reuse.reused, chunks_total, reuse.indexed, len(reuse.removed),
+                    )
 
                 doc.chunks_total = chunks_total
                 db.add(doc)
                 db.commit()
             except SoftTimeLimitExceeded:
                 raise
+            except _ChunkingError as e:
+                db.rollback()  # drop the batches inserted before the chunker failed
+                logger.exception("Chunking failed for %s: %s", document_id, e)
+                _set_doc_error(doc, "CHUNKING_FAILED", "Document chunking failed")
+                db.add(doc)
+                db.commit()
+                return
             except Exception as e:
                 if _chain_has_soft_limit(e):
                     raise SoftTimeLimitExceeded() from e
@@ -718,6 +1100,8 @@ def parse_document(self, document_id: str, locale: str | None = None) -> None:
                 return
 
             logger.info("Completed parse stage for %s: %d chunks", document_id, chunks_total)
+            _store_lexical_index(db, doc, ((p.page_number, _page_content(p)) for p in pages))
+            _store_normalized_texts(db, doc, ((p.page_number, _page_content(p)) for p in pages))
 
             # ---------------- Embedding & Qdrant indexing ----------------
             try:
@@ -729,16 +1113,17 @@ def parse_document(self, document_id: str, locale: str | None = None) -> None:
                 except Exception as e:
                     logger.warning("ensure_collection failed or skipped: %s", e)
 
-                # Load chunk columns as plain tuples: the loop below only needs
+                # Load chunk columns as plain tuples: _index_chunks only needs
                 # (id, text, chunk_index, page_start), and keeping ORM
                 # instances here previously led to one UPDATE flush per chunk
-                # for the vector_id backfill (now a single per-batch UPDATE).
+                # for the vector_id backfill (now one UPDATE per progress flush).
+                # Only chunks without a vector: all of them on a full re-index.
                 chunks = db.execute(
                     select(Chunk.id, Chunk.text, Chunk.chunk_index, Chunk.page_start)
-                    .where(Chunk.document_id == doc.id)
+                    .where(Chunk.document_id == doc.id, Chunk.vector_id.is_(None))
                     .order_by(Chunk.chunk_index)
                 ).all()
-                if not chunks:
+                if not chunks_total:
                     _set_doc_error(doc, "NO_CHUNKS", "No text content could be extracted from the document")
                     db.add(doc)
                     db.commit()
@@ -746,54 +1131,37 @@ def parse_document(self, document_id: str, locale: str | None = None) -> None:
                     return
 
                 doc.status = "embedding"
+                doc.chunks_indexed = chunks_total - len(chunks)
                 db.add(doc)
                 db.commit()
 
                 batch_size = int(getattr(settings, "EMBED_BATCH_SIZE", 64) or 64)
+                max_in_flight = max(1, int(getattr(settings, "EMBED_MAX_CONCURRENCY", 4) or 1))
                 qclient = embedding_service.get_qdrant_client()
+                if reuse is not None and reuse.payload_updates:
+                    _apply_reused_payloads(qclient, reuse.payload_updates)
 
-                total_indexed = int(doc.chunks_indexed or 0)
-                for i in range(0, len(chunks), batch_size):
-                    batch_start = time.time()
-                    batch = chunks[i : i + batch_size]
-                    texts = [c.text for c in batch]
-                    vectors = embedding_service.embed_texts(texts)
-
-                    points: List[PointStruct] = []
-                    for c, v in zip(batch, vectors):
-                        pid = str(c.id)
-                        points.append(
-                            PointStruct(
-                                id=pid,
-                                vector=v,
-                                payload={
-                                    "document_id": str(doc.id),
-                                    "chunk_index": int(c.chunk_index),
-                                    "page_start": int(c.page_start),
-                                },
-                            )
-                        )
-
-                    # Upsert to Qdrant
-                    qclient.upsert(collection_name=settings.QDRANT_COLLECTION, points=points, wait=True)
-
-                    # Update vector_id for the whole batch in one statement
-                    # (vector_id is defined as the chunk's own id in text form).
-                    db.execute(
-                        update(Chunk)
-                        .where(Chunk.id.in_([c.id for c in batch]))
-                        .values(vector_id=cast(Chunk.id, String))
-                    )
-
-                    total_indexed += len(batch)
-                    doc.chunks_indexed = total_indexed
-                    db.add(doc)
-                    db.commit()
+                total_indexed = _index_chunks(
+                    db, doc, chunks, qclient, batch_size=batch_size, max_in_flight=max_in_flight
+                )
 
-                    # Adaptive spacing: only add delay if the batch was too fast.
-                    elapsed = time.time() - batch_start
-                    if elapsed < 0.2:
-                        time.sleep(0.2 - elapsed)
+                # A delete that landed mid-parse set 'deleting' and queued a
+                # purge; writing 'ready' over it would resurrect the document.
+                # The row lock holds delete_document off until this commits.
+                current = db.execute(
+                    select(Document.status).where(Document.id == doc.id).with_for_update()
+                ).scalar_one_or_none()
+                if current is None or current == "deleting":
+                    db.rollback()
+                    if current is None:  # purged already: these vectors would be orphaned
+                        qclient.delete(
+                            collection_name=settings.QDRANT_COLLECTION,
+                            points_selector=Filter(
+                                must=[FieldCondition(key="document_id", match=MatchValue(value=str(doc.id)))]
+                            ),
+                        )
+                    logger.info("Document %s was deleted while parsing; leaving it to the purge", document_id)
+                    return
 
                 # All done — record parse-pipeline metadata (R2b) for observability + backfill.
                 doc.status = "ready"
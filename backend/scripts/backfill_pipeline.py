@@ -0,0 +1,120 @@
+"""Re-parse the corpus onto the current PARSE_PIPELINE_VERSION.
+
+Unlike find_low_quality_docs.py --enqueue, which publishes every candidate
+at once, this creates a backfill run. The run is a prioritized snapshot of
+candidates, checkpointed per document in Postgres. Celery beat advances it
+every minute (advance_backfill_runs):
+
+- at most --max-in-flight documents are parsing at a time;
+- spend stays within --budget-tokens embedding tokens;
+- no dispatch while BACKFILL_LIVE_YIELD_THRESHOLD user-initiated parses
+  are running.
+
+`tick` advances the runs once by hand, for setups without beat.
+
+Usage (from backend/, with the app's env):
+    python3 scripts/backfill_pipeline.py plan --limit 20
+    python3 scripts/backfill_pipeline.py start --max-in-flight 4 --budget-tokens 50000000
+    python3 scripts/backfill_pipeline.py status [RUN_ID]
+    python3 scripts/backfill_pipeline.py pause RUN_ID
+    python3 scripts/backfill_pipeline.py resume RUN_ID --budget-tokens 80000000
+    python3 scripts/backfill_pipeline.py cancel RUN_ID
+    python3 scripts/backfill_pipeline.py tick
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from datetime import timedelta
+
+# Make the backend root importable when run as `python3 scripts/backfill_pipeline.py`.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import select  # noqa: E402
+
+from app.models.sync_database import SyncSessionLocal  # noqa: E402
+from app.models.tables import BackfillRun  # noqa: E402
+from app.services import backfill_service  # noqa: E402
+from app.services.parse_service import PARSE_PIPELINE_VERSION  # noqa: E402
+
+
+def _print_progress(run: BackfillRun) -> None:
+    p = backfill_service.progress(run)
+    eta = str(timedelta(seconds=p["eta_seconds"])) if p["eta_seconds"] is not None else "-"
+    budget = f"/{p['budget_tokens']:,}" if p["budget_tokens"] is not None else ""
+    print(f"run {p['run_id']} [{p['status']}] -> v{p['target_version']}")
+    print(f"  docs:       {p['docs_done']} done, {p['docs_failed']} failed, {p['docs_skipped']} skipped, "
+          f"{p['docs_remaining']} remaining of {p['docs_total']}")
+    print(f"  throughput: {p['docs_per_hour']} docs/hour, {p['chunks_per_second']} chunks/s "
+          f"({p['chunks_done']:,} chunks)")
+    print(f"  tokens:     {p['tokens_spent']:,}{budget}")
+    print(f"  eta:        {eta}")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    sub = ap.add_subparsers(dest="command", required=True)
+    for name in ("plan", "start"):
+        p = sub.add_parser(name)
+        p.add_argument("--quality", type=float, default=0.70, help="text_quality below this ranks first")
+        p.add_argument("--limit", type=int, default=None)
+        p.add_argument("--force", action="store_true", help="include low-quality docs already at the current version")
+        if name == "start":
+            p.add_argument("--max-in-flight", type=int, default=4)
+            p.add_argument("--budget-tokens", type=int, default=None)
+    p = sub.add_parser("status")
+    p.add_argument("run_id", nargs="?")
+    for name in ("pause", "resume", "cancel"):
+        p = sub.add_parser(name)
+        p.add_argument("run_id")
+        if name == "resume":
+            p.add_argument("--max-in-flight", type=int, default=None)
+            p.add_argument("--budget-tokens", type=int, default=None)
+    sub.add_parser("tick")
+    args = ap.parse_args()
+
+    with SyncSessionLocal() as db:
+        if args.command == "plan":
+            rows = backfill_service.select_candidates(db, quality=args.quality, limit=args.limit, force=args.force)
+            print(f"PARSE_PIPELINE_VERSION={PARSE_PIPELINE_VERSION}  candidates={len(rows)}  "
+                  f"est. tokens (full re-embed)={sum(int(r.est_tokens) for r in rows):,}")
+            for r in rows[:50]:
+                print(f"  {r.id}  ~{int(r.est_tokens):,} tokens")
+        elif args.command == "start":
+            run = backfill_service.create_run(
+                db, quality=args.quality, limit=args.limit, force=args.force,
+                max_in_flight=args.max_in_flight, budget_tokens=args.budget_tokens,
+            )
+            _print_progress(run)
+        elif args.command == "status":
+            if args.run_id:
+                runs = [backfill_service.get_run(db, args.run_id)]
+            else:
+                runs = db.execute(select(BackfillRun).order_by(BackfillRun.created_at.desc()).limit(10)).scalars().all()
+            for run in runs:
+                if run is None:
+                    sys.exit("no such run")
+                _print_progress(run)
+        elif args.command == "tick":
+            from app.workers.backfill_worker import run_backfill_tick
+
+            print(f"dispatched {run_backfill_tick()} documents")
+        else:
+            run = backfill_service.get_run(db, args.run_id)
+            if run is None:
+                sys.exit("no such run")
+            status = {"pause": "paused", "resume": "running", "cancel": "cancelled"}[args.command]
+            try:
+                backfill_service.set_status(
+                    db, run, status,
+                    budget_tokens=getattr(args, "budget_tokens", None),
+                    max_in_flight=getattr(args, "max_in_flight", None),
+                )
+            except ValueError as e:
+                sys.exit(str(e))
+            _print_progress(run)
+
+
+if __name__ == "__main__":
+    main()
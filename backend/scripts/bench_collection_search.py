@@ -0,0 +1,136 @@
+"""Per-document coverage and latency of collection vector search strategies.
+
+Seeds a synthetic 50-document collection in which a few "dense" documents
+sit close to every query (the crowding case), then compares, per query:
+
+  collection  one query_points over MatchAny(all docs), limit 24 (search_multi)
+  per-doc     one query_points per document (the former balanced legs),
+              issued concurrently from a thread pool
+  grouped     one query_points_groups by document_id (search_per_document)
+
+Coverage is the share of documents that received their full quota. Local
+mode has no network, so --rtt-ms adds a simulated round trip per Qdrant
+call; pass --url to run against a real Qdrant instead (a scratch collection
+is created and dropped).
+
+Usage (from backend/):
+    python3 scripts/bench_collection_search.py
+    python3 scripts/bench_collection_search.py --documents 50 --dense 5 --rtt-ms 2
+    python3 scripts/bench_collection_search.py --url http://localhost:6333
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from qdrant_client import QdrantClient
+from qdrant_client.models import (
+    Distance,
+    FieldCondition,
+    Filter,
+    MatchAny,
+    MatchValue,
+    PointStruct,
+    VectorParams,
+)
+
+_DIM = 64
+
+
+def _unit(vec: list[float]) -> list[float]:
+    norm = sum(v * v for v in vec) ** 0.5 or 1.0
+    return [v / norm for v in vec]
+
+
+def _seed(client: QdrantClient, name: str, args, rng: random.Random) -> tuple[list[str], list[float]]:
+    client.create_collection(name, vectors_config=VectorParams(size=_DIM, distance=Distance.COSINE))
+    topic = _unit([rng.gauss(0, 1) for _ in range(_DIM)])
+    document_ids = [str(uuid.uuid4()) for _ in range(args.documents)]
+    points = []
+    for position, document_id in enumerate(document_ids):
+        dense = position < args.dense
+        centre = _unit([t + rng.gauss(0, 0.4 if dense else 1.6) for t in topic])
+        for _ in range(args.chunks):
+            vector = _unit([c + rng.gauss(0, 0.3) for c in centre])
+            points.append(PointStruct(id=str(uuid.uuid4()), vector=vector, payload={"document_id": document_id}))
+    for start in range(0, len(points), 1000):
+        client.upsert(name, points[start : start + 1000])
+    return document_ids, topic
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--documents", type=int, default=50)
+    ap.add_argument("--dense", type=int, default=5, help="documents near every query")
+    ap.add_argument("--chunks", type=int, default=120, help="chunks per document")
+    ap.add_argument("--quota", type=int, default=2, help="hits wanted per document")
+    ap.add_argument("--queries", type=int, default=20)
+    ap.add_argument("--rtt-ms", type=float, default=0.0, help="simulated round trip per Qdrant call")
+    ap.add_argument("--url", default=None, help="real Qdrant URL (default: in-process local mode)")
+    args = ap.parse_args()
+
+    rng = random.Random(7)
+    client = QdrantClient(url=args.url) if args.url else QdrantClient(":memory:")
+    name = f"bench_groups_{uuid.uuid4().hex[:8]}"
+    document_ids, topic = _seed(client, name, args, rng)
+    any_doc = Filter(must=[FieldCondition(key="document_id", match=MatchAny(any=document_ids))])
+    fetch = max(args.quota * 3, 6)
+
+    def _rtt() -> None:
+        if args.rtt_ms:
+            time.sleep(args.rtt_ms / 1000)
+
+    def collection(qvec):
+        _rtt()
+        res = client.query_points(name, query=qvec, limit=24, query_filter=any_doc, with_payload=True)
+        counts: dict[str, int] = {}
+        for p in res.points:
+            counts[p.payload["document_id"]] = counts.get(p.payload["document_id"], 0) + 1
+        return counts, 1
+
+    pool = ThreadPoolExecutor(max_workers=8)
+
+    def per_doc(qvec):
+        def one(document_id):
+            _rtt()
+            flt = Filter(must=[FieldCondition(key="document_id", match=MatchValue(value=document_id))])
+            return document_id, len(client.query_points(name, query=qvec, limit=fetch, query_filter=flt).points)
+
+        return dict(pool.map(one, document_ids)), len(document_ids)
+
+    def grouped(qvec):
+        _rtt()
+        res = client.query_points_groups(
+            name, group_by="document_id", query=qvec, limit=len(document_ids), group_size=fetch,
+            query_filter=any_doc, with_payload=False,
+        )
+        return {str(g.id): len(g.hits) for g in res.groups}, 1
+
+    queries = [_unit([t + rng.gauss(0, 0.5) for t in topic]) for _ in range(args.queries)]
+    print(f"{args.documents} documents x {args.chunks} chunks, {args.dense} dense, quota {args.quota}, "
+          f"rtt {args.rtt_ms} ms, {'qdrant ' + args.url if args.url else 'local mode'}\n")
+    print(f"{'strategy':<11} {'calls':>6} {'p50 ms':>8} {'p95 ms':>8} {'coverage':>9}")
+    try:
+        for label, strategy in (("collection", collection), ("per-doc", per_doc), ("grouped", grouped)):
+            strategy(queries[0])  # warm up
+            timings, coverage = [], []
+            for qvec in queries:
+                started = time.perf_counter()
+                counts, calls = strategy(qvec)
+                timings.append((time.perf_counter() - started) * 1000)
+                coverage.append(sum(1 for d in document_ids if counts.get(d, 0) >= args.quota) / len(document_ids))
+            timings.sort()
+            p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+            print(f"{label:<11} {calls:>6} {statistics.median(timings):>8.1f} {p95:>8.1f} "
+                  f"{statistics.mean(coverage):>8.0%}")
+    finally:
+        pool.shutdown()
+        client.delete_collection(name)
+
+
+if __name__ == "__main__":
+    main()
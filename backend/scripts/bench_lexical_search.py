@@ -0,0 +1,123 @@
+"""Latency of lexical retrieval per LEXICAL_SEARCH_MODE on a large collection.
+
+Seeds a synthetic corpus into a session-local TEMP `chunks` table (created
+LIKE public.chunks INCLUDING ALL, so it carries the search_tsv generated
+column and both indexes, and shadows the real table for this connection
+only), then times `lexical_search` / `lexical_search_multi` in each mode.
+Nothing is written to real tables; the transaction is rolled back.
+
+Needs a Postgres migrated to head (the integration-test DB works):
+    DATABASE_URL=postgresql+asyncpg://... python3 scripts/bench_lexical_search.py
+    python3 scripts/bench_lexical_search.py --chunks 50000 --documents 40 --repeats 30
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+import uuid
+
+# Make the backend root importable when run as `python3 scripts/bench_lexical_search.py`.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert, text  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.models.database import AsyncSessionLocal  # noqa: E402
+from app.models.tables import Chunk  # noqa: E402
+from app.services.retrieval_service import retrieval_service  # noqa: E402
+
+_VOCAB = (
+    "agreement party obligation termination notice payment invoice revenue margin forecast "
+    "liability indemnity warranty confidential schedule clause section exhibit governing law "
+    "delaware arbitration dispute quarter fiscal growth customer supplier license territory "
+    "renewal breach remedy damages insurance audit compliance regulation subsidiary merger"
+).split()
+_NEEDLES = ("non-compete", "MetaX", "force majeure", "EBITDA 2028", "change of control")
+_QUERIES = (
+    "Does this agreement contain a non-compete clause?",
+    "What is MetaX 2028 revenue?",
+    "Is there a force majeure provision?",
+    "change of control termination rights",
+    "governing law and arbitration",
+)
+
+
+def _chunk_text(rng: random.Random) -> str:
+    words = [rng.choice(_VOCAB) for _ in range(rng.randint(80, 220))]
+    if rng.random() < 0.03:
+        words.insert(rng.randrange(len(words)), rng.choice(_NEEDLES))
+    return " ".join(words).capitalize() + "."
+
+
+async def _seed(db, document_ids: list[uuid.UUID], total: int, rng: random.Random) -> None:
+    await db.execute(text("CREATE TEMP TABLE chunks (LIKE public.chunks INCLUDING ALL) ON COMMIT DROP"))
+    per_doc = max(1, total // len(document_ids))
+    rows = []
+    for document_id in document_ids:
+        for index in range(per_doc):
+            rows.append(
+                {
+                    "document_id": document_id,
+                    "chunk_index": index,
+                    "text": _chunk_text(rng),
+                    "token_count": 200,
+                    "page_start": index // 3 + 1,
+                    "page_end": index // 3 + 1,
+                    "bboxes": [],
+                    "section_title": f"Section {index // 12 + 1}",
+                }
+            )
+    for start in range(0, len(rows), 2000):
+        await db.execute(insert(Chunk), rows[start : start + 2000])
+    await db.execute(text("ANALYZE chunks"))
+
+
+async def _time(call, repeats: int) -> tuple[float, float]:
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        await call()
+        samples.append((time.perf_counter() - started) * 1000.0)
+    samples.sort()
+    return statistics.median(samples), samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+
+
+async def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--chunks", type=int, default=12000)
+    ap.add_argument("--documents", type=int, default=24)
+    ap.add_argument("--repeats", type=int, default=20)
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args()
+
+    rng = random.Random(args.seed)
+    document_ids = [uuid.uuid4() for _ in range(args.documents)]
+    async with AsyncSessionLocal() as db:
+        started = time.perf_counter()
+        await _seed(db, document_ids, args.chunks, rng)
+        print(f"seeded {args.chunks} chunks / {args.documents} docs in {time.perf_counter() - started:.1f}s")
+        print(f"{'mode':<6} {'scope':<11} {'p50 ms':>8} {'p95 ms':>8}")
+        for mode in ("ilike", "fts", "bm25"):
+            settings.LEXICAL_SEARCH_MODE = mode
+            for scope in ("document", "collection"):
+                p50s, p95s = [], []
+                for query in _QUERIES:
+                    if scope == "document":
+                        call = lambda q=query: retrieval_service.lexical_search(q, document_ids[0], 8, db)  # noqa: E731
+                    else:
+                        call = lambda q=query: retrieval_service.lexical_search_multi(q, document_ids, 8, db)  # noqa: E731
+                    await call()  # warm plan/cache
+                    p50, p95 = await _time(call, args.repeats)
+                    p50s.append(p50)
+                    p95s.append(p95)
+                print(f"{mode:<6} {scope:<11} {statistics.mean(p50s):>8.1f} {max(p95s):>8.1f}")
+        await db.rollback()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,118 @@
+"""PPTX/DOCX → PDF throughput: a fresh LibreOffice per document vs the pool.
+
+Builds --docs small DOCX and PPTX files with python-docx/python-pptx, then
+converts them from --concurrency threads (a worker process converting for
+several parses at once) in two ways:
+
+  subprocess  `libreoffice --headless --convert-to pdf` per document, as
+              convert_to_pdf did before the pool
+  pool        conversion_service.ConversionPool with --instances instances,
+              LIBREOFFICE_POOL_MAX_QUEUE raised to fit every thread
+
+Reports conversions per minute, p50/p95 latency, and the first conversion
+(which includes the pool's instance start). Needs LibreOffice and python3-uno
+(LIBREOFFICE_UNO_PYTHON), as in the backend image.
+
+Usage (from backend/, with the app's env):
+    python3 scripts/bench_libreoffice_pool.py
+    python3 scripts/bench_libreoffice_pool.py --docs 60 --concurrency 4 --instances 2
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Make the backend root importable when run as `python3 scripts/bench_libreoffice_pool.py`.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import docx  # noqa: E402
+import pptx  # noqa: E402
+
+from app.services.conversion_service import (  # noqa: E402
+    _SUFFIX_MAP,
+    ConversionPool,
+    _convert_in_subprocess,
+)
+
+_PARAGRAPH = "Revenue in the region grew by twelve percent while operating costs held steady. "
+
+
+def _docx(i: int) -> bytes:
+    document = docx.Document()
+    document.add_heading(f"Quarterly report {i}", level=1)
+    for _ in range(20):
+        document.add_paragraph(_PARAGRAPH * 4)
+    buf = io.BytesIO()
+    document.save(buf)
+    return buf.getvalue()
+
+
+def _pptx(i: int) -> bytes:
+    deck = pptx.Presentation()
+    for slide_no in range(8):
+        slide = deck.slides.add_slide(deck.slide_layouts[1])
+        slide.shapes.title.text = f"Deck {i}, slide {slide_no + 1}"
+        slide.placeholders[1].text = _PARAGRAPH * 2
+    buf = io.BytesIO()
+    deck.save(buf)
+    return buf.getvalue()
+
+
+def _run(mode: str, inputs: list[tuple[str, bytes]], args: argparse.Namespace) -> dict:
+    pool = ConversionPool(args.instances, max_queue=args.concurrency) if mode == "pool" else None
+
+    def convert(item: tuple[str, bytes]) -> float:
+        file_type, data = item
+        started = time.perf_counter()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            input_path = os.path.join(tmpdir, f"input{_SUFFIX_MAP[file_type]}")
+            with open(input_path, "wb") as f:
+                f.write(data)
+            if pool is None:
+                _convert_in_subprocess(input_path, tmpdir, args.timeout)
+            else:
+                pool.convert(input_path, os.path.join(tmpdir, "input.pdf"), file_type, args.timeout)
+            if not os.path.exists(os.path.join(tmpdir, "input.pdf")):
+                raise RuntimeError("no output PDF")
+        return time.perf_counter() - started
+
+    try:
+        first = convert(inputs[0])
+        wall0 = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+            latencies = sorted(executor.map(convert, inputs[1:]))
+        wall = time.perf_counter() - wall0
+    finally:
+        if pool is not None:
+            pool.close()
+    return {
+        "per_min": len(latencies) / wall * 60,
+        "p50": latencies[len(latencies) // 2],
+        "p95": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+        "first": first,
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--docs", type=int, default=40, help="conversions per mode, half DOCX and half PPTX")
+    ap.add_argument("--concurrency", type=int, default=2, help="threads converting at once")
+    ap.add_argument("--instances", type=int, default=1, help="pool size")
+    ap.add_argument("--timeout", type=float, default=120.0)
+    args = ap.parse_args()
+
+    inputs = [("docx", _docx(i)) if i % 2 == 0 else ("pptx", _pptx(i)) for i in range(args.docs + 1)]
+    print(f"{args.docs} conversions, {args.concurrency} threads, pool of {args.instances}")
+    print(f"{'mode':<11} {'conv/min':>9} {'p50 s':>7} {'p95 s':>7} {'first s':>8}")
+    for mode in ("subprocess", "pool"):
+        r = _run(mode, inputs, args)
+        print(f"{mode:<11} {r['per_min']:>9.1f} {r['p50']:>7.2f} {r['p95']:>7.2f} {r['first']:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Peak memory of the parse pipeline vs page count: list-based vs streamed.
+
+Generates a synthetic text PDF (--pages pages of ~40 lines, running header and
+footer, a heading every few pages) and parses it in a fresh subprocess per
+(mode, size) so peak RSS is not polluted by earlier runs:
+
+  list    all PageInfo in a Python list, chunk_document/extract_elements
+          materialized, every page/element/chunk row built before "insert"
+          (the pre-streaming parse worker)
+  stream  extract_pages -> PageSpool, iter_elements/iter_chunks consumed in
+          _PERSIST_BATCH_SIZE batches (the current parse worker)
+
+Reports peak RSS (ru_maxrss) and the tracemalloc peak of Python allocations.
+The PDF bytes themselves are held in both modes (the upload cap bounds them).
+
+Usage (from backend/):
+    python3 scripts/bench_parse_memory.py
+    python3 scripts/bench_parse_memory.py --pages 250 500 1000 2000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from itertools import islice
+
+# Make the backend root importable when run as `python3 scripts/bench_parse_memory.py`.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_BATCH = 500  # parse_worker._PERSIST_BATCH_SIZE
+_LINE = "Finding {n}: revenue in the region grew while costs held steady through the quarter."
+
+
+def _make_pdf(path: str, n_pages: int) -> None:
+    import fitz
+
+    doc = fitz.open()
+    for pn in range(1, n_pages + 1):
+        page = doc.new_page(width=612, height=792)
+        page.insert_text((50, 30), "Synthetic Annual Report", fontsize=9)
+        y = 70
+        if pn % 4 == 1:
+            page.insert_text((50, y), f"Chapter {pn // 4 + 1}", fontsize=18)
+            y += 30
+        while y < 740:
+            page.insert_text((50, y), _LINE.format(n=f"{pn}.{y}"), fontsize=10)
+            y += 16
+        page.insert_text((50, 780), f"Page {pn} - Confidential", fontsize=8)
+    doc.save(path)
+    doc.close()
+
+
+def _run(mode: str, pdf_path: str) -> dict:
+    from app.services.parse_service import ParseService
+
+    with open(pdf_path, "rb") as f:
+        pdf_bytes = f.read()
+    service = ParseService()
+    tracemalloc.start()
+    started = time.perf_counter()
+    if mode == "list":
+        pages = list(service.iter_pages(pdf_bytes))
+        page_rows = [{"page_number": p.page_number, "content": p.raw_text} for p in pages]
+        element_rows = [vars(e) for e in service.extract_elements(pages)]
+        chunk_rows = [vars(c) for c in service.chunk_document(pages)]
+        counts = (len(page_rows), len(element_rows), len(chunk_rows))
+    else:
+        pages = service.extract_pages(pdf_bytes)
+
+        def _drain(rows) -> int:
+            total = 0
+            it = iter(rows)
+            while batch := list(islice(it, _BATCH)):
+                total += len(batch)
+            return total
+
+        counts = (
+            _drain({"page_number": p.page_number, "content": p.raw_text} for p in pages),
+            _drain(vars(e) for e in service.iter_elements(pages)),
+            _drain(vars(c) for c in service.iter_chunks(pages)),
+        )
+    elapsed = time.perf_counter() - started
+    _, traced_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "pages": counts[0],
+        "elements": counts[1],
+        "chunks": counts[2],
+        "seconds": elapsed,
+        "traced_peak_mb": traced_peak / 2**20,
+        "rss_peak_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--pages", type=int, nargs="+", default=[250, 500, 1000])
+    ap.add_argument("--child", nargs=2, metavar=("MODE", "PDF"), help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.child:
+        print(json.dumps(_run(*args.child)))
+        return
+
+    print(f"{'mode':<7} {'pages':>6} {'elements':>9} {'chunks':>7} {'seconds':>8} {'py peak MB':>11} {'RSS MB':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_pages in args.pages:
+            pdf_path = os.path.join(tmp, f"synthetic-{n_pages}.pdf")
+            _make_pdf(pdf_path, n_pages)
+            for mode in ("list", "stream"):
+                out = subprocess.run(
+                    [sys.executable, os.path.abspath(__file__), "--child", mode, pdf_path],
+                    check=True, capture_output=True, text=True,
+                ).stdout
+                r = json.loads(out.strip().splitlines()[-1])
+                print(f"{mode:<7} {r['pages']:>6} {r['elements']:>9} {r['chunks']:>7} {r['seconds']:>8.2f} "
+                      f"{r['traced_peak_mb']:>11.1f} {r['rss_peak_mb']:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
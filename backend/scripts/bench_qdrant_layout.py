@@ -0,0 +1,166 @@
+"""Recall vs latency of the Qdrant collection layout on document-filtered search.
+
+Creates two scratch collections with the same synthetic corpus:
+
+- baseline: the old layout. Global HNSW graph (m=16), float vectors in RAM,
+  plain keyword index.
+- tenant: the QDRANT_* layout. document_id tenant index, per-document graphs,
+  int8 quantization, on-disk originals.
+
+Both are queried the way retrieval does: filtered to one document, or to a
+10-document collection. Recall@k is measured against exact search on the
+baseline.
+The tenant layout is timed with and without rescoring and at each --ef. The
+scratch collections are dropped at the end.
+
+Needs a running Qdrant; local mode ignores HNSW and quantization:
+    docker run -p 6333:6333 qdrant/qdrant
+    python3 scripts/bench_qdrant_layout.py
+    python3 scripts/bench_qdrant_layout.py --documents 2000 --chunks 200 --ef 32,64,128
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+import uuid
+
+# Make the backend root importable when run as `python3 scripts/bench_qdrant_layout.py`.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from qdrant_client import QdrantClient  # noqa: E402
+from qdrant_client.models import (  # noqa: E402
+    Distance,
+    FieldCondition,
+    Filter,
+    HnswConfigDiff,
+    KeywordIndexParams,
+    KeywordIndexType,
+    MatchAny,
+    MatchValue,
+    PointStruct,
+    QuantizationSearchParams,
+    SearchParams,
+    VectorParams,
+)
+
+from app.services.embedding_service import embedding_service  # noqa: E402
+
+
+def _unit(vec: list[float]) -> list[float]:
+    norm = sum(v * v for v in vec) ** 0.5 or 1.0
+    return [v / norm for v in vec]
+
+
+def _create(client: QdrantClient, name: str, dim: int, *, tenant: bool) -> None:
+    if tenant:
+        client.create_collection(
+            name,
+            vectors_config=VectorParams(size=dim, distance=Distance.COSINE, on_disk=True),
+            hnsw_config=embedding_service._hnsw_config(),
+            quantization_config=embedding_service._quantization_config(),
+        )
+    else:
+        client.create_collection(
+            name,
+            vectors_config=VectorParams(size=dim, distance=Distance.COSINE),
+            hnsw_config=HnswConfigDiff(m=16, ef_construct=100),
+        )
+    client.create_payload_index(
+        name, "document_id", field_schema=KeywordIndexParams(type=KeywordIndexType.KEYWORD, is_tenant=tenant)
+    )
+
+
+def _wait_green(client: QdrantClient, name: str) -> None:
+    while str(getattr(client.get_collection(name).status, "value", "")) != "green":
+        time.sleep(1)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--url", default="http://localhost:6333")
+    ap.add_argument("--documents", type=int, default=500)
+    ap.add_argument("--chunks", type=int, default=200, help="chunks per document")
+    ap.add_argument("--dim", type=int, default=256)
+    ap.add_argument("--queries", type=int, default=100)
+    ap.add_argument("--top-k", type=int, default=24)
+    ap.add_argument("--ef", default="0,64,128", help="comma-separated search hnsw_ef values (0 = default)")
+    args = ap.parse_args()
+
+    rng = random.Random(11)
+    client = QdrantClient(url=args.url, timeout=120)
+    suffix = uuid.uuid4().hex[:8]
+    baseline, tenant = f"bench_baseline_{suffix}", f"bench_tenant_{suffix}"
+    document_ids = [str(uuid.uuid4()) for _ in range(args.documents)]
+    centres = {d: _unit([rng.gauss(0, 1) for _ in range(args.dim)]) for d in document_ids}
+
+    try:
+        _create(client, baseline, args.dim, tenant=False)
+        _create(client, tenant, args.dim, tenant=True)
+        started = time.perf_counter()
+        batch: list[PointStruct] = []
+        for document_id in document_ids:
+            centre = centres[document_id]
+            for _ in range(args.chunks):
+                vector = _unit([c + rng.gauss(0, 0.6) for c in centre])
+                batch.append(PointStruct(id=str(uuid.uuid4()), vector=vector, payload={"document_id": document_id}))
+            if len(batch) >= 2000:
+                for name in (baseline, tenant):
+                    client.upsert(name, batch, wait=False)
+                batch = []
+        for name in (baseline, tenant):
+            if batch:
+                client.upsert(name, batch, wait=True)
+            _wait_green(client, name)
+        points = args.documents * args.chunks
+        print(f"{points} points ({args.documents} documents x {args.chunks}), dim {args.dim}, "
+              f"loaded + indexed in {time.perf_counter() - started:.0f}s\n")
+
+        queries = []
+        for _ in range(args.queries):
+            scope = rng.sample(document_ids, 10)
+            qvec = _unit([c + rng.gauss(0, 0.8) for c in centres[scope[0]]])
+            queries.append((qvec, scope))
+        filters = {
+            "1 doc": lambda scope: Filter(must=[FieldCondition(key="document_id", match=MatchValue(value=scope[0]))]),
+            "10 docs": lambda scope: Filter(must=[FieldCondition(key="document_id", match=MatchAny(any=scope))]),
+        }
+
+        def run(name, flt, params):
+            timings, hits = [], []
+            for qvec, scope in queries:
+                t0 = time.perf_counter()
+                res = client.query_points(
+                    name, query=qvec, query_filter=flt(scope), limit=args.top_k, search_params=params
+                )
+                timings.append((time.perf_counter() - t0) * 1000)
+                hits.append({p.id for p in res.points})
+            return timings, hits
+
+        efs = [int(ef) for ef in args.ef.split(",")]
+        print(f"{'filter':<8} {'layout':<8} {'rescore':<8} {'ef':>4} {'p50 ms':>8} {'p95 ms':>8} "
+              f"{'recall@' + str(args.top_k):>10}")
+        for label, flt in filters.items():
+            _, truth = run(baseline, flt, SearchParams(exact=True))
+            variants = [("baseline", baseline, None, ef) for ef in efs]
+            variants += [("tenant", tenant, rescore, ef) for rescore in (True, False) for ef in efs]
+            for layout, name, rescore, ef in variants:
+                quantization = None if rescore is None else QuantizationSearchParams(rescore=rescore, oversampling=2.0)
+                params = SearchParams(hnsw_ef=ef or None, quantization=quantization)
+                timings, hits = run(name, flt, params)
+                recall = statistics.mean(len(h & t) / max(1, len(t)) for h, t in zip(hits, truth))
+                timings.sort()
+                p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+                print(f"{label:<8} {layout:<8} {'-' if rescore is None else str(rescore):<8} {ef or 'def':>4} "
+                      f"{statistics.median(timings):>8.2f} {p95:>8.2f} {recall:>10.3f}")
+    finally:
+        for name in (baseline, tenant):
+            if client.collection_exists(name):
+                client.delete_collection(name)
+
+
+if __name__ == "__main__":
+    main()
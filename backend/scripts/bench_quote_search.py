@@ -0,0 +1,145 @@
+"""Per-search Quote Finder CPU cost with and without parse-time normalized texts.
+
+Builds a synthetic document (--pages pages of ~40 varied lines, two chunks per
+page, curly quotes / dashes / ligatures sprinkled in so normalization has work
+to do) and times the pure-Python parts of one quote search:
+
+  term scan   _term_scan_candidates over every chunk and page (with the
+              document's lexical index, as production runs it)
+  verify      _verify_against_segments for --quotes proposals, each against a
+              3-page page_text source (exact, normalized and aligned tiers)
+
+  before      chunk/page text normalized per request (no stored texts)
+  after       NormalizedTextIndex read from the parse-time blob
+
+Also reports the one-off parse-time build cost and the stored blob size.
+
+Usage (from backend/):
+    python3 scripts/bench_quote_search.py
+    python3 scripts/bench_quote_search.py --pages 500 --quotes 20 --repeat 5
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+import uuid
+from types import SimpleNamespace
+
+# Make the backend root importable when run as `python3 scripts/bench_quote_search.py`.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services import quote_search_service as qss  # noqa: E402
+from app.services.lexical_index import LexicalIndex, build_index_blob  # noqa: E402
+from app.services.normalized_text_index import (  # noqa: E402
+    NormalizedTextIndex,
+    build_normalized_blob,
+)
+from app.services.quote_source_service import (  # noqa: E402
+    QuoteSource,
+    QuoteSourceSegment,
+)
+
+_VOCAB = (
+    "revenue costs region quarter “growth” margin ﬁnancial outlook—guidance segment’s customers "
+    "contract renewal obligations liability indemnity notice termination climate transition risk"
+).split()
+_TOPICS = ("climate transition risk", "contract renewal", "indemnity notice", "zzz absent phrase")
+
+
+def _document(n_pages: int, rng: random.Random):
+    pages, chunks = [], []
+    for pn in range(1, n_pages + 1):
+        lines = [" ".join(rng.choice(_VOCAB) for _ in range(rng.randint(8, 14))) + "." for _ in range(40)]
+        content = "\n".join(lines)
+        pages.append(SimpleNamespace(page_number=pn, content=content))
+        half = len(lines) // 2
+        for i, part in enumerate((lines[:half], lines[half:])):
+            chunks.append(
+                SimpleNamespace(
+                    id=uuid.uuid4(), text=" ".join(part), page_start=pn, page_end=pn,
+                    chunk_index=2 * (pn - 1) + i, bboxes=[], section_title=None,
+                )
+            )
+    return pages, chunks
+
+
+def _proposals(pages, rng: random.Random, n: int) -> list[tuple[QuoteSource, str]]:
+    out = []
+    for i in range(n):
+        start = rng.randint(1, len(pages) - 2)
+        span = pages[start - 1 : start + 2]
+        segments = [QuoteSourceSegment(p.content, p.page_number, p.page_number) for p in span]
+        source = QuoteSource("\n".join(p.content for p in span), "page_text", start, start + 2, segments)
+        line = rng.choice(span[-1].content.split("\n"))
+        if i % 3 == 1:  # normalized tier: straight quotes / plain ligatures
+            line = line.replace("“", '"').replace("”", '"').replace("’", "'").replace("ﬁ", "fi")
+        elif i % 3 == 2:  # aligned tier: one typo
+            line = line[:10] + "x" + line[11:]
+        out.append((source, line))
+    return out
+
+
+def _time(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--pages", type=int, default=500)
+    ap.add_argument("--quotes", type=int, default=12)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    rng = random.Random(7)
+    pages, chunks = _document(args.pages, rng)
+    proposals = _proposals(pages, rng, args.quotes)
+    document = SimpleNamespace(text_quality=0.95, parse_method="text")
+    index = LexicalIndex(
+        build_index_blob([(c.id, c.text, None) for c in chunks], [(p.page_number, p.content) for p in pages])
+    )
+
+    started = time.perf_counter()
+    blob = build_normalized_blob([(c.id, c.text) for c in chunks], [(p.page_number, p.content) for p in pages])
+    build_ms = (time.perf_counter() - started) * 1000
+    started = time.perf_counter()
+    texts = NormalizedTextIndex(blob)
+    load_ms = (time.perf_counter() - started) * 1000
+    raw_mb = (sum(len(p.content) for p in pages) + sum(len(c.text) for c in chunks)) / 2**20
+
+    for source, quote in proposals:  # sanity: both paths agree
+        assert qss._verify_against_segments(quote, source, document, texts) == qss._verify_against_segments(
+            quote, source, document
+        )
+
+    def scan(use_texts: bool) -> None:
+        for topic in _TOPICS:
+            if use_texts:
+                qss._term_scan_candidates(chunks, [], topic, index, texts)
+            else:
+                qss._term_scan_candidates(chunks, pages, topic, index)
+
+    def verify(use_texts: bool) -> None:
+        for source, quote in proposals:
+            qss._verify_against_segments(quote, source, document, texts if use_texts else None)
+
+    print(f"{args.pages} pages, {len(chunks)} chunks, {len(_TOPICS)} topics, {len(proposals)} proposals")
+    print(f"parse-time build {build_ms:.0f} ms, blob {len(blob) / 2**20:.2f} MB "
+          f"(~{raw_mb:.2f} MB raw page + chunk text), load {load_ms:.1f} ms")
+    print(f"{'stage':<10} {'before ms':>10} {'after ms':>10} {'speedup':>8}")
+    for name, fn in (("term scan", scan), ("verify", verify)):
+        before = _time(lambda: fn(False), args.repeat) / (len(_TOPICS) if fn is scan else len(proposals))
+        after = _time(lambda: fn(True), args.repeat) / (len(_TOPICS) if fn is scan else len(proposals))
+        print(f"{name:<10} {before:>10.2f} {after:>10.2f} {before / after:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
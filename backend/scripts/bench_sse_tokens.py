@@ -0,0 +1,106 @@
+"""SSE frames and CPU per 1k answer tokens: per-character vs coalesced parser.
+
+Replays a synthetic cited answer as provider deltas (--chars-per-token
+characters each, about what chat models stream) through RefParserFSM and
+encodes every event the way api/chat.py's event_generator does (json.dumps
+plus the `event:`/`data:` frame). Compared:
+
+  per-char   the previous parser: one token event per character
+  delta      coalesced, flushed at the end of every delta (coalesce_chars=0)
+  held       coalesced with CHAT_TOKEN_COALESCE_CHARS/_MS (deltas replayed
+             back to back, so only the size threshold fires)
+
+Usage (from backend/, with the app's env):
+    python3 scripts/bench_sse_tokens.py
+    python3 scripts/bench_sse_tokens.py --tokens 2000 --chars-per-token 3 --repeat 50
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+import uuid
+
+# Make the backend root importable when run as `python3 scripts/bench_sse_tokens.py`.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import settings  # noqa: E402
+from app.services.chat_service import RefParserFSM, _ChunkInfo, sse  # noqa: E402
+
+_SENTENCE = "Revenue in the region grew by 12% while operating costs held steady through the quarter"
+
+
+class _PerCharacter(RefParserFSM):
+    """RefParserFSM as it was: a token event for every plain character."""
+
+    def feed(self, token: str) -> list[dict]:
+        events: list[dict] = []
+        for ch in token:
+            if self.state == "TEXT" and ch != "[":
+                events.append(sse("token", {"text": ch}))
+                self.char_offset += 1
+                self.recent_claim = (self.recent_claim + ch)[-self._CLAIM_WINDOW:]
+            else:
+                events.extend(super().feed(ch))
+        return events
+
+
+def _deltas(n_tokens: int, chars_per_token: int) -> list[str]:
+    text, ref = [], 0
+    while sum(map(len, text)) < n_tokens * chars_per_token:
+        ref = ref % 3 + 1
+        text.append(f"{_SENTENCE} [{ref}]. ")
+    answer = "".join(text)[: n_tokens * chars_per_token]
+    return [answer[i:i + chars_per_token] for i in range(0, len(answer), chars_per_token)]
+
+
+def _encode(ev: dict) -> str:
+    return f"event: {ev['event']}\n" + f"data: {json.dumps(ev.get('data', {}), ensure_ascii=False)}\n\n"
+
+
+def _replay(make, deltas: list[str], repeat: int) -> tuple[int, float]:
+    frames = 0
+    started = time.process_time()
+    for _ in range(repeat):
+        fsm = make()
+        for delta in deltas:
+            for ev in fsm.feed(delta):
+                _encode(ev)
+                frames += 1
+        for ev in fsm.flush():
+            _encode(ev)
+            frames += 1
+    return frames // repeat, (time.process_time() - started) / repeat
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--tokens", type=int, default=1000)
+    ap.add_argument("--chars-per-token", type=int, default=4)
+    ap.add_argument("--repeat", type=int, default=200)
+    args = ap.parse_args()
+
+    chunk = _ChunkInfo(id=uuid.uuid4(), page_start=1, page_end=1, bboxes=[], text=_SENTENCE + ".")
+    chunk_map = {1: chunk, 2: chunk, 3: chunk}
+    deltas = _deltas(args.tokens, args.chars_per_token)
+    variants = {
+        "per-char": lambda: _PerCharacter(chunk_map),
+        "delta": lambda: RefParserFSM(chunk_map),
+        "held": lambda: RefParserFSM(
+            chunk_map,
+            coalesce_chars=settings.CHAT_TOKEN_COALESCE_CHARS,
+            coalesce_ms=settings.CHAT_TOKEN_COALESCE_MS,
+        ),
+    }
+    scale = 1000 / len(deltas)
+    print(f"{len(deltas)} deltas, {sum(map(len, deltas))} chars")
+    print(f"{'parser':<9} {'frames/1k tok':>14} {'CPU ms/1k tok':>14}")
+    for name, make in variants.items():
+        frames, cpu = _replay(make, deltas, args.repeat)
+        print(f"{name:<9} {frames * scale:>14.0f} {cpu * 1000 * scale:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
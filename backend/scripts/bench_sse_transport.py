@@ -0,0 +1,150 @@
+"""Chat SSE transport under many concurrent slow readers: legacy vs SSEStream.
+
+Simulates --streams concurrent chat streams in one event loop. Each source
+plays an LLM answer on a schedule: one delta every --interval-ms, yielding a
+token event, plus a citation every tenth delta. Readers come in three kinds:
+
+  fast     take every write immediately
+  slow     spend --slow-write-ms per write (a congested socket)
+  stalled  stop reading after three writes (a frozen tab behind a proxy)
+
+Compared:
+
+  legacy     the previous api/chat.py event_generator: json.dumps plus an
+             f-string frame per event, pulled by the response one at a time
+  transport  app.core.sse.SSEStream, with --stall-timeout as its
+             SSE_STALL_TIMEOUT_SECONDS
+
+Reports frames delivered per second and the p50/p99 latency from each
+event's scheduled time to its arrival at a non-stalled reader. Also writes
+per stream, the process CPU time, and how many stalled streams still hold
+their source (the LLM stream and pre-debited credits) when the run ends.
+
+Usage (from backend/, with the app's env):
+    python3 scripts/bench_sse_transport.py
+    python3 scripts/bench_sse_transport.py --streams 1000 --stalled 0.1 --slow 0.3
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+# Make the backend root importable when run as `python3 scripts/bench_sse_transport.py`.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import orjson  # noqa: E402
+
+from app.core.sse import SSEStream  # noqa: E402
+
+_TEXT = "revenue grew by twelve percent while costs held "
+
+
+async def _source(args: argparse.Namespace, open_sources: set[int], sid: int):
+    open_sources.add(sid)
+    try:
+        start = time.perf_counter()
+        for i in range(args.events):
+            due = start + i * args.interval_ms / 1000
+            delay = due - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            yield {"event": "token", "data": {"text": _TEXT[i % 8 * 6:i % 8 * 6 + 6], "t": due}}
+            if i % 10 == 9:
+                yield {"event": "citation", "data": {"ref_index": 1, "offset": i * 6, "bboxes": [], "t": due}}
+        yield {"event": "done", "data": {"t": time.perf_counter()}}
+    finally:
+        open_sources.discard(sid)
+
+
+async def _legacy(source):
+    async for ev in source:
+        line = f"event: {ev['event']}\n"
+        payload = json.dumps(ev.get("data", {}), ensure_ascii=False)
+        data_line = f"data: {payload}\n\n"
+        yield line + data_line
+
+
+async def _reader(body, kind: str, args: argparse.Namespace, latencies: list[float], counts: dict) -> None:
+    writes = 0
+    async for chunk in body:
+        now = time.perf_counter()
+        writes += 1
+        raw = chunk.encode() if isinstance(chunk, str) else chunk
+        for frame in raw.split(b"\n\n"):
+            if not frame or frame.startswith(b":"):
+                continue
+            data = orjson.loads(frame.split(b"data: ", 1)[1])
+            counts["frames"] += 1
+            if kind != "stalled":
+                latencies.append(now - data["t"])
+        if kind == "slow":
+            await asyncio.sleep(args.slow_write_ms / 1000)
+        elif kind == "stalled" and writes >= 3:
+            await asyncio.sleep(3600)
+    counts["writes"] += writes
+
+
+async def _run(mode: str, args: argparse.Namespace) -> dict:
+    rng = random.Random(7)
+    open_sources: set[int] = set()
+    latencies: list[float] = []
+    counts = {"frames": 0, "writes": 0}
+    kinds = []
+    tasks = []
+    cpu0, wall0 = time.process_time(), time.perf_counter()
+    for sid in range(args.streams):
+        r = rng.random()
+        kind = "stalled" if r < args.stalled else "slow" if r < args.stalled + args.slow else "fast"
+        kinds.append(kind)
+        source = _source(args, open_sources, sid)
+        body = _legacy(source) if mode == "legacy" else SSEStream(
+            source, heartbeat_seconds=15, stall_timeout_seconds=args.stall_timeout,
+        )
+        tasks.append(asyncio.ensure_future(_reader(body, kind, args, latencies, counts)))
+    live = [t for t, k in zip(tasks, kinds) if k != "stalled"]
+    await asyncio.gather(*live)
+    wall = time.perf_counter() - wall0
+    # Give stalled transport streams their stall timeout, then stop everything.
+    await asyncio.sleep(args.stall_timeout + 0.5)
+    held = sum(1 for sid, k in enumerate(kinds) if k == "stalled" and sid in open_sources)
+    cpu = time.process_time() - cpu0
+    for t in tasks:
+        t.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    latencies.sort()
+    return {
+        "frames_per_s": counts["frames"] / wall,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99)] * 1000,
+        "writes_per_stream": counts["writes"] / max(1, len(live)),
+        "cpu_s": cpu,
+        "stalled_holding_source": held,
+        "stalled": kinds.count("stalled"),
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--streams", type=int, default=500)
+    ap.add_argument("--events", type=int, default=300)
+    ap.add_argument("--interval-ms", type=float, default=10.0)
+    ap.add_argument("--slow", type=float, default=0.3, help="fraction of slow readers")
+    ap.add_argument("--slow-write-ms", type=float, default=25.0)
+    ap.add_argument("--stalled", type=float, default=0.05, help="fraction of stalled readers")
+    ap.add_argument("--stall-timeout", type=float, default=2.0)
+    args = ap.parse_args()
+
+    print(f"{'mode':<10} {'frames/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'writes/stream':>14} {'CPU s':>7} {'stalled holding':>16}")
+    for mode in ("legacy", "transport"):
+        r = asyncio.run(_run(mode, args))
+        print(f"{mode:<10} {r['frames_per_s']:>9.0f} {r['p50_ms']:>8.1f} {r['p99_ms']:>8.1f} "
+              f"{r['writes_per_stream']:>14.0f} {r['cpu_s']:>7.2f} {r['stalled_holding_source']:>9}/{r['stalled']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""Time to first byte and peak memory of /text-content: buffered vs streamed.
+
+Inserts a synthetic document (--pages pages of ~--page-chars characters, four
+chunks per page with one spilling onto the next page, a section title every
+few pages), then serves it through both endpoint functions against the real
+database:
+
+  buffered  get_document_text_content + JSON encoding of the whole response
+            (what /text-content does)
+  stream    stream_document_text_content, drained line by line
+            (what /text-content/stream does)
+
+Both the Page.content mode and the chunk-reconstruction fallback are measured
+(--mode). TTFB is the time until the first body bytes exist; the tracemalloc
+peak covers the query and the encoding. The synthetic document is deleted
+afterwards.
+
+Usage (from backend/, with the app's env and docker Postgres):
+    python3 scripts/bench_text_content.py
+    python3 scripts/bench_text_content.py --pages 1000 5000 --mode chunks
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import tracemalloc
+import uuid
+
+# Make the backend root importable when run as `python3 scripts/bench_text_content.py`.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import delete, insert  # noqa: E402
+
+import app.api.documents as documents_module  # noqa: E402
+from app.models.database import AsyncSessionLocal  # noqa: E402
+from app.models.tables import Chunk, Document, Page  # noqa: E402
+
+_WORDS = "revenue grew in the region while costs held steady through the quarter".split()
+
+
+def _text(n_chars: int, seed: int) -> str:
+    words, size, i = [], 0, seed
+    while size < n_chars:
+        word = _WORDS[i % len(_WORDS)]
+        words.append(word)
+        size += len(word) + 1
+        i += 1
+    return " ".join(words)
+
+
+async def _create(n_pages: int, page_chars: int, with_pages: bool) -> uuid.UUID:
+    doc_id = uuid.uuid4()
+    async with AsyncSessionLocal() as db:
+        db.add(Document(
+            id=doc_id, filename="bench-text-content.txt", file_type="txt", file_size=1, status="ready",
+            page_count=n_pages, storage_key=f"documents/{doc_id}/bench.txt",
+        ))
+        await db.flush()
+        page_rows, chunk_rows = [], []
+        for pn in range(1, n_pages + 1):
+            if with_pages:
+                page_rows.append({
+                    "document_id": doc_id, "page_number": pn, "width_pt": 612.0, "height_pt": 792.0,
+                    "content": _text(page_chars, pn),
+                })
+            for k in range(4):
+                chunk_rows.append({
+                    "document_id": doc_id, "chunk_index": len(chunk_rows), "text": _text(page_chars // 4, pn + k),
+                    "token_count": page_chars // 16, "page_start": pn,
+                    "page_end": min(pn + 1, n_pages) if k == 3 else pn, "bboxes": [],
+                    "section_title": f"Section {pn // 5 + 1}" if k == 0 and pn % 5 == 1 else None,
+                })
+        for rows, model in ((page_rows, Page), (chunk_rows, Chunk)):
+            for i in range(0, len(rows), 1000):
+                await db.execute(insert(model), rows[i:i + 1000])
+        await db.commit()
+    return doc_id
+
+
+async def _drop(doc_id: uuid.UUID) -> None:
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(Document).where(Document.id == doc_id))
+        await db.commit()
+
+
+async def _measure(kind: str, doc_id: uuid.UUID) -> dict:
+    async with AsyncSessionLocal() as db:
+        tracemalloc.start()
+        started = time.perf_counter()
+        first_byte = None
+        size = 0
+        if kind == "buffered":
+            result = await documents_module.get_document_text_content(doc_id, user=None, db=db)
+            body = json.dumps(result, ensure_ascii=False).encode("utf-8")
+            first_byte = time.perf_counter() - started
+            size = len(body)
+            del body, result
+        else:
+            response = await documents_module.stream_document_text_content(
+                doc_id, page_from=1, page_to=None, user=None, db=db,
+            )
+            async for chunk in response.body_iterator:
+                if first_byte is None:
+                    first_byte = time.perf_counter() - started
+                size += len(chunk)
+        elapsed = time.perf_counter() - started
+        _, traced_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return {"ttfb_ms": first_byte * 1000, "total_ms": elapsed * 1000, "peak_mb": traced_peak / 2**20, "mb": size / 2**20}
+
+
+async def _main(args: argparse.Namespace) -> None:
+    documents_module.can_access_document = lambda *_a, **_k: True
+    print(f"{'mode':<7} {'pages':>6} {'endpoint':<9} {'body MB':>8} {'TTFB ms':>9} {'total ms':>9} {'py peak MB':>11}")
+    for mode in args.mode:
+        for n_pages in args.pages:
+            doc_id = await _create(n_pages, args.page_chars, with_pages=(mode == "pages"))
+            try:
+                for kind in ("buffered", "stream"):
+                    r = await _measure(kind, doc_id)
+                    print(f"{mode:<7} {n_pages:>6} {kind:<9} {r['mb']:>8.1f} {r['ttfb_ms']:>9.1f} "
+                          f"{r['total_ms']:>9.1f} {r['peak_mb']:>11.1f}")
+            finally:
+                await _drop(doc_id)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--pages", type=int, nargs="+", default=[500, 2000, 5000])
+    ap.add_argument("--page-chars", type=int, default=3000)
+    ap.add_argument("--mode", nargs="+", choices=("pages", "chunks"), default=["pages", "chunks"])
+    asyncio.run(_main(ap.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
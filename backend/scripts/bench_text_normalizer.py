@@ -0,0 +1,104 @@
+"""text_normalizer.normalize: bulk fast path vs the per-code-point loop.
+
+Generates synthetic PDF-like page text (~45 lines of 9-14 words joined by
+newlines, with the typographic apostrophes, curly quotes and en dashes real
+extractions carry) for English and German, checks the fast path returns the
+same (norm_text, norm_to_raw) as the original loop, and times both levels.
+
+Usage (from backend/):
+    python3 scripts/bench_text_normalizer.py
+    python3 scripts/bench_text_normalizer.py --pages 50 --repeat 7
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import time
+import timeit
+
+# Make the backend root importable when run as `python3 scripts/bench_text_normalizer.py`.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.text_normalizer import _fold_codepoint, normalize  # noqa: E402
+
+_WORDS = {
+    "en": (
+        "the company revenue grew in fiscal year driven by strong demand across Europe and North America "
+        "while operating costs held steady margins improved basis points management expects continued growth"
+    ).split(),
+    "de": (
+        "die Gesellschaft erzielte im Geschäftsjahr einen Umsatz von Mrd. Euro das Ergebnis vor Steuern "
+        "stieg gegenüber dem Vorjahr deutlich über Plan Aufsichtsrat Prüfung größere Maßnahmen"
+    ).split(),
+}
+
+
+def _legacy_normalize(text: str, *, fuzzy: bool = False):
+    out_chars, out_map, prev_space = [], [], False
+    for raw_i, ch in enumerate(text):
+        folded = _fold_codepoint(ch, fuzzy=fuzzy)
+        if folded is None:
+            if prev_space:
+                continue
+            out_chars.append(" ")
+            out_map.append(raw_i)
+            prev_space = True
+            continue
+        if folded == "":
+            continue
+        prev_space = False
+        for c in folded:
+            out_chars.append(c)
+            out_map.append(raw_i)
+    return "".join(out_chars), out_map
+
+
+def _page(words: list[str], rng: random.Random) -> str:
+    lines = []
+    for _ in range(45):
+        tokens = [rng.choice(words) for _ in range(rng.randint(9, 14))]
+        line = " ".join(tokens)
+        r = rng.random()
+        if r < 0.1:
+            line = line.replace(" ", "’s ", 1)
+        elif r < 0.15:
+            line = f"“{line}”"
+        elif r < 0.2:
+            line = line.replace(" ", " – ", 1)
+        lines.append(line + rng.choice([".", ",", ";", ""]))
+    return "\n".join(lines)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--pages", type=int, default=20)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    started = time.perf_counter()
+    normalize("warm up", fuzzy=False)
+    normalize("warm up", fuzzy=True)
+    print(f"one-off bulk table build (both levels): {(time.perf_counter() - started) * 1000:.0f} ms\n")
+
+    rng = random.Random(1)
+    print(f"{'lang':<5} {'fuzzy':<6} {'chars/page':>10} {'legacy ms':>10} {'fast ms':>9} {'speedup':>8}")
+    for lang, words in _WORDS.items():
+        pages = [_page(words, rng) for _ in range(args.pages)]
+        chars = sum(map(len, pages)) // len(pages)
+        for fuzzy in (False, True):
+            for page in pages:
+                norm, norm_to_raw = normalize(page, fuzzy=fuzzy)
+                assert (norm, list(norm_to_raw)) == _legacy_normalize(page, fuzzy=fuzzy)
+            legacy = min(
+                timeit.repeat(lambda: [_legacy_normalize(p, fuzzy=fuzzy) for p in pages], number=1, repeat=args.repeat)
+            )
+            fast = min(timeit.repeat(lambda: [normalize(p, fuzzy=fuzzy) for p in pages], number=1, repeat=args.repeat))
+            per_page = 1000 / len(pages)
+            print(f"{lang:<5} {str(fuzzy):<6} {chars:>10} {legacy * per_page:>10.2f} {fast * per_page:>9.3f} "
+                  f"{legacy / fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
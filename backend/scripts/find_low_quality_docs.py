@@ -4,6 +4,8 @@ extracted text is low quality — the R2b backfill finder.
 Read-only by default. With --enqueue it re-dispatches parse_document (idempotent; the worker
 now self-detects script via OSD, so no locale is required). To avoid a re-processing loop,
 documents already OCR'd at the current PARSE_PIPELINE_VERSION are skipped unless --force.
+For corpus-wide backfills (priority order, concurrency cap, token budget, resumable), use
+scripts/backfill_pipeline.py instead of --enqueue.
 
 Usage (in-prod, inside the backend container):
     DB=$DATABASE_PUBLIC_URL python3 scripts/find_low_quality_docs.py            # list
@@ -0,0 +1,103 @@
+"""Move the Qdrant chunk collection to the configured layout.
+
+The layout comes from the QDRANT_* settings:
+- a tenant index on document_id;
+- per-document HNSW graphs (m=0, payload_m);
+- int8 scalar quantization;
+- on-disk original vectors.
+
+New collections are created with it. This command migrates an existing one;
+one of the two modes must be chosen explicitly:
+
+  --rebuild TARGET    create TARGET with the layout and copy every point
+                      into it, then verify the counts. Point
+                      QDRANT_COLLECTION at TARGET and restart API and workers;
+                      the source is left untouched for rollback. Re-runnable.
+                      The safe path for a collection serving traffic.
+  --in-place          drop and recreate the document_id index, then
+                      update_collection. Until the index is back, filtered
+                      searches on the live collection run without it; Qdrant
+                      then re-optimizes segments in the background and
+                      searches run slower until it is done. --wait polls
+                      until it is green. Only for a quiet collection.
+
+Vectors written while a rebuild copies may be missed: run it in a quiet
+window or re-run it right before switching.
+
+Usage (from backend/, with the app's env):
+    python3 scripts/qdrant_migrate_collection.py --dry-run
+    python3 scripts/qdrant_migrate_collection.py --rebuild doc_chunks_v2
+    python3 scripts/qdrant_migrate_collection.py --in-place --wait
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+
+# Make the backend root importable when run as `python3 scripts/qdrant_migrate_collection.py`.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import settings  # noqa: E402
+from app.services.embedding_service import embedding_service  # noqa: E402
+
+
+def _describe(name: str) -> None:
+    info = embedding_service.get_qdrant_client().get_collection(name)
+    params = info.config.params
+    print(f"collection {name}: status={info.status} points={info.points_count}")
+    print(f"  vectors:      {params.vectors}")
+    print(f"  hnsw:         {info.config.hnsw_config}")
+    print(f"  quantization: {info.config.quantization_config}")
+    print(f"  payload:      {info.payload_schema}")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--collection", default=settings.QDRANT_COLLECTION)
+    mode = ap.add_mutually_exclusive_group()
+    mode.add_argument("--rebuild", metavar="TARGET", help="copy into a new collection with the layout")
+    mode.add_argument("--in-place", action="store_true", help="update the collection itself (quiet collections only)")
+    ap.add_argument("--batch", type=int, default=512)
+    ap.add_argument("--wait", action="store_true", help="poll until the collection is green again")
+    ap.add_argument("--dry-run", action="store_true", help="show the current and target layout only")
+    args = ap.parse_args()
+    if not (args.rebuild or args.in_place or args.dry_run):
+        ap.error("choose --rebuild TARGET (safe for a live collection) or --in-place")
+
+    _describe(args.collection)
+    print("\ntarget layout:")
+    for key, value in embedding_service.collection_params().items():
+        print(f"  {key}: {value}")
+    print(f"  document_id index: keyword, is_tenant={settings.QDRANT_TENANT_INDEX}")
+    print(f"  search params: {embedding_service.search_params()}")
+    if args.dry_run:
+        return
+
+    client = embedding_service.get_qdrant_client()
+    name = args.collection
+    if args.rebuild:
+        started = time.perf_counter()
+        copied = embedding_service.copy_collection(args.collection, args.rebuild, batch_size=args.batch)
+        source = client.count(args.collection, exact=True).count
+        target = client.count(args.rebuild, exact=True).count
+        print(f"\ncopied {copied} points in {time.perf_counter() - started:.0f}s; source={source} target={target}")
+        if source != target:
+            sys.exit("point counts differ (writes during the copy?) — re-run before switching")
+        print(f"set QDRANT_COLLECTION={args.rebuild} and restart the API and workers")
+        name = args.rebuild
+    else:
+        embedding_service.apply_collection_config(args.collection)
+        print(f"\nupdated {args.collection}; Qdrant is re-optimizing segments")
+
+    while args.wait:
+        status = client.get_collection(name).status
+        if str(getattr(status, "value", status)) == "green":
+            break
+        time.sleep(5)
+    _describe(name)
+
+
+if __name__ == "__main__":
+    main()
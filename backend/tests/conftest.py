@@ -211,6 +211,26 @@ def pytest_collection_modifyitems(config: pytest.Config, items: list[pytest.Item
             item.add_marker(skip_marker)
 
 
+@pytest.fixture(autouse=True)
+def _reset_query_embedding_cache():
+    """The query-vector LRU is process-wide; a vector cached under one test's
+    stubbed provider must not answer the next test's identical query."""
+    from app.services.query_embedding_cache import query_embedding_cache
+
+    query_embedding_cache.clear()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def _reset_user_principal_cache():
+    """Tests edit users (plan, deletion) behind the API's back; never let one
+    test's cached principal answer the next test's token."""
+    from app.core.principal_cache import user_principal_cache
+
+    user_principal_cache.clear()
+    yield
+
+
 @pytest_asyncio.fixture(loop_scope="session")
 async def client():
     # Import app after env setup
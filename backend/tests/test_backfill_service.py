@@ -0,0 +1,234 @@
+"""Parse-pipeline backfill orchestrator: dispatch limits (cap, budget, live
+traffic), run status changes and progress reporting."""
+from __future__ import annotations
+
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.sql.dml import Update
+
+from app.models.tables import BackfillRun
+from app.services import backfill_service
+
+
+class _FakeSession:
+    """Returns `pending` for the pending-items SELECT and claims every
+    UPDATE; records what was executed and committed."""
+
+    def __init__(self, pending: list) -> None:
+        self.pending = pending
+        self.updates: list[Update] = []
+        self.commits = 0
+
+    def execute(self, stmt, params=None):
+        if isinstance(stmt, Update):
+            self.updates.append(stmt)
+            return SimpleNamespace(rowcount=1)
+        return SimpleNamespace(all=lambda: self.pending)
+
+    def add(self, _obj) -> None:
+        return None
+
+    def commit(self) -> None:
+        self.commits += 1
+
+
+def _run(**overrides) -> BackfillRun:
+    values = dict(
+        id=uuid.uuid4(), target_version=2, status="running", max_in_flight=3, budget_tokens=None,
+        params={"quality": 0.7, "force": False}, docs_total=10, docs_done=0, docs_failed=0,
+        docs_skipped=0, chunks_done=0, tokens_spent=0, finished_at=None,
+        created_at=datetime(2026, 10, 18, tzinfo=timezone.utc),
+    )
+    values.update(overrides)
+    return BackfillRun(**values)
+
+
+def _pending(*est_tokens: int) -> list:
+    return [SimpleNamespace(document_id=uuid.uuid4(), est_tokens=t) for t in est_tokens]
+
+
+@pytest.fixture
+def published(monkeypatch):
+    sent: list[tuple[list, str]] = []
+    from app.workers import parse_worker
+
+    monkeypatch.setattr(
+        parse_worker.parse_document, "apply_async",
+        lambda args, queue: sent.append((args, queue)),
+    )
+    monkeypatch.setattr(backfill_service, "_live_parses", lambda _db: 0)
+    return sent
+
+
+def test_dispatch_fills_free_slots_in_order_on_the_backfill_queue(published, monkeypatch):
+    monkeypatch.setattr(backfill_service.settings, "BACKFILL_PARSE_QUEUE", "parse_backfill")
+    pending = _pending(100, 100)
+    db = _FakeSession(pending)
+
+    assert backfill_service._dispatch(db, _run(), in_flight=1, in_flight_tokens=0) == 2
+
+    assert published == [([str(p.document_id)], "parse_backfill") for p in pending]
+    # Claim + item checkpoint per document, each committed before publishing.
+    assert len(db.updates) == 4 and db.commits == 2
+
+
+def test_dispatch_yields_to_live_uploads(published, monkeypatch):
+    monkeypatch.setattr(backfill_service, "_live_parses", lambda _db: 5)
+    monkeypatch.setattr(backfill_service.settings, "BACKFILL_LIVE_YIELD_THRESHOLD", 2)
+
+    assert backfill_service._dispatch(_FakeSession(_pending(1)), _run(), in_flight=0, in_flight_tokens=0) == 0
+    assert published == []
+
+
+def test_full_run_dispatches_nothing(published):
+    assert backfill_service._dispatch(_FakeSession(_pending(1)), _run(max_in_flight=2), 2, 0) == 0
+    assert published == []
+
+
+def test_budget_counts_in_flight_upper_bounds_and_never_skips_ahead(published):
+    run = _run(budget_tokens=1000, tokens_spent=400)
+    db = _FakeSession(_pending(300, 900, 10))
+
+    assert backfill_service._dispatch(db, run, in_flight=0, in_flight_tokens=200) == 1
+    # 400 spent + 200 in flight + 300 fits; the 900 does not, and the cheap
+    # third document is not dispatched ahead of it.
+    assert len(published) == 1
+    assert run.status == "running"
+
+
+def test_budget_exhausted_once_nothing_is_in_flight(published):
+    run = _run(budget_tokens=1000, tokens_spent=950)
+
+    assert backfill_service._dispatch(_FakeSession(_pending(100)), run, in_flight=0, in_flight_tokens=0) == 0
+    assert run.status == "exhausted"
+
+
+def test_status_changes():
+    db = _FakeSession([])
+    run = _run(status="exhausted")
+
+    backfill_service.set_status(db, run, "running", budget_tokens=5000, max_in_flight=0)
+    assert (run.status, run.budget_tokens, run.max_in_flight) == ("running", 5000, 1)
+
+    backfill_service.set_status(db, run, "cancelled")
+    with pytest.raises(ValueError):
+        backfill_service.set_status(db, run, "running")
+    with pytest.raises(ValueError):
+        backfill_service.set_status(db, _run(), "completed")
+
+
+def test_cancelled_run_reconciles_dispatched_documents_without_dispatching(published, monkeypatch):
+    run = _run(status="cancelled", tokens_spent=100)
+    finished = SimpleNamespace(
+        document_id=uuid.uuid4(), est_tokens=500, dispatched_at=run.created_at, status="ready", chunks_total=40,
+    )
+    still_parsing = SimpleNamespace(
+        document_id=uuid.uuid4(), est_tokens=500, dispatched_at=run.created_at, status="embedding", chunks_total=0,
+    )
+
+    class _ReconcileSession(_FakeSession):
+        def execute(self, stmt, params=None):
+            if isinstance(stmt, Update):
+                return super().execute(stmt, params)
+            # dispatched rows, then the spent-tokens sum, then the open-items count
+            return SimpleNamespace(all=lambda: [finished, still_parsing], scalar=lambda: 300)
+
+    monkeypatch.setattr(backfill_service, "_dispatch", lambda *_a: pytest.fail("a cancelled run dispatched"))
+    db = _ReconcileSession([])
+
+    assert backfill_service.advance_run(db, run) == 0
+    assert (run.docs_done, run.chunks_done, run.tokens_spent) == (1, 40, 400)
+    assert run.status == "cancelled"  # an open item left never completes it
+    assert published == []
+
+
+def test_cancelled_runs_are_advanced_while_documents_are_dispatched():
+    class _RunsSession:
+        def execute(self, stmt, params=None):
+            self.sql = str(stmt.compile(compile_kwargs={"literal_binds": True}))
+            return SimpleNamespace(scalars=lambda: SimpleNamespace(all=lambda: []))
+
+    db = _RunsSession()
+
+    assert backfill_service.advance_open_runs(db) == 0
+    assert "'cancelled'" in db.sql and "'dispatched'" in db.sql
+
+
+def test_progress_reports_throughput_and_eta():
+    started = datetime(2026, 10, 18, tzinfo=timezone.utc)
+    run = _run(docs_total=100, docs_done=18, docs_failed=2, docs_skipped=5, chunks_done=7200, created_at=started)
+
+    p = backfill_service.progress(run, now=started + timedelta(hours=2))
+
+    assert p["docs_per_hour"] == 10.0
+    assert p["chunks_per_second"] == 1.0
+    assert p["docs_remaining"] == 75
+    assert p["eta_seconds"] == 75 * 360
+
+
+def test_progress_before_any_document_finishes_has_no_eta():
+    assert backfill_service.progress(_run())["eta_seconds"] is None
+
+
+@pytest.mark.integration
+def test_run_checkpoints_against_real_postgres(published):
+    """Selection SQL, the claim, and reconcile of a finished reparse.
+    Requires docker Postgres (SKIP_INTEGRATION=0)."""
+    from sqlalchemy import select
+
+    from app.models.sync_database import SyncSessionLocal
+    from app.models.tables import BackfillItem, Document
+
+    with SyncSessionLocal() as db:
+        docs = [
+            Document(
+                filename=f"backfill-{i}.pdf", file_size=1, status="ready", parse_version=None,
+                text_quality=quality, storage_key=f"documents/{uuid.uuid4()}/backfill.pdf",
+            )
+            for i, quality in enumerate((0.95, 0.2))
+        ]
+        db.add_all(docs)
+        db.commit()
+        run = None
+        try:
+            run = backfill_service.create_run(db, max_in_flight=1)
+            positions = dict(
+                db.execute(
+                    select(BackfillItem.document_id, BackfillItem.position).where(BackfillItem.run_id == run.id)
+                ).all()
+            )
+            assert positions[docs[1].id] < positions[docs[0].id]  # garbled text first
+
+            backfill_service.advance_run(db, run)
+            first = db.get(Document, uuid.UUID(published[0][0][0]))
+            assert first.status == "parsing" and len(published) == 1
+
+            first.status = "ready"
+            db.commit()
+            backfill_service.advance_run(db, run)
+            assert run.docs_done == 1 and len(published) == 2
+
+            # Cancelled mid-flight: the dispatched document is still
+            # reconciled, and nothing more is dispatched.
+            backfill_service.set_status(db, run, "cancelled")
+            second = db.get(Document, uuid.UUID(published[1][0][0]))
+            second.status = "ready"
+            db.commit()
+            backfill_service.advance_open_runs(db)
+            db.refresh(run)
+            assert run.docs_done == 2 and run.status == "cancelled" and len(published) == 2
+            state = db.execute(
+                select(BackfillItem.state).where(
+                    BackfillItem.run_id == run.id, BackfillItem.document_id == second.id
+                )
+            ).scalar_one()
+            assert state == "done"
+        finally:
+            if run is not None:
+                db.delete(run)
+            for doc in docs:
+                db.delete(doc)
+            db.commit()
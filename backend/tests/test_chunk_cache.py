@@ -0,0 +1,221 @@
+"""API-process chunk cache: read-through loading, updated_at revalidation,
+non-ready documents bypassing it, the byte bound, and id hydration."""
+from __future__ import annotations
+
+import asyncio
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import chunk_cache as chunk_cache_module
+from app.services.chunk_cache import (
+    CachedChunk,
+    ChunkCache,
+    fetch_chunks_by_id,
+    known_documents,
+)
+
+
+def _row(document_id: uuid.UUID, chunk_index: int, text: str = "Revenue grew in every region."):
+    return (
+        uuid.uuid4(), document_id, chunk_index, text, 7, chunk_index + 1, chunk_index + 1,
+        [{"page": chunk_index + 1, "x": 0.1, "y": 0.2, "w": 0.5, "h": 0.1}], "Results", None,
+    )
+
+
+class _Row(tuple):
+    """Column-ordered result row, like a SQLAlchemy Row."""
+
+    @property
+    def document_id(self):
+        return self[1]
+
+
+class _Result(list):
+    def first(self):
+        return self[0] if self else None
+
+    def one(self):
+        return self[0]
+
+    def scalars(self):
+        return self
+
+
+class _FakeDb:
+    """Serves document versions and chunk rows; records which table each
+    statement read ("chunks.size" for the background size check)."""
+
+    def __init__(self, docs: dict, chunks: dict) -> None:
+        self.docs = docs  # id -> (status, updated_at)
+        self.chunks = chunks  # id -> [row tuples]
+        self.reads: list[str] = []
+
+    async def execute(self, statement):
+        table = statement.get_final_froms()[0].name
+        sql = str(statement)
+        params = list(statement.compile().params.values())
+        if table == "documents":
+            self.reads.append(table)
+            wanted = params[0] if isinstance(params[0], (list, tuple)) else [params[0]]
+            return _Result(
+                SimpleNamespace(id=doc_id, status=status, updated_at=updated_at)
+                for doc_id, (status, updated_at) in self.docs.items()
+                if doc_id in wanted
+            )
+        if "count(" in sql:
+            self.reads.append("chunks.size")
+            rows = self.chunks.get(params[-1], [])
+            return _Result([(len(rows), sum(len(row[3].encode()) for row in rows))])
+        self.reads.append(table)
+        if "chunks.document_id IN" in sql:
+            return _Result(_Row(row) for doc_id in params[0] for row in self.chunks.get(doc_id, []))
+        (wanted,) = params
+        return _Result(CachedChunk(*row) for rows in self.chunks.values() for row in rows if row[0] in wanted)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return None
+
+
+async def _settle(cache: ChunkCache) -> None:
+    while cache._warming:
+        await asyncio.gather(*cache._warming.values())
+
+
+@pytest.mark.asyncio
+async def test_loads_once_then_serves_hits_until_reparse():
+    doc_id = uuid.uuid4()
+    db = _FakeDb({doc_id: ("ready", 1)}, {doc_id: [_row(doc_id, 1), _row(doc_id, 0)]})
+    cache = ChunkCache(max_bytes=1 << 20)
+
+    first = await cache.get(db, doc_id)
+    assert [ch.chunk_index for ch in first] == [1, 0]  # SQL order (ORDER BY in the real query)
+    assert await cache.get(db, doc_id) is first
+    assert db.reads == ["documents", "chunks", "documents"]
+
+    db.docs[doc_id] = ("ready", 2)  # reparse finished with a fresh updated_at
+    assert await cache.get(db, doc_id) is not first
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 2
+
+
+@pytest.mark.asyncio
+async def test_passed_document_skips_version_query():
+    doc_id = uuid.uuid4()
+    db = _FakeDb({}, {doc_id: [_row(doc_id, 0)]})
+    document = SimpleNamespace(id=doc_id, status="ready", updated_at=5)
+    cache = ChunkCache(max_bytes=1 << 20)
+
+    entry = await cache.get(db, doc_id, document)
+    await cache.get(db, doc_id, document)
+
+    assert db.reads == ["chunks"]
+    assert entry.at_index(0).text == "Revenue grew in every region."
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("status", ["parsing", "embedding", "deleting", "error"])
+async def test_not_ready_documents_are_not_cached_and_evict(status):
+    doc_id = uuid.uuid4()
+    db = _FakeDb({doc_id: ("ready", 1)}, {doc_id: [_row(doc_id, 0)]})
+    cache = ChunkCache(max_bytes=1 << 20)
+    await cache.get(db, doc_id)
+    assert cache.stats()["entries"] == 1
+
+    db.docs[doc_id] = (status, 2)
+    assert await cache.get(db, doc_id) is None
+    assert cache.stats()["entries"] == 0 and cache.stats()["bytes"] == 0
+
+
+@pytest.mark.asyncio
+async def test_byte_bound_and_oversized_documents():
+    small, other, huge = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    chunks = {
+        small: [_row(small, i) for i in range(4)],
+        other: [_row(other, i) for i in range(4)],
+        huge: [_row(huge, i, "x" * 20_000) for i in range(10)],
+    }
+    per_doc = (await ChunkCache(1 << 30).get(_FakeDb({small: ("ready", 1)}, chunks), small)).nbytes
+    cache = ChunkCache(max_bytes=per_doc * 4 + 1)
+    db = _FakeDb({doc_id: ("ready", 1) for doc_id in chunks}, chunks)
+
+    found = await cache.get_many(db, [small, other, huge])
+
+    assert len(found[huge]) == 10  # served for this request...
+    stats = cache.stats()
+    assert stats["entries"] == 2  # ...but never resident
+    assert stats["bytes"] <= stats["max_bytes"]
+
+
+@pytest.mark.asyncio
+async def test_cold_hydration_reads_only_the_hit_ids_and_loads_in_the_background(monkeypatch):
+    ready, parsing = uuid.uuid4(), uuid.uuid4()
+    ready_rows, parsing_rows = [_row(ready, 0), _row(ready, 1)], [_row(parsing, 0)]
+    db = _FakeDb({ready: ("ready", 1), parsing: ("parsing", 1)}, {ready: ready_rows, parsing: parsing_rows})
+    background = _FakeDb(db.docs, db.chunks)
+    cache = ChunkCache(max_bytes=1 << 20, session_factory=lambda: background)
+    monkeypatch.setattr(chunk_cache_module, "chunk_cache", cache)
+    wanted = [ready_rows[1][0], parsing_rows[0][0]]
+
+    by_id = await fetch_chunks_by_id(db, [ready, parsing], wanted)
+
+    assert list(by_id) == wanted
+    assert db.reads == ["chunks"]  # WHERE id IN (...) only, as without a cache
+    await _settle(cache)
+    assert background.reads.count("chunks") == 1  # the ready document, off the request path
+    assert cache.stats()["entries"] == 1
+
+    db.reads.clear()
+    by_id = await fetch_chunks_by_id(db, [ready, parsing], wanted)
+
+    assert list(by_id) == wanted
+    assert by_id[ready_rows[1][0]].chunk_index == 1
+    assert db.reads == ["documents", "chunks"]  # version of the resident doc, then IN (...) for the other
+
+
+@pytest.mark.asyncio
+async def test_known_documents_skip_the_version_query(monkeypatch):
+    doc_id = uuid.uuid4()
+    rows = [_row(doc_id, 0)]
+    db = _FakeDb({doc_id: ("ready", 1)}, {doc_id: rows})
+    cache = ChunkCache(max_bytes=1 << 20)
+    await cache.get(db, doc_id)
+    monkeypatch.setattr(chunk_cache_module, "chunk_cache", cache)
+    db.reads.clear()
+
+    with known_documents([SimpleNamespace(id=doc_id, status="ready", updated_at=1)]):
+        by_id = await asyncio.create_task(fetch_chunks_by_id(db, [doc_id], [rows[0][0]]))
+
+    assert by_id[rows[0][0]].chunk_index == 0
+    assert db.reads == []
+
+
+@pytest.mark.asyncio
+async def test_oversized_document_is_never_loaded_in_the_background(monkeypatch):
+    huge = uuid.uuid4()
+    rows = [_row(huge, i, "x" * 20_000) for i in range(10)]
+    db = _FakeDb({huge: ("ready", 1)}, {huge: rows})
+    background = _FakeDb(db.docs, db.chunks)
+    cache = ChunkCache(max_bytes=100_000, session_factory=lambda: background)
+    monkeypatch.setattr(chunk_cache_module, "chunk_cache", cache)
+
+    for _ in range(3):
+        assert len(await fetch_chunks_by_id(db, [huge], [rows[0][0]])) == 1
+        await _settle(cache)
+
+    assert background.reads == ["documents", "chunks.size"]  # checked once, never loaded
+    assert db.reads == ["chunks"] * 3
+    assert cache.stats()["entries"] == 0 and cache.stats()["oversized"] == 1
+
+
+def test_cached_chunk_exposes_chunk_columns():
+    doc_id = uuid.uuid4()
+    row = _row(doc_id, 3)
+    ch = CachedChunk(*row)
+
+    assert (ch.id, ch.document_id, ch.chunk_index, ch.text, ch.token_count) == row[:5]
+    assert (ch.page_start, ch.page_end, ch.bboxes, ch.section_title, ch.vector_id) == row[5:]
+    assert not hasattr(ch, "__dict__")
@@ -0,0 +1,285 @@
+"""LibreOffice conversion pool: instance reuse and recycling, timeouts, crash
+recovery, queue backpressure and the per-process fallback.
+
+A stand-in bridge speaks libreoffice_bridge.py's JSON-line protocol and a
+sleeping process stands in for LibreOffice, so no office install is needed.
+"""
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+
+import billiard
+import pytest
+from celery.signals import worker_process_shutdown
+
+from app.services import conversion_service
+from app.services.conversion_service import ConversionPool, ConversionPoolBusy
+
+_FAKE_BRIDGE = r'''
+import json, os, sys, time
+while True:
+    line = sys.stdin.readline()
+    if not line:
+        break
+    req = json.loads(line)
+    reply = {"ok": True}
+    if req["op"] == "convert":
+        data = open(req["input"], "rb").read()
+        if data == b"HANG":
+            time.sleep(60)
+        if data == b"CRASH":
+            os._exit(1)
+        if data == b"BAD":
+            reply = {"ok": False, "error": "General Error"}
+        else:
+            open(req["output"], "wb").write(b"%PDF " + req["filter"].encode() + b" " + str(os.getpid()).encode())
+    sys.stdout.write(json.dumps(reply) + "\n")
+    sys.stdout.flush()
+'''
+
+
+# Just enough of pyuno for the real libreoffice_bridge.py to run.
+_FAKE_UNO = {
+    "uno.py": r'''
+class _Doc:
+    def storeToURL(self, url, props):
+        open(url[len("file://"):], "wb").write(b"%PDF uno")
+    def close(self, deliver):
+        pass
+class _Desktop:
+    def loadComponentFromURL(self, url, frame, flags, props):
+        return _Doc()
+    def getComponents(self):
+        return ()
+    def terminate(self):
+        return True
+class _Services:
+    def createInstanceWithContext(self, name, ctx):
+        return _Desktop() if name.endswith("Desktop") else _Resolver()
+class _Context:
+    ServiceManager = _Services()
+class _Resolver:
+    def resolve(self, url):
+        return _Context()
+def getComponentContext():
+    return _Context()
+def systemPathToFileUrl(path):
+    return "file://" + path
+''',
+    "com/__init__.py": "",
+    "com/sun/__init__.py": "",
+    "com/sun/star/__init__.py": "",
+    "com/sun/star/beans.py": "class PropertyValue:\n    pass\n",
+    "com/sun/star/connection.py": "class NoConnectException(Exception):\n    pass\n",
+}
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    # A zombie is dead too; only its parent has not reaped it yet.
+    with open(f"/proc/{pid}/stat") as f:
+        return f.read().rsplit(")", 1)[1].split()[0] != "Z"
+
+
+class _FakePool(ConversionPool):
+    bridge_script = ""
+
+    def office_argv(self, pipe_name, profile_dir):
+        return [sys.executable, "-c", "import time; time.sleep(3600)"]
+
+    def bridge_argv(self, pipe_name, office_pid):
+        return [sys.executable, self.bridge_script, pipe_name, str(office_pid)]
+
+
+@pytest.fixture
+def make_pool(tmp_path):
+    script = tmp_path / "bridge.py"
+    script.write_text(_FAKE_BRIDGE)
+    pools = []
+
+    def _make(**kwargs):
+        kwargs.setdefault("max_rss_mb", 0)
+        kwargs.setdefault("startup_timeout", 10)
+        pool = _FakePool(**kwargs)
+        pool.bridge_script = str(script)
+        pools.append(pool)
+        return pool
+
+    yield _make
+    for pool in pools:
+        pool.close()
+
+
+def _convert(pool, tmp_path, content: bytes, *, name: str = "in", timeout: float = 10) -> str:
+    src, out = tmp_path / f"{name}.docx", tmp_path / f"{name}.pdf"
+    src.write_bytes(content)
+    pool.convert(str(src), str(out), "docx", timeout)
+    return out.read_text()
+
+
+def test_instance_is_reused_then_recycled_after_max_conversions(make_pool, tmp_path):
+    pool = make_pool(size=1, max_conversions=3)
+
+    bridges = [_convert(pool, tmp_path, b"doc", name=str(i)).rsplit(" ", 1)[1] for i in range(5)]
+
+    assert bridges[0] == bridges[1] == bridges[2] != bridges[3] == bridges[4]
+    assert pool.stats()["started"] == 2 and pool.stats()["recycled"] == 1
+    assert _convert(pool, tmp_path, b"doc", name="x").startswith("%PDF writer_pdf_Export")
+
+
+def test_timeout_kills_the_instance_and_the_next_conversion_gets_a_fresh_one(make_pool, tmp_path):
+    pool = make_pool(size=1)
+    first = _convert(pool, tmp_path, b"doc", name="a")
+
+    with pytest.raises(RuntimeError, match="timed out after 0.3s"):
+        _convert(pool, tmp_path, b"HANG", name="b", timeout=0.3)
+
+    assert pool.stats()["running"] == 0
+    assert _convert(pool, tmp_path, b"doc", name="c") != first
+    assert pool.stats()["timeouts"] == 1
+
+
+def test_crashed_bridge_and_failed_document_do_not_poison_the_pool(make_pool, tmp_path):
+    pool = make_pool(size=1)
+
+    with pytest.raises(RuntimeError, match="bridge exited"):
+        _convert(pool, tmp_path, b"CRASH", name="a")
+    with pytest.raises(RuntimeError, match="General Error"):
+        _convert(pool, tmp_path, b"BAD", name="b")
+
+    assert _convert(pool, tmp_path, b"doc", name="c").startswith("%PDF")
+    assert pool.stats()["failures"] == 2
+
+
+def test_dead_office_process_is_restarted_before_use(make_pool, tmp_path):
+    pool = make_pool(size=1)
+    first = _convert(pool, tmp_path, b"doc", name="a")
+    pool._instances[0].office.kill()
+    pool._instances[0].office.wait()
+
+    assert _convert(pool, tmp_path, b"doc", name="b") != first
+    assert pool.stats()["started"] == 2
+
+
+def test_full_queue_rejects_instead_of_starting_more_instances(make_pool, tmp_path):
+    pool = make_pool(size=1, max_queue=1, queue_timeout=5)
+    results: dict[str, object] = {}
+
+    def run(name: str, content: bytes, timeout: float) -> None:
+        try:
+            results[name] = _convert(pool, tmp_path, content, name=name, timeout=timeout)
+        except Exception as e:
+            results[name] = e
+
+    slow = threading.Thread(target=run, args=("slow", b"HANG", 0.5))
+    slow.start()
+    while pool.stats()["idle"]:
+        time.sleep(0.01)
+    queued = threading.Thread(target=run, args=("queued", b"doc", 10))
+    queued.start()
+    while not pool.stats()["waiting"]:
+        time.sleep(0.01)
+
+    with pytest.raises(ConversionPoolBusy):
+        _convert(pool, tmp_path, b"doc", name="rejected")
+
+    slow.join()
+    queued.join()
+    assert isinstance(results["slow"], RuntimeError)
+    assert str(results["queued"]).startswith("%PDF")
+    assert pool.stats()["rejected"] == 1 and pool.stats()["queued"] == 1
+
+
+def test_queue_wait_times_out(make_pool, tmp_path):
+    pool = make_pool(size=1, queue_timeout=0.1)
+    failures = []
+
+    def run_slow() -> None:
+        try:
+            _convert(pool, tmp_path, b"HANG", timeout=1)
+        except RuntimeError as e:
+            failures.append(e)
+
+    slow = threading.Thread(target=run_slow)
+    slow.start()
+    while pool.stats()["idle"]:
+        time.sleep(0.01)
+
+    with pytest.raises(ConversionPoolBusy, match="within 0.1s"):
+        _convert(pool, tmp_path, b"doc", name="late")
+    slow.join()
+    assert len(failures) == 1
+
+
+def test_convert_to_pdf_falls_back_to_a_fresh_process_when_the_pool_cannot_start(monkeypatch, tmp_path):
+    pool = _FakePool(size=1, startup_timeout=5)
+    pool.bridge_script = str(tmp_path / "missing_bridge.py")
+    calls = []
+
+    def fake_subprocess(input_path, outdir, timeout):
+        calls.append(os.path.basename(input_path))
+        with open(os.path.join(outdir, "input.pdf"), "wb") as f:
+            f.write(b"%PDF fallback")
+
+    monkeypatch.setattr(conversion_service, "get_pool", lambda: pool)
+    monkeypatch.setattr(conversion_service, "_convert_in_subprocess", fake_subprocess)
+
+    assert conversion_service.convert_to_pdf(b"deck", "pptx") == b"%PDF fallback"
+    assert conversion_service.convert_to_pdf(b"deck", "pptx") == b"%PDF fallback"
+    assert calls == ["input.pptx", "input.pptx"]
+    assert pool.stats()["started"] == 0
+    pool.close()
+
+
+class _UnoPool(_FakePool):
+    def bridge_argv(self, pipe_name, office_pid):
+        return [sys.executable, conversion_service._BRIDGE_PATH, pipe_name, str(office_pid)]
+
+
+@pytest.fixture
+def fake_uno(tmp_path, monkeypatch):
+    for name, source in _FAKE_UNO.items():
+        path = tmp_path / "uno" / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(source)
+    monkeypatch.setenv("PYTHONPATH", str(tmp_path / "uno"))
+
+
+def test_instance_dies_with_a_celery_child_that_skips_cleanup(fake_uno, tmp_path):
+    pids = tmp_path / "pids"
+
+    def _task() -> None:
+        pool = _UnoPool(size=1, max_rss_mb=0, startup_timeout=10)
+        _convert(pool, tmp_path, b"doc")
+        instance = pool._instances[0]
+        pids.write_text(f"{instance.office.pid} {instance.bridge.pid}")
+        os._exit(0)  # how billiard children leave: no atexit, no pool.close()
+
+    child = billiard.Process(target=_task, daemon=True)
+    child.start()
+    child.join(30)
+    office_pid, bridge_pid = map(int, pids.read_text().split())
+
+    deadline = time.monotonic() + 10
+    while (_alive(office_pid) or _alive(bridge_pid)) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert not _alive(office_pid) and not _alive(bridge_pid)
+
+
+def test_worker_process_shutdown_closes_the_pool(fake_uno, tmp_path, monkeypatch):
+    pool = _UnoPool(size=1, max_rss_mb=0, startup_timeout=10)
+    monkeypatch.setattr(conversion_service, "_pool", pool)
+    assert _convert(pool, tmp_path, b"doc") == "%PDF uno"
+    office = pool._instances[0].office
+
+    worker_process_shutdown.send(sender=None, pid=os.getpid(), exitcode=0)
+
+    assert pool.stats()["running"] == 0 and office.poll() is not None
+    with pytest.raises(conversion_service.ConversionPoolUnavailable):
+        _convert(pool, tmp_path, b"doc")
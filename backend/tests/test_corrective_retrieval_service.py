@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import uuid
 from unittest.mock import AsyncMock
 
@@ -20,6 +21,14 @@ def _route(**kwargs) -> QueryRoute:
     )
 
 
+@pytest.fixture(autouse=True)
+def _stub_leg_sessions(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Legs after the first check out their own session; keep them off Postgres.
+    monkeypatch.setattr(
+        corrective_module.corrective_retrieval_service, "_session_factory", lambda: _StubSession([])
+    )
+
+
 @pytest.mark.asyncio
 async def test_empty_vector_results_fall_back_to_lexical(monkeypatch: pytest.MonkeyPatch) -> None:
     document_id = uuid.uuid4()
@@ -266,8 +275,8 @@ async def test_collection_comparison_adds_balanced_per_document_evidence(
 
     monkeypatch.setattr(corrective_module.retrieval_service, "search_multi", AsyncMock(return_value=[initial]))
     monkeypatch.setattr(corrective_module.retrieval_service, "lexical_search_multi", AsyncMock(return_value=[]))
-    search = AsyncMock(side_effect=[[balanced_a], [balanced_b]])
-    monkeypatch.setattr(corrective_module.retrieval_service, "search", search)
+    search_per_document = AsyncMock(return_value={doc_a: [balanced_a], doc_b: [balanced_b]})
+    monkeypatch.setattr(corrective_module.retrieval_service, "search_per_document", search_per_document)
 
     result = await corrective_module.corrective_retrieval_service.retrieve_multi(
         "Compare the conclusions across these reports.",
@@ -282,7 +291,8 @@ async def test_collection_comparison_adds_balanced_per_document_evidence(
         db=object(),
     )
 
-    assert search.await_count == 2
+    search_per_document.assert_awaited_once()
+    assert search_per_document.await_args.args[1] == [doc_a, doc_b]
     assert result.plan and result.plan.needs_balanced_coverage
     assert "balanced_compare" in result.strategy
     assert any(item.get("document_id") == doc_b for item in result.retrieved)
@@ -318,8 +328,11 @@ async def test_collection_comparison_preserves_one_item_per_document_before_extr
 
     monkeypatch.setattr(corrective_module.retrieval_service, "search_multi", AsyncMock(return_value=[]))
     monkeypatch.setattr(corrective_module.retrieval_service, "lexical_search_multi", AsyncMock(return_value=[]))
-    search = AsyncMock(side_effect=per_doc_results)
-    monkeypatch.setattr(corrective_module.retrieval_service, "search", search)
+    monkeypatch.setattr(
+        corrective_module.retrieval_service,
+        "search_per_document",
+        AsyncMock(return_value=dict(zip(document_ids, per_doc_results))),
+    )
 
     result = await corrective_module.corrective_retrieval_service.retrieve_multi(
         "Compare the conclusions across these reports.",
@@ -381,7 +394,11 @@ async def test_collection_table_comparison_keeps_table_evidence_before_balanced_
     monkeypatch.setattr(corrective_module.retrieval_service, "search_multi", AsyncMock(return_value=[]))
     monkeypatch.setattr(corrective_module.retrieval_service, "lexical_search_multi", AsyncMock(return_value=[]))
     monkeypatch.setattr(corrective_module.retrieval_service, "table_search_multi", AsyncMock(return_value=[table_evidence]))
-    monkeypatch.setattr(corrective_module.retrieval_service, "search", AsyncMock(side_effect=per_doc_results))
+    monkeypatch.setattr(
+        corrective_module.retrieval_service,
+        "search_per_document",
+        AsyncMock(return_value=dict(zip(document_ids, per_doc_results))),
+    )
 
     result = await corrective_module.corrective_retrieval_service.retrieve_multi(
         "Compare revenue across these reports.",
@@ -398,3 +415,158 @@ async def test_collection_table_comparison_keeps_table_evidence_before_balanced_
 
     assert any(item.get("table_id") == table_id for item in result.retrieved)
     assert set(document_ids).issubset({item.get("document_id") for item in result.retrieved})
+
+
+class _StubSession:
+    def __init__(self, opened: list["_StubSession"], checkout: asyncio.Event | None = None) -> None:
+        opened.append(self)
+        self._checkout = checkout
+
+    async def connection(self) -> None:
+        if self._checkout is not None:
+            await self._checkout.wait()
+
+    async def __aenter__(self) -> "_StubSession":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        return None
+
+
+def _chunk(text: str) -> dict:
+    return {"chunk_id": uuid.uuid4(), "text": text, "page": 1, "page_end": 1, "bboxes": [], "score": 0.8}
+
+
+@pytest.mark.asyncio
+async def test_table_route_legs_run_concurrently_on_separate_sessions(monkeypatch: pytest.MonkeyPatch) -> None:
+    in_flight = 0
+    peak = 0
+    seen_dbs: list[object] = []
+
+    def _leg(result: list[dict]):
+        async def _run(query, target, *, db, **kwargs):
+            nonlocal in_flight, peak
+            seen_dbs.append(db)
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.02)
+            in_flight -= 1
+            return result
+
+        return _run
+
+    monkeypatch.setattr(corrective_module.retrieval_service, "search", _leg([_chunk("Revenue 2028 was 12m.")]))
+    monkeypatch.setattr(corrective_module.retrieval_service, "table_search", _leg([_chunk("| Revenue | 12m |")]))
+    monkeypatch.setattr(corrective_module.retrieval_service, "lexical_search", _leg([]))
+    opened: list[_StubSession] = []
+    service = corrective_module.CorrectiveRetrievalService(session_factory=lambda: _StubSession(opened))
+    caller_db = object()
+
+    result = await service.retrieve_single(
+        "Show the revenue table",
+        _route(primary_intent=QueryIntent.TABLE_QUERY, intents=(QueryIntent.TABLE_QUERY,)),
+        uuid.uuid4(),
+        top_k=8,
+        db=caller_db,
+    )
+
+    assert peak == 3
+    assert seen_dbs.count(caller_db) == 1
+    assert len(opened) == 2 and all(s in seen_dbs for s in opened)
+    assert set(result.leg_timings_ms) == {"dense", "table", "lexical"}
+
+
+@pytest.mark.asyncio
+async def test_leg_past_deadline_degrades_to_empty() -> None:
+    async def _slow(*args, **kwargs):
+        await asyncio.sleep(5)
+        return [_chunk("never")]
+
+    runner = corrective_module._LegRunner(object(), lambda: _StubSession([]), 0.05)
+
+    results = await runner.run({"dense": AsyncMock(return_value=[_chunk("ok")]), "lexical": _slow})
+
+    assert results["lexical"] == []
+    assert results["dense"][0]["text"] == "ok"
+    assert runner.timings_ms["lexical"] >= 50
+
+
+@pytest.mark.asyncio
+async def test_failing_leg_cancels_siblings() -> None:
+    cancelled = asyncio.Event()
+
+    async def _slow(db):
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        return []
+
+    async def _boom(db):
+        raise RuntimeError("qdrant down")
+
+    runner = corrective_module._LegRunner(object(), lambda: _StubSession([]), 1.0)
+
+    with pytest.raises(RuntimeError, match="qdrant down"):
+        await runner.run({"dense": _slow, "lexical": _boom})
+    assert cancelled.is_set()
+
+
+@pytest.mark.asyncio
+async def test_caller_session_leg_is_never_cut_off_by_the_deadline() -> None:
+    async def _slow_on_caller(db):
+        await asyncio.sleep(0.15)
+        return [_chunk("dense")]
+
+    runner = corrective_module._LegRunner(object(), lambda: _StubSession([]), 0.05)
+
+    results = await runner.run({"dense": _slow_on_caller, "lexical": AsyncMock(return_value=[])})
+
+    assert results["dense"][0]["text"] == "dense"
+
+
+@pytest.mark.asyncio
+async def test_deadline_starts_after_the_session_is_checked_out() -> None:
+    checkout = asyncio.Event()
+
+    async def _leg(db):
+        await asyncio.sleep(0.02)
+        return [_chunk("lexical")]
+
+    runner = corrective_module._LegRunner(object(), lambda: _StubSession([], checkout), 0.05)
+    run = asyncio.create_task(runner.run({"dense": AsyncMock(return_value=[]), "lexical": _leg}))
+    await asyncio.sleep(0.15)  # pool exhausted for longer than the deadline
+    checkout.set()
+
+    results = await run
+
+    assert results["lexical"][0]["text"] == "lexical"
+
+
+@pytest.mark.asyncio
+async def test_own_session_legs_are_bounded_across_runners(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(corrective_module.settings, "RETRIEVAL_LEG_MAX_SESSIONS", 2)
+    monkeypatch.setattr(corrective_module, "_leg_sessions", None)
+    in_flight = 0
+    peak = 0
+
+    async def _leg(db):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.02)
+        in_flight -= 1
+        return []
+
+    opened: list[_StubSession] = []
+    runners = [corrective_module._LegRunner(object(), lambda: _StubSession(opened), 1.0) for _ in range(3)]
+
+    await asyncio.gather(*(runner.run({"dense": _noop, "table": _leg, "lexical": _leg}) for runner in runners))
+
+    assert peak == 2
+    assert len(opened) == 6
+
+
+async def _noop(db):
+    return []
@@ -10,54 +10,196 @@ import app.services.embedding_service as embedding_service_module
 from app.workers import deletion_worker
 
 
-@pytest.mark.asyncio
-async def test_delete_document_queues_retry_for_converted_pdf_cleanup(monkeypatch) -> None:
-    document_id = uuid.uuid4()
-    captured: dict[str, object] = {}
-    document = SimpleNamespace(
-        id=document_id,
+class _FakeSyncSession:
+    """Sync session stand-in: serves the document row, then reports DELETE
+    rowcounts from `remaining` (rows left per table) in batches."""
+
+    def __init__(self, document, remaining: dict[str, int]) -> None:
+        self.document = document
+        self.remaining = remaining
+        self.deletes: list[tuple[str, int]] = []
+        self.commits = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        return None
+
+    def execute(self, stmt):
+        if stmt.is_select:
+            return SimpleNamespace(first=lambda: self.document)
+        table = stmt.table.name
+        if table == "documents":
+            self.deletes.append((table, 1))
+            return SimpleNamespace(rowcount=1)
+        batch_size = deletion_worker.settings.DELETE_BATCH_SIZE
+        deleted = min(batch_size, self.remaining.get(table, 0))
+        self.remaining[table] = self.remaining.get(table, 0) - deleted
+        self.deletes.append((table, deleted))
+        return SimpleNamespace(rowcount=deleted)
+
+    def commit(self) -> None:
+        self.commits += 1
+
+    def rollback(self) -> None:
+        return None
+
+
+def _document(**overrides):
+    values = dict(
         storage_key="documents/original.pdf",
         converted_storage_key="documents/converted.pdf",
         user_id=uuid.uuid4(),
     )
-    db = SimpleNamespace(
-        execute=lambda *_args, **_kwargs: SimpleNamespace(scalar_one_or_none=lambda: document),
-        delete=lambda _doc: None,
-        commit=lambda: None,
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+def _patch_cleanup(monkeypatch, delete_file=lambda _key: None, qdrant_delete=lambda **_kwargs: None) -> None:
+    monkeypatch.setattr("app.services.storage_service.storage_service.delete_file", delete_file)
+    monkeypatch.setattr(
+        embedding_service_module.embedding_service,
+        "get_qdrant_client",
+        lambda: SimpleNamespace(delete=qdrant_delete),
     )
 
-    async def fake_execute(*_args, **_kwargs):
-        return SimpleNamespace(scalar_one_or_none=lambda: document)
 
-    async def fake_delete(_doc):
+@pytest.mark.asyncio
+async def test_delete_document_marks_deleting_and_queues_purge(monkeypatch) -> None:
+    document_id = uuid.uuid4()
+    statements = []
+    queued: list[str] = []
+
+    async def fake_execute(stmt, *_args, **_kwargs):
+        statements.append(stmt)
+        return SimpleNamespace(first=lambda: SimpleNamespace(user_id=uuid.uuid4()))
+
+    async def fake_commit():
         return None
 
+    db = SimpleNamespace(execute=fake_execute, commit=fake_commit)
+    vectors_deleted: list[str] = []
+    monkeypatch.setattr(deletion_worker.purge_document, "delay", queued.append)
+    monkeypatch.setattr(deletion_worker, "delete_document_vectors", vectors_deleted.append)
+    monkeypatch.setattr(
+        deletion_worker, "purge_document_data", lambda _doc_id: pytest.fail("purge must not run inline")
+    )
+
+    deleted = await doc_service_module.doc_service.delete_document(document_id, db)
+
+    assert deleted is True
+    assert queued == [str(document_id)]
+    status, membership = statements
+    assert status.is_dml and status.table.name == "documents"
+    assert status.compile().params["status"] == "deleting"
+    # Out of every collection in the same transaction, vectors gone before returning.
+    assert membership.is_dml and membership.table.name == "collection_documents"
+    assert list(membership.compile().params.values()) == [document_id]
+    assert vectors_deleted == [str(document_id)]
+
+
+@pytest.mark.asyncio
+async def test_delete_document_purges_inline_when_queue_unavailable(monkeypatch) -> None:
+    document_id = uuid.uuid4()
+    purged: list[uuid.UUID] = []
+
+    async def fake_execute(*_args, **_kwargs):
+        return SimpleNamespace(first=lambda: SimpleNamespace(user_id=None))
+
     async def fake_commit():
         return None
 
+    def broken_delay(_doc_id: str) -> None:
+        raise ConnectionError("broker down")
+
+    def qdrant_down(_doc_id: str) -> None:
+        raise ConnectionError("qdrant down")
+
+    db = SimpleNamespace(execute=fake_execute, commit=fake_commit)
+    monkeypatch.setattr(deletion_worker, "delete_document_vectors", qdrant_down)
+    monkeypatch.setattr(deletion_worker.purge_document, "delay", broken_delay)
+    monkeypatch.setattr(deletion_worker, "purge_document_data", purged.append)
+
+    assert await doc_service_module.doc_service.delete_document(document_id, db) is True
+    assert purged == [document_id]
+
+
+@pytest.mark.asyncio
+async def test_delete_document_missing_returns_false(monkeypatch) -> None:
+    async def fake_execute(*_args, **_kwargs):
+        return SimpleNamespace(first=lambda: None)
+
+    async def fake_rollback():
+        return None
+
+    db = SimpleNamespace(execute=fake_execute, rollback=fake_rollback)
+    monkeypatch.setattr(deletion_worker.purge_document, "delay", lambda _doc_id: pytest.fail("nothing to purge"))
+
+    assert await doc_service_module.doc_service.delete_document(uuid.uuid4(), db) is False
+
+
+def test_deleting_document_is_not_accessible() -> None:
+    owner = SimpleNamespace(id=uuid.uuid4())
+    doc = SimpleNamespace(user_id=owner.id, demo_slug=None, status="ready")
+    assert doc_service_module.can_access_document(doc, owner) is True
+    doc.status = "deleting"
+    assert doc_service_module.can_access_document(doc, owner) is False
+
+
+def test_purge_deletes_children_in_bounded_batches(monkeypatch) -> None:
+    monkeypatch.setattr(deletion_worker.settings, "DELETE_BATCH_SIZE", 100)
+    db = _FakeSyncSession(_document(), {"chunks": 250, "pages": 100, "document_elements": 30})
+    monkeypatch.setattr(deletion_worker, "SyncSessionLocal", lambda: db)
+    _patch_cleanup(monkeypatch)
+
+    assert deletion_worker.purge_document_data(uuid.uuid4()) is True
+
+    assert db.deletes == [
+        ("chunks", 100), ("chunks", 100), ("chunks", 50),
+        ("document_elements", 30),
+        ("pages", 100), ("pages", 0),
+        ("document_tables", 0),
+        ("sessions", 0),
+        ("documents", 1),
+    ]
+    assert db.commits == len(db.deletes)
+    assert all(n <= 100 for _, n in db.deletes)
+
+
+def test_purge_missing_document_is_noop(monkeypatch) -> None:
+    db = _FakeSyncSession(None, {})
+    monkeypatch.setattr(deletion_worker, "SyncSessionLocal", lambda: db)
+
+    assert deletion_worker.purge_document_data(uuid.uuid4()) is False
+    assert db.deletes == []
+
+
+def test_purge_runs_external_cleanup_and_queues_retry_for_converted_pdf(monkeypatch) -> None:
+    document_id = uuid.uuid4()
+    captured: dict[str, object] = {}
+    deleted_keys: list[str] = []
+    qdrant_calls: list[dict] = []
+    db = _FakeSyncSession(_document(), {})
+    monkeypatch.setattr(deletion_worker, "SyncSessionLocal", lambda: db)
+
     def fake_delete_file(storage_key: str) -> None:
         if storage_key.endswith("converted.pdf"):
             raise RuntimeError("converted cleanup failed")
+        deleted_keys.append(storage_key)
 
     def fake_delay(doc_id: str, **kwargs) -> None:
         captured["doc_id"] = doc_id
         captured["kwargs"] = kwargs
 
-    monkeypatch.setattr(doc_service_module.storage_service, "delete_file", fake_delete_file)
-    monkeypatch.setattr(
-        embedding_service_module.embedding_service,
-        "get_qdrant_client",
-        lambda: SimpleNamespace(delete=lambda **_kwargs: None),
-    )
+    _patch_cleanup(monkeypatch, delete_file=fake_delete_file, qdrant_delete=lambda **kw: qdrant_calls.append(kw))
     monkeypatch.setattr(deletion_worker.retry_failed_deletion, "delay", fake_delay)
 
-    db.execute = fake_execute
-    db.delete = fake_delete
-    db.commit = fake_commit
-
-    deleted = await doc_service_module.doc_service.delete_document(document_id, db)
+    assert deletion_worker.purge_document_data(document_id) is True
 
-    assert deleted is True
+    assert deleted_keys == ["documents/original.pdf"]
+    assert len(qdrant_calls) == 1
+    assert db.deletes[-1] == ("documents", 1)
     assert captured["doc_id"] == str(document_id)
     assert captured["kwargs"] == {
         "original_storage_key": None,
@@ -66,6 +208,17 @@ async def test_delete_document_queues_retry_for_converted_pdf_cleanup(monkeypatc
     }
 
 
+def test_purge_without_failures_queues_no_retry(monkeypatch) -> None:
+    db = _FakeSyncSession(_document(converted_storage_key=None), {})
+    monkeypatch.setattr(deletion_worker, "SyncSessionLocal", lambda: db)
+    _patch_cleanup(monkeypatch)
+    monkeypatch.setattr(
+        deletion_worker.retry_failed_deletion, "delay", lambda *_a, **_k: pytest.fail("no retry expected")
+    )
+
+    assert deletion_worker.purge_document_data(uuid.uuid4()) is True
+
+
 def test_retry_failed_deletion_retries_both_storage_keys(monkeypatch) -> None:
     deleted_keys: list[str] = []
 
@@ -37,7 +37,7 @@ def _override_dependencies(db: object, user: object | None) -> None:
         return user
 
     api_app.dependency_overrides[deps_module.get_db_session] = _get_db
-    api_app.dependency_overrides[deps_module.get_current_user_optional] = _get_user
+    api_app.dependency_overrides[deps_module.get_current_principal_optional] = _get_user
 
 
 @pytest.fixture(autouse=True)
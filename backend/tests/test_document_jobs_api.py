@@ -41,7 +41,7 @@ def _override_dependencies(db: object, user: object) -> None:
         return user
 
     api_app.dependency_overrides[deps_module.get_db_session] = _get_db
-    api_app.dependency_overrides[deps_module.require_auth] = _require_auth
+    api_app.dependency_overrides[deps_module.require_principal] = _require_auth
 
 
 @pytest.fixture(autouse=True)
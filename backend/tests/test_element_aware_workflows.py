@@ -31,8 +31,8 @@ def test_extraction_context_prefers_element_coverage_before_vector_queries(monke
     )
     monkeypatch.setattr(
         extraction_service,
-        "_retrieve_by_query",
-        lambda *_args, **_kwargs: [(query_chunk, 0.82)],
+        "retrieve_by_queries",
+        lambda _db, _document_id, queries, _top_k, **_kwargs: [[(query_chunk, 0.82)] for _ in queries],
     )
 
     selected = extraction_service.retrieve_extraction_chunks(
@@ -58,8 +58,8 @@ def test_document_diff_context_prefers_element_coverage_before_vector_queries(mo
     )
     monkeypatch.setattr(
         document_diff_service,
-        "_retrieve_by_query",
-        lambda *_args, **_kwargs: [(query_chunk, 0.81)],
+        "retrieve_by_queries",
+        lambda _db, _document_id, queries, _top_k, **_kwargs: [[(query_chunk, 0.81)] for _ in queries],
     )
 
     selected = document_diff_service.retrieve_diff_chunks(
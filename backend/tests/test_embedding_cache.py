@@ -0,0 +1,149 @@
+"""Content-addressed embedding cache: only misses reach the provider, LRU
+eviction bounds the entry count, and a Redis outage degrades to misses."""
+from __future__ import annotations
+
+import pytest
+
+from app.services import embedding_cache as cache_mod
+from app.services.embedding_cache import EmbeddingCache, cache_key, normalize_for_cache
+from app.services.embedding_service import EmbeddingService
+
+
+class _FakePipeline:
+    def __init__(self, redis: "_FakeRedis") -> None:
+        self._redis = redis
+        self._ops: list[tuple[str, tuple]] = []
+
+    def __getattr__(self, name):
+        def _queue(*args, **kwargs):
+            self._ops.append((name, args))
+            return self
+
+        return _queue
+
+    def execute(self):
+        return [getattr(self._redis, name)(*args) for name, args in self._ops]
+
+
+class _FakeRedis:
+    def __init__(self) -> None:
+        self.kv: dict[str, bytes] = {}
+        self.zsets: dict[str, dict[str, float]] = {}
+        self.hashes: dict[str, dict[bytes, int]] = {}
+
+    def ping(self):
+        return True
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+
+    def mget(self, keys):
+        return [self.kv.get(k) for k in keys]
+
+    def mset(self, mapping):
+        self.kv.update(mapping)
+
+    def zadd(self, key, mapping):
+        self.zsets.setdefault(key, {}).update(mapping)
+
+    def zcard(self, key):
+        return len(self.zsets.get(key, {}))
+
+    def zpopmin(self, key, count):
+        members = sorted(self.zsets.get(key, {}).items(), key=lambda kv: kv[1])[:count]
+        for member, _score in members:
+            del self.zsets[key][member]
+        return members
+
+    def delete(self, *keys):
+        for k in keys:
+            self.kv.pop(k, None)
+
+    def hincrby(self, key, field, amount):
+        h = self.hashes.setdefault(key, {})
+        h[field.encode()] = h.get(field.encode(), 0) + amount
+
+    def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+
+@pytest.fixture
+def fake_cache(monkeypatch):
+    cache = EmbeddingCache()
+    cache._client = _FakeRedis()
+    monkeypatch.setattr(cache_mod.settings, "EMBEDDING_CACHE_ENABLED", True)
+    monkeypatch.setattr("app.services.embedding_service.embedding_cache", cache)
+    return cache
+
+
+def _service_with_provider(monkeypatch, calls: list[list[str]]) -> EmbeddingService:
+    svc = EmbeddingService()
+
+    def _embed_uncached(texts, *, _max_retries=None):
+        calls.append(list(texts))
+        return [[float(len(t)), 0.5] for t in texts]
+
+    monkeypatch.setattr(svc, "_embed_uncached", _embed_uncached)
+    return svc
+
+
+def test_normalization_collapses_whitespace_and_unicode_forms():
+    assert normalize_for_cache("  Café\n  au   lait ") == "Café au lait"
+    assert cache_key("m", "a  b") == cache_key("m", "a\nb")
+    assert cache_key("m", "a b") != cache_key("other-model", "a b")
+
+
+def test_only_misses_reach_the_provider(monkeypatch, fake_cache):
+    calls: list[list[str]] = []
+    svc = _service_with_provider(monkeypatch, calls)
+
+    first = svc.embed_texts(["alpha", "beta"])
+    second = svc.embed_texts(["alpha", "gamma", "beta"])
+
+    assert calls == [["alpha", "beta"], ["gamma"]]
+    assert second[0] == first[0] and second[2] == first[1]
+    assert fake_cache.hits == 2 and fake_cache.misses == 3
+
+
+def test_duplicate_texts_in_one_call_are_embedded_once(monkeypatch, fake_cache):
+    calls: list[list[str]] = []
+    svc = _service_with_provider(monkeypatch, calls)
+
+    out = svc.embed_texts(["same text", "same  text", "other"])
+
+    assert calls == [["same text", "other"]]
+    assert out[0] == out[1]
+
+
+def test_lru_eviction_bounds_entry_count(monkeypatch, fake_cache):
+    monkeypatch.setattr(cache_mod.settings, "EMBEDDING_CACHE_MAX_ENTRIES", 2)
+    fake_cache.put_many("m", ["a"], [[1.0]])
+    fake_cache.put_many("m", ["b"], [[2.0]])
+    fake_cache.get_many("m", ["a"])  # touch 'a' -> 'b' is now least recent
+    fake_cache.put_many("m", ["c"], [[3.0]])
+
+    assert fake_cache.get_many("m", ["a", "b", "c"]) == [[1.0], None, [3.0]]
+
+
+def test_redis_failure_degrades_to_provider(monkeypatch, fake_cache):
+    class _Down(_FakeRedis):
+        def mget(self, keys):
+            raise ConnectionError("redis down")
+
+    fake_cache._client = _Down()
+    monkeypatch.setattr(fake_cache, "_get_client", lambda: fake_cache._client)
+    calls: list[list[str]] = []
+    svc = _service_with_provider(monkeypatch, calls)
+
+    assert svc.embed_texts(["x"]) == [[1.0, 0.5]]
+    assert calls == [["x"]]
+
+
+def test_stats_report_process_and_fleet_counters(fake_cache):
+    fake_cache.put_many(cache_mod.settings.EMBEDDING_MODEL, ["a"], [[1.0]])
+    fake_cache.get_many(cache_mod.settings.EMBEDDING_MODEL, ["a", "b"])
+
+    stats = fake_cache.stats()
+
+    assert stats["process"] == {"hits": 1, "misses": 1, "hit_rate": 0.5}
+    assert stats["fleet"]["hits"] == 1 and stats["fleet"]["entries"] == 1
@@ -0,0 +1,181 @@
+"""Async embedding client: token-budget splitting, Retry-After handling,
+oversize-batch halving, the local token bucket, and the sync wrapper."""
+from __future__ import annotations
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from app.services import embedding_client as client_mod
+from app.services.embedding_client import (
+    AsyncEmbeddingClient,
+    EmbeddingClient,
+    EmbeddingProviderError,
+    _LocalBucket,
+    estimate_tokens,
+    parse_retry_after,
+    split_by_token_budget,
+)
+
+
+class _FakeLimiter:
+    def __init__(self) -> None:
+        self.acquired: list[int] = []
+        self.paused: list[float] = []
+        self.waited_seconds = 0.0
+        self.pauses = 0
+
+    async def acquire(self, tokens: int) -> None:
+        self.acquired.append(tokens)
+
+    async def pause(self, seconds: float) -> None:
+        self.paused.append(seconds)
+
+
+def _ok(inputs: list[str]) -> httpx.Response:
+    # Shuffled order: the client must sort by index.
+    data = [{"index": i, "embedding": [float(len(t))]} for i, t in enumerate(inputs)]
+    return httpx.Response(200, json={"data": list(reversed(data))})
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    slept: list[float] = []
+
+    async def _sleep(seconds):
+        slept.append(seconds)
+
+    monkeypatch.setattr(client_mod.asyncio, "sleep", _sleep)
+    monkeypatch.setattr(client_mod.settings, "OPENROUTER_API_KEY", "test-key")
+    return slept
+
+
+def _client(handler, **settings) -> tuple[AsyncEmbeddingClient, _FakeLimiter, list[list[str]]]:
+    bodies: list[list[str]] = []
+
+    def _handle(request: httpx.Request) -> httpx.Response:
+        inputs = json.loads(request.content)["input"]
+        bodies.append(inputs)
+        return handler(inputs, len(bodies))
+
+    limiter = _FakeLimiter()
+    return AsyncEmbeddingClient(limiter, transport=httpx.MockTransport(_handle)), limiter, bodies
+
+
+def test_batches_split_by_estimated_tokens():
+    texts = ["a" * 30, "b" * 30, "c" * 300, "d"]
+    per = [estimate_tokens(t) for t in texts]
+
+    groups = split_by_token_budget(texts, per[0] + per[1])
+
+    assert groups == [[0, 1], [2], [3]]  # the oversize text goes alone
+
+
+def test_retry_after_header_forms():
+    assert parse_retry_after(httpx.Headers({"retry-after": "7"})) == 7.0
+    assert parse_retry_after(httpx.Headers({"retry-after-ms": "250", "retry-after": "9"})) == 0.25
+    assert parse_retry_after(httpx.Headers({"retry-after": "Wed, 21 Oct 2015 07:28:00 GMT"})) == 0.0
+    assert parse_retry_after(httpx.Headers({})) is None
+
+
+@pytest.mark.asyncio
+async def test_order_preserved_across_budget_split(sleeps, monkeypatch):
+    monkeypatch.setattr(client_mod.settings, "EMBEDDING_BATCH_MAX_TOKENS", 5)
+    client, limiter, bodies = _client(lambda inputs, n: _ok(inputs))
+    texts = ["x" * n for n in range(1, 9)]
+
+    vectors = await client.embed("m", texts, max_retries=3)
+
+    assert vectors == [[float(n)] for n in range(1, 9)]
+    assert len(bodies) > 1 and len(limiter.acquired) == len(bodies)
+
+
+@pytest.mark.asyncio
+async def test_429_with_retry_after_pauses_the_fleet(sleeps):
+    def handler(inputs, n):
+        if n == 1:
+            return httpx.Response(429, headers={"retry-after": "3"})
+        return _ok(inputs)
+
+    client, limiter, bodies = _client(handler)
+
+    assert await client.embed("m", ["q"], max_retries=3) == [[1.0]]
+    assert limiter.paused == [3.0]
+    assert sleeps == [0.0]  # the wait happens in the limiter, not here
+    assert len(limiter.acquired) == 2 and client.retries == 1
+
+
+@pytest.mark.asyncio
+async def test_server_errors_back_off_then_give_up(sleeps):
+    client, _, bodies = _client(lambda inputs, n: httpx.Response(503))
+
+    with pytest.raises(EmbeddingProviderError, match="503"):
+        await client.embed("m", ["q"], max_retries=3)
+    assert len(bodies) == 3 and len(sleeps) == 2
+    assert all(0 <= s <= 2 for s in sleeps)
+
+
+@pytest.mark.asyncio
+async def test_client_errors_are_not_retried(sleeps):
+    client, _, bodies = _client(lambda inputs, n: httpx.Response(401, text="bad key"))
+
+    with pytest.raises(EmbeddingProviderError, match="401"):
+        await client.embed("m", ["q"], max_retries=5)
+    assert len(bodies) == 1 and sleeps == []
+
+
+@pytest.mark.asyncio
+async def test_too_large_batches_are_halved(sleeps):
+    def handler(inputs, n):
+        if len(inputs) > 2:
+            return httpx.Response(400, text="This model's maximum context length is 8192 tokens")
+        return _ok(inputs)
+
+    client, _, bodies = _client(handler)
+
+    vectors = await client.embed("m", ["a", "bb", "ccc", "dddd", "eeeee"], max_retries=3)
+
+    assert vectors == [[1.0], [2.0], [3.0], [4.0], [5.0]]
+    assert client.splits == 2
+
+
+@pytest.mark.asyncio
+async def test_empty_data_is_retried(sleeps):
+    def handler(inputs, n):
+        return httpx.Response(200, json={"data": []}) if n == 1 else _ok(inputs)
+
+    client, _, _ = _client(handler)
+
+    assert await client.embed("m", ["q"], max_retries=3) == [[1.0]]
+
+
+def test_local_bucket_refills_and_honours_pause(monkeypatch):
+    now = {"t": 100.0}
+    monkeypatch.setattr(client_mod.time, "monotonic", lambda: now["t"])
+    bucket = _LocalBucket()
+
+    assert bucket.acquire(rpm=2, tpm=0, tokens=10) == 0
+    assert bucket.acquire(rpm=2, tpm=0, tokens=10) == 0
+    assert bucket.acquire(rpm=2, tpm=0, tokens=10) == pytest.approx(30.0)
+    now["t"] += 30
+    assert bucket.acquire(rpm=2, tpm=0, tokens=10) == 0
+
+    assert bucket.acquire(rpm=0, tpm=600, tokens=600) == 0
+    assert bucket.acquire(rpm=0, tpm=600, tokens=60) == pytest.approx(6.0)
+
+    bucket.pause(5)
+    assert bucket.acquire(rpm=0, tpm=0, tokens=1) == pytest.approx(5.0)
+
+
+def test_sync_wrapper_and_coroutines_share_the_loop_client(monkeypatch):
+    monkeypatch.setattr(client_mod.settings, "OPENROUTER_API_KEY", "test-key")
+    wrapper = EmbeddingClient()
+    transport = httpx.MockTransport(lambda request: _ok(json.loads(request.content)["input"]))
+    wrapper._client = AsyncEmbeddingClient(_FakeLimiter(), transport=transport)
+    wrapper._pid = client_mod.os.getpid()
+
+    assert wrapper.embed_sync("m", ["ab", "c"]) == [[2.0], [1.0]]
+    assert asyncio.run(wrapper.embed("m", ["abc"])) == [[3.0]]
+    assert wrapper.stats()["requests"] == 2
@@ -39,7 +39,7 @@ async def test_public_auth_funnel_event_is_recorded_without_user(monkeypatch):
         yield fake_db
 
     api_app.dependency_overrides[deps_module.get_db_session] = _get_db
-    api_app.dependency_overrides[deps_module.get_current_user_optional] = _none_user
+    api_app.dependency_overrides[deps_module.get_current_principal_optional] = _none_user
     monkeypatch.setattr(events_api.public_event_limiter, "is_allowed", AsyncMock(return_value=True))
 
     async with AsyncClient(transport=ASGITransport(app=api_app), base_url="http://test") as client:
@@ -84,7 +84,7 @@ async def test_public_auth_confirm_events_are_recorded_without_user(monkeypatch,
         yield fake_db
 
     api_app.dependency_overrides[deps_module.get_db_session] = _get_db
-    api_app.dependency_overrides[deps_module.get_current_user_optional] = _none_user
+    api_app.dependency_overrides[deps_module.get_current_principal_optional] = _none_user
     monkeypatch.setattr(events_api.public_event_limiter, "is_allowed", AsyncMock(return_value=True))
 
     async with AsyncClient(transport=ASGITransport(app=api_app), base_url="http://test") as client:
@@ -114,7 +114,7 @@ async def test_public_event_rejects_private_event_without_user(monkeypatch):
         yield fake_db
 
     api_app.dependency_overrides[deps_module.get_db_session] = _get_db
-    api_app.dependency_overrides[deps_module.get_current_user_optional] = _none_user
+    api_app.dependency_overrides[deps_module.get_current_principal_optional] = _none_user
     monkeypatch.setattr(events_api.public_event_limiter, "is_allowed", AsyncMock(return_value=True))
 
     async with AsyncClient(transport=ASGITransport(app=api_app), base_url="http://test") as client:
@@ -142,7 +142,7 @@ async def test_public_event_rate_limit(monkeypatch):
         yield _FakeDB()
 
     api_app.dependency_overrides[deps_module.get_db_session] = _get_db
-    api_app.dependency_overrides[deps_module.get_current_user_optional] = _none_user
+    api_app.dependency_overrides[deps_module.get_current_principal_optional] = _none_user
     monkeypatch.setattr(events_api.public_event_limiter, "is_allowed", AsyncMock(return_value=False))
 
     async with AsyncClient(transport=ASGITransport(app=api_app), base_url="http://test") as client:
@@ -174,7 +174,7 @@ async def test_authenticated_user_can_record_private_event(monkeypatch):
         return SimpleNamespace(id=user_id)
 
     api_app.dependency_overrides[deps_module.get_db_session] = _get_db
-    api_app.dependency_overrides[deps_module.get_current_user_optional] = _get_user
+    api_app.dependency_overrides[deps_module.get_current_principal_optional] = _get_user
     monkeypatch.setattr(events_api.public_event_limiter, "is_allowed", AsyncMock(return_value=False))
 
     async with AsyncClient(transport=ASGITransport(app=api_app), base_url="http://test") as client:
@@ -211,7 +211,7 @@ async def test_authenticated_user_can_submit_quote_search_submitted_event(monkey
         return SimpleNamespace(id=user_id)
 
     api_app.dependency_overrides[deps_module.get_db_session] = _get_db
-    api_app.dependency_overrides[deps_module.get_current_user_optional] = _get_user
+    api_app.dependency_overrides[deps_module.get_current_principal_optional] = _get_user
     monkeypatch.setattr(events_api.public_event_limiter, "is_allowed", AsyncMock(return_value=False))
 
     async with AsyncClient(transport=ASGITransport(app=api_app), base_url="http://test") as client:
@@ -244,7 +244,7 @@ async def test_quote_search_submitted_rejects_anonymous_user(monkeypatch):
         yield fake_db
 
     api_app.dependency_overrides[deps_module.get_db_session] = _get_db
-    api_app.dependency_overrides[deps_module.get_current_user_optional] = _none_user
+    api_app.dependency_overrides[deps_module.get_current_principal_optional] = _none_user
     monkeypatch.setattr(events_api.public_event_limiter, "is_allowed", AsyncMock(return_value=True))
 
     async with AsyncClient(transport=ASGITransport(app=api_app), base_url="http://test") as client:
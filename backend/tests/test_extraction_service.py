@@ -3,8 +3,14 @@ from __future__ import annotations
 import csv
 import io
 import uuid
+from types import SimpleNamespace
 
+from qdrant_client import QdrantClient
+from qdrant_client.models import Distance, PointStruct, VectorParams
+
+from app.core.config import settings
 from app.models.tables import Chunk
+from app.services import extraction_service
 from app.services.extraction_service import (
     TEMPLATES,
     _citation_from_chunk,
@@ -105,3 +111,37 @@ def test_citation_from_chunk_uses_most_specific_page_and_bbox_order() -> None:
     assert citation["confidence_score"] == 0.912
     assert citation["text_snippet"].startswith("Risk Factors:")
     assert [bbox["page"] for bbox in citation["bboxes"]] == [4, 4, 5]
+
+
+def test_retrieve_by_queries_makes_one_search_and_one_select_for_all_queries(monkeypatch) -> None:
+    document_id = uuid.uuid4()
+    chunks = [
+        Chunk(id=uuid.uuid4(), document_id=document_id, chunk_index=i, text=f"{name} " * 30, page_start=1, page_end=1)
+        for i, name in enumerate(["north", "east", "tiny"])
+    ]
+    chunks[2].text = "too short"
+    other_doc_point = PointStruct(id=str(uuid.uuid4()), vector=[1.0, 0.0], payload={"document_id": "other"})
+    qdrant = QdrantClient(":memory:")
+    qdrant.create_collection(settings.QDRANT_COLLECTION, vectors_config=VectorParams(size=2, distance=Distance.COSINE))
+    qdrant.upsert(settings.QDRANT_COLLECTION, points=[
+        PointStruct(id=str(chunks[0].id), vector=[1.0, 0.1], payload={"document_id": str(document_id)}),
+        PointStruct(id=str(chunks[1].id), vector=[0.1, 1.0], payload={"document_id": str(document_id)}),
+        PointStruct(id=str(chunks[2].id), vector=[1.0, 0.0], payload={"document_id": str(document_id)}),
+        other_doc_point,
+    ])
+    batches = []
+    real_batch = qdrant.query_batch_points
+    monkeypatch.setattr(qdrant, "query_batch_points", lambda **kw: batches.append(kw) or real_batch(**kw))
+    monkeypatch.setattr(extraction_service.embedding_service, "get_qdrant_client", lambda: qdrant)
+    monkeypatch.setattr(extraction_service.embedding_service, "search_params", lambda: None)
+    selects = []
+    db = SimpleNamespace(execute=lambda stmt: selects.append(stmt) or SimpleNamespace(scalars=lambda: iter(chunks)))
+
+    ranked = extraction_service.retrieve_by_queries(
+        db, document_id, ["north", "east"], 1, query_vectors=[[1.0, 0.0], [0.0, 1.0]]
+    )
+
+    assert [[chunk for chunk, _score in hits] for hits in ranked] == [[chunks[0]], [chunks[1]]]
+    assert len(batches) == 1 and len(batches[0]["requests"]) == 2
+    assert len(selects) == 1
+    assert extraction_service.retrieve_by_queries(db, document_id, [], 1) == []
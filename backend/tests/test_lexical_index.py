@@ -0,0 +1,177 @@
+"""Parse-time inverted index: blob round trip, BM25 ranking, the quote term
+scan shortcut (identical hits to the full scan), and the API-side LRU."""
+from __future__ import annotations
+
+import random
+import string
+import tracemalloc
+import uuid
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.services import quote_search_service as qss
+from app.services.lexical_index import (
+    LexicalIndex,
+    LexicalIndexCache,
+    build_index_blob,
+    index_tokens,
+)
+from app.services.retrieval_service import _bm25_query_terms, retrieval_service
+
+
+def _chunk(text: str, page: int = 1, section_title: str | None = None):
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        document_id=uuid.uuid4(),
+        text=text,
+        page_start=page,
+        page_end=page,
+        bboxes=[],
+        section_title=section_title,
+    )
+
+
+def _index(chunks, pages=()) -> LexicalIndex:
+    return LexicalIndex(
+        build_index_blob(
+            [(c.id, c.text, c.section_title) for c in chunks],
+            [(p.page_number, p.content) for p in pages],
+        )
+    )
+
+
+def test_tokens_use_fuzzy_normalization_and_strip_edge_punctuation():
+    assert index_tokens("“Climate  Risk”, ﬁnal—draft!") == ["climate", "risk", "final-draft"]
+
+
+def test_blob_round_trip_and_bm25_ranking():
+    chunks = [
+        _chunk("Revenue grew in every region during the year."),
+        _chunk("MetaX revenue for 2028 is forecast at $42m; MetaX leads the segment."),
+        _chunk("Notices must be delivered in writing."),
+    ]
+    index = _index(chunks)
+
+    assert index.chunk_ids == [c.id for c in chunks]
+    hits = index.bm25(_bm25_query_terms("What is MetaX 2028 revenue?"), top_k=5)
+
+    assert [chunk_id for chunk_id, _ in hits] == [chunks[1].id, chunks[0].id]
+    assert hits[0][1] > hits[1][1] > 0
+
+
+def test_bm25_matches_cjk_terms_as_substrings():
+    chunks = [_chunk("本协议的收入确认政策适用于所有子公司。"), _chunk("Unrelated English text.")]
+    hits = _index(chunks).bm25(_bm25_query_terms("收入确认"), top_k=5)
+
+    assert [chunk_id for chunk_id, _ in hits] == [chunks[0].id]
+
+
+def test_nbytes_counts_the_decoded_objects_not_just_the_blob():
+    rng = random.Random(7)
+    words = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 10))) for _ in range(5000)]
+    blob = build_index_blob([(uuid.uuid4(), " ".join(rng.choices(words, k=60)), None) for _ in range(800)])
+
+    tracemalloc.start()
+    try:
+        index = LexicalIndex(blob)
+        decoded, _peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert decoded > len(blob) // 2  # ids and vocab are far from free
+    assert 0.8 <= index.nbytes / (len(blob) + decoded) <= 1.25
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_term_scan_with_index_matches_full_scan(seed):
+    rng = random.Random(seed)
+    words = ["climate", "Risk", "risks,", "(transition)", "naïve", "co-operation", "“quoted”", "收入确认", "deadline."]
+    chunks = [
+        _chunk(" ".join(rng.choice(words) for _ in range(rng.randint(3, 12))), page=i // 2 + 1)
+        for i in range(30)
+    ]
+    pages = [
+        SimpleNamespace(page_number=n, content=" ".join(rng.choice(words) for _ in range(8)) if n % 3 else None)
+        for n in range(1, 16)
+    ]
+    index = _index(chunks, pages)
+
+    for topic in ("Climate risk", "transition", "naive", "operation", "收入", "quoted deadline", "zzz absent"):
+        expected = qss._term_scan_candidates(chunks, pages, topic)
+        assert qss._term_scan_candidates(chunks, pages, topic, index) == expected, topic
+
+
+class _Result:
+    def __init__(self, first=None, scalar=None, scalars=()):
+        self._first, self._scalar, self._scalars = first, scalar, list(scalars)
+
+    def first(self):
+        return self._first
+
+    def scalar_one_or_none(self):
+        return self._scalar
+
+    def scalars(self):
+        return self._scalars
+
+
+@pytest.mark.asyncio
+async def test_cache_revalidates_on_reparse_and_bounds_bytes():
+    blob = build_index_blob([(uuid.uuid4(), "alpha beta", None)])
+    built = {"at": 1}
+    blob_reads = []
+
+    async def execute(statement):
+        if "blob" in str(statement).split("FROM")[0]:
+            blob_reads.append(1)
+            return _Result(scalar=blob)
+        return _Result(first=SimpleNamespace(built_at=built["at"], format_version=1))
+
+    db = SimpleNamespace(execute=AsyncMock(side_effect=execute))
+    cache = LexicalIndexCache(max_bytes=LexicalIndex(blob).nbytes * 2)
+    doc_a, doc_b, doc_c = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+
+    first = await cache.get(db, doc_a)
+    assert await cache.get(db, doc_a) is first
+    built["at"] = 2  # reparse
+    assert await cache.get(db, doc_a) is not first
+    assert len(blob_reads) == 2
+
+    await cache.get(db, doc_b)
+    await cache.get(db, doc_c)
+    stats = cache.stats()
+    assert stats["entries"] == 2 and stats["bytes"] <= stats["max_bytes"]
+
+
+@pytest.mark.asyncio
+async def test_bm25_search_hydrates_only_ranked_hits(monkeypatch):
+    chunks = [
+        _chunk("MetaX 2028 revenue is forecast at $42m according to the valuation table." * 3),
+        _chunk("Nothing relevant in this chunk at all, just filler about notices." * 3),
+    ]
+    index = _index(chunks)
+    monkeypatch.setattr("app.services.retrieval_service.lexical_index_cache.get", AsyncMock(return_value=index))
+    monkeypatch.setattr("app.services.chunk_cache.chunk_cache.resident", AsyncMock(return_value={}))
+    statements = []
+
+    async def execute(statement):
+        statements.append(statement)
+        return _Result(scalars=[chunks[0]])
+
+    db = SimpleNamespace(execute=AsyncMock(side_effect=execute))
+    payloads = await retrieval_service.bm25_search("MetaX 2028 revenue", [chunks[0].document_id], 8, db)
+
+    assert [p["chunk_id"] for p in payloads] == [chunks[0].id]
+    assert len(statements) == 1
+    assert 0.48 <= payloads[0]["score"] <= 0.99
+
+
+@pytest.mark.asyncio
+async def test_bm25_search_defers_to_sql_without_index(monkeypatch):
+    monkeypatch.setattr("app.services.retrieval_service.lexical_index_cache.get", AsyncMock(return_value=None))
+    db = SimpleNamespace(execute=AsyncMock())
+
+    assert await retrieval_service.bm25_search("MetaX revenue", [uuid.uuid4()], 8, db) is None
+    db.execute.assert_not_awaited()
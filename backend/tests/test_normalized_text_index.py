@@ -0,0 +1,117 @@
+"""Parse-time normalized texts: blob round trip (identical to normalize()),
+the stale-entry guard, and quote term scan / verification parity with the
+on-the-fly path."""
+from __future__ import annotations
+
+import random
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import quote_search_service as qss
+from app.services.normalized_text_index import (
+    NormalizedTextIndex,
+    build_normalized_blob,
+)
+from app.services.quote_source_service import QuoteSource, QuoteSourceSegment
+from app.services.quote_verification_service import verify_quote
+from app.services.text_normalizer import normalize
+
+_WORDS = [
+    "climate", "Risk", "risks,", "(transition)", "naïve", "co-operation", "“quoted”", "收入确认",
+    "deadline.", "ﬁnal", "…", "Ｆｕｌｌ", "—", "don’t", "​", "  ", "\n\n", "株式会社", "é",
+]
+
+
+def _text(rng: random.Random, n: int) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(n))
+
+
+def _chunk(text: str, page: int = 1):
+    return SimpleNamespace(id=uuid.uuid4(), text=text, page_start=page, page_end=page, bboxes=[])
+
+
+def _texts(chunks, pages=()) -> NormalizedTextIndex:
+    return NormalizedTextIndex(
+        build_normalized_blob([(c.id, c.text) for c in chunks], [(p.page_number, p.content) for p in pages])
+    )
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_round_trip_matches_normalize(seed):
+    rng = random.Random(seed)
+    chunks = [_chunk(_text(rng, rng.randint(0, 40))) for _ in range(20)]
+    pages = [SimpleNamespace(page_number=n, content=_text(rng, 60) if n % 4 else None) for n in range(1, 12)]
+    texts = _texts(chunks, pages)
+
+    for fuzzy in (False, True):
+        for c in chunks:
+            norm, norm_to_raw = texts.chunk(c.id, fuzzy=fuzzy)
+            expected = normalize(c.text, fuzzy=fuzzy)
+            assert norm == expected[0]
+            assert list(norm_to_raw) == expected[1]
+        for p in pages:
+            stored = texts.page(p.page_number, fuzzy=fuzzy)
+            if p.content is None:
+                assert stored is None
+            else:
+                assert tuple(stored) == normalize(p.content, fuzzy=fuzzy)
+    assert texts.page_numbers == [p.page_number for p in pages if p.content]
+
+
+def test_unknown_or_changed_text_is_not_served():
+    chunk = _chunk("Revenue grew in every region.")
+    texts = _texts([chunk])
+
+    assert texts.chunk(uuid.uuid4(), fuzzy=False) is None
+    assert texts.chunk(chunk.id, fuzzy=False, raw_len=len(chunk.text) + 1) is None
+    assert texts.chunk(chunk.id, fuzzy=False, raw_len=len(chunk.text)).text == "Revenue grew in every region."
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_term_scan_with_texts_matches_full_scan(seed):
+    rng = random.Random(seed)
+    chunks = [_chunk(_text(rng, rng.randint(3, 12)), page=i // 2 + 1) for i in range(30)]
+    pages = [SimpleNamespace(page_number=n, content=_text(rng, 8) if n % 3 else None) for n in range(1, 16)]
+    texts = _texts(chunks, pages)
+
+    for topic in ("Climate risk", "transition", "naive", "final", "收入", "quoted deadline", "zzz absent"):
+        expected = qss._term_scan_candidates(chunks, pages, topic)
+        assert qss._term_scan_candidates(chunks, [], topic, texts=texts) == expected, topic
+
+
+def test_segment_verification_with_texts_matches_on_the_fly():
+    page_text = "Fluency is the most prized quality in translation today, and it renders the translator’s labour invisible."
+    chunk = _chunk("Publishers reward transparent prose above all else, the report’s authors conclude.", page=3)
+    texts = _texts([chunk], [SimpleNamespace(page_number=3, content=page_text)])
+    document = SimpleNamespace(text_quality=0.95, parse_method="text")
+    sources = [
+        QuoteSource(page_text, "page_text", 3, 3, [QuoteSourceSegment(page_text, 3, 3)]),
+        QuoteSource(chunk.text, "extracted_text", 3, 3, [QuoteSourceSegment(chunk.text, 3, 3, chunk_id=chunk.id)]),
+    ]
+    proposals = [
+        "the most prized quality in translation today",
+        "the translator's labour invisible",
+        "Fluency is the most prised quality in translation today, and it renders",
+        "publishers reward transparent prose above all else, the report's authors",
+        "nothing like this appears",
+    ]
+
+    for source in sources:
+        assert qss._segment_norms(source, source.segments[0], texts)
+        for quote in proposals:
+            assert qss._verify_against_segments(quote, source, document, texts) == qss._verify_against_segments(
+                quote, source, document
+            ), quote
+
+
+def test_verify_quote_uses_precomputed_normalization():
+    source = "He said — “stop”."
+    v = verify_quote(
+        '- "stop"',
+        source,
+        source_norm=normalize(source),
+        source_fuzzy_norm=normalize(source, fuzzy=True),
+    )
+    assert v == verify_quote('- "stop"', source)
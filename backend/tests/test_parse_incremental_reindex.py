@@ -0,0 +1,188 @@
+"""Incremental reparse: new chunks are matched to the document's existing
+chunks by text digest, keeping row ids and Qdrant points for unchanged text
+and embedding only new or changed chunks."""
+from __future__ import annotations
+
+import uuid
+from collections import deque
+from types import SimpleNamespace
+
+import pytest
+from qdrant_client import QdrantClient
+from qdrant_client.models import PointStruct, VectorParams
+from sqlalchemy.sql.dml import Delete, Insert, Update
+
+from app.workers import parse_worker
+from app.workers.parse_worker import _ChunkReuse, _ReusableChunk
+
+
+def _row(index: int, text: str, page: int = 1) -> dict:
+    return {
+        "document_id": None,
+        "chunk_index": index,
+        "text": text,
+        "token_count": 3,
+        "page_start": page,
+        "page_end": page,
+        "bboxes": [],
+        "section_title": None,
+    }
+
+
+def _reusable(*chunks: tuple[str, _ReusableChunk]) -> dict[str, deque]:
+    out: dict[str, deque] = {}
+    for text, chunk in chunks:
+        out.setdefault(parse_worker._chunk_digest(text), deque()).append(chunk)
+    return out
+
+
+def test_digest_matches_postgres_md5():
+    # SELECT md5('abc') in PostgreSQL.
+    assert parse_worker._chunk_digest("abc") == "900150983cd24fb0d6963f7d28e17f72"
+
+
+def test_unchanged_text_keeps_id_and_vector_changed_text_is_inserted():
+    kept, moved, stale = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    reusable = _reusable(
+        ("intro", _ReusableChunk(kept, True, 0, 1)),
+        ("body", _ReusableChunk(moved, True, 1, 1)),
+        ("old ending", _ReusableChunk(stale, True, 2, 2)),
+    )
+    reuse = _ChunkReuse()
+
+    updates, inserts = parse_worker._match_chunk_rows(
+        [_row(0, "intro"), _row(1, "new paragraph"), _row(2, "body", page=2), _row(3, "new ending", page=2)],
+        reusable,
+        reuse,
+    )
+
+    assert [u["id"] for u in updates] == [kept, moved]
+    assert [u["vector_id"] for u in updates] == [str(kept), str(moved)]
+    assert "text" not in updates[0] and "document_id" not in updates[0]
+    assert [i["text"] for i in inserts] == ["new paragraph", "new ending"]
+    # The moved chunk's point keeps its vector but needs its payload fixed.
+    assert reuse.payload_updates == [(str(moved), {"chunk_index": 2, "page_start": 2})]
+    assert (reuse.reused, reuse.indexed) == (2, 2)
+    assert [c.id for q in reusable.values() for c in q] == [stale]  # left over -> removed
+
+
+def test_duplicate_texts_pair_up_in_order_and_missing_vectors_are_reembedded():
+    first, second = uuid.uuid4(), uuid.uuid4()
+    reusable = _reusable(
+        ("repeated footer", _ReusableChunk(first, True, 3, 1)),
+        ("repeated footer", _ReusableChunk(second, False, 7, 2)),
+    )
+    reuse = _ChunkReuse()
+
+    updates, inserts = parse_worker._match_chunk_rows(
+        [_row(3, "repeated footer"), _row(7, "repeated footer", page=2), _row(9, "repeated footer", page=3)],
+        reusable,
+        reuse,
+    )
+
+    assert [u["id"] for u in updates] == [first, second]
+    assert updates[1]["vector_id"] is None  # kept id, but its point is gone
+    assert len(inserts) == 1
+    assert (reuse.reused, reuse.indexed, reuse.payload_updates) == (2, 1, [])
+
+
+def test_only_chunks_whose_point_exists_count_as_indexed(monkeypatch):
+    monkeypatch.setattr(parse_worker.settings, "QDRANT_COLLECTION", "chunks")
+    client = QdrantClient(":memory:")
+    client.create_collection("chunks", vectors_config=VectorParams(size=2, distance="Cosine"))
+    live, gone, never = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    client.upsert("chunks", [PointStruct(id=str(live), vector=[1.0, 0.0], payload={})])
+    rows = [
+        SimpleNamespace(id=live, digest="a", chunk_index=0, page_start=1, vector_id=str(live)),
+        SimpleNamespace(id=gone, digest="b", chunk_index=1, page_start=1, vector_id=str(gone)),
+        SimpleNamespace(id=never, digest="a", chunk_index=2, page_start=2, vector_id=None),
+    ]
+    db = SimpleNamespace(execute=lambda _stmt: SimpleNamespace(all=lambda: rows))
+
+    reusable = parse_worker._load_reusable_chunks(db, SimpleNamespace(id=uuid.uuid4()), client)
+
+    assert list(reusable["a"]) == [_ReusableChunk(live, True, 0, 1), _ReusableChunk(never, False, 2, 2)]
+    assert list(reusable["b"]) == [_ReusableChunk(gone, False, 1, 1)]
+
+
+def test_persist_parks_indexes_then_updates_inserts_and_deletes():
+    kept, stale = uuid.uuid4(), uuid.uuid4()
+    reusable = _reusable(("same", _ReusableChunk(kept, True, 4, 1)), ("gone", _ReusableChunk(stale, True, 5, 1)))
+    executed: list[tuple[object, object]] = []
+    db = SimpleNamespace(execute=lambda stmt, params=None: executed.append((stmt, params)))
+    chunk_infos = [
+        SimpleNamespace(chunk_index=0, text="same", token_count=1, page_start=1, page_end=1, bboxes=[], section_title=None),
+        SimpleNamespace(chunk_index=1, text="fresh", token_count=1, page_start=1, page_end=1, bboxes=[], section_title=None),
+    ]
+
+    reuse = parse_worker._persist_chunks_incremental(db, SimpleNamespace(id=uuid.uuid4()), chunk_infos, reusable)
+
+    kinds = [type(stmt) for stmt, _ in executed]
+    assert kinds == [Update, Update, Insert, Delete]
+    assert executed[0][1] is None  # the single index-parking UPDATE
+    assert [p["id"] for p in executed[1][1]] == [kept]
+    assert [p["text"] for p in executed[2][1]] == ["fresh"]
+    assert (reuse.total, reuse.reused, reuse.removed) == (2, 1, [stale])
+    assert reuse.payload_updates == [(str(kept), {"chunk_index": 0, "page_start": 1})]
+
+
+def test_reused_payloads_are_rewritten_in_place(monkeypatch):
+    monkeypatch.setattr(parse_worker.settings, "QDRANT_COLLECTION", "chunks")
+    client = QdrantClient(":memory:")
+    client.create_collection("chunks", vectors_config=VectorParams(size=2, distance="Cosine"))
+    point = str(uuid.uuid4())
+    client.upsert("chunks", [PointStruct(id=point, vector=[1.0, 0.0], payload={"document_id": "d", "chunk_index": 4})])
+
+    parse_worker._apply_reused_payloads(client, [(point, {"chunk_index": 0, "page_start": 2})])
+
+    assert client.retrieve("chunks", [point], with_payload=True)[0].payload == {
+        "document_id": "d", "chunk_index": 0, "page_start": 2,
+    }
+
+
+@pytest.mark.integration
+def test_reparse_against_real_postgres_keeps_ids_of_unchanged_chunks():
+    """The index parking must avoid uq_chunks_document_index, and reused rows
+    must never be deleted (saved_quotes.source_chunk_id is ON DELETE SET
+    NULL). Requires docker Postgres (SKIP_INTEGRATION=0)."""
+    from sqlalchemy import select
+
+    from app.models.sync_database import SyncSessionLocal
+    from app.models.tables import Chunk, Document
+
+    with SyncSessionLocal() as db:
+        doc = Document(
+            filename="incremental.pdf", file_size=1,
+            storage_key=f"documents/{uuid.uuid4()}/incremental.pdf", status="parsing",
+        )
+        db.add(doc)
+        db.commit()
+        db.refresh(doc)
+        try:
+            first = [
+                SimpleNamespace(chunk_index=i, text=t, token_count=1, page_start=1, page_end=1, bboxes=[], section_title=None)
+                for i, t in enumerate(["alpha", "beta", "gamma"])
+            ]
+            parse_worker._insert_rows_batched(db, Chunk, parse_worker._chunk_rows(doc.id, first))
+            db.commit()
+            before = {r.text: r.id for r in db.execute(select(Chunk.text, Chunk.id).where(Chunk.document_id == doc.id))}
+
+            second = [
+                SimpleNamespace(chunk_index=i, text=t, token_count=1, page_start=1, page_end=1, bboxes=[], section_title=None)
+                for i, t in enumerate(["new", "gamma", "alpha"])
+            ]
+            reusable = parse_worker._load_reusable_chunks(
+                db, doc, SimpleNamespace(retrieve=lambda **_kw: [])
+            )
+            reuse = parse_worker._persist_chunks_incremental(db, doc, second, reusable)
+            db.commit()
+
+            after = db.execute(
+                select(Chunk.text, Chunk.id, Chunk.chunk_index).where(Chunk.document_id == doc.id).order_by(Chunk.chunk_index)
+            ).all()
+            assert [r.text for r in after] == ["new", "gamma", "alpha"]
+            assert after[1].id == before["gamma"] and after[2].id == before["alpha"]
+            assert reuse.removed == [before["beta"]]
+        finally:
+            db.delete(doc)
+            db.commit()
@@ -140,7 +140,7 @@ class TestParseWorkerPersistsPdfPageContent:
                 return None
 
         monkeypatch.setattr(parse_worker, "sync_engine", SimpleNamespace(connect=lambda: _LockConn()))
-        monkeypatch.setattr(parse_worker, "_download_file_bytes", lambda *_a, **_k: b"%PDF-1.4\nfake")
+        monkeypatch.setattr(parse_worker, "_download_file", lambda *_a, **_k: b"%PDF-1.4\nfake")
         monkeypatch.setattr(parse_worker.settings, "OCR_ENABLED", False)
 
         monkeypatch.setattr(parse_worker.embedding_service, "ensure_collection", lambda *_a, **_k: None)
@@ -1,16 +1,28 @@
 """Tests for ParseService — detect_scanned and OCR interface."""
 from __future__ import annotations
 
+import json
+import re
 import sys
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
+import billiard
+import fitz
+import pytest
+
 # Ensure backend is importable
 BACKEND_DIR = Path(__file__).resolve().parents[1]
 if str(BACKEND_DIR) not in sys.path:
     sys.path.insert(0, str(BACKEND_DIR))
 
-from app.services.parse_service import BlockInfo, PageInfo, ParseService  # noqa: E402
+from app.services import parse_service  # noqa: E402
+from app.services.parse_service import (  # noqa: E402
+    BlockInfo,
+    PageInfo,
+    PageSpool,
+    ParseService,
+)
 
 
 class TestDetectScanned:
@@ -142,6 +154,145 @@ class TestExtractPagesOcr:
         assert actual_dpi >= 72, "DPI should not go below 72"
 
 
+class _Interrupted(Exception):
+    """Stands in for Celery's SoftTimeLimitExceeded (an Exception subclass)."""
+
+
+def _mock_ocr_page(text: str) -> MagicMock:
+    page = MagicMock()
+    page.rect.width = 612
+    page.rect.height = 792
+    page.rotation = 0
+    page.get_text.side_effect = lambda kind, textpage=None: {"blocks": []} if kind == "dict" else text
+    return page
+
+
+class TestOcrCheckpointAndPool:
+    def setup_method(self):
+        self.svc = ParseService()
+
+    @patch("app.services.parse_service.fitz")
+    def test_interrupted_ocr_resumes_from_checkpoint(self, mock_fitz, monkeypatch, tmp_path):
+        monkeypatch.setattr(parse_service, "_OCR_CHECKPOINT_ROOT", str(tmp_path))
+        pages = [_mock_ocr_page(f"text {i}") for i in (1, 2, 3)]
+        pages[2].get_textpage_ocr.side_effect = _Interrupted()
+        mock_fitz.open.side_effect = lambda **_kw: MagicMock(__iter__=MagicMock(return_value=iter(pages)))
+
+        with pytest.raises(_Interrupted):
+            self.svc.extract_pages_ocr(b"scan", languages="eng", dpi=150)
+
+        pages[2].get_textpage_ocr.side_effect = None
+        result = self.svc.extract_pages_ocr(b"scan", languages="eng", dpi=150)
+
+        assert [(p.page_number, p.raw_text) for p in result] == [(1, "text 1"), (2, "text 2"), (3, "text 3")]
+        # Pages finished before the interrupt were not OCR'd again.
+        assert [p.get_textpage_ocr.call_count for p in pages] == [1, 1, 2]
+        assert list(tmp_path.iterdir()) == []  # checkpoint discarded on completion
+
+    def test_checkpoint_pages_are_json_and_unreadable_ones_are_discarded(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(parse_service, "_OCR_CHECKPOINT_ROOT", str(tmp_path))
+        checkpoint = parse_service.OcrCheckpoint(b"scan", "eng", 300)
+        page = PageInfo(
+            page_number=1, width_pt=612, height_pt=792, rotation=0,
+            blocks=[BlockInfo(page=1, text="Umsatz", bbox=(1.0, 2.0, 3.0, 4.0), font_size=11.0)],
+            raw_text="Umsatz",
+        )
+        checkpoint.store(page)
+        Path(checkpoint.path, "000002.json").write_bytes(b"\x80\x05cos\nsystem\n.")  # a pickle is not a checkpoint
+
+        resumed = parse_service.OcrCheckpoint(b"scan", "eng", 300)
+
+        assert json.loads(Path(resumed.path, "000001.json").read_text())["raw_text"] == "Umsatz"
+        assert resumed.pages == {1, 2}
+        assert resumed.get(1) == page
+        assert resumed.get(2) is None and resumed.pages == {1}
+
+    @patch("app.services.parse_service.fitz")
+    def test_parallel_results_merge_in_page_order(self, mock_fitz, monkeypatch, tmp_path):
+        monkeypatch.setattr(parse_service, "_OCR_CHECKPOINT_ROOT", str(tmp_path))
+        mock_fitz.open.return_value = MagicMock(page_count=6)
+        checkpoint = parse_service.OcrCheckpoint(b"scan", "eng", 300)
+        checkpoint.store(PageInfo(page_number=2, width_pt=1, height_pt=1, rotation=0, blocks=[], raw_text="p2"))
+        seen_shards: list[list[int]] = []
+
+        def _fake_pool(_pdf, shards, languages, dpi, workers):
+            seen_shards.extend(shards)
+            for shard in reversed(shards):  # completion order != page order
+                yield [
+                    (pi, None, "tesseract crashed") if pi == 5 else
+                    (pi, PageInfo(page_number=pi, width_pt=1, height_pt=1, rotation=0, blocks=[], raw_text=f"p{pi}"), None)
+                    for pi in shard
+                ]
+
+        monkeypatch.setattr(parse_service, "_run_ocr_pool", _fake_pool)
+
+        result = self.svc.extract_pages_ocr(b"scan", languages="eng", dpi=300, workers=2)
+
+        assert sorted(pi for shard in seen_shards for pi in shard) == [1, 3, 4, 5, 6]
+        assert [p.raw_text for p in result] == ["p1", "p2", "p3", "p4", "p6"]
+
+    @patch("app.services.parse_service.fitz")
+    def test_dead_worker_falls_back_to_serial(self, mock_fitz, monkeypatch, tmp_path):
+        monkeypatch.setattr(parse_service, "_OCR_CHECKPOINT_ROOT", str(tmp_path))
+        pages = [_mock_ocr_page(f"text {i}") for i in (1, 2)]
+        mock_fitz.open.return_value = MagicMock(page_count=2, __iter__=MagicMock(return_value=iter(pages)))
+
+        def _broken_pool(*_args):
+            raise ChildProcessError("OCR worker exited with status -9")
+            yield  # pragma: no cover
+
+        monkeypatch.setattr(parse_service, "_run_ocr_pool", _broken_pool)
+
+        result = self.svc.extract_pages_ocr(b"scan", languages="eng", dpi=300, workers=4)
+
+        assert [p.raw_text for p in result] == ["text 1", "text 2"]
+
+    def test_worker_processes_open_shared_file_and_return_ordered_pages(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(parse_service, "_OCR_CHECKPOINT_ROOT", str(tmp_path))
+
+        # Real worker processes; pages whose OCR fails (no Tesseract here) are
+        # skipped exactly as in the serial path.
+        result = self.svc.extract_pages_ocr(_four_page_pdf(), languages="eng", dpi=72, workers=2)
+
+        numbers = [p.page_number for p in result]
+        assert numbers == sorted(numbers) and set(numbers) <= {1, 2, 3, 4}
+
+    def test_parallel_ocr_runs_inside_a_daemonic_celery_child(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(parse_service, "_OCR_CHECKPOINT_ROOT", str(tmp_path / "ocr"))
+
+        def _no_serial(*_args):
+            raise AssertionError("fell back to serial OCR")
+
+        monkeypatch.setattr(ParseService, "_extract_pages_ocr_serial", _no_serial)
+        outcome = tmp_path / "outcome.json"
+        pdf_bytes = _four_page_pdf()
+
+        def _task() -> None:
+            try:
+                pages = ParseService().extract_pages_ocr(pdf_bytes, languages="eng", dpi=72, workers=2)
+                outcome.write_text(json.dumps({"pages": [p.page_number for p in pages]}))
+            except BaseException as e:
+                outcome.write_text(json.dumps({"error": repr(e)}))
+
+        # A prefork pool child, as the parse task runs in production.
+        child = billiard.Process(target=_task, daemon=True)
+        child.start()
+        child.join(120)
+
+        result = json.loads(outcome.read_text())
+        assert "error" not in result, result["error"]
+        assert set(result["pages"]) <= {1, 2, 3, 4}
+
+
+def _four_page_pdf() -> bytes:
+    doc = fitz.open()
+    for i in range(4):
+        doc.new_page().insert_text((72, 72), f"Scanned page {i + 1}")
+    pdf_bytes = doc.tobytes()
+    doc.close()
+    return pdf_bytes
+
+
 class TestChunkDocumentIntegrity:
     def setup_method(self):
         self.svc = ParseService()
@@ -291,3 +442,88 @@ class TestChunkDocumentIntegrity:
         chunks = self.svc.chunk_document([page])
 
         assert chunks[0].text == "这是第一句，继续说明。"
+
+
+def _book(n_pages: int) -> list[PageInfo]:
+    """Multi-page document with a running header/footer, periodic headings
+    and short form-field lines that become micro-chunks."""
+    pages = []
+    for pn in range(1, n_pages + 1):
+        blocks = [BlockInfo(page=pn, text="Annual Report 2024", bbox=(50, 10, 300, 24), font_size=9)]
+        if pn % 3 == 1:
+            blocks.append(BlockInfo(page=pn, text=f"Chapter {pn}", bbox=(50, 60, 300, 84), font_size=18))
+        for i in range(6):
+            y = 100 + i * 40
+            text = f"Page {pn} paragraph {i} explains one finding in plain words." if i != 3 else "Sign:"
+            blocks.append(BlockInfo(page=pn, text=text, bbox=(50, y, 550, y + 14), font_size=10))
+        blocks.append(BlockInfo(page=pn, text="Confidential", bbox=(50, 770, 200, 784), font_size=8))
+        pages.append(PageInfo(page_number=pn, width_pt=600, height_pt=800, rotation=0, blocks=blocks))
+    return pages
+
+
+class TestStreamingParse:
+    def setup_method(self):
+        self.svc = ParseService()
+
+    def test_page_spool_round_trips_pages(self):
+        pages = _book(5)
+        spool = PageSpool()
+        for page in pages:
+            spool.append(page)
+
+        assert len(spool) == 5
+        assert list(spool) == pages
+        assert spool[-1] == pages[-1]
+        assert spool[1:3] == pages[1:3]
+        # Independent iterators may interleave (nested passes over one spool).
+        assert [(a.page_number, b.page_number) for a, b in zip(spool, spool[::-1])] == [
+            (1, 5), (2, 4), (3, 3), (4, 2), (5, 1),
+        ]
+        spool.close()
+
+    def test_spooled_pages_chunk_identically_to_a_list(self):
+        pages = _book(12)
+        spool = PageSpool()
+        for page in pages:
+            spool.append(page)
+
+        assert self.svc.chunk_document(spool) == self.svc.chunk_document(pages)
+        assert self.svc.extract_elements(spool) == self.svc.extract_elements(pages)
+
+    def test_iter_chunks_assembles_across_pages_with_overlap(self):
+        self.svc.TARGET_MIN_TOKENS = 40
+        self.svc.TARGET_MAX_TOKENS = 60
+        self.svc.OVERLAP_TOKENS = 10
+
+        chunks = list(self.svc.iter_chunks(_book(6)))
+
+        assert [c.chunk_index for c in chunks] == list(range(len(chunks)))
+        assert any(c.page_start != c.page_end for c in chunks)
+        for prev, nxt in zip(chunks, chunks[1:]):
+            # Overlap carries the tail sentence of one chunk into the next.
+            assert set(re.findall(r"Page \d+ paragraph \d+", prev.text)) & set(
+                re.findall(r"Page \d+ paragraph \d+", nxt.text)
+            )
+        text = " ".join(c.text for c in chunks)
+        assert "Annual Report 2024" not in text and "Confidential" not in text
+        # Micro-chunks ("Sign:") are merged into a neighbour, never emitted alone.
+        assert all(len(c.text) >= 50 for c in chunks)
+        assert chunks[0].section_title == "Chapter 1"
+
+    def test_iter_chunks_is_lazy(self):
+        pulled: list[int] = []
+        source = _book(30)
+
+        class _Tracking(list):
+            def __iter__(self):
+                for page in super().__iter__():
+                    pulled.append(page.page_number)
+                    yield page
+
+        it = self.svc.iter_chunks(_Tracking(source))
+        next(it)
+
+        # Two statistics passes read every page; the chunking pass has only
+        # read as far as the first chunk needed.
+        assert len(pulled) < 3 * len(source)
+
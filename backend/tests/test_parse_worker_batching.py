@@ -103,7 +103,7 @@ class TestSerializationGuards:
             def detect_scanned(self, _p) -> bool:
                 return True
 
-            def extract_pages_ocr(self, _b, *, languages, dpi):
+            def extract_pages_ocr(self, _b, *, languages, dpi, workers=1):
                 return [
                     SimpleNamespace(
                         page_number=1,
@@ -147,7 +147,7 @@ class TestSerializationGuards:
             def detect_scanned(self, _p) -> bool:
                 return True
 
-            def extract_pages_ocr(self, _b, *, languages, dpi):
+            def extract_pages_ocr(self, _b, *, languages, dpi, workers=1):
                 return [
                     SimpleNamespace(
                         page_number=1,
@@ -288,6 +288,45 @@ class TestSerializationGuards:
         assert conn.closed
 
 
+    def test_final_write_leaves_a_deleting_document_alone(self, monkeypatch):
+        """A delete that lands while chunks are being embedded sets 'deleting'
+        and queues the purge; the parse must not write 'ready' over it."""
+        doc = _make_doc(uuid.uuid4())
+
+        class _Result:
+            def all(self):
+                return []
+
+            def scalar(self):
+                return None
+
+            def scalar_one_or_none(self):
+                return "deleting"
+
+        class _DeletedMidParseSession(_RecordingSession):
+            def __init__(self, doc):
+                super().__init__(doc)
+                self.rollbacks = 0
+
+            def execute(self, stmt, params=None):
+                super().execute(stmt, params)
+                return _Result()
+
+            def rollback(self) -> None:
+                self.rollbacks += 1
+
+        session = _DeletedMidParseSession(doc)
+        _wire_minimal_pdf_parse(monkeypatch, lambda: session)
+        monkeypatch.setattr(parse_worker, "_store_lexical_index", lambda *_a, **_k: None)
+        monkeypatch.setattr(parse_worker, "_store_normalized_texts", lambda *_a, **_k: None)
+        monkeypatch.setattr(parse_worker, "_index_chunks", lambda *_a, **_k: 1)
+
+        parse_worker.parse_document.run(str(doc.id))
+
+        assert doc.status == "embedding"  # last write before the delete landed
+        assert session.rollbacks == 1
+
+
 class TestWatchdogNoCandidates:
     def test_no_candidates_dispatches_nothing(self, monkeypatch):
         class _EmptyResult:
@@ -705,7 +744,7 @@ def _wire_minimal_pdf_parse(monkeypatch, session_factory, *, lock_granted: bool
         "sync_engine",
         SimpleNamespace(connect=lambda: _StubLockConn(granted=lock_granted)),
     )
-    monkeypatch.setattr(parse_worker, "_download_file_bytes", lambda *_a, **_k: b"%PDF-1.4\nfake")
+    monkeypatch.setattr(parse_worker, "_download_file", lambda *_a, **_k: b"%PDF-1.4\nfake")
     monkeypatch.setattr(parse_worker.settings, "OCR_ENABLED", False)
     monkeypatch.setattr(parse_worker.embedding_service, "ensure_collection", lambda *_a, **_k: None)
 
@@ -732,11 +771,11 @@ def _wire_minimal_pdf_parse(monkeypatch, session_factory, *, lock_granted: bool
         def detect_scanned(self, _pages) -> bool:
             return False
 
-        def extract_elements(self, _pages):
-            return []
+        def iter_elements(self, _pages):
+            return iter([])
 
-        def chunk_document(self, _pages):
-            return [
+        def iter_chunks(self, _pages):
+            return iter([
                 SimpleNamespace(
                     chunk_index=0,
                     text="chunk text",
@@ -746,7 +785,7 @@ def _wire_minimal_pdf_parse(monkeypatch, session_factory, *, lock_granted: bool
                     bboxes=[],
                     section_title=None,
                 )
-            ]
+            ])
 
     monkeypatch.setattr(parse_worker, "ParseService", _FakeParseService)
 
@@ -995,3 +1034,97 @@ class TestPersistFailurePaths:
         assert doc.status == "error"
         assert doc.error_msg.startswith("ERR_CODE:VECTORIZE_FAILED:")
         assert fresh_sessions, "error status must be written on a fresh session"
+
+
+class TestIndexChunksPipeline:
+    """user-001: bounded in-flight embeds, ordered fire-and-forget upserts with
+    a final barrier, and batched vector_id/chunks_indexed progress writes."""
+
+    @staticmethod
+    def _chunks(n: int) -> list[SimpleNamespace]:
+        return [
+            SimpleNamespace(id=uuid.uuid4(), text=f"chunk {i}", chunk_index=i, page_start=1 + i // 10)
+            for i in range(n)
+        ]
+
+    class _RecordingQdrant:
+        def __init__(self):
+            self.upserts: list[tuple[list, bool]] = []
+
+        def upsert(self, *, collection_name, points, wait):
+            self.upserts.append((points, wait))
+
+    def _run(self, monkeypatch, chunks, *, batch_size=4, max_in_flight=3, embed=None):
+        import threading
+        import time
+
+        state = {"active": 0, "peak": 0}
+        lock = threading.Lock()
+
+        def _fake_embed(texts):
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            time.sleep(0.01)
+            with lock:
+                state["active"] -= 1
+            return [[float(len(t))] for t in texts]
+
+        monkeypatch.setattr(parse_worker.embedding_service, "embed_texts", embed or _fake_embed)
+        doc = _make_doc(uuid.uuid4())
+        db = _RecordingSession(doc)
+        qdrant = self._RecordingQdrant()
+        total = parse_worker._index_chunks(
+            db, doc, chunks, qdrant, batch_size=batch_size, max_in_flight=max_in_flight
+        )
+        return total, doc, db, qdrant, state["peak"]
+
+    def test_upserts_every_chunk_in_order_and_only_last_waits(self, monkeypatch):
+        chunks = self._chunks(18)
+
+        total, doc, _db, qdrant, _peak = self._run(monkeypatch, chunks)
+
+        assert total == 18 and doc.chunks_indexed == 18
+        upserted = [p.id for points, _wait in qdrant.upserts for p in points]
+        assert upserted == [str(c.id) for c in chunks]
+        assert [wait for _points, wait in qdrant.upserts] == [False] * 4 + [True]
+        assert qdrant.upserts[0][0][0].payload == {
+            "document_id": str(doc.id),
+            "chunk_index": 0,
+            "page_start": 1,
+        }
+
+    def test_embeds_are_bounded_but_concurrent(self, monkeypatch):
+        _total, _doc, _db, _qdrant, peak = self._run(
+            monkeypatch, self._chunks(40), batch_size=2, max_in_flight=3
+        )
+        assert 1 < peak <= 3
+
+    def test_progress_writes_are_batched(self, monkeypatch):
+        # 9 batches -> flushes after batch 4, 8 and the final batch 9.
+        _total, _doc, db, _qdrant, _peak = self._run(
+            monkeypatch, self._chunks(36), batch_size=4, max_in_flight=2
+        )
+        assert db.commits == 3
+        assert len(db.executed) == 3  # one vector_id UPDATE per flush
+
+    def test_embed_failure_propagates_without_flushing_unacked_batches(self, monkeypatch):
+        calls = {"n": 0}
+
+        def _flaky_embed(texts):
+            calls["n"] += 1
+            if calls["n"] == 2:
+                raise RuntimeError("provider down")
+            return [[0.0] for _ in texts]
+
+        doc = _make_doc(uuid.uuid4())
+        db = _RecordingSession(doc)
+        qdrant = self._RecordingQdrant()
+        monkeypatch.setattr(parse_worker.embedding_service, "embed_texts", _flaky_embed)
+
+        with pytest.raises(RuntimeError, match="provider down"):
+            parse_worker._index_chunks(db, doc, self._chunks(12), qdrant, batch_size=4, max_in_flight=1)
+
+        assert len(qdrant.upserts) == 1
+        assert db.commits == 0  # first batch upserted but below the flush interval
+        assert doc.chunks_indexed == 0
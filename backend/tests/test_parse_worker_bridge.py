@@ -150,7 +150,7 @@ def test_parse_document_uses_stored_locale_for_ocr(monkeypatch) -> None:
             return None
 
     monkeypatch.setattr(parse_worker, "sync_engine", SimpleNamespace(connect=lambda: _LockConn()))
-    monkeypatch.setattr(parse_worker, "_download_file_bytes", lambda *_args, **_kwargs: b"%PDF-1.4\nfake")
+    monkeypatch.setattr(parse_worker, "_download_file", lambda *_args, **_kwargs: b"%PDF-1.4\nfake")
     monkeypatch.setattr(parse_worker.settings, "OCR_ENABLED", True)
     monkeypatch.setattr(parse_worker.settings, "OCR_DPI", 300)
 
@@ -179,7 +179,7 @@ def test_parse_document_uses_stored_locale_for_ocr(monkeypatch) -> None:
         def detect_scanned(self, _pages) -> bool:
             return True
 
-        def extract_pages_ocr(self, _pdf_bytes: bytes, *, languages: str, dpi: int):
+        def extract_pages_ocr(self, _pdf_bytes: bytes, *, languages: str, dpi: int, workers: int = 1):
             ocr_calls.append((languages, dpi))
             return [
                 SimpleNamespace(
@@ -0,0 +1,163 @@
+"""User principal cache: (sub, iat) keying, TTL, invalidation (including a
+load racing one), and the principal dependency skipping the database on hits."""
+from __future__ import annotations
+
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from jose import jwt
+from starlette.requests import Request
+
+from app.core import deps as deps_module
+from app.core.principal_cache import UserPrincipal, UserPrincipalCache
+from tests.conftest import TEST_AUTH_SECRET
+
+
+def _request(sub: str, iat: int) -> Request:
+    now = int(datetime.now(timezone.utc).timestamp())
+    token = jwt.encode(
+        {"sub": sub, "iat": iat, "exp": now + 3600}, TEST_AUTH_SECRET, algorithm="HS256"
+    )
+    return Request({"type": "http", "headers": [(b"authorization", f"Bearer {token}".encode())]})
+
+
+class _FakeSessionFactory:
+    """Stands in for AsyncSessionLocal; counts sessions and serves one user row."""
+
+    def __init__(self, rows: dict) -> None:
+        self.rows = rows
+        self.opened = 0
+
+    def __call__(self):
+        factory = self
+
+        class _Session:
+            async def __aenter__(self):
+                factory.opened += 1
+                return self
+
+            async def __aexit__(self, *exc):
+                return False
+
+            async def execute(self, statement):
+                (wanted,) = statement.compile().params.values()
+                row = factory.rows.get(wanted)
+                return SimpleNamespace(first=lambda: row)
+
+        return _Session()
+
+
+@pytest.fixture
+def principal_env(monkeypatch):
+    user_id = uuid.uuid4()
+    sessions = _FakeSessionFactory(
+        {user_id: SimpleNamespace(id=user_id, email="reader@example.com", plan="plus")}
+    )
+    cache = UserPrincipalCache(max_entries=100, ttl_seconds=60)
+    monkeypatch.setattr(deps_module.settings, "AUTH_SECRET", TEST_AUTH_SECRET)
+    monkeypatch.setattr(deps_module, "AsyncSessionLocal", sessions)
+    monkeypatch.setattr(deps_module, "user_principal_cache", cache)
+    return SimpleNamespace(user_id=user_id, sessions=sessions, cache=cache)
+
+
+@pytest.mark.asyncio
+async def test_principal_is_loaded_once_per_token(principal_env):
+    env = principal_env
+    request = _request(str(env.user_id), iat=1_000)
+
+    first = await deps_module.get_current_principal_optional(request)
+    second = await deps_module.get_current_principal_optional(request)
+
+    assert first == UserPrincipal(env.user_id, "reader@example.com", "plus")
+    assert second is first
+    assert env.sessions.opened == 1
+    assert env.cache.stats()["hits"] == 1
+
+    # A re-issued token (new iat) never reuses the old entry.
+    await deps_module.get_current_principal_optional(_request(str(env.user_id), iat=2_000))
+    assert env.sessions.opened == 2
+
+
+@pytest.mark.asyncio
+async def test_invalidation_reloads_plan_change(principal_env):
+    env = principal_env
+    request = _request(str(env.user_id), iat=1_000)
+    await deps_module.get_current_principal_optional(request)
+
+    env.sessions.rows[env.user_id].plan = "pro"
+    env.cache.invalidate(env.user_id)
+
+    assert (await deps_module.get_current_principal_optional(request)).plan == "pro"
+    assert env.sessions.opened == 2
+
+
+@pytest.mark.asyncio
+async def test_guests_unknown_users_and_bad_tokens_resolve_to_none(principal_env):
+    env = principal_env
+    guest = Request({"type": "http", "headers": []})
+    forged = Request({"type": "http", "headers": [(b"authorization", b"Bearer not-a-jwt")]})
+
+    assert await deps_module.get_current_principal_optional(guest) is None
+    assert await deps_module.get_current_principal_optional(forged) is None
+    assert await deps_module.get_current_principal_optional(_request(str(uuid.uuid4()), iat=1)) is None
+    assert env.sessions.opened == 1  # only the unknown user reached the database
+    assert env.cache.stats()["entries"] == 0
+
+    with pytest.raises(HTTPException) as exc:
+        await deps_module.require_principal(None)
+    assert exc.value.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_full_user_dependency_warms_principal_cache(principal_env):
+    env = principal_env
+    user = SimpleNamespace(id=env.user_id, email="reader@example.com", plan="free")
+
+    class _Db:
+        async def get(self, model, user_id):
+            assert user_id == env.user_id
+            return user
+
+    request = _request(str(env.user_id), iat=1_000)
+    assert await deps_module.get_current_user_optional(request, _Db()) is user
+
+    principal = await deps_module.get_current_principal_optional(request)
+    assert principal == UserPrincipal(env.user_id, "reader@example.com", "free")
+    assert env.sessions.opened == 0
+
+
+def test_load_racing_an_invalidation_is_not_stored():
+    cache = UserPrincipalCache(max_entries=10, ttl_seconds=60)
+    user_id = uuid.uuid4()
+    key = (str(user_id), 1)
+
+    generation = cache.generation  # load starts...
+    cache.invalidate(user_id)  # ...the plan changes and commits...
+    cache.put(key, UserPrincipal(user_id, "a@example.com", "free"), generation)  # ...stale row lands
+
+    assert cache.get(key) is None
+
+
+def test_ttl_and_capacity(monkeypatch):
+    from app.core import principal_cache as module
+
+    clock = [100.0]
+    monkeypatch.setattr(module.time, "monotonic", lambda: clock[0])
+    cache = UserPrincipalCache(max_entries=2, ttl_seconds=60)
+    principals = [UserPrincipal(uuid.uuid4(), f"u{i}@example.com", "free") for i in range(3)]
+    for principal in principals:
+        cache.put((str(principal.id), 1), principal, cache.generation)
+
+    assert cache.stats()["entries"] == 2
+    assert cache.get((str(principals[0].id), 1)) is None  # evicted, least recent
+    assert cache.get((str(principals[2].id), 1)) is principals[2]
+
+    clock[0] += 61
+    assert cache.get((str(principals[2].id), 1)) is None
+
+    disabled = UserPrincipalCache(max_entries=2, ttl_seconds=0)
+    disabled.put((str(principals[0].id), 1), principals[0], disabled.generation)
+    assert disabled.get((str(principals[0].id), 1)) is None
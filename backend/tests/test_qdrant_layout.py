@@ -0,0 +1,139 @@
+"""Qdrant collection layout from settings: create params, the tenant index,
+in-place migration, rebuild copy, and search params."""
+from __future__ import annotations
+
+import importlib.util
+import sys
+import uuid
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from qdrant_client import QdrantClient
+from qdrant_client.models import Disabled, PointStruct, ScalarType, VectorParams
+
+from app.services import embedding_service as embedding_module
+from app.services.embedding_service import EmbeddingService
+
+
+class _RecordingClient:
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, dict]] = []
+
+    def __getattr__(self, name):
+        def record(**kwargs):
+            self.calls.append((name, kwargs))
+            if name == "get_collections":
+                return SimpleNamespace(collections=[])
+
+        return record
+
+
+@pytest.fixture
+def service(monkeypatch):
+    service = EmbeddingService()
+    service.dim = 8
+    client = _RecordingClient()
+    monkeypatch.setattr(service, "get_qdrant_client", lambda: client)
+    monkeypatch.setattr(embedding_module.settings, "QDRANT_COLLECTION", "chunks")
+    return service, client
+
+
+def test_new_collection_gets_configured_layout_and_tenant_index(service):
+    service, client = service
+
+    service.ensure_collection()
+
+    (create, create_kwargs), (index, index_kwargs) = client.calls[1:]
+    assert (create, index) == ("create_collection", "create_payload_index")
+    assert create_kwargs["vectors_config"].on_disk is True
+    assert create_kwargs["vectors_config"].size == 8
+    hnsw = create_kwargs["hnsw_config"]
+    assert (hnsw.m, hnsw.payload_m) == (0, 16)
+    assert create_kwargs["quantization_config"].scalar.type == ScalarType.INT8
+    assert create_kwargs["quantization_config"].scalar.always_ram is True
+    assert index_kwargs["field_name"] == "document_id"
+    assert index_kwargs["field_schema"].is_tenant is True
+
+
+def test_layout_follows_settings(service, monkeypatch):
+    service, _ = service
+    monkeypatch.setattr(embedding_module.settings, "QDRANT_QUANTIZATION", "none")
+    monkeypatch.setattr(embedding_module.settings, "QDRANT_ON_DISK_VECTORS", False)
+    monkeypatch.setattr(embedding_module.settings, "QDRANT_HNSW_M", 16)
+    monkeypatch.setattr(embedding_module.settings, "QDRANT_HNSW_EF", 0)
+
+    params = service.collection_params()
+
+    assert params["quantization_config"] is None
+    assert params["vectors_config"].on_disk is False
+    assert params["hnsw_config"].m == 16
+    assert service.search_params() is None
+
+    monkeypatch.setattr(embedding_module.settings, "QDRANT_QUANTIZATION", "binary")
+    with pytest.raises(RuntimeError):
+        service.collection_params()
+
+
+def test_search_params_rescore_quantized_candidates(monkeypatch):
+    monkeypatch.setattr(embedding_module.settings, "QDRANT_HNSW_EF", 96)
+
+    params = EmbeddingService.search_params()
+
+    assert params.hnsw_ef == 96
+    assert params.quantization.rescore is True
+    assert params.quantization.oversampling == 2.0
+
+
+def test_in_place_migration_recreates_index_before_updating_collection(service, monkeypatch):
+    service, client = service
+    monkeypatch.setattr(embedding_module.settings, "QDRANT_QUANTIZATION", "none")
+
+    service.apply_collection_config()
+
+    # The tenant index must exist before m=0 drops the global HNSW graph.
+    assert [name for name, _ in client.calls] == [
+        "delete_payload_index", "create_payload_index", "update_collection",
+    ]
+    assert client.calls[1][1]["field_schema"].is_tenant is True
+    update = client.calls[2][1]
+    assert update["collection_name"] == "chunks"
+    assert update["vectors_config"][""].on_disk is True
+    assert update["quantization_config"] == Disabled.DISABLED  # turns existing quantization off
+
+
+def test_rebuild_copies_every_point(monkeypatch):
+    client = QdrantClient(":memory:")
+    client.create_collection("old", vectors_config=VectorParams(size=4, distance="Cosine"))
+    points = [
+        PointStruct(id=str(uuid.uuid4()), vector=[1.0, i, 0.0, 0.5], payload={"document_id": f"d{i % 3}"})
+        for i in range(25)
+    ]
+    client.upsert("old", points)
+    service = EmbeddingService()
+    service.dim = 4
+    monkeypatch.setattr(service, "get_qdrant_client", lambda: client)
+
+    assert service.copy_collection("old", "new", batch_size=10) == 25
+    assert service.copy_collection("old", "new", batch_size=10) == 25  # re-runnable
+
+    assert client.count("new").count == 25
+    copied = client.retrieve("new", [points[7].id], with_payload=True, with_vectors=True)[0]
+    assert copied.payload == {"document_id": "d1"}
+    assert copied.vector == pytest.approx(client.retrieve("old", [points[7].id], with_vectors=True)[0].vector)
+
+
+def test_migration_script_never_defaults_to_in_place(monkeypatch):
+    script = Path(__file__).resolve().parents[1] / "scripts" / "qdrant_migrate_collection.py"
+    spec = importlib.util.spec_from_file_location("qdrant_migrate_collection", script)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    monkeypatch.setattr(
+        module.embedding_service, "apply_collection_config",
+        lambda *_a, **_k: pytest.fail("updated the live collection without --in-place"),
+    )
+    monkeypatch.setattr(sys, "argv", ["qdrant_migrate_collection.py", "--wait"])
+
+    with pytest.raises(SystemExit) as exc:
+        module.main()
+    assert exc.value.code == 2
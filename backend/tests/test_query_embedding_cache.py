@@ -0,0 +1,128 @@
+"""Query-vector LRU + single-flight in front of the embedding provider."""
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.services import query_embedding_cache as qec_mod
+from app.services.query_embedding_cache import QueryEmbeddingCache
+
+
+@pytest.fixture
+def provider(monkeypatch):
+    calls: list[str] = []
+    lock = threading.Lock()
+
+    def _embed(texts):
+        time.sleep(0.02)
+        with lock:
+            calls.extend(texts)
+        return [[float(len(t))] for t in texts]
+
+    async def _aembed(texts):
+        # Yield without a timer: one test freezes time.monotonic, which the
+        # event loop's clock shares.
+        for _ in range(3):
+            await asyncio.sleep(0)
+        with lock:
+            calls.extend(texts)
+        return [[float(len(t))] for t in texts]
+
+    monkeypatch.setattr(qec_mod.embedding_service, "embed_texts", _embed)
+    monkeypatch.setattr(qec_mod.embedding_service, "aembed_texts", _aembed)
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_repeat_query_is_served_from_memory(provider):
+    cache = QueryEmbeddingCache(max_entries=8, ttl_seconds=60)
+
+    first = await cache.embed("What is the revenue?")
+    second = await cache.embed("What is  the revenue? ")
+
+    assert first == second
+    assert provider == ["What is the revenue?"]
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_queries_share_one_provider_call(provider):
+    cache = QueryEmbeddingCache(max_entries=8, ttl_seconds=60)
+
+    results = await asyncio.gather(*(cache.embed("summarize") for _ in range(5)))
+
+    assert provider == ["summarize"]
+    assert all(r == results[0] for r in results)
+    assert cache.coalesced == 4
+
+
+@pytest.mark.asyncio
+async def test_cancelled_leader_does_not_cancel_followers(provider):
+    cache = QueryEmbeddingCache(max_entries=8, ttl_seconds=60)
+
+    leader = asyncio.create_task(cache.embed("q"))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(cache.embed("q"))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await follower == [1.0]
+    assert provider == ["q"]
+
+
+@pytest.mark.asyncio
+async def test_ttl_expiry_and_lru_eviction(provider, monkeypatch):
+    cache = QueryEmbeddingCache(max_entries=2, ttl_seconds=10)
+    now = {"t": 1000.0}
+    monkeypatch.setattr(qec_mod.time, "monotonic", lambda: now["t"])
+
+    await cache.embed("a")
+    await cache.embed("b")
+    await cache.embed("a")  # hit; 'b' becomes least recent
+    await cache.embed("c")  # evicts 'b'
+    await cache.embed("b")
+    assert provider == ["a", "b", "c", "b"]
+
+    now["t"] += 11
+    await cache.embed("c")
+    assert provider[-1] == "c"
+
+
+@pytest.mark.asyncio
+async def test_provider_failure_propagates_and_is_not_cached(monkeypatch):
+    cache = QueryEmbeddingCache(max_entries=8, ttl_seconds=60)
+    attempts = {"n": 0}
+
+    async def _flaky(texts):
+        attempts["n"] += 1
+        if attempts["n"] == 1:
+            raise RuntimeError("provider down")
+        return [[0.5] for _ in texts]
+
+    monkeypatch.setattr(qec_mod.embedding_service, "aembed_texts", _flaky)
+
+    with pytest.raises(RuntimeError, match="provider down"):
+        await cache.embed("q")
+    assert await cache.embed("q") == [0.5]
+
+
+def test_sync_path_shares_the_lru(provider):
+    cache = QueryEmbeddingCache(max_entries=8, ttl_seconds=60)
+
+    assert cache.embed_sync("diff query") == cache.embed_sync("diff query")
+    assert provider == ["diff query"]
+
+
+def test_batch_sync_embeds_only_misses_in_one_call(provider):
+    cache = QueryEmbeddingCache(max_entries=8, ttl_seconds=60)
+    cache.embed_sync("cached")
+
+    vectors = cache.embed_many_sync(["cached", "terms", "fees", "terms "])
+
+    assert vectors == [[6.0], [5.0], [4.0], [5.0]]
+    assert provider == ["cached", "terms", "fees"]
+    assert cache.embed_many_sync(["fees", "terms"]) == [[4.0], [5.0]]
+    assert len(provider) == 3
@@ -1,5 +1,12 @@
 from __future__ import annotations
 
+import random
+import threading
+import time
+import uuid
+from types import SimpleNamespace
+
+from app.services import question_template_service as qts
 from app.services.question_template_service import (
     MAX_TEMPLATE_QUESTIONS,
     estimated_template_cost,
@@ -58,3 +65,85 @@ def test_render_question_template_markdown_groups_by_document() -> None:
     assert content.startswith("# Checklist")
     assert "## a.pdf" in content
     assert "Sources: [1]" in content
+
+
+def test_cells_run_concurrently_and_keep_document_question_order(monkeypatch) -> None:
+    docs = [SimpleNamespace(id=uuid.uuid4(), filename=f"doc{i}.pdf") for i in range(3)]
+    questions = ["Term?", "Parties?", "Governing law?", "Fees?"]
+    calls = {"embed": [], "elements": [], "retrieve": [], "fallback": [], "active": 0, "peak": 0}
+    lock = threading.Lock()
+
+    def embed_texts(texts):
+        calls["embed"].append(list(texts))
+        return [[float(i)] for i, _ in enumerate(texts)]
+
+    def elements(_db, document_id, max_chunks):
+        calls["elements"].append(document_id)
+        return []
+
+    def retrieve(_db, document_id, queries, top_k, *, query_vectors):
+        calls["retrieve"].append(document_id)
+        assert queries == questions
+        assert query_vectors == [[float(i)] for i in range(len(questions))]
+        ranked = []
+        for question in queries:
+            chunk = SimpleNamespace(
+                id=uuid.uuid4(), document_id=document_id, page_start=1, page_end=1, bboxes=[], section_title=None,
+                text="x",
+            )
+            missing = document_id == docs[1].id and question == "Fees?"
+            ranked.append([] if missing else [(chunk, 0.9)])
+        return ranked
+
+    def call_llm(template, chunks, _locale, _domain):
+        with lock:
+            calls["active"] += 1
+            calls["peak"] = max(calls["peak"], calls["active"])
+        time.sleep(random.uniform(0.001, 0.02))
+        with lock:
+            calls["active"] -= 1
+        return {"answer": f"{chunks[0][0].document_id}:{template.description}", "source_refs": [1]}, 10, 2
+
+    monkeypatch.setattr(qts.embedding_service, "embed_texts", embed_texts)
+    monkeypatch.setattr(qts, "get_element_aware_chunks", elements)
+    monkeypatch.setattr(qts, "retrieve_by_queries", retrieve)
+    monkeypatch.setattr(qts, "first_chunks", lambda _db, document_id, _n: calls["fallback"].append(document_id) or [])
+    monkeypatch.setattr(qts, "_call_llm", call_llm)
+    monkeypatch.setattr(qts.settings, "QUESTION_TEMPLATE_CONCURRENCY", 3)
+    db = SimpleNamespace(add=lambda _obj: None, commit=lambda: None)
+    job = SimpleNamespace(metadata_json={"pre_debited": 180})
+
+    cells = qts._answer_cells(db, job, docs, questions, None)
+
+    assert calls["embed"] == [questions]
+    assert calls["elements"] == calls["retrieve"] == [doc.id for doc in docs]
+    assert calls["fallback"] == [docs[1].id]
+    assert 1 < calls["peak"] <= 3
+    answers = [cells[key] for key in sorted(cells)]
+    assert [(a["document_filename"], a["question_index"]) for a in answers] == [
+        (doc.filename, qi) for doc in docs for qi in range(len(questions))
+    ]
+    skipped = answers[len(questions) + 3]
+    assert skipped["answer"] == "" and skipped["_prompt_tokens"] == 0
+    assert answers[0]["answer"] == f"{docs[0].id}:Term?"
+    assert answers[0]["citations"][0]["document_filename"] == "doc0.pdf"
+
+
+def test_progress_lists_answered_cells_in_final_order_without_citations() -> None:
+    committed = []
+    db = SimpleNamespace(add=lambda _obj: None, commit=lambda: committed.append(True))
+    job = SimpleNamespace(metadata_json={"pre_debited": 30, "predebit_ledger_id": "l"})
+    cells = {
+        (1, 0): {"question_index": 0, "answer": "b", "citations": [{}], "_prompt_tokens": 1},
+        (0, 1): {"question_index": 1, "answer": "a", "citations": [{}], "_prompt_tokens": 1},
+    }
+
+    qts._save_progress(db, job, cells, total=4)
+
+    assert job.metadata_json["pre_debited"] == 30
+    assert job.metadata_json["progress"] == {
+        "cells_done": 2,
+        "cells_total": 4,
+        "answers": [{"question_index": 1, "answer": "a"}, {"question_index": 0, "answer": "b"}],
+    }
+    assert committed == [True]
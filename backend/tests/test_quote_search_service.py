@@ -40,6 +40,17 @@ from app.services.quote_search_service import (  # noqa: E402
 DOCUMENT_ID = uuid.uuid4()
 
 
+@pytest.fixture(autouse=True)
+def _no_cached_document_data(monkeypatch):
+    """The fake DBs below only model chunk/page queries; documents here have
+    no parse-time normalized texts (verification normalizes on the fly) and
+    never hit the chunk cache (chunks are read through the fake DB)."""
+    monkeypatch.setattr(qss.normalized_text_cache, "get", AsyncMock(return_value=None))
+    monkeypatch.setattr(qss.chunk_cache, "get", AsyncMock(return_value=None))
+    monkeypatch.setattr(qss.chunk_cache, "get_many", AsyncMock(return_value={}))
+    monkeypatch.setattr(qss.chunk_cache, "resident", AsyncMock(return_value={}))
+
+
 def _document(**overrides):
     base = dict(id=DOCUMENT_ID, page_count=10, text_quality=0.95, parse_method="text")
     base.update(overrides)
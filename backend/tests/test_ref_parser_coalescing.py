@@ -0,0 +1,153 @@
+"""RefParserFSM coalesces plain text into one token event per provider delta
+(or per held run) while keeping the per-character parser's text, citation
+char_offset and recent_claim exactly."""
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+import uuid
+
+import pytest
+
+from app.services import chat_service
+from app.services.chat_service import RefParserFSM, _ChunkInfo, current_claim, sse
+
+
+class _PerCharacterParser:
+    """The pre-coalescing parser: one token event per character."""
+
+    def __init__(self, chunk_map) -> None:
+        self.chunk_map = chunk_map
+        self.buffer = ""
+        self.char_offset = 0
+        self.state = "TEXT"
+        self.recent_claim = ""
+
+    def feed(self, token):
+        events = []
+        for ch in token:
+            if self.state == "TEXT":
+                if ch == "[":
+                    self.state, self.buffer = "MAYBE_REF", "["
+                else:
+                    events.append(sse("token", {"text": ch}))
+                    self.char_offset += 1
+                    self.recent_claim = (self.recent_claim + ch)[-RefParserFSM._CLAIM_WINDOW:]
+            else:
+                self.buffer += ch
+                if ch == "]":
+                    inner = self.buffer[1:-1]
+                    if inner.isdigit() and int(inner) in self.chunk_map:
+                        events.append(sse("citation", {
+                            "ref": int(inner), "offset": self.char_offset, "claim": current_claim(self.recent_claim),
+                        }))
+                    else:
+                        events.append(sse("token", {"text": self.buffer}))
+                        self.char_offset += len(self.buffer)
+                    self.buffer, self.state = "", "TEXT"
+                elif len(self.buffer) > 8:
+                    events.append(sse("token", {"text": self.buffer}))
+                    self.char_offset += len(self.buffer)
+                    self.buffer, self.state = "", "TEXT"
+        return events
+
+    def flush(self):
+        events = [sse("token", {"text": self.buffer})] if self.buffer else []
+        self.buffer = ""
+        return events
+
+
+@pytest.fixture(autouse=True)
+def _plain_citations(monkeypatch):
+    monkeypatch.setattr(
+        chat_service, "_citation_payload",
+        lambda ref, _chunk, offset, claim: {"ref": ref, "offset": offset, "claim": claim},
+    )
+
+
+def _chunk_map():
+    chunk = _ChunkInfo(id=uuid.uuid4(), page_start=1, page_end=1, bboxes=[], text="Revenue grew.")
+    return {1: chunk, 2: chunk}
+
+
+def _run(parser, deltas):
+    events = [ev for delta in deltas for ev in parser.feed(delta)] + parser.flush()
+    text = "".join(ev["data"]["text"] for ev in events if ev["event"] == "token")
+    citations = [ev["data"] for ev in events if ev["event"] == "citation"]
+    return events, text, citations
+
+
+_ANSWER = (
+    "Revenue grew 12% [1]. Costs [see note] held [2][1] steady; array[0] and [99] are not refs. "
+    "A long bracket [abcdefghijk] falls back, and so does a dangling one ["
+)
+
+
+@pytest.mark.parametrize("seed", range(25))
+def test_same_text_offsets_and_claims_as_per_character_parser(seed):
+    rng = random.Random(seed)
+    cuts = sorted(rng.sample(range(1, len(_ANSWER)), rng.randint(1, 40)))
+    deltas = [_ANSWER[a:b] for a, b in zip([0, *cuts], [*cuts, len(_ANSWER)])]
+
+    _, want_text, want_citations = _run(_PerCharacterParser(_chunk_map()), deltas)
+    events, text, citations = _run(RefParserFSM(_chunk_map()), deltas)
+
+    assert text == want_text
+    assert citations == want_citations
+    # At most one token event per delta plus one per citation (and the flush).
+    assert sum(ev["event"] == "token" for ev in events) <= len(deltas) + len(citations) + 1
+
+
+def test_text_before_a_citation_is_flushed_ahead_of_it():
+    fsm = RefParserFSM(_chunk_map())
+
+    events = fsm.feed("Revenue grew[1] again")
+
+    assert [(ev["event"], ev["data"].get("text")) for ev in events] == [
+        ("token", "Revenue grew"), ("citation", None), ("token", " again"),
+    ]
+    assert events[1]["data"]["offset"] == len("Revenue grew")
+
+
+def test_short_deltas_are_held_until_size_or_age_threshold(monkeypatch):
+    now = {"t": 10.0}
+    monkeypatch.setattr(chat_service.time, "monotonic", lambda: now["t"])
+    fsm = RefParserFSM(_chunk_map(), coalesce_chars=8, coalesce_ms=40)
+
+    assert [ev["data"]["text"] for ev in fsm.feed("The")] == ["The"]  # first token is never held
+    assert fsm.feed(" rev") == []
+    assert fsm.held_text == " rev" and fsm.char_offset == 7
+    assert [ev["data"]["text"] for ev in fsm.feed("en")] == []
+    assert [ev["data"]["text"] for ev in fsm.feed("ue grew")] == [" revenue grew"]
+
+    assert fsm.feed(" by") == []
+    now["t"] += 0.05
+    assert [ev["data"]["text"] for ev in fsm.feed(" 12")] == [" by 12"]
+
+    assert fsm.feed("%") == []
+    assert [ev["data"]["text"] for ev in fsm.flush()] == ["%"]
+    assert fsm.held_text == ""
+
+
+@pytest.mark.asyncio
+async def test_held_text_is_flushed_during_a_provider_pause():
+    fsm = RefParserFSM(_chunk_map(), coalesce_chars=16, coalesce_ms=40)
+
+    async def provider():
+        yield "The"
+        yield " rev"
+        await asyncio.sleep(0.5)  # the model stalls mid-answer
+        yield "enue grew."
+
+    started = time.monotonic()
+    emitted: list[tuple[str, float]] = []
+    async for chunk in chat_service._deltas_with_flush_ticks(provider(), fsm):
+        events = fsm.tick() if chunk is None else fsm.feed(chunk)
+        emitted += [(ev["data"]["text"], time.monotonic() - started) for ev in events]
+    emitted += [(ev["data"]["text"], time.monotonic() - started) for ev in fsm.flush()]
+
+    assert [text for text, _ in emitted] == ["The", " rev", "enue grew."]
+    assert emitted[0][1] < 0.03
+    assert 0.03 <= emitted[1][1] < 0.3  # due after coalesce_ms, not when the stall ends
+    assert emitted[2][1] >= 0.5
@@ -0,0 +1,123 @@
+"""search_per_document: one grouped Qdrant query gives every document its
+quota even when a few dense documents dominate the collection ranking, and
+all hits are hydrated with a single chunk query."""
+from __future__ import annotations
+
+import uuid
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+from qdrant_client import QdrantClient
+from qdrant_client.models import Distance, PointStruct, VectorParams
+
+from app.services import retrieval_service as retrieval_module
+from app.services.retrieval_service import retrieval_service
+
+_QUERY = [1.0, 0.0, 0.0, 0.0]
+
+
+class _Rows:
+    def __init__(self, values):
+        self._values = values
+
+    def scalars(self):
+        return self._values
+
+
+def _collection(document_ids, dense_ids):
+    """Dense documents sit right on the query vector; the rest are far off it."""
+    client = QdrantClient(":memory:")
+    client.create_collection("chunks", vectors_config=VectorParams(size=4, distance=Distance.COSINE))
+    chunks, points = [], []
+    for document_id in document_ids:
+        near = document_id in dense_ids
+        for index in range(12 if near else 4):
+            chunk_id = uuid.uuid4()
+            vector = [1.0, 0.02 * index, 0.0, 0.0] if near else [0.3, 1.0, 0.1 * index, 0.0]
+            points.append(PointStruct(id=str(chunk_id), vector=vector, payload={"document_id": str(document_id)}))
+            chunks.append(
+                SimpleNamespace(
+                    id=chunk_id,
+                    document_id=document_id,
+                    chunk_index=index,
+                    text=f"Evidence {index} " + "x" * 220,
+                    page_start=index + 1,
+                    page_end=index + 1,
+                    bboxes=[],
+                    section_title=None,
+                )
+            )
+    client.upsert("chunks", points)
+    return client, chunks
+
+
+@pytest.fixture
+def collection(monkeypatch):
+    document_ids = [uuid.uuid4() for _ in range(10)]
+    client, chunks = _collection(document_ids, set(document_ids[:2]))
+    client.query_points_groups = _counting(client.query_points_groups)
+    monkeypatch.setattr(retrieval_module.settings, "QDRANT_COLLECTION", "chunks")
+    monkeypatch.setattr(retrieval_module.embedding_service, "get_qdrant_client", lambda: client)
+    monkeypatch.setattr(retrieval_module.query_embedding_cache, "embed", AsyncMock(return_value=_QUERY))
+    monkeypatch.setattr("app.services.chunk_cache.chunk_cache.resident", AsyncMock(return_value={}))
+    db = SimpleNamespace(execute=AsyncMock(return_value=_Rows(chunks)))
+    return SimpleNamespace(document_ids=document_ids, client=client, db=db)
+
+
+def _counting(fn):
+    def wrapper(*args, **kwargs):
+        wrapper.calls += 1
+        return fn(*args, **kwargs)
+
+    wrapper.calls = 0
+    return wrapper
+
+
+@pytest.mark.asyncio
+async def test_every_document_gets_its_quota_in_one_round_trip(collection):
+    results = await retrieval_service.search_per_document("q", collection.document_ids, 2, collection.db)
+
+    assert set(results) == set(collection.document_ids)
+    assert all(len(items) == 2 for items in results.values())
+    assert collection.client.query_points_groups.calls == 1
+    assert collection.db.execute.await_count == 1  # one IN (...) hydration for all documents
+    for items in results.values():
+        assert items[0]["score"] >= items[1]["score"]
+        assert "document_id" not in items[0]  # same payload shape as `search`
+
+
+def test_collection_ranking_alone_is_crowded_out(collection):
+    hits = collection.client.query_points("chunks", query=_QUERY, limit=24).points
+    covered = {p.payload["document_id"] for p in hits}
+
+    assert len(covered) < len(collection.document_ids)  # what the grouped query fixes
+
+
+@pytest.mark.asyncio
+async def test_micro_chunks_are_filtered_per_document(collection):
+    first = collection.document_ids[0]
+    for row in collection.db.execute.return_value.scalars():
+        if row.document_id == first and row.chunk_index == 0:
+            row.text = "p. 1"
+
+    results = await retrieval_service.search_per_document("q", [first], 2, collection.db)
+
+    assert [item["page"] for item in results[first]] == [2, 3]
+
+
+@pytest.mark.asyncio
+async def test_over_fetch_matches_search_when_top_hits_are_micro_chunks(collection):
+    first = collection.document_ids[0]
+    for row in collection.db.execute.return_value.scalars():
+        if row.document_id == first and row.chunk_index < 8:
+            row.text = f"p. {row.chunk_index + 1}"
+
+    results = await retrieval_service.search_per_document("q", [first], 2, collection.db)
+
+    assert [item["page"] for item in results[first]] == [9, 10]
+
+
+@pytest.mark.asyncio
+async def test_no_documents():
+    assert await retrieval_service.search_per_document("q", [], 2, object()) == {}
@@ -5,7 +5,9 @@ from types import SimpleNamespace
 from unittest.mock import AsyncMock
 
 import pytest
+from sqlalchemy.dialects import postgresql
 
+from app.services import retrieval_service as retrieval_module
 from app.services.rag_evaluator_service import extract_query_terms
 from app.services.retrieval_service import (
     _lexical_score,
@@ -105,8 +107,8 @@ async def test_semantic_search_backfills_short_chunks_when_all_hits_filtered(mon
     )
 
     monkeypatch.setattr(
-        "app.services.retrieval_service.embedding_service.embed_texts",
-        lambda _texts: [[0.1, 0.2, 0.3]],
+        "app.services.retrieval_service.embedding_service.aembed_texts",
+        AsyncMock(return_value=[[0.1, 0.2, 0.3]]),
     )
     monkeypatch.setattr(
         "app.services.retrieval_service.embedding_service.get_qdrant_client",
@@ -116,6 +118,7 @@ async def test_semantic_search_backfills_short_chunks_when_all_hits_filtered(mon
             )
         ),
     )
+    monkeypatch.setattr("app.services.chunk_cache.chunk_cache.resident", AsyncMock(return_value={}))
     db = SimpleNamespace(execute=AsyncMock(return_value=_Rows([short_chunk])))
 
     payloads = await retrieval_service.search("Example Domain documentation", document_id, 8, db)
@@ -159,6 +162,84 @@ async def test_table_search_multi_constrains_representative_chunks_to_table_page
     assert "chunks.page_end" in second_statement
 
 
+def _lexical_chunk(text: str, page: int, section_title: str | None = None):
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        document_id=uuid.uuid4(),
+        text=text,
+        page_start=page,
+        page_end=page,
+        bboxes=[],
+        section_title=section_title,
+    )
+
+
+async def _run_lexical(monkeypatch, mode: str, query: str, rows: list):
+    monkeypatch.setattr(retrieval_module.settings, "LEXICAL_SEARCH_MODE", mode)
+    captured = []
+
+    async def execute(statement):
+        captured.append(statement)
+        return _Rows(list(rows))
+
+    db = SimpleNamespace(execute=AsyncMock(side_effect=execute))
+    payloads = await retrieval_service.lexical_search(query, "doc-id", 3, db, min_text_len=20)
+    return payloads, captured[0]
+
+
+@pytest.mark.asyncio
+async def test_fts_mode_matches_through_tsvector_and_keeps_weighted_order(monkeypatch) -> None:
+    _payloads, statement = await _run_lexical(monkeypatch, "fts", "Find MetaX 2028 revenue", [])
+
+    sql = str(statement.compile(dialect=postgresql.dialect()))
+    assert "search_tsv @@" in sql
+    assert "phraseto_tsquery" in sql
+    assert "ILIKE" not in sql.upper()
+    order_by = list(statement._order_by_clauses)
+    assert "CASE" in str(order_by[0]).upper()
+
+
+@pytest.mark.asyncio
+async def test_fts_mode_keeps_ilike_for_cjk_terms(monkeypatch) -> None:
+    _payloads, statement = await _run_lexical(monkeypatch, "fts", "MetaX 收入", [])
+
+    sql = str(statement.compile(dialect=postgresql.dialect()))
+    assert "search_tsv @@" in sql
+    assert "ILIKE" in sql.upper()
+
+
+@pytest.mark.asyncio
+async def test_fts_and_ilike_modes_rank_candidates_identically(monkeypatch) -> None:
+    rows = [
+        _lexical_chunk("General operating obligations of the agreement are listed here.", 1),
+        _lexical_chunk("The agreement contains a non-compete clause in section 8.", 9),
+        _lexical_chunk("A clause about notices; the agreement is governed by Delaware law.", 4),
+        _lexical_chunk("Non-compete obligations survive termination.", 6, section_title="Clause 8"),
+    ]
+    query = "Does this agreement contain a non-compete clause?"
+
+    legacy, _ = await _run_lexical(monkeypatch, "ilike", query, rows)
+    fts, _ = await _run_lexical(monkeypatch, "fts", query, rows)
+
+    assert [p["chunk_id"] for p in fts] == [p["chunk_id"] for p in legacy]
+    assert [p["score"] for p in fts] == [p["score"] for p in legacy]
+    assert legacy[0]["chunk_id"] == rows[1].id
+
+
+@pytest.mark.asyncio
+async def test_bm25_mode_keeps_sql_rank_order_with_lexical_scores(monkeypatch) -> None:
+    rows = [
+        _lexical_chunk("Revenue grew in every region during the year under review.", 2),
+        _lexical_chunk("MetaX 2028 revenue is forecast at $42m.", 5),
+    ]
+
+    payloads, statement = await _run_lexical(monkeypatch, "bm25", "Find MetaX 2028 revenue", rows)
+
+    assert "ts_rank_cd" in str(list(statement._order_by_clauses)[0])
+    assert [p["chunk_id"] for p in payloads] == [rows[0].id, rows[1].id]
+    assert payloads[1]["score"] > payloads[0]["score"]
+
+
 def test_lexical_score_prefers_late_exact_hit_over_many_broad_hits() -> None:
     terms = extract_query_terms("Does this agreement contain a non-compete clause?").lexical_terms
     broad_score = _lexical_score("The agreement contains general operating obligations.", terms)
@@ -0,0 +1,168 @@
+"""SSE transport: frame encoding, write batching, heartbeats, and cancelling
+the source on stalled or disconnected clients."""
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+from fastapi import Depends, FastAPI
+
+from app.core.sse import SSEStream, encode_event, sse_response
+
+
+def _parse(body: bytes) -> list[tuple[str, dict]]:
+    out = []
+    for raw in body.decode("utf-8").split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in raw.splitlines() if not line.startswith(":"))
+        if lines:
+            out.append((lines["event"], json.loads(lines["data"])))
+    return out
+
+
+def test_encoding_round_trips_like_the_json_frames_it_replaces():
+    data = {"text": "Umsatz stieg um 12 % — 增长", "offset": 3, "bboxes": [{"x": 0.5}]}
+
+    frame = encode_event({"event": "token", "data": data})
+
+    assert frame.startswith(b"event: token\ndata: ") and frame.endswith(b"\n\n")
+    assert "增长".encode() in frame  # not \\u-escaped
+    assert _parse(frame) == [("token", data)]
+    assert _parse(encode_event({"event": "done", "data": {1: None}})) == [("done", {"1": None})]
+
+
+@pytest.mark.asyncio
+async def test_burst_of_events_goes_out_as_one_write():
+    async def source():
+        for i in range(5):
+            yield {"event": "token", "data": {"text": str(i)}}
+
+    writes = [chunk async for chunk in SSEStream(source(), heartbeat_seconds=5)]
+
+    assert len(writes) == 1
+    assert [d["text"] for _, d in _parse(writes[0])] == ["0", "1", "2", "3", "4"]
+
+
+@pytest.mark.asyncio
+async def test_quiet_stream_gets_heartbeat_comments():
+    async def source():
+        await asyncio.sleep(0.05)
+        yield {"event": "done", "data": {}}
+
+    writes = [chunk async for chunk in SSEStream(source(), heartbeat_seconds=0.01)]
+
+    assert writes[0] == b": ping\n\n"
+    assert _parse(b"".join(writes)) == [("done", {})]
+
+
+@pytest.mark.asyncio
+async def test_stalled_client_cancels_the_source_at_its_yield():
+    seen: list[str] = []
+
+    async def source():
+        try:
+            for i in range(1000):
+                yield {"event": "token", "data": {"text": "x" * 100, "i": i}}
+        except asyncio.CancelledError:
+            seen.append("cancelled")
+            raise
+        finally:
+            seen.append("finally")
+
+    writes = SSEStream(source(), heartbeat_seconds=5, buffer_max_bytes=1024, stall_timeout_seconds=0.05)
+    it = writes.__aiter__()
+    first = await it.__anext__()
+    await asyncio.sleep(0.2)  # the client stops reading
+
+    rest = [chunk async for chunk in it]
+
+    assert seen == ["cancelled", "finally"]
+    assert rest == []  # buffered frames are dropped, the response ends
+    assert _parse(first)[0][1]["i"] == 0
+
+
+@pytest.mark.asyncio
+async def test_disconnect_cancels_the_source_inside_its_await():
+    seen: list[str] = []
+    started = asyncio.Event()
+
+    async def source():
+        yield {"event": "token", "data": {"text": "a"}}
+        try:
+            started.set()
+            await asyncio.sleep(30)  # waiting on the LLM
+        except asyncio.CancelledError:
+            seen.append("cancelled")
+            raise
+        yield {"event": "done", "data": {}}
+
+    it = SSEStream(source(), heartbeat_seconds=5).__aiter__()
+    await it.__anext__()
+    reader = asyncio.ensure_future(it.__anext__())
+    await started.wait()
+    reader.cancel()  # Starlette cancels the response task on http.disconnect
+    with pytest.raises(asyncio.CancelledError):
+        await reader
+    await it.aclose()
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+    assert seen == ["cancelled"]
+
+
+@pytest.mark.asyncio
+async def test_disconnect_waits_for_the_source_to_unwind_before_dependencies_close():
+    order: list[str] = []
+    streaming = asyncio.Event()
+
+    async def get_db():
+        yield "db"
+        order.append("db closed")
+
+    async def source(db):
+        try:
+            yield {"event": "token", "data": {"text": "a"}}
+            await asyncio.sleep(30)  # waiting on the LLM
+        finally:
+            await asyncio.sleep(0.05)  # cancel-path persist on the request's session
+            order.append("source finally")
+
+    app = FastAPI()
+
+    @app.get("/stream")
+    async def stream(db=Depends(get_db)):
+        return sse_response(source(db))
+
+    requests = [{"type": "http.request", "body": b"", "more_body": False}]
+
+    async def receive():
+        if requests:
+            return requests.pop()
+        await streaming.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.body" and message.get("body"):
+            streaming.set()
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": "/stream", "raw_path": b"/stream", "root_path": "",
+        "query_string": b"", "headers": [], "client": ("test", 1), "server": ("test", 80),
+    }
+    await asyncio.wait_for(app(scope, receive, send), timeout=5)
+
+    assert order == ["source finally", "db closed"]
+
+
+@pytest.mark.asyncio
+async def test_source_error_is_raised_after_buffered_frames():
+    async def source():
+        yield {"event": "token", "data": {"text": "partial"}}
+        raise RuntimeError("boom")
+
+    it = SSEStream(source(), heartbeat_seconds=5).__aiter__()
+
+    assert _parse(await it.__anext__()) == [("token", {"text": "partial"})]
+    with pytest.raises(RuntimeError, match="boom"):
+        await it.__anext__()
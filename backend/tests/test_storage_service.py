@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 import datetime
+import io
 
 import pytest
+from minio.error import S3Error
 
 from app.services import storage_service as storage_module
 
@@ -70,3 +72,53 @@ def test_upload_file_wraps_storage_transport_errors(monkeypatch: pytest.MonkeyPa
 
     with pytest.raises(storage_module.StorageUnavailableError):
         service.upload_file(b"hello", "documents/report.pdf", "application/pdf")
+
+
+def _service_with(monkeypatch: pytest.MonkeyPatch, fake_minio) -> storage_module.StorageService:
+    monkeypatch.setattr(storage_module, "Minio", fake_minio)
+    return storage_module.StorageService(
+        endpoint="minio-v2.railway.internal:9000",
+        access_key="access",
+        secret_key="secret",
+        bucket="bucket",
+        default_ttl=300,
+    )
+
+
+def test_upload_stream_hands_the_file_object_to_put_object(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: list[dict] = []
+
+    class FakeMinio:
+        def __init__(self, *_args, **_kwargs):
+            pass
+
+        def put_object(self, bucket, key, data, length, content_type, sse=None):
+            calls.append({"data": data, "length": length, "body": data.read(length)})
+
+    service = _service_with(monkeypatch, FakeMinio)
+    stream = io.BytesIO(b"%PDF-1.4 body")
+
+    service.upload_stream(stream, 13, "documents/report.pdf", "application/pdf")
+
+    assert calls == [{"data": stream, "length": 13, "body": b"%PDF-1.4 body"}]
+
+
+def test_upload_stream_rewinds_for_unencrypted_fallback(monkeypatch: pytest.MonkeyPatch) -> None:
+    bodies: list[bytes] = []
+
+    class FakeMinio:
+        def __init__(self, *_args, **_kwargs):
+            pass
+
+        def put_object(self, bucket, key, data, length, content_type, sse=None):
+            bodies.append(data.read(length))
+            if sse is not None:
+                raise S3Error("NotImplemented", "no KMS", "", "", "", None)
+
+    service = _service_with(monkeypatch, FakeMinio)
+    stream = io.BytesIO(b"header" + b"payload")
+    stream.seek(6)
+
+    service.upload_stream(stream, 7, "documents/report.pdf")
+
+    assert bodies == [b"payload", b"payload"]
@@ -0,0 +1,208 @@
+"""Streamed /text-content: NDJSON framing, page windowing, and page text
+identical to the buffered endpoint's in both the Page.content and the
+chunk-reconstruction modes."""
+from __future__ import annotations
+
+import json
+import sys
+import uuid
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi import HTTPException
+
+import app.api.documents as documents_module
+
+
+class _Stream:
+    def __init__(self, rows) -> None:
+        self._rows = rows
+
+    def __aiter__(self):
+        return self._gen()
+
+    async def _gen(self):
+        for row in self._rows:
+            yield row
+
+
+class _FakeDb:
+    """Answers the section-title query, the completeness aggregate and the
+    two streamed cursors from in-memory Page/Chunk fixtures, applying the
+    page window the statements carry."""
+
+    def __init__(self, pages, chunks) -> None:
+        self.pages = pages
+        self.chunks = chunks
+        self.streamed: list[str] = []
+
+    @staticmethod
+    def _window(stmt) -> tuple[int, int | None]:
+        params = stmt.compile().params
+        lower = [v for k, v in params.items() if k.startswith(("page_number_1", "page_end"))]
+        upper = [v for k, v in params.items() if k.startswith(("page_number_2", "page_start"))]
+        return (lower[0] if lower else 1), (upper[0] if upper else None)
+
+    async def execute(self, stmt):
+        sql = str(stmt)
+        if "count(" in sql:
+            blank = sum(1 for p in self.pages if not (p.content or "").strip())
+            numbers = [p.page_number for p in self.pages]
+            row = (len(numbers), min(numbers, default=None), max(numbers, default=None), blank)
+            return SimpleNamespace(one=lambda: row)
+        lo, hi = self._window(stmt)
+        rows = [
+            (c.section_title, c.page_start, c.page_end)
+            for c in sorted(self.chunks, key=lambda c: c.chunk_index)
+            if c.section_title is not None and c.page_end >= lo and (hi is None or c.page_start <= hi)
+        ]
+        return SimpleNamespace(all=lambda: rows)
+
+    async def stream(self, stmt):
+        lo, hi = self._window(stmt)
+        if "FROM pages" in str(stmt):
+            self.streamed.append("pages")
+            rows = [
+                (p.page_number, p.content) for p in sorted(self.pages, key=lambda p: p.page_number)
+                if p.page_number >= lo and (hi is None or p.page_number <= hi)
+            ]
+        else:
+            self.streamed.append("chunks")
+            rows = [
+                (c.text, c.page_start, c.page_end)
+                for c in sorted(self.chunks, key=lambda c: (c.page_start, c.chunk_index))
+                if c.page_end >= lo and (hi is None or c.page_start <= hi)
+            ]
+        return _Stream(rows)
+
+
+def _page(page_number: int, content: str | None):
+    return SimpleNamespace(page_number=page_number, content=content)
+
+
+def _chunk(index: int, text: str, page_start: int, page_end: int, section_title: str | None = None):
+    return SimpleNamespace(
+        chunk_index=index, text=text, page_start=page_start, page_end=page_end, section_title=section_title,
+    )
+
+
+def _doc(page_count):
+    return SimpleNamespace(
+        id=uuid.uuid4(), file_type="txt", filename="notes.txt", source_url="https://example.com/notes", page_count=page_count,
+    )
+
+
+@pytest.fixture
+def serve(monkeypatch):
+    def _serve(doc):
+        monkeypatch.setattr(documents_module.doc_service, "get_document", AsyncMock(return_value=doc))
+        monkeypatch.setattr(documents_module, "can_access_document", lambda *_a, **_k: True)
+    return _serve
+
+
+async def _lines(doc, db, page_from=1, page_to=None) -> list[dict]:
+    response = await documents_module.stream_document_text_content(
+        doc.id, page_from=page_from, page_to=page_to, user=None, db=db,
+    )
+    assert response.media_type == "application/x-ndjson"
+    body = b"".join([chunk async for chunk in response.body_iterator])
+    return [json.loads(line) for line in body.decode("utf-8").splitlines()]
+
+
+async def _buffered_pages(doc, pages, chunks) -> list[dict]:
+    """The buffered endpoint over the same fixtures (its execute order:
+    Page rows, section-title chunks, fallback chunks)."""
+    results = iter([
+        sorted(pages, key=lambda p: p.page_number),
+        [c for c in sorted(chunks, key=lambda c: c.chunk_index) if c.section_title is not None],
+        sorted(chunks, key=lambda c: (c.page_start, c.chunk_index)),
+    ])
+
+    async def execute(_stmt):
+        values = next(results)
+        return SimpleNamespace(scalars=lambda: SimpleNamespace(all=lambda: values))
+
+    db = SimpleNamespace(execute=execute)
+    return (await documents_module.get_document_text_content(doc.id, user=None, db=db))["pages"]
+
+
+_CHUNKS = [
+    _chunk(0, "Intro.", 1, 1, "Introduction"),
+    _chunk(1, "Spans two and three.", 2, 3, "Methods"),
+    _chunk(2, "More on two.", 2, 2),
+    _chunk(3, "Page three alone.", 3, 3),
+    _chunk(4, "Spans three to five.", 3, 5, "Results"),
+    _chunk(5, "Page five.", 5, 5),
+]
+
+
+@pytest.mark.asyncio
+async def test_framing_and_page_content_mode(serve):
+    doc = _doc(page_count=3)
+    serve(doc)
+    pages = [_page(1, "One."), _page(2, "Two."), _page(3, "Three.")]
+    db = _FakeDb(pages, _CHUNKS)
+
+    lines = await _lines(doc, db)
+
+    assert lines[0] == {
+        "type": "meta", "file_type": "txt", "title": "notes", "source_url": "https://example.com/notes",
+        "domain": "example.com", "page_count": 3,
+    }
+    assert lines[-1] == {"type": "end", "pages": 3}
+    assert [{k: v for k, v in line.items() if k != "type"} for line in lines[1:-1]] == await _buffered_pages(
+        doc, pages, _CHUNKS
+    )
+    assert db.streamed == ["pages"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "pages",
+    [
+        [_page(1, "One."), _page(2, "   "), _page(3, "Three.")],  # blank page
+        [_page(1, "One."), _page(3, "Three.")],  # missing row
+        [],  # legacy document
+    ],
+)
+async def test_incomplete_page_content_reconstructs_from_chunks_like_buffered(serve, pages):
+    doc = _doc(page_count=5)
+    serve(doc)
+    db = _FakeDb(pages, _CHUNKS)
+
+    lines = await _lines(doc, db)
+
+    assert db.streamed == ["chunks"]
+    assert [{k: v for k, v in line.items() if k != "type"} for line in lines[1:-1]] == await _buffered_pages(
+        doc, pages, _CHUNKS
+    )
+
+
+@pytest.mark.asyncio
+async def test_window_returns_the_same_pages_as_a_slice_of_the_full_document(serve):
+    doc = _doc(page_count=None)
+    serve(doc)
+
+    full = (await _lines(doc, _FakeDb([], _CHUNKS)))[1:-1]
+    window = await _lines(doc, _FakeDb([], _CHUNKS), page_from=3, page_to=4)
+
+    assert window[1:-1] == [p for p in full if 3 <= p["page_number"] <= 4]
+    assert window[-1] == {"type": "end", "pages": 2}
+    # Page 4 sits inside the chunk that starts on page 3; its title carries over.
+    assert [p["section_title"] for p in window[1:-1]] == ["Methods", "Results"]
+
+
+@pytest.mark.asyncio
+async def test_reversed_window_is_rejected(serve):
+    doc = _doc(page_count=1)
+    serve(doc)
+
+    with pytest.raises(HTTPException) as exc:
+        await documents_module.stream_document_text_content(doc.id, page_from=5, page_to=2, user=None, db=_FakeDb([], []))
+    assert exc.value.status_code == 400
+
+
+def test_blank_chars_are_exactly_what_str_strip_removes():
+    whitespace = {chr(c) for c in range(sys.maxunicode + 1) if chr(c).isspace()}
+    assert set(documents_module._BLANK_CHARS) == whitespace
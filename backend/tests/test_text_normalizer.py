@@ -7,14 +7,22 @@ The displayed quote is ALWAYS the raw slice — so the map must be exact.
 """
 from __future__ import annotations
 
+import random
 import sys
 from pathlib import Path
 
+import pytest
+
 BACKEND_DIR = Path(__file__).resolve().parents[1]
 if str(BACKEND_DIR) not in sys.path:
     sys.path.insert(0, str(BACKEND_DIR))
 
-from app.services.text_normalizer import normalize, raw_span  # noqa: E402
+from app.services.text_normalizer import (  # noqa: E402
+    OffsetMap,
+    _fold_codepoint,
+    normalize,
+    raw_span,
+)
 
 
 def _roundtrip(raw: str, query: str, *, fuzzy: bool = False) -> str:
@@ -126,3 +134,70 @@ class TestRawSpanProjection:
         idx = norm.find("beta")
         rs, re = raw_span(to_raw, len(raw), idx, idx + 4)
         assert raw[rs:re] == "beta"
+
+
+def _reference_normalize(text: str, *, fuzzy: bool = False):
+    """The original one-code-point-at-a-time loop the bulk fast path must
+    reproduce exactly."""
+    out_chars, out_map, prev_space = [], [], False
+    for raw_i, ch in enumerate(text):
+        folded = _fold_codepoint(ch, fuzzy=fuzzy)
+        if folded is None:
+            if prev_space:
+                continue
+            out_chars.append(" ")
+            out_map.append(raw_i)
+            prev_space = True
+            continue
+        if folded == "":
+            continue
+        prev_space = False
+        for c in folded:
+            out_chars.append(c)
+            out_map.append(raw_i)
+    return "".join(out_chars), out_map
+
+
+_TRICKY = (
+    " \t\n\r\u00a0\u2002\u3000\u1680\u200b\u00ad\u0640\ufeffaAzZ09.,;ßẞäÖéİıﬁ…“”„–—´¨¸˘ͺ΅‗‾ΣςКَ"
+    "本協ｆＦ３㍿株가\U0001f600ⅻ"
+)
+
+
+class TestBulkFastPathMatchesReference:
+    @pytest.mark.parametrize("fuzzy", [False, True])
+    @pytest.mark.parametrize("seed", range(4))
+    def test_random_text(self, seed, fuzzy):
+        rng = random.Random(seed)
+        for _ in range(500):
+            n = rng.randint(0, 40)
+            if rng.random() < 0.5:
+                text = "".join(rng.choice(_TRICKY) for _ in range(n))
+            else:
+                hi = 0x2FFFF if rng.random() < 0.3 else 0x3100
+                text = "".join(chr(rng.randint(0, hi)) for _ in range(n))
+            norm, to_raw = normalize(text, fuzzy=fuzzy)
+            ref_norm, ref_map = _reference_normalize(text, fuzzy=fuzzy)
+            assert norm == ref_norm, text
+            assert list(to_raw) == ref_map, text
+            assert [to_raw[i] for i in range(len(to_raw))] == ref_map, text
+
+    @pytest.mark.parametrize("fuzzy", [False, True])
+    def test_every_bulk_block_code_point(self, fuzzy):
+        # Each code point alone, between spaces and next to a space run, so
+        # both the bulk table and the whitespace bookkeeping are covered.
+        for cp in [*range(0x0000, 0x0590), *range(0x1E00, 0x2070), *range(0x3000, 0x3100), 0x4E00, 0xAC00, 0xFB01]:
+            ch = chr(cp)
+            for text in (ch, f" {ch} b", f"a{ch}  {ch}\n"):
+                norm, to_raw = normalize(text, fuzzy=fuzzy)
+                assert (norm, list(to_raw)) == _reference_normalize(text, fuzzy=fuzzy), hex(cp)
+
+    def test_dropped_code_point_does_not_split_a_whitespace_run(self):
+        assert normalize("a \u200b\n\u00ad  b") == ("a b", [0, 1, 7])
+
+    def test_offset_map_is_run_encoded(self):
+        _, to_raw = normalize("alpha  beta\n\ngamma …")
+        assert isinstance(to_raw, OffsetMap)
+        # Runs break only where the raw index does not advance by one.
+        assert [list(starts) for starts in to_raw.runs()] == [[0, 6, 11, 18, 19], [0, 7, 13, 19, 19]]
+        assert to_raw == [0, 1, 2, 3, 4, 5, 7, 8, 9, 10, 11, 13, 14, 15, 16, 17, 18, 19, 19, 19]
@@ -0,0 +1,129 @@
+"""Upload bodies stay in Starlette's spool: validation reads only the head
+(and ZIP directory), create_document streams the file object to storage, and
+the parse worker maps the downloaded object instead of holding it as bytes."""
+from __future__ import annotations
+
+import io
+import tempfile
+import uuid
+import zipfile
+from types import SimpleNamespace
+
+import pytest
+
+import app.services.doc_service as doc_service_module
+from app.api.documents import _validate_file_content
+from app.workers import parse_worker
+
+
+def _docx_bytes(with_content_types: bool = True) -> bytes:
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as zf:
+        if with_content_types:
+            zf.writestr("[Content_Types].xml", "<Types/>")
+        zf.writestr("word/document.xml", "<w:document/>")
+    return buf.getvalue()
+
+
+class _CountingReader(io.BytesIO):
+    def __init__(self, data: bytes) -> None:
+        super().__init__(data)
+        self.bytes_read = 0
+
+    def read(self, size: int = -1) -> bytes:
+        out = super().read(size)
+        self.bytes_read += len(out)
+        return out
+
+
+@pytest.mark.parametrize(
+    ("data", "file_type", "valid"),
+    [
+        (b"%PDF-1.7\n" + b"x" * 1000, "pdf", True),
+        (b"not-a-pdf", "pdf", False),
+        (_docx_bytes(), "docx", True),
+        (_docx_bytes(with_content_types=False), "docx", False),
+        (b"PK\x03\x04 truncated", "docx", False),
+        (b"plain text", "txt", True),
+    ],
+)
+def test_validate_file_content_on_stream(data: bytes, file_type: str, valid: bool) -> None:
+    stream = io.BytesIO(data)
+    stream.seek(3)
+
+    assert _validate_file_content(stream, file_type) is valid
+    assert stream.tell() == 0
+
+
+def test_pdf_validation_reads_only_the_signature() -> None:
+    stream = _CountingReader(b"%PDF-1.4\n" + b"\0" * (4 * 1024 * 1024))
+
+    assert _validate_file_content(stream, "pdf") is True
+    assert stream.bytes_read == len(b"%PDF")
+
+
+@pytest.mark.asyncio
+async def test_create_document_streams_file_object_to_storage(monkeypatch) -> None:
+    uploads: list[tuple] = []
+    added = []
+
+    def fake_upload_stream(stream, length, storage_key, content_type):
+        uploads.append((stream.read(), length, storage_key, content_type))
+
+    def fail_upload_file(*_args, **_kwargs):
+        pytest.fail("spooled uploads must not be materialized as bytes")
+
+    async def fake_commit():
+        return None
+
+    async def fail_read():
+        pytest.fail("spooled uploads must not be read whole")
+
+    monkeypatch.setattr(doc_service_module.storage_service, "upload_stream", fake_upload_stream)
+    monkeypatch.setattr(doc_service_module.storage_service, "upload_file", fail_upload_file)
+    monkeypatch.setattr(parse_worker.parse_document, "delay", lambda *_a, **_k: None)
+
+    with tempfile.SpooledTemporaryFile(max_size=8) as spool:
+        spool.write(b"%PDF-1.4 spooled to disk")
+        spool.seek(0)
+        upload = SimpleNamespace(filename="report.pdf", content_type="application/pdf", file=spool, read=fail_read)
+        db = SimpleNamespace(add=added.append, commit=fake_commit)
+
+        doc_id = await doc_service_module.doc_service.create_document(upload, db, user_id=uuid.uuid4())
+
+    assert uploads == [
+        (b"%PDF-1.4 spooled to disk", 24, f"documents/{doc_id}/report.pdf", "application/pdf"),
+    ]
+    assert added[0].file_size == 24
+
+
+class _FakeObject:
+    def __init__(self, data: bytes) -> None:
+        self._data = data
+        self.released = False
+
+    def stream(self, amt: int):
+        for i in range(0, len(self._data), amt):
+            yield self._data[i : i + amt]
+
+    def close(self) -> None:
+        pass
+
+    def release_conn(self) -> None:
+        self.released = True
+
+
+@pytest.mark.parametrize("size", [0, 10, 3 * 1024 * 1024 + 7])
+def test_download_file_returns_mapped_object(monkeypatch, size: int) -> None:
+    data = bytes(range(256)) * (size // 256) + b"\x01" * (size % 256)
+    obj = _FakeObject(data)
+    monkeypatch.setattr(
+        parse_worker, "_get_minio_client", lambda: SimpleNamespace(get_object=lambda _bucket, _key: obj)
+    )
+
+    mapped = parse_worker._download_file("bucket", "documents/x/report.pdf")
+
+    assert isinstance(mapped, memoryview)
+    assert len(mapped) == size
+    assert mapped == data
+    assert obj.released
@@ -493,7 +493,14 @@ export default function QuestionTemplatesPanel({
                 {(activeRun.status === "queued" || activeRun.status === "running") && (
                   <div className="space-y-2">
                     <div className="h-2 overflow-hidden rounded-full bg-zinc-200 dark:bg-zinc-800">
-                      <div className="h-full w-1/2 animate-pulse rounded-full bg-zinc-900 motion-reduce:animate-none dark:bg-zinc-50" />
+                      {activeRun.progress && activeRun.progress.cells_total > 0 ? (
+                        <div
+                          className="h-full rounded-full bg-zinc-900 transition-[width] dark:bg-zinc-50"
+                          style={{ width: `${Math.round((activeRun.progress.cells_done / activeRun.progress.cells_total) * 100)}%` }}
+                        />
+                      ) : (
+                        <div className="h-full w-1/2 animate-pulse rounded-full bg-zinc-900 motion-reduce:animate-none dark:bg-zinc-50" />
+                      )}
                     </div>
                     <p className="text-sm text-zinc-500 dark:text-zinc-400">
                       {tOr("templates.runningHint", "DocTalk is applying the checklist and building cited answers.")}
@@ -210,32 +210,73 @@ export default function TextViewer({ documentId, fileType, targetPage, scrollNon
   }, []);
 
   useEffect(() => {
-    let cancelled = false;
+    const controller = new AbortController();
     setLoading(true);
-    fetch(`${PROXY_BASE}/api/documents/${documentId}/text-content`)
-      .then(res => {
-        if (!res.ok) throw new Error(`HTTP ${res.status}`);
-        return res.json();
-      })
-      .then(data => {
-        if (!cancelled) {
-          setPages(data.pages || []);
+    setPages([]);
+    // Pages read since the last render are appended once per animation
+    // frame, so a long document doesn't re-render (and copy) on every read.
+    let pending: TextPage[] = [];
+    let frame = 0;
+    const flush = () => {
+      frame = 0;
+      if (controller.signal.aborted || pending.length === 0) return;
+      const batch = pending;
+      pending = [];
+      setPages(prev => prev.concat(batch));
+      setLoading(false);
+    };
+    // NDJSON: a meta line, one line per page, then an end marker. Pages are
+    // rendered as they arrive instead of after the whole document is built.
+    const load = async () => {
+      const res = await fetch(`${PROXY_BASE}/api/documents/${documentId}/text-content/stream`, {
+        signal: controller.signal,
+      });
+      if (!res.ok || !res.body) throw new Error(`HTTP ${res.status}`);
+      const reader = res.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = '';
+      let ended = false;
+      const handleLine = (line: string) => {
+        if (!line.trim()) return;
+        const msg = JSON.parse(line);
+        if (msg.type === 'meta') {
           setSourceMeta({
-            title: data.title,
-            sourceUrl: data.source_url,
-            domain: data.domain,
-            isUrlSource: Boolean(data.source_url) || data.file_type === 'url' || fileType === 'url',
+            title: msg.title,
+            sourceUrl: msg.source_url,
+            domain: msg.domain,
+            isUrlSource: Boolean(msg.source_url) || msg.file_type === 'url' || fileType === 'url',
           });
-          setLoading(false);
-        }
-      })
-      .catch(err => {
-        if (!cancelled) {
-          setError(err.message);
-          setLoading(false);
+        } else if (msg.type === 'page') {
+          pending.push({ page_number: msg.page_number, text: msg.text, section_title: msg.section_title });
+        } else if (msg.type === 'end') {
+          ended = true;
         }
-      });
-    return () => { cancelled = true; };
+      };
+      for (;;) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+        const lines = buffer.split('\n');
+        buffer = lines.pop() ?? '';
+        lines.forEach(handleLine);
+        if (pending.length > 0 && !frame) frame = requestAnimationFrame(flush);
+      }
+      handleLine(buffer + decoder.decode());
+      if (!ended) throw new Error('Incomplete response');
+      cancelAnimationFrame(frame);
+      flush();
+      setLoading(false);
+    };
+    load().catch(err => {
+      if (!controller.signal.aborted) {
+        setError(err.message);
+        setLoading(false);
+      }
+    });
+    return () => {
+      controller.abort();
+      cancelAnimationFrame(frame);
+    };
   }, [documentId, fileType]);
 
   // Scroll to target page (and highlight) when citation is clicked
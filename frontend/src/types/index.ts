@@ -291,6 +291,8 @@ export interface ExtractionJob {
   updated_at: string;
   completed_at: string | null;
   result: ExtractionResultPayload | null;
+  // Question template runs: answered cells so far.
+  progress?: { cells_done: number; cells_total: number } | null;
 }
 
 export interface DocumentTable {